@@ -0,0 +1,13 @@
+"""
+Núcleo del Mini-Compilador (subconjunto de Python con bloques BEGIN ... END).
+
+Este paquete no depende de Tkinter: puede importarse desde procesos
+trabajadores, scripts o pruebas sin abrir ventanas. La interfaz gráfica vive
+en Compilador.py.
+"""
+from .lexer import lexer, token_spec, token_regex
+from .nodes import ASTNode
+from .parser import Parser
+from .semantic import semantic_analysis
+from .codegen import generate_code
+from .compiler import compile_code
@@ -0,0 +1,226 @@
+"""
+Serialización binaria compacta del AST (lista de ASTNode).
+
+Pensada para la caché de compilación y para pasar árboles entre procesos:
+es más pequeña y rápida que pickle, y el codificador y el decodificador son
+iterativos (una pila explícita), así que no dependen del límite de
+recursión aunque el árbol sea muy profundo.
+
+El árbol se escribe en preorden como un flujo de enteros, cinco por nodo:
+
+    tipo, valor, número de hijos, línea, columna
+
+donde tipo y valor son índices a una tabla de valores internados y línea o
+columna 0 significa None. Distribución del archivo (little-endian):
+
+    cabecera   b'MAST' + versión (u8)
+    valores    u32 cantidad + una etiqueta (u8) por valor, y después los
+               enteros (i64), los reales (f64) y los textos (longitudes en
+               caracteres + UTF-8 concatenado) en el orden de la tabla; los
+               enteros que no caben en i64 van como texto decimal
+    flujo      u32 longitud + typecode ('B', 'H' o 'I') + los enteros;
+               el primero es el número de nodos raíz
+"""
+import gc
+import struct
+import sys
+from array import array
+
+from .nodes import ASTNode
+
+MAGIC = b'MAST'
+VERSION = 2
+
+NONE, BOOL, INT, FLOAT, STR, BIGINT = range(6)
+
+_U8 = struct.Struct('<B')
+_U32 = struct.Struct('<I')
+
+
+class ASTFormatError(ValueError):
+    pass
+
+
+def _pack_array(out, typecode, values):
+    values = array(typecode, values)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    out += values.tobytes()
+
+
+def _pack_index_array(out, values):
+    largest = max(values, default=0)
+    typecode = 'B' if largest < 2 ** 8 else 'H' if largest < 2 ** 16 else 'I'
+    out += _U32.pack(len(values))
+    out += typecode.encode('ascii')
+    _pack_array(out, typecode, values)
+
+
+def _pack_values(out, values):
+    tags, ints, floats, texts = bytearray(), [], [], []
+    for value in values:
+        if value is None:
+            tags.append(NONE)
+        elif value is True or value is False:
+            tags.append(BOOL)
+            ints.append(int(value))
+        elif isinstance(value, int) and -2 ** 63 <= value < 2 ** 63:
+            tags.append(INT)
+            ints.append(value)
+        elif isinstance(value, int):
+            # Fuera del rango de i64: su texto decimal va con los textos
+            tags.append(BIGINT)
+            texts.append(str(value))
+        elif isinstance(value, float):
+            tags.append(FLOAT)
+            floats.append(value)
+        elif isinstance(value, str):
+            tags.append(STR)
+            texts.append(value)
+        else:
+            raise TypeError(f"Valor no serializable en el AST: {value!r}")
+    out += _U32.pack(len(values))
+    out += tags
+    _pack_array(out, 'q', ints)
+    _pack_array(out, 'd', floats)
+    _pack_index_array(out, [len(text) for text in texts])
+    data = ''.join(texts).encode('utf-8')
+    out += _U32.pack(len(data))
+    out += data
+
+
+class _Reader:
+    def __init__(self, data):
+        self.data = memoryview(data)
+        self.pos = 0
+
+    def unpack(self, fmt):
+        try:
+            (value,) = fmt.unpack_from(self.data, self.pos)
+        except struct.error:
+            raise ASTFormatError("AST binario truncado")
+        self.pos += fmt.size
+        return value
+
+    def take(self, size):
+        if self.pos + size > len(self.data):
+            raise ASTFormatError("AST binario truncado")
+        chunk = self.data[self.pos:self.pos + size]
+        self.pos += size
+        return chunk
+
+    def array(self, typecode, count):
+        values = array(typecode)
+        values.frombytes(self.take(count * values.itemsize))
+        if sys.byteorder == 'big':
+            values.byteswap()
+        return values.tolist()
+
+    def index_array(self):
+        count = self.unpack(_U32)
+        typecode = str(self.take(1), 'ascii')
+        if typecode not in ('B', 'H', 'I'):
+            raise ASTFormatError(f"Typecode inválido: {typecode!r}")
+        return self.array(typecode, count)
+
+    def values(self):
+        tags = bytes(self.take(self.unpack(_U32)))
+        ints = iter(self.array('q', tags.count(INT) + tags.count(BOOL)))
+        floats = iter(self.array('d', tags.count(FLOAT)))
+        lengths = self.index_array()
+        text = str(self.take(self.unpack(_U32)), 'utf-8')
+        values, start = [], 0
+        lengths = iter(lengths)
+        for tag in tags:
+            if tag == STR or tag == BIGINT:
+                end = start + next(lengths)
+                values.append(text[start:end] if tag == STR else int(text[start:end]))
+                start = end
+            elif tag == INT:
+                values.append(next(ints))
+            elif tag == FLOAT:
+                values.append(next(floats))
+            elif tag == BOOL:
+                values.append(bool(next(ints)))
+            elif tag == NONE:
+                values.append(None)
+            else:
+                raise ASTFormatError(f"Etiqueta de valor desconocida: {tag}")
+        return values
+
+
+def dumps(ast_nodes):
+    """
+    Codifica una lista de ASTNode (lo que devuelve Parser.parse) a bytes.
+    """
+    values, value_index = [], {}
+    stream = [len(ast_nodes)]
+    append = stream.append
+    stack = list(reversed(ast_nodes))
+    pop, extend = stack.pop, stack.extend
+    while stack:
+        node = pop()
+        for value in (node.nodetype, node.value):
+            # El tipo forma parte de la clave: 1, 1.0 y True son distintos
+            key = (value.__class__, value)
+            index = value_index.get(key)
+            if index is None:
+                index = value_index[key] = len(values)
+                values.append(value)
+            append(index)
+        children = node.children
+        append(len(children))
+        append(node.line or 0)
+        append(node.column or 0)
+        if children:
+            extend(reversed(children))
+
+    out = bytearray(MAGIC)
+    out += _U8.pack(VERSION)
+    _pack_values(out, values)
+    _pack_index_array(out, stream)
+    return bytes(out)
+
+
+def loads(data):
+    """
+    Reconstruye la lista de ASTNode codificada con dumps.
+    """
+    reader = _Reader(data)
+    if bytes(reader.take(len(MAGIC))) != MAGIC:
+        raise ASTFormatError("No es un AST binario de minipy")
+    version = reader.unpack(_U8)
+    if version != VERSION:
+        raise ASTFormatError(f"Versión de AST no soportada: {version}")
+    values = reader.values()
+    stream = reader.index_array()
+    if not stream:
+        raise ASTFormatError("AST binario vacío")
+
+    roots = []
+    # Pila de [lista de hijos por llenar, hijos que faltan]
+    pending = [[roots, stream[0]]]
+    i = 1
+    # Se crean muchos objetos seguidos y ninguno es basura: sin pausar el
+    # recolector de ciclos, este recorrería el árbol una y otra vez
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        while pending:
+            top = pending[-1]
+            if not top[1]:
+                pending.pop()
+                continue
+            top[1] -= 1
+            kind, value, count, line, column = stream[i:i + 5]
+            i += 5
+            node = ASTNode(values[kind], values[value], None, line or None, column or None)
+            top[0].append(node)
+            if count:
+                pending.append([node.children, count])
+    except (ValueError, IndexError):
+        raise ASTFormatError("Flujo de nodos inválido")
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return roots
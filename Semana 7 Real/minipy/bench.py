@@ -0,0 +1,593 @@
+"""
+Benchmarks del núcleo minipy.
+
+Uso (desde la carpeta "Semana 7 Real"):
+    python -m minipy.bench closures [-n ITERACIONES]
+    python -m minipy.bench binario [-n SENTENCIAS]
+    python -m minipy.bench ast [-n SENTENCIAS]
+    python -m minipy.bench dag [-n BLOQUES]
+    python -m minipy.bench tipos [-n ITERACIONES]
+    python -m minipy.bench bucles [-n ITERACIONES]
+    python -m minipy.bench saltos [-n ITERACIONES]
+    python -m minipy.bench ssa [-n ITERACIONES]
+    python -m minipy.bench parcial [-n ITERACIONES]
+    python -m minipy.bench hilos [-n PROGRAMAS]
+    python -m minipy.bench incremental [-n SENTENCIAS]
+    python -m minipy.bench paralelo [-n KILOBYTES]
+"""
+import argparse
+import os
+import pickle
+import tempfile
+import time
+import tracemalloc
+
+from .lexer import lexer
+from .parser import Parser
+
+# Bucle caliente: la condición es verdadera mientras n sea distinto de cero
+HOT_LOOP = """
+n = {n};
+s = 0;
+i = 0;
+while n : BEGIN
+    s = s + i * 2;
+    if i - 3 : BEGIN
+        i = i + 1;
+    END
+    else : BEGIN
+        i = i + 2;
+    END
+    n = n - 1;
+END
+"""
+
+
+def parse(source):
+    return Parser(lexer(source)).parse()
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def best_of(function, *args, repeat=5):
+    return min((timed(function, *args) for _ in range(repeat)), key=lambda pair: pair[0])
+
+
+def bench_closures(iterations):
+    from .interpreter import interpret
+    from .closures import compile_closures
+
+    ast_nodes = parse(HOT_LOOP.format(n=iterations))
+    t_tree, env_tree = timed(interpret, ast_nodes)
+    t_compile, program = timed(compile_closures, ast_nodes)
+    t_run, env_closures = timed(program.run)
+    assert env_tree == env_closures, (env_tree, env_closures)
+
+    print(f"bucle de {iterations} iteraciones")
+    print(f"  intérprete del árbol : {t_tree * 1000:9.1f} ms")
+    print(f"  clausuras (compilar) : {t_compile * 1000:9.1f} ms")
+    print(f"  clausuras (ejecutar) : {t_run * 1000:9.1f} ms")
+    print(f"  aceleración          : {t_tree / t_run:9.1f}x")
+
+
+def straight_line(statements):
+    """
+    Programa sin bucles de `statements` asignaciones con un if cada 10.
+    """
+    lines = ["x0 = 1;", "y = 2.5;"]
+    for i in range(1, statements):
+        lines.append(f"x{i % 50} = x{(i - 1) % 50} * {i} + y - {i % 7};")
+        if i % 10 == 0:
+            lines.append(f"if x{i % 50} : BEGIN y = y / 2; END else : BEGIN y = y + 1; END")
+    return "\n".join(lines)
+
+
+def bench_binario(statements):
+    from .compiler import compile_code
+    from .tac import from_tac
+    from .binary_ir import save, load
+
+    ir = compile_code(straight_line(statements))[3]
+    program = from_tac(ir)
+    with tempfile.TemporaryDirectory() as folder:
+        text_path = os.path.join(folder, "programa.tac")
+        binary_path = os.path.join(folder, "programa.mtac")
+        with open(text_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(ir) + "\n")
+        save(program, binary_path)
+
+        def load_text():
+            with open(text_path, encoding="utf-8") as f:
+                return from_tac(f.read().splitlines())
+
+        t_text, from_text = best_of(load_text)
+        t_binary, from_binary = best_of(load, binary_path)
+        text_size = os.path.getsize(text_path)
+        binary_size = os.path.getsize(binary_path)
+    assert from_text.to_tac() == from_binary.to_tac() == ir
+
+    print(f"{len(ir)} instrucciones")
+    print(f"  texto   : {text_size:9d} bytes  {t_text * 1000:8.2f} ms")
+    print(f"  binario : {binary_size:9d} bytes  {t_binary * 1000:8.2f} ms")
+    print(f"  tamaño  : {binary_size / text_size:9.2f}x   carga: {t_text / t_binary:6.1f}x más rápida")
+
+
+def bench_ast(statements):
+    from .ast_binary import dumps, loads
+    from .nodes import ASTNode
+
+    ast_nodes = parse(straight_line(statements))
+    t_pickle_dump, pickled = best_of(pickle.dumps, ast_nodes, pickle.HIGHEST_PROTOCOL)
+    t_pickle_load, _ = best_of(pickle.loads, pickled)
+    t_dump, encoded = best_of(dumps, ast_nodes)
+    t_load, decoded = best_of(loads, encoded)
+    assert repr(decoded) == repr(ast_nodes)
+
+    print(f"{statements} sentencias")
+    print(f"  pickle  : {len(pickled):9d} bytes  codificar {t_pickle_dump * 1000:7.2f} ms"
+          f"  decodificar {t_pickle_load * 1000:7.2f} ms")
+    print(f"  binario : {len(encoded):9d} bytes  codificar {t_dump * 1000:7.2f} ms"
+          f"  decodificar {t_load * 1000:7.2f} ms")
+
+    # Expresión muy anidada (1 + 1 + ... por la derecha): pickle recorre el
+    # árbol de forma recursiva. Se construye a mano porque el parser también
+    # es recursivo.
+    depth = 100_000
+    expr = ASTNode('num', 1)
+    for _ in range(depth):
+        expr = ASTNode('binop', '+', [ASTNode('num', 1), expr])
+    deep = [ASTNode('assign', 'x', [expr])]
+    try:
+        pickle.dumps(deep)
+        pickle_deep = "ok"
+    except RecursionError:
+        pickle_deep = "RecursionError"
+    assert loads(dumps(deep))[0].children[0].children[1].children[1].nodetype == 'binop'
+    print(f"  anidamiento {depth}: pickle {pickle_deep}, binario ok")
+
+
+def repeated_subexpressions(blocks):
+    """
+    Programa en el que cada bloque repite la misma subexpresión en la
+    asignación, en la condición y en las dos ramas de un if.
+    """
+    lines = ["a = 1; b = 2; c = 3;"]
+    for i in range(blocks):
+        expr = f"(a * b + c * {i % 10})"
+        lines.append(f"x{i % 20} = {expr} * {expr};")
+        lines.append(f"if {expr} - {i} : BEGIN y = {expr} * 2; END "
+                     f"else : BEGIN y = {expr} * 3 + x{i % 20}; END")
+        lines.append("a = a + 1;")
+    return "\n".join(lines)
+
+
+def count_nodes(ast_nodes):
+    seen = set()
+    stack = list(ast_nodes)
+    while stack:
+        node = stack.pop()
+        if id(node) not in seen:
+            seen.add(id(node))
+            stack.extend(node.children)
+    return len(seen)
+
+
+def bench_dag(blocks):
+    from .compiler import compile_code
+    from .tac import from_tac, run_tac
+
+    source = repeated_subexpressions(blocks)
+    print(f"{blocks} bloques")
+    results = []
+    for hash_cons in (False, True):
+        tracemalloc.start()
+        _tokens, ast_nodes, _symtab, ir = compile_code(source, hash_cons)
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        t_run, env = best_of(run_tac, from_tac(ir))
+        results.append(env)
+        label = "DAG (hash_cons)" if hash_cons else "árbol"
+        print(f"  {label:16s}: {count_nodes(ast_nodes):8d} nodos  {len(ir):8d} instrucciones"
+              f"  {memory / 1024:9.0f} KiB  ejecutar {t_run * 1000:7.2f} ms")
+    assert results[0] == results[1]
+
+
+# Bucles numéricos con el lenguaje tal cual: sin comparaciones, la condición
+# de cada while es una resta de enteros
+NUMERIC_LOOP = """
+n = {n};
+i = 0;
+s = 0;
+while n - i : BEGIN
+    j = 0;
+    while j - 3 : BEGIN
+        s = s + i * j;
+        j = j + 1;
+    END
+    k = s;
+    i = i + 1;
+END
+"""
+
+
+def bench_tipos(iterations):
+    from .closures import compile_closures
+    from .codegen import generate_code
+    from .semantic import semantic_analysis
+    from .tac import from_tac, run_tac, specialize
+
+    ast_nodes = parse(NUMERIC_LOOP.format(n=iterations))
+    untyped_closures = compile_closures(ast_nodes)
+    generic = from_tac(generate_code(ast_nodes))
+    semantic_analysis(ast_nodes)
+    typed_closures = compile_closures(ast_nodes)
+    specialized = specialize(from_tac(*generate_code(ast_nodes, with_types=True)))
+
+    t_generic, env_generic = best_of(run_tac, generic, repeat=3)
+    t_specialized, env_specialized = best_of(run_tac, specialized, repeat=3)
+    t_untyped, env_untyped = best_of(untyped_closures.run, repeat=3)
+    t_typed, env_typed = best_of(typed_closures.run, repeat=3)
+    assert env_generic == env_specialized == env_untyped == env_typed
+
+    print(f"bucle de {iterations} iteraciones ({len(generic)} -> {len(specialized)} instrucciones)")
+    print(f"  TAC genérico        : {t_generic * 1000:9.1f} ms")
+    print(f"  TAC especializado   : {t_specialized * 1000:9.1f} ms  ({t_generic / t_specialized:.2f}x)")
+    print(f"  clausuras sin tipos : {t_untyped * 1000:9.1f} ms")
+    print(f"  clausuras con tipos : {t_typed * 1000:9.1f} ms  ({t_untyped / t_typed:.2f}x)")
+
+
+# Cálculos invariantes, multiplicaciones por la variable de inducción e
+# identidades algebraicas dentro del bucle
+INVARIANT_LOOP = """
+n = {n};
+a = 3;
+b = 4;
+i = 0;
+s = 0;
+while n - i : BEGIN
+    s = s + (a * b + a) * 1 + i * 4;
+    t = s - b * 2 + 0;
+    i = i + 1;
+END
+"""
+
+
+def bench_bucles(iterations):
+    from .codegen import generate_code
+    from .optimizer import optimize
+    from .semantic import semantic_analysis
+    from .tac import from_tac, run_tac, specialize
+
+    ast_nodes = parse(INVARIANT_LOOP.format(n=iterations))
+    semantic_analysis(ast_nodes)
+    ir, types = generate_code(ast_nodes, with_types=True)
+    stats = {}
+    optimized_ir, optimized_types = optimize(ir, types, stats)
+    plain = specialize(from_tac(ir, types))
+    optimized = specialize(from_tac(optimized_ir, optimized_types))
+
+    t_plain, env_plain = best_of(run_tac, plain, repeat=3)
+    t_optimized, env_optimized = best_of(run_tac, optimized, repeat=3)
+    assert env_plain == env_optimized
+
+    print(f"bucle de {iterations} iteraciones")
+    print(f"  invariantes movidos : {stats.get('invariantes', 0)}")
+    print(f"  reducciones         : {stats.get('reducciones', 0)}")
+    print(f"  identidades         : {stats.get('identidades', 0)}")
+    print(f"  TAC sin optimizar   : {t_plain * 1000:9.1f} ms")
+    print(f"  TAC optimizado      : {t_optimized * 1000:9.1f} ms  ({t_plain / t_optimized:.2f}x)")
+
+
+# Ifs sin else y anidados al final del cuerpo: cadenas de saltos a saltos
+BRANCHY_LOOP = """
+n = {n};
+i = 0;
+s = 0;
+while n : BEGIN
+    if i - 3 : BEGIN
+        if s : BEGIN
+            s = s - 1;
+        END
+    END
+    else : BEGIN
+        s = s + 2;
+    END
+    if 0 : BEGIN
+        s = 0;
+    END
+    i = i + 1;
+    if i - 5 : BEGIN
+        n = n - 1;
+    END
+    else : BEGIN
+        i = 0;
+    END
+END
+"""
+
+
+def bench_saltos(iterations):
+    from .codegen import generate_code
+    from .optimizer import optimize_jumps
+    from .semantic import semantic_analysis
+    from .tac import count_jumps, from_tac, run_tac, specialize
+
+    print(f"bucles de {iterations} iteraciones")
+    for name, template in (("HOT_LOOP", HOT_LOOP), ("BRANCHY_LOOP", BRANCHY_LOOP)):
+        ast_nodes = parse(template.format(n=iterations))
+        semantic_analysis(ast_nodes)
+        ir, types = generate_code(ast_nodes, with_types=True)
+        stats = {}
+        plain = specialize(from_tac(ir, types))
+        optimized = specialize(from_tac(*optimize_jumps(ir, types, stats)))
+
+        t_plain, env_plain = best_of(run_tac, plain, repeat=3)
+        t_optimized, env_optimized = best_of(run_tac, optimized, repeat=3)
+        assert env_plain == env_optimized
+        jumps_plain = count_jumps(plain)
+        jumps_optimized = count_jumps(optimized)
+
+        print(f"  {name}: {len(plain)} -> {len(optimized)} instrucciones {stats}")
+        print(f"    saltos ejecutados : {jumps_plain:9d} -> {jumps_optimized:9d}"
+              f"  ({1 - jumps_optimized / jumps_plain:.0%} menos)")
+        print(f"    tiempo            : {t_plain * 1000:7.1f} ms -> {t_optimized * 1000:7.1f} ms"
+              f"  ({t_plain / t_optimized:.2f}x)")
+
+
+# Condiciones que sólo se vuelven constantes al propagar a través de
+# variables y de ramas ya decididas
+CONSTANT_BRANCHES = """
+n = {n};
+k = 4;
+d = k * 2 - 8;
+s = 0;
+if d : BEGIN
+    k = k + 1;
+END
+while n : BEGIN
+    if k - 4 : BEGIN
+        s = s * k;
+    END
+    else : BEGIN
+        s = s + k;
+    END
+    while d : BEGIN
+        s = s - 1;
+    END
+    n = n - 1;
+END
+"""
+
+
+def bench_ssa(iterations):
+    from .codegen import generate_code
+    from .semantic import semantic_analysis
+    from .ssa import propagate_constants
+    from .tac import from_tac, run_tac, specialize
+
+    print(f"bucles de {iterations} iteraciones")
+    programs = (("HOT_LOOP", HOT_LOOP), ("BRANCHY_LOOP", BRANCHY_LOOP),
+                ("INVARIANT_LOOP", INVARIANT_LOOP), ("CONSTANT_BRANCHES", CONSTANT_BRANCHES))
+    for name, template in programs:
+        ast_nodes = parse(template.format(n=iterations))
+        semantic_analysis(ast_nodes)
+        ir, types = generate_code(ast_nodes, with_types=True)
+        stats = {}
+        propagated = propagate_constants(ir, types, stats)
+        plain = specialize(from_tac(ir, types))
+        optimized = specialize(from_tac(*propagated))
+
+        t_plain, env_plain = best_of(run_tac, plain, repeat=3)
+        t_optimized, env_optimized = best_of(run_tac, optimized, repeat=3)
+        assert env_plain == env_optimized
+
+        print(f"  {name}: {len(ir)} -> {len(propagated[0])} instrucciones"
+              f"  ({1 - len(propagated[0]) / len(ir):.0%} menos) {stats}")
+        print(f"    tiempo : {t_plain * 1000:7.1f} ms -> {t_optimized * 1000:7.1f} ms"
+              f"  ({t_plain / t_optimized:.2f}x)")
+
+
+def bench_parcial(iterations):
+    from .compiler import compile_code
+    from .partial_eval import DEFAULT_FUEL
+    from .tac import from_tac, run_tac
+
+    print(f"bucles de {iterations} iteraciones, combustible {DEFAULT_FUEL}")
+    for name, template in (("HOT_LOOP", HOT_LOOP), ("BRANCHY_LOOP", BRANCHY_LOOP),
+                           ("CONSTANT_BRANCHES", CONSTANT_BRANCHES)):
+        source = template.format(n=iterations)
+        t_compile, (_, _, _, ir) = timed(compile_code, source)
+        t_fold, (_, _, _, folded) = timed(lambda: compile_code(source, fuel=DEFAULT_FUEL))
+        t_run, env = best_of(run_tac, from_tac(ir), repeat=3)
+        t_run_folded, env_folded = best_of(run_tac, from_tac(folded), repeat=3)
+        assert env == env_folded
+
+        result = "tabla de valores" if folded != ir else "sin combustible, código normal"
+        print(f"  {name}: {len(ir)} -> {len(folded)} instrucciones ({result})")
+        print(f"    compilar : {t_compile * 1000:9.2f} ms -> {t_fold * 1000:9.2f} ms")
+        print(f"    ejecutar : {t_run * 1000:9.2f} ms -> {t_run_folded * 1000:9.2f} ms")
+
+
+def stress_program(seed):
+    """
+    Programa de prueba distinto para cada semilla: asignaciones, if y while
+    con las variables y constantes que elige un generador con esa semilla.
+    """
+    import random
+
+    rng = random.Random(seed)
+    names = ["a", "b", "c", "d"]
+
+    def expr(depth):
+        if depth == 0 or rng.random() < 0.3:
+            return rng.choice(names + [str(rng.randint(0, 9)), f"{rng.randint(0, 9)}.5"])
+        return f"({expr(depth - 1)} {rng.choice('+-*/')} {expr(depth - 1)})"
+
+    lines = [f"{name} = {rng.randint(1, 9)};" for name in names]
+    for _ in range(rng.randint(5, 30)):
+        kind = rng.random()
+        if kind < 0.2:
+            lines.append(f"if {expr(2)} : BEGIN {rng.choice(names)} = {expr(3)}; END "
+                         f"else : BEGIN {rng.choice(names)} = {expr(3)}; END")
+        elif kind < 0.3:
+            lines.append(f"i = 3; while i : BEGIN {rng.choice(names)} = {expr(3)}; i = i - 1; END")
+        else:
+            lines.append(f"{rng.choice(names)} = {expr(3)};")
+    return "\n".join(lines)
+
+
+def bench_hilos(programs):
+    """
+    Prueba de estrés de compile_code: compila los programas uno tras otro y
+    después desde muchos hilos a la vez (cambiando de hilo muy a menudo), y
+    comprueba que cada resultado coincide con el de la compilación
+    secuencial.
+    """
+    import sys
+    from concurrent.futures import ThreadPoolExecutor
+    from .compiler import compile_code
+
+    def compile_one(seed):
+        tokens, ast_nodes, symtab, ir = compile_code(stress_program(seed), hash_cons=seed % 2 == 1,
+                                                     optimize=seed % 3 == 0)
+        return tokens, repr(ast_nodes), symtab, ir
+
+    seeds = range(programs)
+    t_sequential, expected = timed(lambda: [compile_one(seed) for seed in seeds])
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(max_workers=32) as pool:
+            t_threads, results = timed(lambda: list(pool.map(compile_one, seeds)))
+    finally:
+        sys.setswitchinterval(switch_interval)
+    mismatches = [seed for seed in seeds if results[seed] != expected[seed]]
+
+    print(f"{programs} programas, 32 hilos")
+    print(f"  secuencial : {t_sequential * 1000:9.1f} ms")
+    print(f"  con hilos  : {t_threads * 1000:9.1f} ms")
+    print(f"  resultados distintos de la compilación secuencial: {len(mismatches)}")
+    assert not mismatches, f"programas {mismatches[:10]}"
+
+
+def bench_incremental(statements):
+    from .compiler import compile_code
+    from .incremental import IncrementalFrontEnd
+
+    def program(size):
+        lines = []
+        for i in range(size // 4):
+            lines.append(f"x{i % 50} = {i} + y;")
+            lines.append(f"while x{i % 50} - {i} : BEGIN")
+            lines.append(f"    x{i % 50} = x{i % 50} + 1;")
+            lines.append("END")
+        return lines
+
+    for size in (statements // 100, statements // 10, statements):
+        # Al menos un while, para que haya una línea que editar
+        lines = program(max(size, 4))
+        source = "\n".join(lines)
+        t_full, _ = timed(lambda: Parser(lexer(source)).parse())
+        front_end = IncrementalFrontEnd(source)
+        front_end.parse()
+        # Cambiar un número dentro del cuerpo de un while a mitad del archivo
+        middle = (len(lines) // 8) * 4 + 3
+        column = lines[middle - 1].index("1;")
+
+        def change_number():
+            front_end.edit((middle, column), (middle, column + 1), "2")
+            front_end.parse()
+            front_end.edit((middle, column), (middle, column + 1), "1")
+            return front_end.parse()
+
+        # Insertar y quitar una línea (las posteriores cambian de número)
+        def insert_line():
+            front_end.edit((middle, 0), (middle, 0), "    z = 1;\n")
+            front_end.parse()
+            front_end.edit((middle, 0), (middle + 1, 0), "")
+            return front_end.parse()
+
+        # Lo mismo con compile() (análisis semántico y TAC), como "Compilar"
+        def compile_changed_number():
+            front_end.edit((middle, column), (middle, column + 1), "2")
+            front_end.compile()
+            front_end.edit((middle, column), (middle, column + 1), "1")
+            return front_end.compile()
+
+        t_number, (tokens, ast_nodes) = best_of(change_number)
+        t_line, (tokens, ast_nodes) = best_of(insert_line)
+        assert tokens == lexer(source) and repr(ast_nodes) == repr(Parser(tokens).parse())
+        t_compile_full, expected = best_of(compile_code, source)
+        t_compile, compiled = best_of(compile_changed_number)
+        assert compiled[2:] == expected[2:]
+        print(f"{len(lines):8d} líneas: análisis completo {t_full * 1000:8.2f} ms"
+              f"  cambiar un número {t_number / 2 * 1000:6.3f} ms"
+              f"  insertar una línea {t_line / 2 * 1000:7.3f} ms"
+              f"  compilar: completo {t_compile_full * 1000:8.2f} ms"
+              f"  tras cambiar un número {t_compile / 2 * 1000:7.2f} ms")
+
+
+def bench_paralelo(kilobytes):
+    """
+    Lexer secuencial contra parallel_lexer.lex_chunks sobre un código de
+    kilobytes KB. Los tokens de cada trozo se cuentan y se descartan: los de
+    un archivo de cientos de MB no caben en memoria.
+    """
+    from .parallel_lexer import lex_chunks, parallel_lexer, split_chunks
+
+    block = []
+    for i in range(2000):
+        block.append(f"x{i % 97} = (x{(i + 3) % 97} + {i}) * 2.5 - y{i % 13};")
+        if i % 50 == 0:
+            block.append("while x1 : BEGIN y = y - 1; END")
+    block = "\n".join(block) + "\n"
+    source = block * max(kilobytes * 1024 // len(block), 1)
+    megabytes = len(source) / 1e6
+    prefix = source[:3 * len(block)]
+    assert parallel_lexer(prefix, 2, 64 * 1024) == lexer(prefix)
+
+    def sequential():
+        return sum(len(lexer(source[start:end], first_line))
+                   for start, end, first_line in split_chunks(source))
+
+    t_sequential, count = timed(sequential)
+    print(f"{megabytes:.1f} MB, {count} tokens, {os.cpu_count()} CPU")
+    print(f"  lexer secuencial    : {t_sequential:8.2f} s  {megabytes / t_sequential:6.2f} MB/s")
+    for workers in sorted({2, 4, os.cpu_count() or 1}):
+        t_parallel, parallel_count = timed(
+            lambda: sum(len(tokens) for tokens in lex_chunks(source, workers)))
+        assert parallel_count == count
+        print(f"  {workers:2d} procesos         : {t_parallel:8.2f} s  {megabytes / t_parallel:6.2f} MB/s"
+              f"  ({t_sequential / t_parallel:.2f}x)")
+
+
+BENCHMARKS = {
+    'ast': bench_ast,
+    'dag': bench_dag,
+    'binario': bench_binario,
+    'closures': bench_closures,
+    'tipos': bench_tipos,
+    'bucles': bench_bucles,
+    'saltos': bench_saltos,
+    'ssa': bench_ssa,
+    'parcial': bench_parcial,
+    'hilos': bench_hilos,
+    'incremental': bench_incremental,
+    'paralelo': bench_paralelo,
+}
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Benchmarks del núcleo minipy.")
+    arg_parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    arg_parser.add_argument("-n", "--iteraciones", type=int, default=200_000)
+    args = arg_parser.parse_args(argv)
+    BENCHMARKS[args.benchmark](args.iteraciones)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Formato binario compacto y versionado para el TAC de minipy.
+
+Guarda un TacProgram tal cual está en memoria, de modo que cargarlo no
+requiere analizar texto: las secciones se leen directamente a los arreglos
+de instrucciones que usa run_tac.
+
+Distribución del archivo (enteros little-endian):
+
+    cabecera    b'MTAC' + versión (u8)
+    nombres     u32 longitud + los nombres en UTF-8 separados por '\n'
+    constantes  u32 cantidad, y por constante una etiqueta (u8) y su valor:
+                0 = entero i64, 1 = real f64, 2 = entero grande como texto
+    etiquetas   u32 cantidad, y por etiqueta su nombre + u32 instrucción
+    código      u32 instrucciones, los códigos de operación (u8 cada uno)
+                y después los operandos a, b y c; cada arreglo de operandos
+                lleva delante su typecode de array ('B', 'H' o 'I'), el más
+                pequeño en el que caben todos sus valores
+"""
+import struct
+import sys
+from array import array
+
+from .tac import TacProgram
+
+MAGIC = b'MTAC'
+VERSION = 1
+
+INT, FLOAT, BIGINT = range(3)
+
+_U8 = struct.Struct('<B')
+_U16 = struct.Struct('<H')
+_U32 = struct.Struct('<I')
+_I64 = struct.Struct('<q')
+_F64 = struct.Struct('<d')
+
+
+class BinaryFormatError(ValueError):
+    pass
+
+
+def _pack_text(out, text):
+    data = text.encode('utf-8')
+    out += _U16.pack(len(data))
+    out += data
+
+
+def _pack_index_array(out, values):
+    largest = max(values, default=0)
+    typecode = 'B' if largest < 2 ** 8 else 'H' if largest < 2 ** 16 else 'I'
+    values = array(typecode, values)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    out += typecode.encode('ascii')
+    out += values.tobytes()
+
+
+def dumps(program):
+    """
+    Serializa un TacProgram a bytes.
+    """
+    out = bytearray(MAGIC)
+    out += _U8.pack(VERSION)
+
+    names = '\n'.join(program.names).encode('utf-8')
+    out += _U32.pack(len(names))
+    out += names
+
+    out += _U32.pack(len(program.constants))
+    for value in program.constants:
+        if isinstance(value, float):
+            out += _U8.pack(FLOAT) + _F64.pack(value)
+        elif -2 ** 63 <= value < 2 ** 63:
+            out += _U8.pack(INT) + _I64.pack(value)
+        else:
+            out += _U8.pack(BIGINT)
+            _pack_text(out, str(value))
+
+    out += _U32.pack(len(program.labels))
+    for label, index in program.labels.items():
+        _pack_text(out, label)
+        out += _U32.pack(index)
+
+    out += _U32.pack(len(program.opcodes))
+    out += bytes(program.opcodes)
+    for operands in (program.a, program.b, program.c):
+        _pack_index_array(out, operands)
+    return bytes(out)
+
+
+class _Reader:
+    def __init__(self, data):
+        self.data = memoryview(data)
+        self.pos = 0
+
+    def unpack(self, fmt):
+        try:
+            (value,) = fmt.unpack_from(self.data, self.pos)
+        except struct.error:
+            raise BinaryFormatError("Archivo de IR truncado")
+        self.pos += fmt.size
+        return value
+
+    def take(self, size):
+        if self.pos + size > len(self.data):
+            raise BinaryFormatError("Archivo de IR truncado")
+        chunk = self.data[self.pos:self.pos + size]
+        self.pos += size
+        return chunk
+
+    def text(self):
+        return str(self.take(self.unpack(_U16)), 'utf-8')
+
+    def index_array(self, count):
+        typecode = str(self.take(1), 'ascii')
+        if typecode not in ('B', 'H', 'I'):
+            raise BinaryFormatError(f"Typecode de operandos inválido: {typecode!r}")
+        values = array(typecode)
+        values.frombytes(self.take(count * values.itemsize))
+        if sys.byteorder == 'big':
+            values.byteswap()
+        return values.tolist()
+
+
+def loads(data):
+    """
+    Reconstruye el TacProgram guardado con dumps.
+    """
+    reader = _Reader(data)
+    if bytes(reader.take(len(MAGIC))) != MAGIC:
+        raise BinaryFormatError("No es un archivo de IR de minipy")
+    version = reader.unpack(_U8)
+    if version != VERSION:
+        raise BinaryFormatError(f"Versión de IR no soportada: {version}")
+
+    names = str(reader.take(reader.unpack(_U32)), 'utf-8')
+    names = names.split('\n') if names else []
+
+    constants = []
+    for _ in range(reader.unpack(_U32)):
+        tag = reader.unpack(_U8)
+        if tag == INT:
+            constants.append(reader.unpack(_I64))
+        elif tag == FLOAT:
+            constants.append(reader.unpack(_F64))
+        elif tag == BIGINT:
+            constants.append(int(reader.text()))
+        else:
+            raise BinaryFormatError(f"Tipo de constante desconocido: {tag}")
+
+    labels = {}
+    for _ in range(reader.unpack(_U32)):
+        label = reader.text()
+        labels[label] = reader.unpack(_U32)
+
+    count = reader.unpack(_U32)
+    opcodes = list(reader.take(count))
+    a = reader.index_array(count)
+    b = reader.index_array(count)
+    c = reader.index_array(count)
+    return TacProgram(opcodes, a, b, c, names, constants, labels)
+
+
+def save(program, path):
+    with open(path, 'wb') as f:
+        f.write(dumps(program))
+
+
+def load(path):
+    with open(path, 'rb') as f:
+        return loads(f.read())
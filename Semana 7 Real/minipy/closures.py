@@ -0,0 +1,236 @@
+"""
+Compilación del AST a clausuras de Python.
+
+El árbol se recorre una sola vez: cada nodo se convierte en una función que
+ya tiene ligados sus hijos y los índices (slots) de las variables que usa.
+Ejecutar el programa es entonces una llamada normal, sin despachar por
+'nodetype' en cada visita. La semántica es la misma que la de
+minipy.interpreter.
+"""
+
+
+class _Unset:
+    """
+    Valor inicial del slot de una variable sin asignar. Cualquier operación
+    aritmética o de verdad con él falla igual que en el intérprete, sin que
+    los accesos normales tengan que comprobar nada.
+    """
+    __slots__ = ('name',)
+
+    def __init__(self, name):
+        self.name = name
+
+    def _fail(self, *args):
+        raise NameError(f"Variable '{self.name}' sin inicializar")
+
+    __add__ = __radd__ = __sub__ = __rsub__ = _fail
+    __mul__ = __rmul__ = __truediv__ = __rtruediv__ = _fail
+    __bool__ = _fail
+
+
+# Las expresiones compiladas se representan como (tipo, dato):
+#   ('const', valor)  ('var', slot)  ('fn', clausura que recibe los slots)
+# Para cada operador y cada combinación de tipos de operandos se genera una
+# fábrica de clausuras especializada, p. ej. ('+', 'var', 'const') produce
+# lambda s: s[i] + c. '!=' solo se usa en condiciones (ver condition).
+_OPERAND = {'const': '{}', 'var': 's[{}]', 'fn': '{}(s)'}
+_BINOP_FACTORIES = {
+    (op, lk, rk): eval(f"lambda a, b: lambda s: "
+                       f"{_OPERAND[lk].format('a')} {op} {_OPERAND[rk].format('b')}")
+    for op in ('+', '-', '*', '/', '!=') for lk in _OPERAND for rk in _OPERAND
+}
+
+
+class CompiledProgram:
+    def __init__(self, names, body):
+        self.names = names  # nombre de variable por slot
+        self.body = body    # clausura del programa completo
+
+    def run(self, env=None):
+        """
+        Ejecuta el programa y devuelve el entorno final (nombre -> valor).
+        """
+        slots = [_Unset(name) for name in self.names]
+        extra = {}
+        if env:
+            index = {name: i for i, name in enumerate(self.names)}
+            for name, value in env.items():
+                if name in index:
+                    slots[index[name]] = value
+                else:
+                    extra[name] = value
+        self.body(slots)
+        extra.update((name, value) for name, value in zip(self.names, slots)
+                     if value.__class__ is not _Unset)
+        return extra
+
+
+class ClosureCompiler:
+    def __init__(self):
+        self.slots = {}  # nombre de variable -> índice
+
+    def slot(self, name):
+        if name not in self.slots:
+            self.slots[name] = len(self.slots)
+        return self.slots[name]
+
+    def compile(self, ast_nodes):
+        body = self.sequence([self.stmt(node) for node in ast_nodes])
+        names = [None] * len(self.slots)
+        for name, i in self.slots.items():
+            names[i] = name
+        return CompiledProgram(names, body or _nothing)
+
+    # --------------------------------------------------------------
+    # Sentencias
+    # --------------------------------------------------------------
+    def sequence(self, stmts):
+        stmts = tuple(f for f in stmts if f is not None)
+        if not stmts:
+            return None
+        if len(stmts) == 1:
+            return stmts[0]
+        if len(stmts) == 2:
+            first, second = stmts
+
+            def run_pair(s):
+                first(s)
+                second(s)
+            return run_pair
+
+        def run_block(s):
+            for stmt in stmts:
+                stmt(s)
+        return run_block
+
+    def stmt(self, node):
+        if node.nodetype == 'assign':
+            return self.assign(self.slot(node.value), self.expr(node.children[0]))
+
+        elif node.nodetype == 'if':
+            # children = [cond, if_block, else_block]
+            cond = self.as_function(self.condition(node.children[0]))
+            then = self.stmt(node.children[1]) or _nothing
+            other = self.stmt(node.children[2])
+            if other is None:
+                def run_if(s):
+                    if cond(s):
+                        then(s)
+                return run_if
+
+            def run_if_else(s):
+                if cond(s):
+                    then(s)
+                else:
+                    other(s)
+            return run_if_else
+
+        elif node.nodetype == 'while':
+            # children = [cond, block]
+            kind, data = self.condition(node.children[0])
+            body = self.stmt(node.children[1]) or _nothing
+            if kind == 'var':
+                def run_while_var(s):
+                    while s[data]:
+                        body(s)
+                return run_while_var
+            if kind == 'ne':
+                (lk, lv), (rk, rv) = data
+                if lk == 'var' and rk == 'const':
+                    def run_while_ne_const(s):
+                        while s[lv] != rv:
+                            body(s)
+                    return run_while_ne_const
+                if lk == 'var' and rk == 'var':
+                    def run_while_ne_var(s):
+                        while s[lv] != s[rv]:
+                            body(s)
+                    return run_while_ne_var
+            cond = self.as_function((kind, data))
+
+            def run_while(s):
+                while cond(s):
+                    body(s)
+            return run_while
+
+        elif node.nodetype == 'block':
+            return self.sequence([self.stmt(stmt) for stmt in node.children])
+
+    def assign(self, target, compiled):
+        kind, data = compiled
+        if kind == 'const':
+            def run_assign_const(s):
+                s[target] = data
+            return run_assign_const
+        if kind == 'var':
+            def run_assign_var(s):
+                value = s[data]
+                if value.__class__ is _Unset:
+                    value._fail()
+                s[target] = value
+            return run_assign_var
+
+        def run_assign(s):
+            s[target] = data(s)
+        return run_assign
+
+    # --------------------------------------------------------------
+    # Expresiones
+    # --------------------------------------------------------------
+    def expr(self, node):
+        if node.nodetype == 'num':
+            return 'const', node.value
+        elif node.nodetype == 'id':
+            return 'var', self.slot(node.value)
+        elif node.nodetype == 'binop':
+            lk, lv = self.expr(node.children[0])
+            rk, rv = self.expr(node.children[1])
+            # Plegado de constantes; la división entre cero se deja para la
+            # ejecución, como en el intérprete.
+            if lk == 'const' and rk == 'const' and not (node.value == '/' and rv == 0):
+                return 'const', _BINOP_FACTORIES[(node.value, lk, rk)](lv, rv)(None)
+            return 'fn', _BINOP_FACTORIES[(node.value, lk, rk)](lv, rv)
+        raise ValueError(f"Nodo '{node.nodetype}' no es una expresión")
+
+    def condition(self, node):
+        """
+        Compila la condición de un if o while. Si semantic_analysis inferió
+        que es una resta de enteros, "a - b" es verdadera exactamente cuando
+        a != b, y se compara sin calcular la resta: devuelve
+        ('ne', (operando, operando)).
+        """
+        if node.nodetype == 'binop' and node.value == '-' and node.type == 'int':
+            left = self.expr(node.children[0])
+            right = self.expr(node.children[1])
+            if not (left[0] == 'const' and right[0] == 'const'):
+                return 'ne', (left, right)
+        return self.expr(node)
+
+    def as_function(self, compiled):
+        kind, data = compiled
+        if kind == 'const':
+            return lambda s: data
+        if kind == 'var':
+            return lambda s: s[data]
+        if kind == 'ne':
+            (lk, lv), (rk, rv) = data
+            return _BINOP_FACTORIES[('!=', lk, rk)](lv, rv)
+        return data
+
+
+def _nothing(s):
+    pass
+
+
+def compile_closures(ast_nodes):
+    """
+    Compila la lista de sentencias a un CompiledProgram.
+    """
+    return ClosureCompiler().compile(ast_nodes)
+
+
+def run_closures(ast_nodes, env=None):
+    """
+    Compila y ejecuta; devuelve el entorno final.
+    """
+    return compile_closures(ast_nodes).run(env)
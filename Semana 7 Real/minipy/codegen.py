@@ -0,0 +1,175 @@
+"""
+Generación de código intermedio de tres direcciones.
+"""
+from .tac import TEMP_PREFIX, constant_text
+
+
+############################################################
+# 5. GENERACIÓN DE CÓDIGO INTERMEDIO (3 Direcciones)
+############################################################
+def generate_code(ast_nodes, with_types=False):
+    """
+    Devuelve la lista de instrucciones, o (instrucciones, tipos) con
+    with_types=True; los tipos solo están si antes se ejecutó
+    semantic_analysis. Todo el estado vive en un CodeGenerator nuevo, así
+    que puede llamarse desde varios hilos a la vez.
+    """
+    generator = CodeGenerator(ast_nodes)
+    for node in ast_nodes:
+        generator.gen_stmt(node)
+    if with_types:
+        return generator.ir_code, generator.ir_types
+    return generator.ir_code
+
+
+def find_shared(ast_nodes):
+    """
+    Nodos de expresión alcanzables desde más de un padre. Con un árbol
+    normal (sin hash_cons) el resultado es vacío y la generación de código
+    no cambia.
+    """
+    seen, shared = set(), set()
+    stack = list(ast_nodes)
+    while stack:
+        node = stack.pop()
+        if node in seen:
+            shared.add(node)
+            continue
+        seen.add(node)
+        stack.extend(node.children)
+    return shared
+
+
+def reads(node):
+    """
+    Variables que lee una expresión.
+    """
+    names = set()
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if node.nodetype == 'id':
+            names.add(node.value)
+        stack.extend(node.children)
+    return frozenset(names)
+
+
+def assigned_vars(node):
+    names = set()
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if node.nodetype == 'assign':
+            names.add(node.value)
+        elif node.nodetype in ('if', 'while', 'block'):
+            stack.extend(node.children)
+    return names
+
+
+class CodeGenerator:
+    """
+    Estado de una generación de código: instrucciones emitidas, tipos,
+    contador de temporales y valores compartidos disponibles.
+    """
+    def __init__(self, ast_nodes):
+        self.ir_code = []
+        # Tipo del valor que calcula cada instrucción de ir_code ('int',
+        # 'float', 'num' o None), tomado de las anotaciones de semantic_analysis
+        self.ir_types = []
+        self.temp_count = 0
+        # Subexpresiones compartidas (el AST es un DAG cuando el parser usa
+        # hash_cons): nodos con más de un padre, y para los ya calculados el
+        # temporal que tiene su valor y las variables que lee. Una entrada es
+        # válida mientras ninguna de esas variables se reasigne y el cálculo
+        # domine el uso.
+        self.shared_nodes = find_shared(ast_nodes)
+        self.available = {}
+
+    def new_temp(self):
+        self.temp_count += 1
+        return f"{TEMP_PREFIX}{self.temp_count}"
+
+    def new_label(self, kind):
+        # Las etiquetas se numeran con el mismo contador que los temporales
+        self.temp_count += 1
+        return f"label_{kind}_{self.temp_count}"
+
+    def emit(self, line, value_type=None):
+        self.ir_code.append(line)
+        self.ir_types.append(value_type)
+
+    def kill(self, var_name):
+        """
+        Invalida los valores compartidos que dependen de var_name.
+        """
+        for node in [node for node, (_, names) in self.available.items() if var_name in names]:
+            del self.available[node]
+
+    def gen_stmt(self, node):
+        if node.nodetype == 'assign':
+            expr_result = self.gen_expr(node.children[0])
+            self.emit(f"{node.value} = {expr_result}", node.children[0].type)
+            self.kill(node.value)
+
+        elif node.nodetype == 'if':
+            # children = [cond, if_block, else_block]
+            cond_expr = self.gen_expr(node.children[0])
+            label_else = self.new_label("else")
+            label_end = self.new_label("end")
+            self.emit(f"IF NOT {cond_expr} GOTO {label_else}")
+            before = dict(self.available)
+
+            # if_block
+            self.gen_stmt(node.children[1])
+            after_if = self.available
+
+            self.emit(f"GOTO {label_end}")
+            self.emit(f"{label_else}:")
+            # else_block
+            self.available = dict(before)
+            self.gen_stmt(node.children[2])
+            self.emit(f"{label_end}:")
+            # Tras el if solo sigue válido lo calculado antes y no invalidado
+            # en ninguna de las dos ramas
+            self.available = {expr: entry for expr, entry in before.items()
+                              if after_if.get(expr) is entry and self.available.get(expr) is entry}
+
+        elif node.nodetype == 'while':
+            # children = [cond, block]
+            label_start = self.new_label("while")
+            label_end = self.new_label("end")
+            # A la cabecera también se llega desde el final del cuerpo
+            for var_name in assigned_vars(node.children[1]):
+                self.kill(var_name)
+            self.emit(f"{label_start}:")
+            cond_expr = self.gen_expr(node.children[0])
+            self.emit(f"IF NOT {cond_expr} GOTO {label_end}")
+            # La salida del bucle viene siempre de la condición
+            at_exit = dict(self.available)
+            self.gen_stmt(node.children[1])
+            self.emit(f"GOTO {label_start}")
+            self.emit(f"{label_end}:")
+            self.available = at_exit
+
+        elif node.nodetype == 'block':
+            for stmt in node.children:
+                self.gen_stmt(stmt)
+
+    def gen_expr(self, node):
+        if node.nodetype == 'num':
+            return constant_text(node.value)
+        elif node.nodetype == 'id':
+            return node.value
+        elif node.nodetype == 'binop':
+            if node in self.available:
+                return self.available[node][0]
+            left = self.gen_expr(node.children[0])
+            right = self.gen_expr(node.children[1])
+            temp_var = self.new_temp()
+            self.emit(f"{temp_var} = {left} {node.value} {right}", node.type)
+            if node in self.shared_nodes:
+                self.available[node] = (temp_var, reads(node))
+            return temp_var
+        else:
+            # if, while, assign se manejan en gen_stmt, no en gen_expr
+            return ""
@@ -0,0 +1,49 @@
+"""
+Función principal del compilador: encadena todas las fases.
+"""
+from .lexer import lexer
+from .parser import Parser
+from .semantic import semantic_analysis
+from .codegen import generate_code
+from .optimizer import optimize as optimize_tac
+from .partial_eval import partial_evaluate
+
+
+############################################################
+# 6. FUNCIÓN PRINCIPAL DEL COMPILADOR
+############################################################
+def compile_code(source, hash_cons=False, optimize=False, fuel=None):
+    """
+    Toma el código fuente, produce (tokens, ast, symbol_table, ir).
+    Con hash_cons=True las subexpresiones repetidas comparten nodo y el
+    código intermedio calcula cada valor compartido una sola vez mientras
+    siga siendo válido. Con optimize=True el código intermedio pasa por
+    optimizer.optimize (identidades algebraicas y optimización de lazos).
+    Con fuel=N el programa se evalúa al compilar ejecutando a lo sumo N
+    instrucciones; si termina, el código intermedio es la tabla de valores
+    finales de partial_eval.partial_evaluate y, si no, el código normal.
+
+    Cada fase guarda su estado en objetos propios de la llamada (la tabla
+    de símbolos que devuelve semantic_analysis, el CodeGenerator de
+    generate_code), así que compile_code puede llamarse desde varios hilos
+    a la vez.
+    """
+    # 1. Análisis Léxico
+    tokens = lexer(source)
+
+    # 2. Análisis Sintáctico
+    parser = Parser(tokens, hash_cons)
+    ast_nodes = parser.parse()
+
+    # 3. Análisis Semántico
+    symbol_table = semantic_analysis(ast_nodes)
+
+    # 4. Generación de Código Intermedio
+    ir, types = generate_code(ast_nodes, with_types=True)
+    folded = partial_evaluate(ir, types, fuel) if fuel is not None else None
+    if folded is not None:
+        ir, types = folded
+    elif optimize:
+        ir, types = optimize_tac(ir, types)
+
+    return tokens, ast_nodes, symbol_table, ir
@@ -0,0 +1,143 @@
+"""
+Resaltado de sintaxis incremental para un widget Text de Tkinter.
+
+Los colores salen de las mismas expresiones regulares que usa el lexer
+(minipy.lexer.token_spec): cada línea se analiza por separado y los
+desplazamientos de cada token dentro de la línea dan las columnas de la
+etiqueta. Como ningún token cruza un salto de línea, una edición solo
+cambia el resaltado de las líneas que toca; las etiquetas del resto se
+mueven solas con el texto.
+
+Highlighter intercepta insert/delete/replace del widget, acumula el rango
+de líneas dañadas (corrigiéndolo si ediciones posteriores agregan o quitan
+líneas) y lo vuelve a etiquetar en un callback after_idle, por tandas de
+CHUNK_LINES líneas para que cargar un archivo grande no congele la ventana.
+Varias pulsaciones seguidas se resuelven en una sola pasada.
+
+El módulo no importa tkinter: solo usa los métodos del widget que recibe.
+"""
+import re
+
+from .lexer import token_spec
+
+TAG_OPTIONS = {
+    'keyword': {'foreground': '#0000c0', 'font': ('Courier', 10, 'bold')},
+    'number': {'foreground': '#a05000'},
+    'operator': {'foreground': '#808080'},
+    'error': {'background': '#ffc0c0'},
+}
+KIND_TAGS = {'IF': 'keyword', 'ELSE': 'keyword', 'WHILE': 'keyword', 'BEGIN': 'keyword',
+             'END': 'keyword', 'NUM': 'number', 'OP': 'operator', 'ASSIGN': 'operator',
+             'MISMATCH': 'error'}
+CHUNK_LINES = 500
+
+_line_token = re.compile('|'.join(f'(?P<{name}>{pattern})' for name, pattern in token_spec
+                                  if name != 'NEWLINE'))
+
+
+def line_spans(line):
+    """
+    (etiqueta, columna inicial, columna final) de cada token resaltado de
+    una línea, con columnas desde 0 como en los índices de Tkinter.
+    """
+    spans = []
+    for mo in _line_token.finditer(line):
+        tag = KIND_TAGS.get(mo.lastgroup)
+        if tag is not None:
+            spans.append((tag, mo.start(), mo.end()))
+    return spans
+
+
+def union_damage(damage, first, removed, inserted):
+    """
+    Une el rango de líneas dañadas damage ((primera, última) o None) con
+    una edición que reemplaza las líneas first .. first + removed por
+    first .. first + inserted; el rango viejo se corrige si la edición
+    agregó o quitó líneas antes de su final.
+    """
+    last = first + inserted
+    if damage is None:
+        return first, last
+    damage_first, damage_last = damage
+    if damage_last > first + removed:
+        damage_last += inserted - removed
+    elif damage_last >= first:
+        damage_last = last
+    return min(damage_first, first), max(damage_last, last)
+
+
+class Highlighter:
+    def __init__(self, text, chunk_lines=CHUNK_LINES):
+        self.text = text
+        self.chunk_lines = chunk_lines
+        self.damage = None      # (primera, última) línea por volver a etiquetar
+        self.scheduled = None   # id del callback after_idle pendiente
+        for tag, options in TAG_OPTIONS.items():
+            text.tag_configure(tag, **options)
+        # El comando Tcl del widget pasa por _proxy, que ve cada edición
+        self.widget_command = text._w + '_sin_resaltado'
+        text.tk.call('rename', text._w, self.widget_command)
+        text.tk.createcommand(text._w, self._proxy)
+        self._mark(1, 0, self._line_count() - 1)
+
+    def _call(self, *args):
+        return self.text.tk.call((self.widget_command,) + args)
+
+    def _line(self, index):
+        return int(str(self._call('index', index)).split('.')[0])
+
+    def _line_count(self):
+        return self._line('end-1c')
+
+    def _proxy(self, command, *args):
+        if command not in ('insert', 'delete', 'replace') or not args:
+            return self._call(command, *args)
+        lines_before = self._line_count()
+        # 'end' es la línea siguiente a la última, pero lo que se inserta
+        # ahí queda en la última
+        first = min(self._line(args[0]), lines_before)
+        removed = 0
+        if command != 'insert' and len(args) > 1:
+            removed = min(self._line(args[1]), lines_before) - first
+        result = self._call(command, *args)
+        delta = self._line_count() - lines_before
+        if command == 'delete' and len(args) == 1:
+            removed = -delta  # borró un carácter: 1 si era un salto de línea
+        self._mark(first, removed, max(removed + delta, 0))
+        return result
+
+    def _mark(self, first, removed, inserted):
+        self.damage = union_damage(self.damage, first, removed, inserted)
+        if self.scheduled is None:
+            self.scheduled = self.text.after_idle(self._flush)
+
+    def _flush(self):
+        self.scheduled = None
+        if self.damage is None:
+            return
+        first, last = self.damage
+        last = min(last, self._line_count())
+        chunk_last = min(last, first + self.chunk_lines - 1)
+        self.highlight(first, chunk_last)
+        if chunk_last < last:
+            self.damage = (chunk_last + 1, last)
+            self.scheduled = self.text.after_idle(self._flush)
+        else:
+            self.damage = None
+
+    def highlight(self, first, last):
+        """
+        Vuelve a etiquetar las líneas first .. last: una llamada a tag_remove
+        y otra a tag_add por etiqueta, con todos los rangos juntos.
+        """
+        start, end = f'{first}.0', f'{last}.end'
+        ranges = {tag: [] for tag in TAG_OPTIONS}
+        lines = str(self._call('get', start, end)).split('\n')
+        for line_number, line in enumerate(lines, first):
+            for tag, column, end_column in line_spans(line):
+                ranges[tag].append(f'{line_number}.{column}')
+                ranges[tag].append(f'{line_number}.{end_column}')
+        for tag, indices in ranges.items():
+            self._call('tag', 'remove', tag, start, end)
+            if indices:
+                self._call('tag', 'add', tag, *indices)
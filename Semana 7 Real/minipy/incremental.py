@@ -0,0 +1,621 @@
+"""
+Análisis léxico y sintáctico incremental para el editor.
+
+IncrementalFrontEnd conserva el texto (por líneas), la lista de tokens y el
+AST del último análisis. Cada edición (edit, o update con el texto completo)
+solo anota qué líneas cambiaron; parse() vuelve a analizar lo mínimo:
+
+- léxico: los tokens nunca cruzan un salto de línea, así que cada comienzo
+  de línea es un punto de resincronización y basta con volver a analizar
+  las líneas dañadas;
+- sintáctico: se busca el bloque BEGIN/END más interno que contiene todo el
+  daño (sin tocar su BEGIN ni su END) y, dentro de él (o del programa), se
+  vuelven a analizar solo las sentencias que tocan el daño. El análisis
+  continúa hasta caer en el comienzo de una sentencia vieja posterior al
+  daño (o en el END del bloque); de ahí en adelante el AST viejo sigue
+  siendo válido.
+
+La posición de una sentencia es la de su primer token (node.line,
+node.column), y la del END de cada bloque se guarda en block_ends. Los
+tokens y los nodos no guardan su número de línea sino un ancla (_Line) de
+la línea, y el número se calcula al leerlo con LineIndex, que reparte las
+anclas en bloques y suma sus tamaños con un árbol de Fenwick. Así, si la
+edición cambia el número de líneas, las siguientes cambian de número sin
+tocar sus tokens ni sus nodos, y el costo de una edición no depende del
+tamaño del archivo (salvo mover punteros al reemplazar en las listas de
+tokens y sentencias). Si el análisis del
+bloque falla o termina en otro lugar (p. ej. se escribió un END de más), se
+repite a nivel del programa, así que el resultado es siempre el mismo que el
+de Parser(lexer(texto)).parse() (tokens es una vista que da Token con el
+número de línea ya resuelto). Un error de sintaxis se propaga y el daño
+queda pendiente para el siguiente parse().
+
+El AST se construye sin hash_cons: los nodos no se comparten entre
+sentencias. Por eso compile() también reutiliza, para cada sentencia del
+programa que no cambió, su análisis semántico y su código intermedio
+(_Analysis): la inferencia de tipos se repite solo si cambió el tipo con el
+que llega alguna de las variables que la sentencia usa, y el TAC se guarda
+como plantilla para renumerar sus temporales y etiquetas sin volver a
+generarlo. Juntar los resultados sigue recorriendo todas las sentencias del
+programa (no las de los bloques), pero con un costo por sentencia mucho
+menor que analizarla.
+"""
+from .lexer import Token, lexer
+from .nodes import ASTNode
+from .parser import Parser
+from .semantic import TypeInference, analyze_node, type_name
+from .codegen import CodeGenerator, assigned_vars, reads
+from .tac import TEMP_PREFIX
+
+BLOCK_LINES = 64   # anclas por bloque de LineIndex (hasta el doble antes de partirlo)
+
+
+class _Line:
+    """
+    Ancla de una línea: los tokens y nodos la guardan en lugar del número de
+    línea, que se calcula con number().
+    """
+    __slots__ = ('block',)
+
+    def __init__(self):
+        self.block = None   # _LineBlock que la contiene (None si se quitó)
+
+    def number(self):
+        block = self.block
+        return block.owner.start(block.index) + block.lines.index(self) + 1
+
+
+class _LineBlock:
+    __slots__ = ('owner', 'index', 'lines')
+
+    def __init__(self, owner, lines):
+        self.owner = owner
+        self.index = 0
+        self.lines = lines
+        for line in lines:
+            line.block = self
+
+
+class LineIndex:
+    """
+    Las anclas de las líneas en orden, en bloques de unas BLOCK_LINES. Un
+    árbol de Fenwick sobre el tamaño de los bloques da la primera línea de
+    cada bloque en O(log n); insertar o quitar líneas solo toca los bloques
+    afectados.
+    """
+    def __init__(self):
+        self.blocks = []
+        self.tree = [0]
+
+    def start(self, index):
+        """
+        Número de líneas en los bloques anteriores al bloque index.
+        """
+        tree = self.tree
+        total = 0
+        while index:
+            total += tree[index]
+            index &= index - 1
+        return total
+
+    def _find(self, position):
+        # (bloque, desplazamiento) de la línea position (desde 0): el bloque
+        # es el último cuyo comienzo no pasa de position
+        tree = self.tree
+        index = 0
+        step = 1 << (len(tree) - 1).bit_length()
+        while step:
+            candidate = index + step
+            if candidate < len(tree) and tree[candidate] <= position:
+                index = candidate
+                position -= tree[candidate]
+            step >>= 1
+        return index, position
+
+    def _rebuild(self):
+        tree = [0] * (len(self.blocks) + 1)
+        for i, block in enumerate(self.blocks, 1):
+            block.index = i - 1
+            tree[i] += len(block.lines)
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self.tree = tree
+
+    def _add(self, index, amount):
+        tree = self.tree
+        index += 1
+        while index < len(tree):
+            tree[index] += amount
+            index += index & -index
+
+    def replace(self, position, removed, anchors):
+        """
+        Quita removed líneas desde la línea position (desde 0) y pone las
+        anclas anchors en su lugar.
+        """
+        blocks = self.blocks
+        if not blocks:
+            blocks.append(_LineBlock(self, []))
+            self._rebuild()
+        index, offset = self._find(position)
+        if index == len(blocks):
+            index -= 1
+            offset = len(blocks[index].lines)
+        first = index
+        block = blocks[index]
+        block.lines[offset:offset] = anchors
+        for anchor in anchors:
+            anchor.block = block
+        changes = {index: len(anchors)}
+        offset += len(anchors)
+        while removed:
+            lines = block.lines
+            if offset == len(lines):
+                index += 1
+                block, offset = blocks[index], 0
+                continue
+            gone = lines[offset:offset + removed]
+            for anchor in gone:
+                anchor.block = None
+            del lines[offset:offset + len(gone)]
+            changes[index] = changes.get(index, 0) - len(gone)
+            removed -= len(gone)
+        touched = blocks[first:index + 1]
+        if all(0 < len(block.lines) <= 2 * BLOCK_LINES for block in touched):
+            for index, amount in changes.items():
+                self._add(index, amount)
+            return
+        # Un bloque quedó vacío o demasiado grande: se reparten de nuevo sus
+        # anclas y se reconstruye el árbol
+        lines = [anchor for block in touched for anchor in block.lines]
+        blocks[first:index + 1] = [_LineBlock(self, lines[i:i + BLOCK_LINES])
+                                   for i in range(0, len(lines), BLOCK_LINES)]
+        self._rebuild()
+
+
+class _AnchoredNode(ASTNode):
+    """
+    Nodo cuya línea es un ancla (_Line): node.line da el número actual.
+    """
+    @property
+    def line(self):
+        anchor = self.anchor
+        return anchor.number() if anchor.__class__ is _Line else anchor
+
+    @line.setter
+    def line(self, value):
+        self.anchor = value
+
+
+class TokenList:
+    """
+    Vista de los tokens del front end (con anclas en lugar de líneas) que
+    da cada Token con su número de línea.
+    """
+    def __init__(self, tokens):
+        self.tokens = tokens
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self.tokens)))]
+        t = self.tokens[index]
+        return Token(t[0], t[1], t[2].number(), t[3])
+
+    def __iter__(self):
+        # Las anclas van en orden: dentro de un bloque basta con seguir
+        # buscando desde la anterior
+        last = block = None
+        offset = start = 0
+        for t in self.tokens:
+            anchor = t[2]
+            if anchor is not last:
+                if anchor.block is not block:
+                    block = anchor.block
+                    start = block.owner.start(block.index)
+                    offset = 0
+                offset = block.lines.index(anchor, offset)
+                last = anchor
+            yield Token(t[0], t[1], start + offset + 1, t[3])
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+def token_index(tokens, line, column, lo=0, hi=None):
+    """
+    Índice del primer token (con ancla de línea) en la posición (line,
+    column) o después.
+    """
+    if hi is None:
+        hi = len(tokens)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        token = tokens[mid]
+        token_line = token[2].number()
+        if token_line < line or token_line == line and token[3] < column:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def walk(nodes):
+    stack = list(nodes)
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(node.children)
+
+
+class SpanParser(Parser):
+    """
+    Parser que empieza en el token pos, crea nodos con ancla de línea y
+    anota en block_ends la posición (ancla, columna) del END de cada bloque.
+    """
+    node_class = _AnchoredNode
+
+    def __init__(self, tokens, pos, block_ends):
+        super().__init__(tokens)
+        self.pos = pos
+        self.block_ends = block_ends
+
+    def block(self):
+        node = super().block()
+        end_token = self.tokens[self.pos - 1]
+        self.block_ends[node] = (end_token[2], end_token[3])
+        return node
+
+
+class _SplicedTokens:
+    """
+    Vista de la lista de tokens nueva sin copiarla: los tokens viejos [lo,
+    hi) reemplazados por middle. El parser solo lee alrededor del daño, así
+    que no hace falta construir la lista completa hasta confirmar el
+    análisis.
+    """
+    def __init__(self, old, lo, hi, middle):
+        self.old = old
+        self.lo = lo
+        self.hi = hi
+        self.middle = middle
+        self.shift = len(middle) - (hi - lo)
+
+    def __len__(self):
+        return len(self.old) + self.shift
+
+    def __getitem__(self, index):
+        if index < self.lo:
+            return self.old[index]
+        if index < self.lo + len(self.middle):
+            return self.middle[index - self.lo]
+        return self.old[index - self.shift]
+
+
+class _TemplateGenerator(CodeGenerator):
+    """
+    CodeGenerator de una sola sentencia: sus temporales y etiquetas son
+    campos de formato ({0}, {1}, ...) que str.format numera según el lugar
+    de la sentencia en el programa.
+    """
+    def __init__(self):
+        super().__init__([])
+
+    def new_temp(self):
+        self.temp_count += 1
+        return f"{TEMP_PREFIX}{{{self.temp_count - 1}}}"
+
+    def new_label(self, kind):
+        self.temp_count += 1
+        return f"label_{kind}_{{{self.temp_count - 1}}}"
+
+
+class _Analysis:
+    """
+    Análisis semántico y TAC de una sentencia del programa (sin hash_cons
+    sus nodos no se comparten con otras, así que se analiza sola).
+
+    La inferencia de tipos de la sentencia solo depende de los tipos con los
+    que llegan las variables que lee o asigna (inputs), y solo cambia los de
+    las que asigna: se repite únicamente si cambió alguno de esos tipos.
+    """
+    __slots__ = ('names', 'inputs', 'outputs', 'templates', 'temps', 'start', 'ir',
+                 'key', 'effect', 'assigned')
+
+    def __init__(self, node):
+        # Variables en el orden en que la sentencia las usa por primera vez,
+        # con su 'initialized' (ver semantic.analyze_node)
+        table = {}
+        analyze_node(node, table)
+        self.names = [(var_name, entry['initialized']) for var_name, entry in table.items()]
+        self.outputs = tuple(assigned_vars(node))
+        self.inputs = tuple(reads(node) | set(self.outputs))
+        generator = _TemplateGenerator()
+        generator.gen_stmt(node)
+        self.templates = generator.ir_code
+        self.temps = generator.temp_count
+        self.start = self.ir = None
+        self.key = self.effect = self.assigned = None
+
+    def infer(self, node, state, key):
+        """
+        Anota los tipos de la sentencia a partir del estado de tipos con el
+        que se llega a ella (key: los tipos de inputs en ese estado).
+        """
+        inference = TypeInference()
+        after = inference.stmt(node, state)
+        self.effect = [(var_name, after[var_name]) for var_name in self.outputs]
+        self.assigned = inference.assigned
+        self.key = key
+
+    def code(self, start):
+        """
+        TAC de la sentencia cuando antes de ella se numeraron start
+        temporales y etiquetas.
+        """
+        if start != self.start:
+            numbers = range(start + 1, start + self.temps + 1)
+            self.ir = [template.format(*numbers) for template in self.templates]
+            self.start = start
+        return self.ir
+
+
+class _Misaligned(Exception):
+    """
+    El análisis de un bloque no terminó en su END: hay que repetirlo a
+    nivel del programa.
+    """
+
+
+class IncrementalFrontEnd:
+    def __init__(self, source=""):
+        self.lines = []
+        # Anclas de las líneas del último análisis (las de self.lines
+        # pueden tener ediciones pendientes)
+        self.index = LineIndex()
+        self.anchored_tokens = []
+        self.tokens = TokenList(self.anchored_tokens)
+        self.ast = []
+        self.block_ends = {}   # nodo block -> (ancla, columna) de su END
+        self.analysis = {}     # sentencia del programa -> _Analysis
+        # Líneas dañadas (primera, última) en el texto actual y diferencia de
+        # líneas respecto del último análisis, o None si no hay cambios
+        self.damage = None
+        self.update(source)
+
+    # ------------------------------------------------------------------
+    # Ediciones
+    # ------------------------------------------------------------------
+    def edit(self, start, end, text):
+        """
+        Reemplaza el texto entre start y end por text. Las posiciones son
+        (línea, columna) como los índices del widget Text de Tkinter: la
+        línea empieza en 1 y la columna en 0.
+        """
+        (first, start_column), (last, end_column) = start, end
+        prefix = self.lines[first - 1][:start_column]
+        suffix = self.lines[last - 1][end_column:]
+        self._replace_lines(first, last, (prefix + text + suffix).split('\n'))
+
+    def update(self, source):
+        """
+        Recibe el texto completo y registra como dañadas solo las líneas que
+        cambiaron (las que quedan entre el prefijo y el sufijo comunes).
+        """
+        new_lines = source.split('\n')
+        old_lines = self.lines
+        common = min(len(old_lines), len(new_lines))
+        first = 0
+        while first < common and old_lines[first] == new_lines[first]:
+            first += 1
+        old_end, new_end = len(old_lines), len(new_lines)
+        while (old_end > first and new_end > first
+               and old_lines[old_end - 1] == new_lines[new_end - 1]):
+            old_end -= 1
+            new_end -= 1
+        if first == old_end and first == new_end:
+            return
+        self._replace_lines(first + 1, old_end, new_lines[first:new_end])
+
+    def _replace_lines(self, first, last, new_lines):
+        # Las líneas first..last (desde 1; last = first - 1 si no se quita
+        # ninguna) pasan a ser new_lines
+        self.lines[first - 1:last] = new_lines
+        new_last = first + len(new_lines) - 1
+        delta = len(new_lines) - (last - first + 1)
+        if self.damage is None:
+            self.damage = (first, new_last, delta)
+            return
+        damage_first, damage_last, damage_delta = self.damage
+        if damage_last > last:
+            damage_last += delta
+        elif damage_last >= first:
+            damage_last = new_last
+        self.damage = (min(damage_first, first), max(damage_last, new_last),
+                       damage_delta + delta)
+
+    # ------------------------------------------------------------------
+    # Análisis
+    # ------------------------------------------------------------------
+    def parse(self):
+        """
+        Devuelve (tokens, ast) del texto actual, analizando solo lo dañado.
+        Las dos listas son siempre las mismas y se modifican en su lugar.
+        """
+        if self.damage is not None:
+            self._reparse()
+        return self.tokens, self.ast
+
+    def compile(self):
+        """
+        Como compiler.compile_code: (tokens, ast, symbol_table, ir), igual
+        que semantic_analysis y generate_code sobre el AST completo pero
+        reutilizando lo de las sentencias que no cambiaron.
+        """
+        tokens, ast_nodes = self.parse()
+        symbol_table, assigned, ir = {}, {}, []
+        # Tipos de cada variable en el punto actual (ver semantic.TypeInference)
+        state, temps = {}, 0
+        previous, self.analysis = self.analysis, {}
+        for node in ast_nodes:
+            analysis = previous.get(node)
+            if analysis is None:
+                analysis = _Analysis(node)
+            self.analysis[node] = analysis
+            key = tuple(map(state.get, analysis.inputs))
+            if key != analysis.key:
+                analysis.infer(node, state, key)
+            for var_name, types in analysis.effect:
+                state[var_name] = types
+            for var_name, initialized in analysis.names:
+                if var_name not in symbol_table:
+                    symbol_table[var_name] = {'type': 'unknown', 'initialized': initialized}
+            for var_name, types in analysis.assigned.items():
+                if var_name in assigned:
+                    assigned[var_name] |= types
+                else:
+                    assigned[var_name] = set(types)
+            ir += analysis.code(temps)
+            temps += analysis.temps
+        for var_name, types in assigned.items():
+            symbol_table[var_name]['type'] = type_name(types) or 'unknown'
+        return tokens, ast_nodes, symbol_table, ir
+
+    def _reparse(self):
+        first, last, delta = self.damage
+        old = self.anchored_tokens
+        anchors = [_Line() for _ in range(last - first + 1)]
+        middle = []
+        if last >= first:
+            middle = [Token(t[0], t[1], anchors[t[2] - first], t[3])
+                      for t in lexer('\n'.join(self.lines[first - 1:last]), first)]
+        # Tokens viejos [lo, hi) de las líneas dañadas (LineIndex aún tiene
+        # la numeración del análisis anterior)
+        lo = token_index(old, first, 0)
+        hi = token_index(old, last - delta + 1, 0, lo)
+        tokens = _SplicedTokens(old, lo, hi, middle)
+        shift = tokens.shift
+
+        block_ends = {}
+        chain = self._containers(old, lo, hi)
+        try:
+            stmts, i, k, new_stmts = self._parse_container(chain[-1], old, tokens,
+                                                           lo, hi, shift, block_ends)
+        except (SyntaxError, _Misaligned):
+            if len(chain) == 1:
+                raise
+            block_ends.clear()
+            stmts, i, k, new_stmts = self._parse_container(chain[0], old, tokens,
+                                                           lo, hi, shift, block_ends)
+
+        if stmts is not self.ast:
+            # Se reemplazaron sentencias dentro de un bloque: la sentencia del
+            # programa que lo contiene cambió aunque sea el mismo nodo
+            top, _ = self._affected(self.ast, old, lo, hi, 0, len(old))
+            self.analysis.pop(self.ast[top], None)
+
+        # Confirmar: las anclas de las líneas dañadas pasan a ser las nuevas
+        # (las líneas siguientes se renumeran solas), se reemplazan las
+        # sentencias y se quitan los END de los bloques descartados
+        self.index.replace(first - 1, last - delta - first + 1, anchors)
+        for node in walk(stmts[i:k]):
+            self.block_ends.pop(node, None)
+        stmts[i:k] = new_stmts
+        self.block_ends.update(block_ends)
+        old[lo:hi] = middle
+        self.damage = None
+
+    def _statement_index(self, tokens, node):
+        return token_index(tokens, node.line, node.column)
+
+    def _affected(self, stmts, tokens, lo, hi, inner_lo, inner_hi):
+        """
+        Sentencias [i, j) de stmts (que ocupan los tokens [inner_lo,
+        inner_hi)) que tocan los tokens [lo - 1, hi + 1): se incluyen las
+        vecinas del daño por si la edición las une o las parte.
+        """
+        a = max(lo - 1, inner_lo)
+        b = min(hi + 1, inner_hi)
+        # Se comparan posiciones (línea, columna) y no índices de token: una
+        # sola búsqueda por sentencia en lugar de una por cada comparación
+        end = (float('inf'), 0)
+        position_a = (tokens[a][2].number(), tokens[a][3]) if a < len(tokens) else end
+        position_b = (tokens[b][2].number(), tokens[b][3]) if b < len(tokens) else end
+        # i: última sentencia que empieza en a o antes
+        low, high = 0, len(stmts)
+        while low < high:
+            mid = (low + high) // 2
+            if (stmts[mid].line, stmts[mid].column) <= position_a:
+                low = mid + 1
+            else:
+                high = mid
+        i = max(low - 1, 0)
+        # j: primera sentencia que empieza en b o después
+        low, high = i, len(stmts)
+        while low < high:
+            mid = (low + high) // 2
+            if (stmts[mid].line, stmts[mid].column) < position_b:
+                low = mid + 1
+            else:
+                high = mid
+        return i, max(low, i)
+
+    def _containers(self, tokens, lo, hi):
+        """
+        Cadena de contenedores desde el programa hasta el bloque más interno
+        que contiene los tokens dañados [lo, hi) sin incluir su BEGIN ni su
+        END. Cada contenedor es (sentencias, inner_lo, inner_hi, es_bloque).
+        """
+        container = (self.ast, 0, len(tokens), False)
+        chain = [container]
+        while True:
+            stmts, inner_lo, inner_hi, _ = container
+            i, j = self._affected(stmts, tokens, lo, hi, inner_lo, inner_hi)
+            if j - i != 1 or stmts[i].nodetype not in ('if', 'while'):
+                return chain
+            for block in stmts[i].children[1:]:
+                if block.line is None or block not in self.block_ends:
+                    continue  # else vacío sin BEGIN
+                begin = token_index(tokens, block.line, block.column)
+                end_anchor, end_column = self.block_ends[block]
+                end = token_index(tokens, end_anchor.number(), end_column)
+                if begin < lo and end >= hi:
+                    container = (block.children, begin + 1, end, True)
+                    chain.append(container)
+                    break
+            else:
+                return chain
+
+    def _parse_container(self, container, old, tokens, lo, hi, shift, block_ends):
+        """
+        Vuelve a analizar las sentencias del contenedor que tocan el daño.
+        Devuelve (sentencias, i, k, nuevas): nuevas reemplaza a
+        sentencias[i:k].
+        """
+        stmts, inner_lo, inner_hi, is_block = container
+        i, j = self._affected(stmts, old, lo, hi, inner_lo, inner_hi)
+        start = self._statement_index(old, stmts[i]) if i > 0 else inner_lo
+        end = inner_hi + shift
+        parser = SpanParser(tokens, start, block_ends)
+        new_stmts = []
+        k = j
+        while True:
+            # Las sentencias viejas que el análisis ya pasó quedan reemplazadas
+            while k < len(stmts) and self._statement_index(old, stmts[k]) + shift < parser.pos:
+                k += 1
+            if parser.pos == end:
+                k = len(stmts)
+                break
+            if k < len(stmts) and self._statement_index(old, stmts[k]) + shift == parser.pos:
+                break
+            token = parser.current_token()
+            if parser.pos > end or is_block and (token is None or token[0] == 'END'):
+                raise _Misaligned()
+            new_stmts.append(parser.statement())
+        return stmts, i, k, new_stmts
@@ -0,0 +1,65 @@
+"""
+Intérprete que recorre el AST directamente.
+
+Es la referencia semántica del lenguaje: cada nodo se despacha por su
+'nodetype' en cada visita. Las condiciones de 'if' y 'while' son verdaderas
+cuando su valor es distinto de cero.
+"""
+
+
+class Interpreter:
+    def __init__(self, env=None):
+        # Valores de las variables: nombre -> número
+        self.env = dict(env) if env else {}
+
+    def run(self, ast_nodes):
+        for node in ast_nodes:
+            self.exec_stmt(node)
+        return self.env
+
+    def exec_stmt(self, node):
+        if node.nodetype == 'assign':
+            self.env[node.value] = self.eval_expr(node.children[0])
+
+        elif node.nodetype == 'if':
+            # children = [cond, if_block, else_block]
+            if self.eval_expr(node.children[0]):
+                self.exec_stmt(node.children[1])
+            else:
+                self.exec_stmt(node.children[2])
+
+        elif node.nodetype == 'while':
+            # children = [cond, block]
+            while self.eval_expr(node.children[0]):
+                self.exec_stmt(node.children[1])
+
+        elif node.nodetype == 'block':
+            for stmt in node.children:
+                self.exec_stmt(stmt)
+
+    def eval_expr(self, node):
+        if node.nodetype == 'num':
+            return node.value
+        elif node.nodetype == 'id':
+            if node.value not in self.env:
+                raise NameError(f"Variable '{node.value}' sin inicializar")
+            return self.env[node.value]
+        elif node.nodetype == 'binop':
+            left = self.eval_expr(node.children[0])
+            right = self.eval_expr(node.children[1])
+            if node.value == '+':
+                return left + right
+            elif node.value == '-':
+                return left - right
+            elif node.value == '*':
+                return left * right
+            elif node.value == '/':
+                return left / right
+        raise ValueError(f"Nodo '{node.nodetype}' no es una expresión")
+
+
+def interpret(ast_nodes, env=None):
+    """
+    Ejecuta la lista de sentencias y devuelve el entorno final.
+    """
+    return Interpreter(env).run(ast_nodes)
@@ -0,0 +1,79 @@
+"""
+Análisis léxico del mini-lenguaje.
+"""
+import re
+from collections import namedtuple
+
+############################################################
+# 1. ANALIZADOR LÉXICO
+############################################################
+token_spec = [
+    ('IF', r'if\b'),
+    ('ELSE', r'else\b'),
+    ('WHILE', r'while\b'),
+    ('BEGIN', r'BEGIN\b'),
+    ('END', r'END\b'),
+    ('ID', r'[A-Za-z_]\w*'),  # Identificadores
+    ('NUM', r'\d+(\.\d+)?'),  # Números (enteros o decimales)
+    ('ASSIGN', r'='),  # Asignación
+    ('OP', r'[+\-*/]'),  # Operadores aritméticos
+    ('LPAREN', r'\('),
+    ('RPAREN', r'\)'),
+    ('COLON', r':'),
+    ('SEMICOL', r';'),
+    ('NEWLINE', r'\n+'),
+    ('SKIP', r'[ \t]+'),  # Espacios
+    ('MISMATCH', r'.'),  # Cualquier otro carácter no esperado
+]
+
+token_regex = '|'.join(f'(?P<{name}>{pattern})' for name, pattern in token_spec)
+
+
+# Un token se sigue usando como la tupla (tipo, valor); además recuerda la
+# línea y la columna (ambas desde 1) donde empieza en el código fuente.
+Token = namedtuple('Token', ['type', 'value', 'line', 'column'])
+
+
+def lexer(code, first_line=1):
+    """
+    Convierte el código fuente en una lista de tokens (tipo, valor, línea, columna).
+    first_line es el número de la primera línea de code (para volver a
+    analizar solo un trozo de un archivo, ver minipy.incremental).
+    """
+    tokens = []
+    line = first_line
+    line_start = 0
+    for mo in re.finditer(token_regex, code):
+        kind = mo.lastgroup
+        value = mo.group()
+        column = mo.start() - line_start + 1
+        if kind in ['IF', 'ELSE', 'WHILE', 'BEGIN', 'END']:
+            tokens.append(Token(kind, value, line, column))
+        elif kind == 'ID':
+            tokens.append(Token('ID', value, line, column))
+        elif kind == 'NUM':
+            val = float(value) if '.' in value else int(value)
+            tokens.append(Token('NUM', val, line, column))
+        elif kind == 'ASSIGN':
+            tokens.append(Token('ASSIGN', value, line, column))
+        elif kind == 'OP':
+            tokens.append(Token('OP', value, line, column))
+        elif kind == 'LPAREN':
+            tokens.append(Token('LPAREN', value, line, column))
+        elif kind == 'RPAREN':
+            tokens.append(Token('RPAREN', value, line, column))
+        elif kind == 'COLON':
+            tokens.append(Token('COLON', value, line, column))
+        elif kind == 'SEMICOL':
+            tokens.append(Token('SEMICOL', value, line, column))
+        elif kind == 'NEWLINE':
+            # Los saltos de línea no son tokens, pero actualizan la posición
+            line += len(value)
+            line_start = mo.end()
+            continue
+        elif kind == 'SKIP':
+            # Ignoramos espacios
+            continue
+        elif kind == 'MISMATCH':
+            raise ValueError(f"Carácter inesperado: {value} (línea {line}, columna {column})")
+    return tokens
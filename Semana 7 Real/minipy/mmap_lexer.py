@@ -0,0 +1,142 @@
+"""
+Compilación desde archivo con mmap y tokens sin copia.
+
+El archivo se mapea en memoria y el lexer recorre sus bytes directamente (el
+alfabeto de tokens es ASCII). Cada token guarda solo su tipo y sus
+desplazamientos dentro del mapeo; el valor se calcula la primera vez que se
+pide, y solo los identificadores y números necesitan leer el mapeo (los
+demás tokens tienen texto fijo).
+"""
+import mmap
+import re
+
+from .lexer import token_regex
+from .parser import Parser
+from .semantic import semantic_analysis
+from .codegen import generate_code
+
+token_regex_bytes = re.compile(token_regex.encode('ascii'))
+
+# Valor de los tokens que no dependen del código fuente
+_FIXED_VALUES = {'IF': 'if', 'ELSE': 'else', 'WHILE': 'while', 'BEGIN': 'BEGIN',
+                 'END': 'END', 'ASSIGN': '=', 'LPAREN': '(', 'RPAREN': ')',
+                 'COLON': ':', 'SEMICOL': ';'}
+_ONE_CHAR = [chr(c) for c in range(128)]
+
+
+class SliceToken:
+    """
+    Token que se comporta como la tupla (tipo, valor, línea, columna) de
+    minipy.lexer.Token, pero sin copiar su texto.
+    """
+    __slots__ = ('type', 'start', 'end', 'line', 'column', '_source', '_value')
+
+    def __init__(self, kind, start, end, line, column, source):
+        self.type = kind
+        self.start = start
+        self.end = end
+        self.line = line
+        self.column = column
+        self._source = source
+        self._value = _FIXED_VALUES.get(kind)
+
+    @property
+    def value(self):
+        if self._value is None:
+            if self.type == 'NUM':
+                # int() y float() aceptan bytes: no hace falta decodificar
+                text = self._source[self.start:self.end]
+                self._value = float(text) if b'.' in text else int(text)
+            elif self.end - self.start == 1:
+                self._value = _ONE_CHAR[self._source[self.start]]
+            else:
+                self._value = self._source[self.start:self.end].decode('ascii')
+        return self._value
+
+    def __len__(self):
+        return 4
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return tuple(self[i] for i in range(4)[index])
+        if index < 0:
+            index += 4
+        if index == 0:
+            return self.type
+        if index == 1:
+            return self.value
+        if index == 2:
+            return self.line
+        if index == 3:
+            return self.column
+        raise IndexError("índice de token fuera de rango")
+
+    def __repr__(self):
+        return (f"SliceToken({self.type!r}, {self.start}, {self.end}, "
+                f"line={self.line}, column={self.column})")
+
+
+class MappedSource:
+    """
+    Archivo fuente mapeado en memoria. Los SliceToken leen del mapeo, así que
+    los valores que no se hayan pedido antes de cerrarlo dejan de estar
+    disponibles.
+    """
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        try:
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # no se puede mapear un archivo vacío
+            self.data = b''
+
+    def tokens(self):
+        return lexer_mapped(self.data)
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def lexer_mapped(data):
+    """
+    Igual que minipy.lexer.lexer, pero sobre bytes (o un mmap) y con SliceToken.
+    """
+    tokens = []
+    line = 1
+    line_start = 0
+    for mo in token_regex_bytes.finditer(data):
+        kind = mo.lastgroup
+        start = mo.start()
+        if kind == 'NEWLINE':
+            line += mo.end() - start
+            line_start = mo.end()
+        elif kind == 'SKIP':
+            continue
+        elif kind == 'MISMATCH':
+            # El mensaje de lexer muestra el carácter, aunque ocupe varios bytes
+            char = data[start:start + 4].decode('utf-8', 'replace')[0]
+            raise ValueError(f"Carácter inesperado: {char} "
+                             f"(línea {line}, columna {start - line_start + 1})")
+        else:
+            tokens.append(SliceToken(kind, start, mo.end(), line, start - line_start + 1, data))
+    return tokens
+
+
+def compile_file(path):
+    """
+    Compila un archivo leyéndolo con mmap. Devuelve (ast, symbol_table, ir),
+    es decir, lo mismo que compile_code salvo la lista de tokens, que apunta
+    al mapeo ya cerrado.
+    """
+    with MappedSource(path) as source:
+        ast_nodes = Parser(source.tokens()).parse()
+    symbol_table = semantic_analysis(ast_nodes)
+    ir = generate_code(ast_nodes)
+    return ast_nodes, symbol_table, ir
@@ -0,0 +1,28 @@
+"""
+Nodos del Árbol de Sintaxis Abstracta.
+"""
+
+
+############################################################
+# 2. AST (Árbol de Sintaxis Abstracta)
+############################################################
+class ASTNode:
+    def __init__(self, nodetype, value=None, children=None, line=None, column=None):
+        """
+        nodetype: 'assign', 'binop', 'if', 'while', 'num', 'id', 'block'
+        value:    nombre de variable, operador, etc.
+        children: lista de nodos hijos
+        line, column: posición en el código fuente del token que inicia el nodo
+        type:     en expresiones, tipo inferido por semantic_analysis: 'int',
+                  'float', 'num' (número de tipo variable) o None (sin
+                  analizar, o una variable que puede no estar asignada)
+        """
+        self.nodetype = nodetype
+        self.value = value
+        self.children = children or []
+        self.line = line
+        self.column = column
+        self.type = None
+
+    def __repr__(self):
+        return f"{self.nodetype}({self.value}, {self.children})"
@@ -0,0 +1,572 @@
+"""
+Optimizaciones sobre el código de tres direcciones de generate_code.
+
+Cada pasada recibe y devuelve el TAC como lista de texto, junto con la
+lista paralela de tipos de generate_code(..., with_types=True) (o None si
+no se conocen). Los tipos permiten saber que una instrucción no puede
+fallar: si su tipo no es None, sus operandos están asignados con seguridad.
+
+- simplify_algebra: identidades algebraicas (x*1, x+0, x-0, x*2 -> x+x).
+- optimize_loops: encuentra los lazos naturales (label_while_* ... GOTO
+  label_while_*), saca a un preencabezado los cálculos invariantes y reduce
+  la fuerza de las multiplicaciones por variables de inducción.
+- optimize_jumps: pliega ramas constantes, enhebra cadenas de saltos y
+  elimina los else vacíos, el código inalcanzable y las etiquetas sobrantes.
+"""
+from .tac import TEMP_PREFIX, is_temp, parse_constant
+
+
+class Instr:
+    """
+    Instrucción del TAC ya separada en partes:
+        label   dest:
+        goto    GOTO dest
+        ifnot   IF NOT left GOTO dest
+        move    dest = left
+        binop   dest = left op right
+    """
+    __slots__ = ('kind', 'dest', 'left', 'op', 'right', 'type')
+
+    def __init__(self, kind, dest, left=None, op=None, right=None, type=None):
+        self.kind = kind
+        self.dest = dest
+        self.left = left
+        self.op = op
+        self.right = right
+        self.type = type
+
+    def operands(self):
+        if self.kind == 'binop':
+            return (self.left, self.right)
+        if self.kind in ('move', 'ifnot'):
+            return (self.left,)
+        return ()
+
+    def defines(self):
+        return self.dest if self.kind in ('move', 'binop') else None
+
+    def __str__(self):
+        if self.kind == 'label':
+            return f"{self.dest}:"
+        if self.kind == 'goto':
+            return f"GOTO {self.dest}"
+        if self.kind == 'ifnot':
+            return f"IF NOT {self.left} GOTO {self.dest}"
+        if self.kind == 'move':
+            return f"{self.dest} = {self.left}"
+        return f"{self.dest} = {self.left} {self.op} {self.right}"
+
+
+def parse_tac(ir, types=None):
+    code = []
+    for i, line in enumerate(ir):
+        value_type = types[i] if types else None
+        if line.endswith(':'):
+            code.append(Instr('label', line[:-1]))
+        elif line.startswith('GOTO '):
+            code.append(Instr('goto', line[5:]))
+        elif line.startswith('IF NOT '):
+            cond, label = line[7:].split(' GOTO ')
+            code.append(Instr('ifnot', label, cond))
+        else:
+            dest, expr = line.split(' = ')
+            parts = expr.split(' ')
+            if len(parts) == 3:
+                code.append(Instr('binop', dest, parts[0], parts[1], parts[2], value_type))
+            else:
+                code.append(Instr('move', dest, expr, type=value_type))
+    return code
+
+
+def format_tac(code, with_types):
+    ir = [str(ins) for ins in code]
+    return ir, ([ins.type for ins in code] if with_types else None)
+
+
+def is_const(operand):
+    # Los nombres empiezan por letra, '_' o '%'; una constante, por dígito o
+    # signo (los reales no finitos se escriben '+inf', '-inf', '+nan')
+    return operand[0].isdigit() or operand[0] in '+-'
+
+
+def int_const(operand):
+    """
+    Valor de una constante entera, o None si el operando no lo es.
+    """
+    return int(operand) if operand.isdigit() else None
+
+
+# ----------------------------------------------------------------------
+# Identidades algebraicas
+# ----------------------------------------------------------------------
+def simplify_instr(ins):
+    """
+    Devuelve la instrucción simplificada, o None si no hay identidad
+    aplicable. Solo se usan constantes enteras: x * 1.0 no es x si x es
+    entero. x + 0 solo se simplifica con x entero (-0.0 + 0 es 0.0).
+    """
+    if ins.kind != 'binop':
+        return None
+    op, left, right = ins.op, ins.left, ins.right
+    if op == '*':
+        if right == '1':
+            return Instr('move', ins.dest, left, type=ins.type)
+        if left == '1':
+            return Instr('move', ins.dest, right, type=ins.type)
+        if right == '2':
+            return Instr('binop', ins.dest, left, '+', left, ins.type)
+        if left == '2':
+            return Instr('binop', ins.dest, right, '+', right, ins.type)
+    elif op == '+' and ins.type == 'int':
+        if right == '0':
+            return Instr('move', ins.dest, left, type=ins.type)
+        if left == '0':
+            return Instr('move', ins.dest, right, type=ins.type)
+    elif op == '-' and right == '0':
+        return Instr('move', ins.dest, left, type=ins.type)
+    return None
+
+
+def simplify_algebra(ir, types=None, stats=None):
+    code = parse_tac(ir, types)
+    for i, ins in enumerate(code):
+        simpler = simplify_instr(ins)
+        if simpler is not None:
+            code[i] = simpler
+            if stats is not None:
+                stats['identidades'] = stats.get('identidades', 0) + 1
+    return format_tac(code, types is not None)
+
+
+# ----------------------------------------------------------------------
+# Lazos
+# ----------------------------------------------------------------------
+def find_loops(code):
+    """
+    Lazos naturales (encabezado, último salto de vuelta) con una sola
+    entrada: el encabezado es una etiqueta label_while_* a la que vuelve un
+    salto posterior, y desde fuera del lazo solo se llega a él cayendo desde
+    la instrucción anterior. Ordenados de más interno a más externo.
+    """
+    labels = {ins.dest: i for i, ins in enumerate(code) if ins.kind == 'label'}
+    # Tras enhebrar saltos puede haber varios saltos de vuelta: el lazo
+    # llega hasta el último
+    back_edges = {}
+    for end, ins in enumerate(code):
+        if ins.kind in ('goto', 'ifnot') and ins.dest.startswith('label_while_'):
+            header = labels.get(ins.dest)
+            if header is not None and header < end:
+                back_edges[header] = end
+    loops = []
+    for header, end in back_edges.items():
+        single_entry = True
+        for k, other in enumerate(code):
+            if header <= k <= end or other.kind not in ('goto', 'ifnot'):
+                continue
+            target = labels.get(other.dest)
+            if target is not None and header <= target <= end:
+                single_entry = False
+                break
+        if single_entry:
+            loops.append((header, end))
+    loops.sort(key=lambda loop: loop[1] - loop[0])
+    return loops
+
+
+def _count_defs(code, start, end):
+    defs = {}
+    for ins in code[start:end + 1]:
+        name = ins.defines()
+        if name is not None:
+            defs[name] = defs.get(name, 0) + 1
+    return defs
+
+
+def _can_fail(ins):
+    """
+    True si la instrucción podría fallar al ejecutarse en el preencabezado
+    aunque el lazo no llegara a ejecutarla. La división nunca se mueve
+    (entre cero, o un entero enorme que no cabe en un real); +, - y * no
+    fallan si los operandos están asignados y son enteros (mezclar un entero
+    enorme con un real también desborda).
+    """
+    if ins.op == '/':
+        return True
+    if ins.type == 'int':
+        return False
+    return not all(int_const(x) is not None for x in ins.operands())
+
+
+def hoist_invariants(code, header, end, program_defs, stats=None):
+    """
+    Mueve antes del encabezado los temporales del lazo cuyo valor no cambia
+    entre iteraciones. Devuelve el número de instrucciones movidas.
+    """
+    defs = _count_defs(code, header, end)
+    hoisted = set()
+    moved = []
+    for k in range(header + 1, end):
+        ins = code[k]
+        if (ins.kind == 'binop' and is_temp(ins.dest) and program_defs.get(ins.dest) == 1
+                and all(is_const(x) or x in hoisted or x not in defs for x in ins.operands())
+                and not _can_fail(ins)):
+            hoisted.add(ins.dest)
+            moved.append(k)
+    if moved:
+        instrs = [code[k] for k in moved]
+        for k in reversed(moved):
+            del code[k]
+        code[header:header] = instrs
+        if stats is not None:
+            stats['invariantes'] = stats.get('invariantes', 0) + len(instrs)
+    return len(moved)
+
+
+def _induction_steps(code, header, end, defs):
+    """
+    Variables de inducción básicas del lazo: las que solo se asignan como
+    i = t con t = i + c, c + i o i - c (c constante entera) y son enteras.
+    Devuelve {variable: [(índice de la asignación, paso), ...]}.
+    """
+    temp_def = {}
+    for k in range(header + 1, end):
+        ins = code[k]
+        if ins.kind == 'binop' and is_temp(ins.dest):
+            temp_def[ins.dest] = ins
+    updates = {}
+    rejected = set()
+    for k in range(header + 1, end):
+        ins = code[k]
+        name = ins.defines()
+        if name is None or is_temp(name) or name in rejected:
+            continue
+        step = None
+        source = temp_def.get(ins.left) if ins.kind == 'move' else None
+        if source is not None and source.type == 'int' and defs.get(source.dest) == 1:
+            if source.op == '+' and source.left == name and int_const(source.right) is not None:
+                step = int_const(source.right)
+            elif source.op == '+' and source.right == name and int_const(source.left) is not None:
+                step = int_const(source.left)
+            elif source.op == '-' and source.left == name and int_const(source.right) is not None:
+                step = -int_const(source.right)
+        if step is None:
+            rejected.add(name)
+            updates.pop(name, None)
+        else:
+            updates.setdefault(name, []).append((k, step))
+    return updates
+
+
+def _uses_in_block(code, temp, start, end, blocked):
+    """
+    Índices de los usos de temp si están todos en el mismo bloque básico
+    que su definición (start) y antes de cualquier asignación a una
+    variable de blocked; si no, None.
+    """
+    uses = []
+    for k in range(start + 1, end + 1):
+        ins = code[k]
+        if temp in ins.operands():
+            uses.append(k)
+        if ins.kind in ('label', 'goto', 'ifnot') or ins.defines() in blocked:
+            # Fin del bloque: no puede haber usos más adelante
+            if any(temp in later.operands() for later in code[k + 1:]):
+                return None
+            return uses
+    return uses
+
+
+def reduce_strength(code, header, end, fresh_temp, stats=None):
+    """
+    Reemplaza t = i * k (i variable de inducción entera, k constante o
+    invariante) por una variable s que se mantiene igual a i * k: se
+    inicializa en el preencabezado y se incrementa junto con i. Solo se
+    aplica si los usos de t se pueden leer de s directamente, de modo que
+    el lazo no ejecuta más instrucciones que antes.
+    """
+    defs = _count_defs(code, header, end)
+    ivs = _induction_steps(code, header, end, defs)
+    reduced = 0
+    k = header + 1
+    while k < end:
+        ins = code[k]
+        if ins.kind == 'binop' and ins.op == '*' and ins.type == 'int' and is_temp(ins.dest):
+            if ins.left in ivs and (is_const(ins.right) or ins.right not in defs):
+                iv, factor = ins.left, ins.right
+            elif ins.right in ivs and (is_const(ins.left) or ins.left not in defs):
+                iv, factor = ins.right, ins.left
+            else:
+                k += 1
+                continue
+            uses = _uses_in_block(code, ins.dest, k, end, {iv})
+            if uses is None or is_const(factor) and int_const(factor) is None:
+                k += 1
+                continue
+            # s = i * k en el preencabezado; s += paso * k tras cada i = i + paso
+            s = fresh_temp()
+            preheader = [Instr('binop', s, iv, '*', factor, 'int')]
+            increments = {}
+            for index, step in ivs[iv]:
+                if int_const(factor) is not None:
+                    delta = step * int_const(factor)
+                    amount = str(abs(delta))
+                else:
+                    delta = step
+                    amount = fresh_temp()
+                    preheader.append(Instr('binop', amount, factor, '*', str(abs(step)), 'int'))
+                increments[index] = Instr('binop', s, s, '-' if delta < 0 else '+', amount, 'int')
+            for u in uses:
+                use = code[u]
+                if use.left == ins.dest:
+                    use.left = s
+                if use.right == ins.dest:
+                    use.right = s
+            new_code = []
+            for index, other in enumerate(code):
+                if index == header:
+                    new_code.extend(preheader)
+                if index != k:
+                    new_code.append(other)
+                if index in increments:
+                    new_code.append(increments[index])
+            code[:] = new_code
+            if stats is not None:
+                stats['reducciones'] = stats.get('reducciones', 0) + 1
+            reduced += 1
+            # Los índices cambiaron: se recalcula todo el lazo
+            return reduced + reduce_strength(code, header + len(preheader),
+                                             end + len(preheader) - 1 + len(increments),
+                                             fresh_temp, stats)
+        k += 1
+    return reduced
+
+
+def optimize_loops(ir, types=None, stats=None):
+    """
+    Aplica movimiento de código invariante y reducción de fuerza a cada lazo,
+    del más interno al más externo. Devuelve (ir, tipos).
+    """
+    code = parse_tac(ir, types)
+    temp_numbers = [int(name[len(TEMP_PREFIX):]) for ins in code
+                    for name in (ins.dest, ins.left, ins.right)
+                    if name and is_temp(name)]
+    counter = [max(temp_numbers, default=0)]
+
+    def fresh_temp():
+        counter[0] += 1
+        return f"{TEMP_PREFIX}{counter[0]}"
+
+    done = set()
+    while True:
+        pending = [(h, e) for h, e in find_loops(code) if code[h].dest not in done]
+        if not pending:
+            break
+        header, end = pending[0]
+        label = code[header].dest
+        done.add(label)
+        program_defs = _count_defs(code, 0, len(code) - 1)
+        moved = hoist_invariants(code, header, end, program_defs, stats)
+        reduce_strength(code, header + moved, end, fresh_temp, stats)
+    return format_tac(code, types is not None)
+
+
+# ----------------------------------------------------------------------
+# Saltos
+# ----------------------------------------------------------------------
+def _count(stats, key):
+    if stats is not None:
+        stats[key] = stats.get(key, 0) + 1
+
+
+def _constant_temps(code):
+    """
+    Valor de los temporales definidos una sola vez a partir de constantes
+    (t = 3, t = 2 - 2, ...). Los temporales se definen antes de sus usos,
+    así que basta un recorrido en orden.
+    """
+    defs = _count_defs(code, 0, len(code) - 1)
+    values = {}
+
+    def value(operand):
+        if is_const(operand):
+            return parse_constant(operand)
+        return values.get(operand)
+
+    for ins in code:
+        if ins.kind not in ('move', 'binop') or not is_temp(ins.dest) or defs[ins.dest] != 1:
+            continue
+        operands = [value(x) for x in ins.operands()]
+        if None in operands:
+            continue
+        if ins.kind == 'move':
+            values[ins.dest] = operands[0]
+            continue
+        left, right = operands
+        try:
+            if ins.op == '+':
+                values[ins.dest] = left + right
+            elif ins.op == '-':
+                values[ins.dest] = left - right
+            elif ins.op == '*':
+                values[ins.dest] = left * right
+            else:
+                values[ins.dest] = left / right
+        except (ArithmeticError, ValueError):
+            # Error en tiempo de ejecución (p. ej. 1 / 0): no es constante
+            pass
+    return values
+
+
+def fold_branches(code, stats=None):
+    """
+    IF NOT c GOTO L con c constante: desaparece si c es verdadera y se
+    convierte en GOTO L si es falsa.
+    """
+    values = _constant_temps(code)
+    changed = False
+    for i, ins in enumerate(code):
+        if ins.kind != 'ifnot':
+            continue
+        cond = ins.left
+        if is_const(cond):
+            value = parse_constant(cond)
+        elif cond in values:
+            value = values[cond]
+        else:
+            continue
+        code[i] = Instr('goto', ins.dest) if not value else None
+        _count(stats, 'ramas')
+        changed = True
+    if changed:
+        code[:] = [ins for ins in code if ins is not None]
+    return changed
+
+
+def _skip_labels(code, index):
+    # Las posiciones en None son saltos ya eliminados en esta pasada
+    while index < len(code) and (code[index] is None or code[index].kind == 'label'):
+        index += 1
+    return index
+
+
+def thread_jumps(code, stats=None):
+    """
+    Un salto a una etiqueta seguida de GOTO M pasa a saltar directamente a
+    M. Un salto a la instrucción siguiente se elimina (el condicional solo
+    si su condición no puede fallar: constante o temporal).
+    """
+    labels = {ins.dest: i for i, ins in enumerate(code) if ins.kind == 'label'}
+    changed = False
+    for i, ins in enumerate(code):
+        if ins is None or ins.kind not in ('goto', 'ifnot'):
+            continue
+        target, seen = ins.dest, {ins.dest}
+        while True:
+            landing = _skip_labels(code, labels[target])
+            if landing == len(code) or code[landing].kind != 'goto' or code[landing].dest in seen:
+                break
+            target = code[landing].dest
+            seen.add(target)
+        if target != ins.dest:
+            ins.dest = target
+            _count(stats, 'enhebrados')
+            changed = True
+        if (_skip_labels(code, labels[target]) == _skip_labels(code, i + 1)
+                and (ins.kind == 'goto' or is_const(ins.left) or is_temp(ins.left))):
+            code[i] = None
+            _count(stats, 'saltos')
+            changed = True
+    if changed:
+        code[:] = [ins for ins in code if ins is not None]
+    return changed
+
+
+def remove_unreachable(code, stats=None):
+    """
+    Elimina las instrucciones a las que no se llega desde el principio y
+    las etiquetas a las que ya no salta nadie.
+    """
+    labels = {ins.dest: i for i, ins in enumerate(code) if ins.kind == 'label'}
+    reachable = [False] * len(code)
+    pending = [0] if code else []
+    while pending:
+        i = pending.pop()
+        if i >= len(code) or reachable[i]:
+            continue
+        reachable[i] = True
+        ins = code[i]
+        if ins.kind in ('goto', 'ifnot'):
+            pending.append(labels[ins.dest])
+        if ins.kind != 'goto':
+            pending.append(i + 1)
+    targets = {ins.dest for i, ins in enumerate(code)
+               if reachable[i] and ins.kind in ('goto', 'ifnot')}
+    kept = []
+    for i, ins in enumerate(code):
+        if not reachable[i]:
+            if ins.kind != 'label':
+                _count(stats, 'inalcanzables')
+        elif ins.kind != 'label' or ins.dest in targets:
+            kept.append(ins)
+    changed = len(kept) != len(code)
+    code[:] = kept
+    return changed
+
+
+def merge_labels(code, stats=None):
+    """
+    Etiquetas seguidas (por ejemplo label_else y label_end de un if sin
+    else) se reducen a la primera. Los encabezados label_while_* se
+    conservan: optimize_loops los usa para encontrar los lazos.
+    """
+    rename = {}
+    keep = None
+    for ins in code:
+        if ins.kind != 'label':
+            keep = None
+        elif ins.dest.startswith('label_while_'):
+            keep = None
+        elif keep is None:
+            keep = ins.dest
+        else:
+            rename[ins.dest] = keep
+    if not rename:
+        return False
+    for ins in code:
+        if ins.kind in ('goto', 'ifnot') and ins.dest in rename:
+            ins.dest = rename[ins.dest]
+    code[:] = [ins for ins in code if not (ins.kind == 'label' and ins.dest in rename)]
+    for _ in rename:
+        _count(stats, 'etiquetas')
+    return True
+
+
+def optimize_jumps(ir, types=None, stats=None):
+    """
+    Pliega ramas constantes, enhebra cadenas de saltos, quita saltos a la
+    instrucción siguiente (lo que elimina los else vacíos), código
+    inalcanzable y etiquetas sobrantes, hasta que nada cambie. Devuelve
+    (ir, tipos).
+    """
+    code = parse_tac(ir, types)
+    changed = True
+    while changed:
+        changed = fold_branches(code, stats)
+        changed |= thread_jumps(code, stats)
+        changed |= merge_labels(code, stats)
+        changed |= remove_unreachable(code, stats)
+    return format_tac(code, types is not None)
+
+
+def optimize(ir, types=None, stats=None):
+    """
+    Todas las optimizaciones de este módulo, en orden. Devuelve (ir, tipos).
+    """
+    # ssa usa las estructuras de este módulo: se importa aquí para evitar
+    # la importación circular
+    from .ssa import propagate_constants
+
+    ir, types = simplify_algebra(ir, types, stats)
+    # propagate_constants termina con optimize_jumps
+    ir, types = propagate_constants(ir, types, stats)
+    return optimize_loops(ir, types, stats)
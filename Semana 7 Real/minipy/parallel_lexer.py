@@ -0,0 +1,87 @@
+"""
+Análisis léxico en paralelo de archivos enormes.
+
+Ningún token cruza un salto de línea, así que el código se puede cortar en
+trozos que terminan en '\\n' y lexear cada trozo por separado: basta con
+decirle a lexer en qué línea empieza el trozo (las columnas no cambian,
+porque cada trozo empieza al comienzo de una línea). lex_chunks reparte los
+trozos entre procesos y devuelve sus tokens en orden, así que el resultado
+es el mismo que el de lexer(code), incluido el error del primer carácter
+inesperado.
+
+Los procesos devuelven los tokens por columnas (tipos, valores, líneas,
+columnas): serializar cuatro tuplas es varias veces más barato que
+serializar una namedtuple por token, y el proceso principal, que es el
+cuello de botella, solo arma los Token. Como mucho hay 2 * workers trozos en
+vuelo, así que la memoria no depende del tamaño del archivo si se consumen
+los trozos a medida que llegan.
+"""
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .lexer import Token, lexer
+
+CHUNK_SIZE = 1 << 20  # caracteres por trozo (se alarga hasta el siguiente '\n')
+
+
+def split_chunks(code, chunk_size=CHUNK_SIZE):
+    """
+    Corta code en trozos de unos chunk_size caracteres que terminan en un
+    salto de línea (o en el final del código). Devuelve una lista de
+    (inicio, fin, línea donde empieza el trozo).
+    """
+    chunks = []
+    start = 0
+    line = 1
+    while start < len(code):
+        end = code.find('\n', start + chunk_size - 1)
+        end = len(code) if end == -1 else end + 1
+        chunks.append((start, end, line))
+        line += code.count('\n', start, end)
+        start = end
+    return chunks
+
+
+def _lex_chunk(text, first_line):
+    # En el proceso trabajador: los tokens del trozo, por columnas
+    return tuple(zip(*lexer(text, first_line)))
+
+
+def _tokens(columns):
+    return list(map(Token, *columns)) if columns else []
+
+
+def lex_chunks(code, workers=None, chunk_size=CHUNK_SIZE):
+    """
+    Genera, en orden, la lista de tokens de cada trozo de split_chunks(code).
+    workers es el número de procesos (por defecto, uno por CPU); con
+    workers=1 o un solo trozo se lexea en este proceso.
+    """
+    chunks = split_chunks(code, chunk_size)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(chunks) <= 1:
+        for start, end, first_line in chunks:
+            yield lexer(code[start:end], first_line)
+        return
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        pending = deque()
+        for start, end, first_line in chunks:
+            pending.append(pool.submit(_lex_chunk, code[start:end], first_line))
+            if len(pending) >= 2 * workers:
+                yield _tokens(pending.popleft().result())
+        while pending:
+            yield _tokens(pending.popleft().result())
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+def parallel_lexer(code, workers=None, chunk_size=CHUNK_SIZE):
+    """
+    Igual que lexer(code), pero lexeando los trozos en paralelo.
+    """
+    tokens = []
+    for chunk_tokens in lex_chunks(code, workers, chunk_size):
+        tokens.extend(chunk_tokens)
+    return tokens
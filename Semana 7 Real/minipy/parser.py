@@ -0,0 +1,180 @@
+"""
+Parser de descenso recursivo del mini-lenguaje.
+"""
+from .nodes import ASTNode
+
+
+############################################################
+# 3. PARSER: Construye el AST a partir de la lista de tokens
+############################################################
+class Parser:
+    node_class = ASTNode   # clase de los nodos que se crean (ver minipy.incremental)
+
+    def __init__(self, tokens, hash_cons=False):
+        """
+        hash_cons: si es True, las subexpresiones estructuralmente idénticas
+        (mismo tipo, valor e hijos) comparten un único nodo, así que el AST
+        pasa a ser un DAG. Un nodo compartido conserva la posición de su
+        primera aparición.
+        """
+        self.tokens = tokens
+        self.pos = 0
+        self.shared = {} if hash_cons else None
+
+    def current_token(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    @staticmethod
+    def position(token):
+        """
+        (línea, columna) del token, o (None, None) si es una tupla sin posición.
+        """
+        return (token[2], token[3]) if len(token) > 3 else (None, None)
+
+    def expr_node(self, nodetype, value, children, token):
+        """
+        Crea un nodo de expresión (num, id, binop), o devuelve el ya existente
+        si hash_cons está activo. Las expresiones del lenguaje no tienen
+        efectos secundarios, así que compartirlas es seguro.
+        """
+        if self.shared is None:
+            return self.node_class(nodetype, value, children, *self.position(token))
+        # Los hijos ya son únicos, así que basta con su identidad
+        key = (nodetype, value.__class__, value) + tuple(id(child) for child in children or ())
+        node = self.shared.get(key)
+        if node is None:
+            node = self.shared[key] = self.node_class(nodetype, value, children, *self.position(token))
+        return node
+
+    def match(self, expected_type):
+        """
+        Avanza en la lista de tokens si el tipo coincide,
+        de lo contrario lanza un error de sintaxis.
+        """
+        token = self.current_token()
+        if token and token[0] == expected_type:
+            self.pos += 1
+            return token
+        raise SyntaxError(f"Se esperaba {expected_type}, encontrado {token}")
+
+    def parse(self):
+        """
+        parse() -> Devuelve una lista de nodos AST (varias sentencias).
+        """
+        statements = []
+        while self.current_token() is not None:
+            statements.append(self.statement())
+        return statements
+
+    def statement(self):
+        """
+        statement -> if_statement | while_statement | assign_statement
+        """
+        token = self.current_token()
+        if not token:
+            return None
+        if token[0] == 'IF':
+            return self.if_statement()
+        elif token[0] == 'WHILE':
+            return self.while_statement()
+        elif token[0] == 'ID':
+            return self.assign_statement()
+        else:
+            raise SyntaxError(f"Sentencia desconocida con token {token}")
+
+    def block(self):
+        """
+        block -> BEGIN statement* END
+        """
+        begin_token = self.match('BEGIN')
+        stmts = []
+        while self.current_token() and self.current_token()[0] != 'END':
+            stmts.append(self.statement())
+        self.match('END')
+        return self.node_class('block', None, stmts, *self.position(begin_token))
+
+    def if_statement(self):
+        """
+        if_statement -> IF expression COLON block [ ELSE COLON block ]
+        """
+        if_token = self.match('IF')
+        condition = self.expression()
+        self.match('COLON')
+        if_block = self.block()
+
+        else_block = self.node_class('block', None, [])
+        token = self.current_token()
+        if token and token[0] == 'ELSE':
+            self.match('ELSE')
+            self.match('COLON')
+            else_block = self.block()
+        return self.node_class('if', None, [condition, if_block, else_block], *self.position(if_token))
+
+    def while_statement(self):
+        """
+        while_statement -> WHILE expression COLON block
+        """
+        while_token = self.match('WHILE')
+        condition = self.expression()
+        self.match('COLON')
+        body_block = self.block()
+        return self.node_class('while', None, [condition, body_block], *self.position(while_token))
+
+    def assign_statement(self):
+        """
+        assign_statement -> ID ASSIGN expression SEMICOL
+        """
+        id_token = self.match('ID')
+        self.match('ASSIGN')
+        expr_node = self.expression()
+        self.match('SEMICOL')
+        return self.node_class('assign', id_token[1], [expr_node], *self.position(id_token))
+
+    def expression(self):
+        """
+        Soporta +, -, *, /, y paréntesis:
+        expression -> term ( ('+'|'-') term )*
+        """
+        node = self.term()
+        while (self.current_token() and
+               self.current_token()[0] == 'OP' and
+               self.current_token()[1] in ['+', '-']):
+            op_token = self.match('OP')
+            right = self.term()
+            node = self.expr_node('binop', op_token[1], [node, right], op_token)
+        return node
+
+    def term(self):
+        """
+        term -> factor ( ('*'|'/') factor )*
+        """
+        node = self.factor()
+        while (self.current_token() and
+               self.current_token()[0] == 'OP' and
+               self.current_token()[1] in ['*', '/']):
+            op_token = self.match('OP')
+            right = self.factor()
+            node = self.expr_node('binop', op_token[1], [node, right], op_token)
+        return node
+
+    def factor(self):
+        """
+        factor -> NUM | ID | '(' expression ')'
+        """
+        token = self.current_token()
+        if not token:
+            raise SyntaxError("Fin de tokens inesperado en 'factor'.")
+
+        if token[0] == 'NUM':
+            self.match('NUM')
+            return self.expr_node('num', token[1], None, token)
+        elif token[0] == 'ID':
+            self.match('ID')
+            return self.expr_node('id', token[1], None, token)
+        elif token[0] == 'LPAREN':
+            self.match('LPAREN')
+            node = self.expression()
+            self.match('RPAREN')
+            return node
+        else:
+            raise SyntaxError(f"Factor inesperado con token {token}")
@@ -0,0 +1,121 @@
+"""
+Evaluación parcial de programas completos.
+
+El lenguaje no tiene instrucciones de entrada: cada programa es un cálculo
+cerrado que da el mismo resultado en todas sus ejecuciones. partial_evaluate
+lo ejecuta al compilar con un presupuesto de instrucciones (combustible) y,
+si termina, reemplaza el TAC por una tabla con el valor final de cada
+variable:
+
+    x = 5
+    y = 0 - 3
+    z = 2.5
+
+Ejecutar esa tabla ya casi no cuesta nada. Si se agota el combustible, si el
+programa falla (NameError, ZeroDivisionError, ...) o si algún valor final no
+se puede escribir como constante del TAC (inf, nan, -0.0, enteros enormes),
+devuelve None y el compilador genera el código normal: un programa que falla
+debe seguir fallando en cada ejecución.
+"""
+import math
+
+from .closures import _Unset
+from .tac import MOVE, ADD, SUB, MUL, DIV, GOTO, IFNOT, from_tac, is_temp
+
+DEFAULT_FUEL = 1_000_000  # instrucciones del TAC ejecutadas como máximo
+MAX_INT_BITS = 4096       # un entero más grande detiene la evaluación
+
+
+def _too_big(value):
+    return value.__class__ is int and value.bit_length() > MAX_INT_BITS
+
+
+def run_with_fuel(program, fuel=DEFAULT_FUEL):
+    """
+    Ejecuta un TacProgram sin especializar igual que tac.run_tac, pero
+    descuenta una unidad de combustible por instrucción. Devuelve el entorno
+    final de las variables del usuario, o None si se agota el combustible o
+    algún entero supera MAX_INT_BITS (el tiempo de cada operación crece con
+    el tamaño del número). Los errores del programa se propagan.
+    """
+    names = program.names
+    regs = [_Unset(name) for name in names] + list(program.constants)
+    opcodes, a, b, c = program.opcodes, program.a, program.b, program.c
+    pc = 0
+    end = len(opcodes)
+    while pc < end:
+        fuel -= 1
+        if fuel < 0:
+            return None
+        op = opcodes[pc]
+        if op == MOVE:
+            value = regs[b[pc]]
+            if value.__class__ is _Unset:
+                value._fail()
+        elif op == GOTO:
+            pc = a[pc]
+            continue
+        elif op == IFNOT:
+            if not regs[b[pc]]:
+                pc = a[pc]
+                continue
+            pc += 1
+            continue
+        elif op == ADD:
+            value = regs[b[pc]] + regs[c[pc]]
+        elif op == SUB:
+            value = regs[b[pc]] - regs[c[pc]]
+        elif op == MUL:
+            value = regs[b[pc]] * regs[c[pc]]
+        elif op == DIV:
+            value = regs[b[pc]] / regs[c[pc]]
+        else:
+            raise ValueError(f"Instrucción {op} no soportada: el programa debe estar sin especializar")
+        if _too_big(value):
+            return None
+        regs[a[pc]] = value
+        pc += 1
+    return {name: value for name, value in zip(names, regs)
+            if value.__class__ is not _Unset and not is_temp(name)}
+
+
+def constant_text(value):
+    """
+    Texto del TAC que produce value: una constante ("5", "2.5", "1e+300")
+    o, si es negativo, una resta desde cero ("0 - 3", "0.0 - 2.5"). None si
+    el valor no se puede escribir así.
+    """
+    if value.__class__ is int:
+        if _too_big(value):
+            return None
+        return str(value) if value >= 0 else f"0 - {-value}"
+    if not math.isfinite(value) or math.copysign(1.0, value) < 0 and value == 0:
+        return None
+    # repr de un float positivo empieza por dígito y float() lo relee exacto
+    return repr(value) if value >= 0 else f"0.0 - {-value!r}"
+
+
+def partial_evaluate(ir, types=None, fuel=DEFAULT_FUEL):
+    """
+    Evalúa el TAC de generate_code al compilar. Devuelve (tabla, tipos) con
+    una asignación por variable del usuario, o None si hay que generar el
+    código normal (ver el docstring del módulo). tipos es None si types lo
+    es, como en las pasadas de optimizer.
+    """
+    try:
+        env = run_with_fuel(from_tac(ir), fuel)
+    except Exception:
+        # El error debe repetirse en cada ejecución
+        return None
+    if env is None:
+        return None
+    table = []
+    for name, value in env.items():
+        text = constant_text(value)
+        if text is None:
+            return None
+        table.append(f"{name} = {text}")
+    table_types = None
+    if types is not None:
+        table_types = ['int' if value.__class__ is int else 'float' for value in env.values()]
+    return table, table_types
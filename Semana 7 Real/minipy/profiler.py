@@ -0,0 +1,129 @@
+"""
+Perfilado de programas a nivel de sentencia del código fuente.
+
+Cuenta cuántas veces se ejecuta cada sentencia y el tiempo acumulado que
+pasa en ella (incluidas las sentencias anidadas, en el caso de 'if' y
+'while'). Las sentencias se identifican por la línea y columna que el lexer
+guarda en cada ASTNode.
+"""
+from time import perf_counter
+
+from .interpreter import Interpreter
+from .closures import ClosureCompiler
+from .codegen import generate_code
+from .partial_eval import run_with_fuel
+from .tac import from_tac
+
+
+def describe(node):
+    """
+    Texto corto para identificar una sentencia en el reporte.
+    """
+    if node.nodetype == 'assign':
+        return f"{node.value} = ..."
+    return node.nodetype
+
+
+class Profiler:
+    def __init__(self):
+        # (línea, columna, descripción) -> [ejecuciones, segundos]
+        self.stats = {}
+
+    def entry(self, node):
+        """
+        Registro (mutable) de la sentencia; se crea la primera vez.
+        """
+        key = (node.line, node.column, describe(node))
+        if key not in self.stats:
+            self.stats[key] = [0, 0.0]
+        return self.stats[key]
+
+    def record(self, node, elapsed):
+        stat = self.entry(node)
+        stat[0] += 1
+        stat[1] += elapsed
+
+    def hot_spots(self):
+        """
+        Lista de (línea, columna, descripción, ejecuciones, segundos),
+        de mayor a menor tiempo acumulado.
+        """
+        rows = [(line, column, label, count, total)
+                for (line, column, label), (count, total) in self.stats.items()]
+        rows.sort(key=lambda row: row[4], reverse=True)
+        return rows
+
+    def report(self, limit=None):
+        """
+        Reporte de puntos calientes como lista de líneas de texto.
+        """
+        lines = [f"{'línea:col':>10}  {'ejecuciones':>11}  {'tiempo (ms)':>11}  sentencia"]
+        for line, column, label, count, total in self.hot_spots()[:limit]:
+            position = f"{line}:{column}" if line is not None else "?"
+            lines.append(f"{position:>10}  {count:>11}  {total * 1000:>11.3f}  {label}")
+        return lines
+
+
+class ProfilingInterpreter(Interpreter):
+    """
+    Intérprete del árbol que mide cada sentencia ejecutada.
+    """
+    def __init__(self, env=None, profiler=None):
+        super().__init__(env)
+        self.profiler = profiler or Profiler()
+
+    def exec_stmt(self, node):
+        if node.nodetype == 'block':
+            return super().exec_stmt(node)
+        start = perf_counter()
+        try:
+            super().exec_stmt(node)
+        finally:
+            self.profiler.record(node, perf_counter() - start)
+
+
+class ProfilingClosureCompiler(ClosureCompiler):
+    """
+    Compilador a clausuras que envuelve cada sentencia en un medidor.
+    """
+    def __init__(self, profiler=None):
+        super().__init__()
+        self.profiler = profiler or Profiler()
+
+    def stmt(self, node):
+        compiled = super().stmt(node)
+        if compiled is None or node.nodetype == 'block':
+            return compiled
+        stat = self.profiler.entry(node)
+
+        def run_profiled(s):
+            start = perf_counter()
+            try:
+                compiled(s)
+            finally:
+                stat[0] += 1
+                stat[1] += perf_counter() - start
+        return run_profiled
+
+
+def profile_program(ast_nodes, env=None, engine='closures', fuel=None):
+    """
+    Ejecuta el programa midiendo cada sentencia.
+    engine: 'closures' (minipy.closures) o 'tree' (minipy.interpreter).
+    fuel: si se da (solo sin env), antes de medir se ejecuta el TAC del
+    programa con partial_eval.run_with_fuel; si no termina dentro de ese
+    presupuesto de instrucciones se devuelve None en lugar de quedarse en
+    un lazo infinito.
+    Devuelve (entorno final, Profiler).
+    """
+    if fuel is not None:
+        if env is not None:
+            raise ValueError("fuel no admite un entorno inicial")
+        if run_with_fuel(from_tac(generate_code(ast_nodes)), fuel) is None:
+            return None
+    profiler = Profiler()
+    if engine == 'tree':
+        final_env = ProfilingInterpreter(env, profiler).run(ast_nodes)
+    else:
+        final_env = ProfilingClosureCompiler(profiler).compile(ast_nodes).run(env)
+    return final_env, profiler
@@ -0,0 +1,192 @@
+"""
+Análisis semántico, inferencia de tipos y tabla de símbolos.
+"""
+
+
+############################################################
+# 4. ANÁLISIS SEMÁNTICO Y TABLA DE SÍMBOLOS
+############################################################
+def semantic_analysis(ast_nodes):
+    """
+    Recorre el AST y verifica uso de variables, y devuelve la tabla de
+    símbolos (una nueva en cada llamada). Además infiere los tipos (ver
+    infer_types): anota cada expresión con su tipo y guarda en la tabla el
+    tipo de cada variable asignada.
+    """
+    symbol_table = {}
+    for node in ast_nodes:
+        analyze_node(node, symbol_table)
+    for var_name, var_type in infer_types(ast_nodes).items():
+        symbol_table[var_name]['type'] = var_type
+    return symbol_table
+
+
+def analyze_node(node, symbol_table):
+    if node.nodetype == 'assign':
+        var_name = node.value
+        if var_name not in symbol_table:
+            symbol_table[var_name] = {'type': 'unknown', 'initialized': True}
+        analyze_node(node.children[0], symbol_table)
+
+    elif node.nodetype == 'binop':
+        left, right = node.children
+        analyze_node(left, symbol_table)
+        analyze_node(right, symbol_table)
+
+    elif node.nodetype == 'num':
+        # No requiere acción
+        pass
+
+    elif node.nodetype == 'id':
+        if node.value not in symbol_table:
+            symbol_table[node.value] = {'type': 'unknown', 'initialized': False}
+
+    elif node.nodetype == 'if':
+        # children = [cond, if_block, else_block]
+        condition = node.children[0]
+        if_block = node.children[1]
+        else_block = node.children[2]
+        analyze_node(condition, symbol_table)
+        analyze_node(if_block, symbol_table)
+        analyze_node(else_block, symbol_table)
+
+    elif node.nodetype == 'while':
+        condition = node.children[0]
+        block_node = node.children[1]
+        analyze_node(condition, symbol_table)
+        analyze_node(block_node, symbol_table)
+
+    elif node.nodetype == 'block':
+        for stmt in node.children:
+            analyze_node(stmt, symbol_table)
+
+
+############################################################
+# INFERENCIA DE TIPOS (sensible al flujo)
+############################################################
+# El estado en cada punto del programa asigna a cada variable el conjunto de
+# tipos que puede tener: 'int', 'float' y UNDEF (todavía sin asignar). Una
+# variable que no aparece en el estado está sin asignar. En un if se unen los
+# estados de las dos ramas; en un while se itera hasta el punto fijo.
+UNDEF = 'undef'
+_UNASSIGNED = frozenset([UNDEF])
+
+
+def type_name(types):
+    """
+    Nombre del tipo de un valor a partir de sus tipos posibles.
+    """
+    if not types or UNDEF in types:
+        return None
+    if len(types) == 1:
+        return next(iter(types))
+    return 'num'
+
+
+def join_type(a, b):
+    """
+    Une dos anotaciones de tipo del mismo nodo (p. ej. un nodo compartido
+    por hash_cons, o visitado en varias iteraciones de un while).
+    """
+    if a == b:
+        return a
+    if a is None or b is None:
+        return None
+    return 'num'
+
+
+class TypeInference:
+    def __init__(self):
+        self.seen = set()         # nodos ya anotados en este análisis
+        self.assigned = {}        # variable -> tipos de todos sus valores
+
+    def annotate(self, node, types):
+        name = type_name(types)
+        if node in self.seen:
+            name = join_type(node.type, name)
+        else:
+            self.seen.add(node)
+        node.type = name
+
+    def expr(self, node, state):
+        """
+        Tipos posibles del valor de la expresión (sin UNDEF: leer una
+        variable sin asignar es un error en ejecución).
+        """
+        if node.nodetype == 'num':
+            types = frozenset(['float' if isinstance(node.value, float) else 'int'])
+            self.annotate(node, types)
+        elif node.nodetype == 'id':
+            var_types = state.get(node.value, _UNASSIGNED)
+            self.annotate(node, var_types)
+            types = var_types - _UNASSIGNED
+        else:
+            left = self.expr(node.children[0], state)
+            right = self.expr(node.children[1], state)
+            if not left or not right:
+                types = frozenset()
+            elif node.value == '/':
+                types = frozenset(['float'])
+            else:
+                # int op int es int; si interviene un float, el resultado es float
+                types = frozenset((l if l == r else 'float') for l in left for r in right)
+            if node.children[0].type is None or node.children[1].type is None:
+                # Algún operando puede no estar asignado: el tipo del valor se
+                # conoce, pero calcularlo puede fallar
+                self.annotate(node, types | _UNASSIGNED)
+            else:
+                self.annotate(node, types)
+        return types
+
+    def stmt(self, node, state):
+        """
+        Devuelve el estado después de ejecutar la sentencia.
+        """
+        if node.nodetype == 'assign':
+            types = self.expr(node.children[0], state)
+            state = dict(state)
+            state[node.value] = types
+            self.assigned[node.value] = self.assigned.get(node.value, frozenset()) | types
+            return state
+
+        elif node.nodetype == 'if':
+            self.expr(node.children[0], state)
+            return join_states(self.stmt(node.children[1], state),
+                               self.stmt(node.children[2], state))
+
+        elif node.nodetype == 'while':
+            head = state
+            while True:
+                self.expr(node.children[0], head)
+                after_body = self.stmt(node.children[1], head)
+                new_head = join_states(state, after_body)
+                if new_head == head:
+                    return head
+                head = new_head
+
+        elif node.nodetype == 'block':
+            for child in node.children:
+                state = self.stmt(child, state)
+            return state
+        return state
+
+
+def join_states(a, b):
+    joined = {}
+    for var_name in a.keys() | b.keys():
+        joined[var_name] = a.get(var_name, _UNASSIGNED) | b.get(var_name, _UNASSIGNED)
+    return joined
+
+
+def infer_types(ast_nodes):
+    """
+    Anota cada nodo de expresión con su tipo (node.type) y devuelve el tipo
+    de cada variable asignada, unido sobre todas sus asignaciones ('int',
+    'float', 'num' o 'unknown' si nunca recibe un valor válido).
+    """
+    inference = TypeInference()
+    state = {}
+    for node in ast_nodes:
+        state = inference.stmt(node, state)
+    return {var_name: type_name(types) or 'unknown'
+            for var_name, types in inference.assigned.items()}
@@ -0,0 +1,506 @@
+"""
+Forma SSA y propagación de constantes condicional dispersa (SCCP).
+
+propagate_constants convierte el TAC de generate_code a SSA, propaga
+constantes con SCCP (Wegman y Zadeck) y vuelve a TAC:
+
+1. Grafo de flujo: bloques básicos del TAC; los inalcanzables se descartan.
+2. Dominadores (algoritmo iterativo de Cooper, Harvey y Kennedy) y fronteras
+   de dominancia, que indican dónde colocar las funciones phi (SSA
+   semipodada: solo para nombres que se leen en otro bloque).
+3. Renombrado: cada definición crea una versión nueva (x.1, x.2, ...; el
+   punto no puede aparecer en un nombre del lenguaje). La versión x.0 es el
+   valor de entrada, que puede no estar asignado.
+4. SCCP: cada versión vale TOP (aún sin valor), una constante o BOTTOM
+   (varía o no se conoce), y solo se siguen las aristas que pueden
+   ejecutarse; un if o while cuya condición resulta constante deja una sola
+   salida ejecutable.
+5. Vuelta a TAC: los usos de versiones constantes se reemplazan por la
+   constante, los saltos con condición constante se pliegan y los bloques no
+   ejecutables desaparecen. Como no se propagan copias, las versiones de una
+   misma variable nunca están vivas a la vez (SSA convencional): basta con
+   quitar el sufijo de versión y las phi. Al final optimizer.optimize_jumps
+   limpia los saltos que quedaron.
+
+Una lectura de una variable que puede no estar asignada nunca se reemplaza
+(su phi recibe x.0, que es BOTTOM), así que el NameError se conserva; una
+operación que falla al evaluarla (división entre cero) también queda como
+está.
+"""
+from .optimizer import Instr, parse_tac, format_tac, is_const, optimize_jumps
+from .tac import is_temp, parse_constant
+
+# Valores del retículo de SCCP; una constante se representa como (valor,)
+TOP = 'TOP'
+BOTTOM = 'BOTTOM'
+
+# Enteros más grandes no se calculan en tiempo de compilación
+MAX_CONSTANT_BITS = 4096
+
+
+class Block:
+    __slots__ = ('index', 'instrs', 'fall', 'jump', 'succs', 'preds', 'phis')
+
+    def __init__(self, index):
+        self.index = index
+        self.instrs = []
+        # Sucesor al seguir de largo y destino del salto (None si no hay)
+        self.fall = None
+        self.jump = None
+        self.succs = []
+        self.preds = []
+        # variable -> Phi
+        self.phis = {}
+
+    def terminator(self):
+        if self.instrs and self.instrs[-1].kind in ('goto', 'ifnot'):
+            return self.instrs[-1]
+        return None
+
+
+class Phi:
+    __slots__ = ('var', 'dest', 'args')
+
+    def __init__(self, var, count):
+        self.var = var
+        self.dest = None
+        # Un argumento por predecesor, en el orden de Block.preds
+        self.args = [None] * count
+
+    def __str__(self):
+        return f"{self.dest} = phi({', '.join(self.args)})"
+
+
+# ----------------------------------------------------------------------
+# Grafo de flujo y dominadores
+# ----------------------------------------------------------------------
+def build_cfg(code):
+    """
+    Divide el código en bloques básicos y devuelve solo los alcanzables
+    desde el primero, en el orden del código.
+    """
+    blocks = [Block(0)]
+    for ins in code:
+        current = blocks[-1]
+        starts_block = ins.kind == 'label' and any(x.kind != 'label' for x in current.instrs)
+        if starts_block or current.terminator() is not None:
+            current = Block(len(blocks))
+            blocks.append(current)
+        current.instrs.append(ins)
+
+    block_of_label = {ins.dest: block for block in blocks
+                      for ins in block.instrs if ins.kind == 'label'}
+    for block in blocks:
+        last = block.terminator()
+        if last is None or last.kind == 'ifnot':
+            block.fall = blocks[block.index + 1] if block.index + 1 < len(blocks) else None
+        if last is not None:
+            block.jump = block_of_label[last.dest]
+        block.succs = [succ for succ in (block.fall, block.jump) if succ is not None]
+        if len(block.succs) == 2 and block.fall is block.jump:
+            block.succs.pop()
+
+    reachable, stack = {blocks[0]}, [blocks[0]]
+    while stack:
+        for succ in stack.pop().succs:
+            if succ not in reachable:
+                reachable.add(succ)
+                stack.append(succ)
+    blocks = [block for block in blocks if block in reachable]
+    for i, block in enumerate(blocks):
+        block.index = i
+    for block in blocks:
+        for succ in block.succs:
+            succ.preds.append(block)
+    return blocks
+
+
+def reverse_postorder(blocks):
+    order, seen = [], {blocks[0]}
+    # Pila de (bloque, iterador de sucesores) para no depender de la recursión
+    stack = [(blocks[0], iter(blocks[0].succs))]
+    while stack:
+        block, succs = stack[-1]
+        for succ in succs:
+            if succ not in seen:
+                seen.add(succ)
+                stack.append((succ, iter(succ.succs)))
+                break
+        else:
+            stack.pop()
+            order.append(block)
+    order.reverse()
+    return order
+
+
+def dominators(blocks):
+    """
+    Dominador inmediato de cada bloque (el de entrada es su propio
+    dominador), con el algoritmo iterativo de Cooper, Harvey y Kennedy.
+    """
+    order = reverse_postorder(blocks)
+    position = {block: i for i, block in enumerate(order)}
+    entry = blocks[0]
+    idom = {entry: entry}
+
+    def intersect(a, b):
+        while a is not b:
+            while position[a] > position[b]:
+                a = idom[a]
+            while position[b] > position[a]:
+                b = idom[b]
+        return a
+
+    changed = True
+    while changed:
+        changed = False
+        for block in order[1:]:
+            processed = [pred for pred in block.preds if pred in idom]
+            new_idom = processed[0]
+            for pred in processed[1:]:
+                new_idom = intersect(pred, new_idom)
+            if idom.get(block) is not new_idom:
+                idom[block] = new_idom
+                changed = True
+    return idom
+
+
+def dominance_frontiers(blocks, idom):
+    frontiers = {block: set() for block in blocks}
+    for block in blocks:
+        if len(block.preds) < 2:
+            continue
+        for pred in block.preds:
+            runner = pred
+            while runner is not idom[block]:
+                frontiers[runner].add(block)
+                runner = idom[runner]
+    return frontiers
+
+
+# ----------------------------------------------------------------------
+# Construcción de SSA
+# ----------------------------------------------------------------------
+def base_name(ssa_name):
+    return ssa_name.rpartition('.')[0]
+
+
+def to_ssa(code):
+    """
+    Construye la forma SSA del código (lista de Instr). Devuelve los bloques
+    alcanzables con las instrucciones renombradas y las phi colocadas.
+    """
+    blocks = build_cfg(code)
+    idom = dominators(blocks)
+    frontiers = dominance_frontiers(blocks, idom)
+
+    # SSA semipodada: solo necesitan phi los nombres que algún bloque lee
+    # antes de definirlos (los temporales casi nunca); van en la frontera de
+    # dominancia iterada de sus definiciones
+    live_in = set()
+    def_sites = {}
+    for block in blocks:
+        defined = set()
+        for ins in block.instrs:
+            live_in.update(x for x in ins.operands() if not is_const(x) and x not in defined)
+            name = ins.defines()
+            if name is not None:
+                defined.add(name)
+                def_sites.setdefault(name, set()).add(block)
+    for var, sites in def_sites.items():
+        if var not in live_in:
+            continue
+        pending = list(sites)
+        while pending:
+            block = pending.pop()
+            for frontier in frontiers[block]:
+                if var not in frontier.phis:
+                    frontier.phis[var] = Phi(var, len(frontier.preds))
+                    if frontier not in sites:
+                        sites.add(frontier)
+                        pending.append(frontier)
+
+    children = {block: [] for block in blocks}
+    for block in blocks[1:]:
+        children[idom[block]].append(block)
+
+    counters = {}
+    stacks = {}
+
+    def current(var):
+        versions = stacks.get(var)
+        return versions[-1] if versions else f"{var}.0"
+
+    def define(var, pushed):
+        counters[var] = counters.get(var, 0) + 1
+        name = f"{var}.{counters[var]}"
+        stacks.setdefault(var, []).append(name)
+        pushed.append(var)
+        return name
+
+    def rename_use(operand):
+        return operand if is_const(operand) else current(operand)
+
+    # Recorrido del árbol de dominadores con una pila explícita: al entrar en
+    # un bloque se renombra; al salir se deshacen sus definiciones
+    work = [(blocks[0], None)]
+    while work:
+        block, pushed = work.pop()
+        if pushed is not None:
+            for var in pushed:
+                stacks[var].pop()
+            continue
+        pushed = []
+        for phi in block.phis.values():
+            phi.dest = define(phi.var, pushed)
+        for ins in block.instrs:
+            if ins.kind in ('move', 'binop', 'ifnot'):
+                ins.left = rename_use(ins.left)
+            if ins.kind == 'binop':
+                ins.right = rename_use(ins.right)
+            if ins.kind in ('move', 'binop'):
+                ins.dest = define(ins.dest, pushed)
+        for succ in block.succs:
+            j = succ.preds.index(block)
+            for phi in succ.phis.values():
+                phi.args[j] = current(phi.var)
+        work.append((block, pushed))
+        for child in reversed(children[block]):
+            work.append((child, None))
+    return blocks
+
+
+def format_ssa(blocks):
+    """
+    Texto de la forma SSA (phi incluidas), para inspeccionarla.
+    """
+    lines = []
+    for block in blocks:
+        labels = [ins for ins in block.instrs if ins.kind == 'label']
+        lines.extend(str(ins) for ins in labels)
+        lines.extend(str(phi) for phi in block.phis.values())
+        lines.extend(str(ins) for ins in block.instrs if ins.kind != 'label')
+    return lines
+
+
+# ----------------------------------------------------------------------
+# SCCP
+# ----------------------------------------------------------------------
+def _same(a, b):
+    # 1 y 1.0 son constantes distintas, igual que 0.0 y -0.0
+    if type(a) is not type(b):
+        return False
+    return a.hex() == b.hex() if type(a) is float else a == b
+
+
+def _meet(a, b):
+    if a == TOP:
+        return b
+    if b == TOP:
+        return a
+    if a == BOTTOM or b == BOTTOM or not _same(a[0], b[0]):
+        return BOTTOM
+    return a
+
+
+def _literal(text):
+    return parse_constant(text)
+
+
+def _evaluate(op, left, right):
+    try:
+        if op == '+':
+            value = left + right
+        elif op == '-':
+            value = left - right
+        elif op == '*':
+            if (isinstance(left, int) and isinstance(right, int)
+                    and left.bit_length() + right.bit_length() > MAX_CONSTANT_BITS):
+                return BOTTOM
+            value = left * right
+        else:
+            value = left / right
+    except (ArithmeticError, ValueError):
+        # Falla al ejecutarse: la instrucción debe quedarse
+        return BOTTOM
+    if isinstance(value, int) and value.bit_length() > MAX_CONSTANT_BITS:
+        return BOTTOM
+    return (value,)
+
+
+def sccp(blocks):
+    """
+    Devuelve (valores, bloques ejecutables): el valor del retículo de cada
+    versión y los bloques a los que se puede llegar.
+    """
+    values = {}
+    uses = {}
+    for block in blocks:
+        for phi in block.phis.values():
+            values[phi.dest] = TOP
+            for arg in phi.args:
+                uses.setdefault(arg, []).append((block, phi))
+        for ins in block.instrs:
+            name = ins.defines()
+            if name is not None:
+                values[name] = TOP
+            for operand in ins.operands():
+                if not is_const(operand):
+                    uses.setdefault(operand, []).append((block, ins))
+
+    def value(operand):
+        if is_const(operand):
+            return (_literal(operand),)
+        # Las versiones .0 son la entrada del programa: desconocidas
+        return values.get(operand, BOTTOM)
+
+    executable_edges = set()
+    executable = set()
+    flow_work = [(None, blocks[0])]
+    ssa_work = []
+
+    def update(name, new_value):
+        if values[name] != new_value:
+            values[name] = new_value
+            ssa_work.append(name)
+
+    def visit_phi(block, phi):
+        result = TOP
+        for pred, arg in zip(block.preds, phi.args):
+            if (pred, block) in executable_edges:
+                result = _meet(result, value(arg))
+        update(phi.dest, result)
+
+    def visit(block, ins):
+        if ins.kind == 'move':
+            update(ins.dest, value(ins.left))
+        elif ins.kind == 'binop':
+            left, right = value(ins.left), value(ins.right)
+            if left == BOTTOM or right == BOTTOM:
+                update(ins.dest, BOTTOM)
+            elif left != TOP and right != TOP:
+                update(ins.dest, _evaluate(ins.op, left[0], right[0]))
+        elif ins.kind in ('goto', 'ifnot'):
+            if ins.kind == 'goto':
+                targets = block.succs
+            else:
+                cond = value(ins.left)
+                if cond == TOP:
+                    return
+                if cond == BOTTOM:
+                    targets = block.succs
+                elif cond[0]:
+                    targets = [block.fall] if block.fall is not None else []
+                else:
+                    targets = [block.jump]
+            for succ in targets:
+                flow_work.append((block, succ))
+
+    while flow_work or ssa_work:
+        while flow_work:
+            pred, block = flow_work.pop()
+            if (pred, block) in executable_edges:
+                continue
+            executable_edges.add((pred, block))
+            for phi in block.phis.values():
+                visit_phi(block, phi)
+            if block in executable:
+                continue
+            executable.add(block)
+            for ins in block.instrs:
+                visit(block, ins)
+            if block.terminator() is None and block.fall is not None:
+                flow_work.append((block, block.fall))
+        while ssa_work:
+            for block, user in uses.get(ssa_work.pop(), ()):
+                if block not in executable:
+                    continue
+                if isinstance(user, Phi):
+                    visit_phi(block, user)
+                else:
+                    visit(block, user)
+    return values, executable
+
+
+# ----------------------------------------------------------------------
+# Vuelta a TAC
+# ----------------------------------------------------------------------
+def _constant_text(value):
+    """
+    Texto de la constante si el TAC puede escribirla (sin signo, finita), o
+    None.
+    """
+    text = str(value)
+    return text if text[0].isdigit() else None
+
+
+def from_ssa(blocks, values, executable, stats=None):
+    phi_args = {arg for block in blocks for phi in block.phis.values() for arg in phi.args}
+
+    def count(key):
+        if stats is not None:
+            stats[key] = stats.get(key, 0) + 1
+
+    def replace(operand):
+        if is_const(operand):
+            return operand
+        known = values.get(operand, BOTTOM)
+        if known not in (TOP, BOTTOM):
+            text = _constant_text(known[0])
+            if text is not None:
+                count('constantes')
+                return text
+        return base_name(operand)
+
+    code = []
+    for block in blocks:
+        if block not in executable:
+            count('bloques_muertos')
+            continue
+        for ins in block.instrs:
+            if ins.kind == 'label':
+                code.append(ins)
+                continue
+            if ins.kind == 'ifnot':
+                cond = values.get(ins.left, BOTTOM) if not is_const(ins.left) else (_literal(ins.left),)
+                if cond not in (TOP, BOTTOM):
+                    count('ramas')
+                    if not cond[0]:
+                        code.append(Instr('goto', ins.dest))
+                    continue
+                code.append(Instr('ifnot', ins.dest, replace(ins.left)))
+                continue
+            if ins.kind == 'goto':
+                code.append(ins)
+                continue
+            known = values.get(ins.dest, BOTTOM)
+            if (is_temp(base_name(ins.dest)) and ins.dest not in phi_args
+                    and known not in (TOP, BOTTOM) and _constant_text(known[0]) is not None):
+                # Todos sus usos ya leen la constante
+                count('definiciones')
+                continue
+            left = replace(ins.left)
+            if ins.kind == 'move':
+                code.append(Instr('move', base_name(ins.dest), left, type=ins.type))
+            else:
+                code.append(Instr('binop', base_name(ins.dest), left, ins.op,
+                                  replace(ins.right), ins.type))
+    return code
+
+
+def propagate_constants(ir, types=None, stats=None):
+    """
+    SSA + SCCP + vuelta a TAC. Devuelve (ir, tipos); en stats se suman las
+    phi colocadas, las constantes propagadas, las ramas plegadas y los
+    bloques eliminados.
+    """
+    code = parse_tac(ir, types)
+    if not code:
+        return format_tac(code, types is not None)
+    blocks = to_ssa(code)
+    if stats is not None:
+        stats['phi'] = stats.get('phi', 0) + sum(len(block.phis) for block in blocks)
+    values, executable = sccp(blocks)
+    code = from_ssa(blocks, values, executable, stats)
+    ir, types = format_tac(code, types is not None)
+    return optimize_jumps(ir, types, stats)
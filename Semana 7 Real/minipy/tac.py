@@ -0,0 +1,318 @@
+"""
+Código de tres direcciones en forma de arreglos de instrucciones.
+
+generate_code produce el TAC como texto ("%t1 = x + 1", "GOTO label_end_3",
+...). Aquí se convierte una sola vez a arreglos paralelos de enteros
+(código de operación y tres operandos por instrucción) que un intérprete
+recorre sin volver a analizar texto:
+
+- cada variable o temporal tiene un slot; las constantes ocupan slots a
+  continuación de los nombres, así todo operando es un índice de slot;
+- las etiquetas se resuelven a índices de instrucción y se guardan aparte
+  (tabla de etiquetas) solo para poder volver a imprimir el texto; en los
+  saltos, el operando c es la posición de la etiqueta en esa tabla.
+
+Si se conocen los tipos de las instrucciones (generate_code con
+with_types=True), specialize() reemplaza instrucciones genéricas por otras
+que aprovechan los tipos:
+
+- COPY: asignación cuyo origen está asignado con seguridad, sin comprobar
+  si la variable tiene valor;
+- IFEQ: "t = a - b" seguido de "IF NOT t GOTO L" con a y b enteros (el caso
+  habitual, porque el lenguaje no tiene comparaciones) se convierte en un
+  único salto si a == b, sin calcular la resta.
+"""
+import math
+import operator
+
+from .closures import _Unset
+
+# Códigos de operación
+MOVE, ADD, SUB, MUL, DIV, GOTO, IFNOT, COPY, IFEQ = range(9)
+
+OPCODE_NAMES = ['MOVE', 'ADD', 'SUB', 'MUL', 'DIV', 'GOTO', 'IFNOT', 'COPY', 'IFEQ']
+BINOPS = {'+': ADD, '-': SUB, '*': MUL, '/': DIV}
+BINOP_SYMBOLS = {code: op for op, code in BINOPS.items()}
+
+# Los temporales se llaman %t1, %t2, ...: ningún identificador del lenguaje
+# empieza por '%', así que no pueden chocar con las variables del usuario
+TEMP_PREFIX = '%t'
+
+
+def is_temp(name):
+    return name.startswith(TEMP_PREFIX)
+
+
+def constant_text(value):
+    """
+    Texto de una constante en el TAC. Los reales no finitos se escriben con
+    signo ('+inf', '-inf', '+nan'): 'inf' y 'nan' son identificadores válidos
+    del lenguaje y se leerían como variables.
+    """
+    if isinstance(value, float) and not math.isfinite(value):
+        return f"{value:+}"
+    return str(value)
+
+
+def parse_constant(text):
+    """
+    Valor del operando si es una constante numérica, o None si es un nombre.
+    Los nombres empiezan por letra, '_' o '%'; una constante, por dígito o
+    signo, y se lee con int() o, si no es entera, con float().
+    """
+    if not (text[0].isdigit() or text[0] in '+-'):
+        return None
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+class TacProgram:
+    def __init__(self, opcodes, a, b, c, names, constants, labels, types=None):
+        self.opcodes = opcodes      # código de operación por instrucción
+        self.a = a                  # destino (o índice de salto)
+        self.b = b                  # primer operando (o condición)
+        self.c = c                  # segundo operando (o etiqueta del salto)
+        self.names = names          # nombre por slot (0 .. len(names)-1)
+        self.constants = constants  # valor por slot (len(names) ..)
+        self.labels = labels        # etiqueta -> índice de instrucción
+        self.types = types          # tipo del valor calculado por instrucción, o None
+
+    def __len__(self):
+        return len(self.opcodes)
+
+    def to_tac(self):
+        """
+        Vuelve a imprimir el TAC en el mismo formato que generate_code.
+        IFEQ se imprime como "IF a == b GOTO L", que from_tac no lee: un
+        programa especializado solo se imprime para mostrarlo.
+        """
+        slot_text = self.names + [constant_text(value) for value in self.constants]
+        label_names = list(self.labels)
+        labels_at = {}
+        for label, index in self.labels.items():
+            labels_at.setdefault(index, []).append(label)
+        lines = []
+        for i, op in enumerate(self.opcodes):
+            for label in labels_at.get(i, ()):
+                lines.append(f"{label}:")
+            if op == MOVE or op == COPY:
+                lines.append(f"{slot_text[self.a[i]]} = {slot_text[self.b[i]]}")
+            elif op == GOTO:
+                lines.append(f"GOTO {label_names[self.c[i]]}")
+            elif op == IFNOT:
+                lines.append(f"IF NOT {slot_text[self.b[i]]} GOTO {label_names[self.c[i]]}")
+            elif op == IFEQ:
+                # c es el segundo operando: la etiqueta se busca por el destino
+                target = labels_at[self.a[i]][0]
+                lines.append(f"IF {slot_text[self.b[i]]} == {slot_text[self.c[i]]} GOTO {target}")
+            else:
+                lines.append(f"{slot_text[self.a[i]]} = {slot_text[self.b[i]]} "
+                             f"{BINOP_SYMBOLS[op]} {slot_text[self.c[i]]}")
+        for label in labels_at.get(len(self.opcodes), ()):
+            lines.append(f"{label}:")
+        return lines
+
+
+def from_tac(ir, types=None):
+    """
+    Convierte la lista de instrucciones de texto de generate_code en un
+    TacProgram. Es el único paso que analiza texto. types, si se da, es la
+    lista paralela a ir de generate_code(..., with_types=True).
+    """
+    names, name_slot = [], {}
+    constants, constant_slot = [], {}
+    parsed = []
+    labels = {}
+    instruction_types = []
+
+    def operand(text):
+        value = parse_constant(text)
+        if value is not None:
+            key = (type(value), value)
+            if key not in constant_slot:
+                constant_slot[key] = len(constants)
+                constants.append(value)
+            return ('const', constant_slot[key])
+        if text not in name_slot:
+            name_slot[text] = len(names)
+            names.append(text)
+        return ('name', name_slot[text])
+
+    for i, line in enumerate(ir):
+        if line.endswith(':'):
+            labels[line[:-1]] = len(parsed)
+            continue
+        instruction_types.append(types[i] if types else None)
+        if line.startswith('GOTO '):
+            parsed.append((GOTO, line[5:], None, None))
+        elif line.startswith('IF NOT '):
+            cond, label = line[7:].split(' GOTO ')
+            parsed.append((IFNOT, label, operand(cond), None))
+        else:
+            dest, expr = line.split(' = ')
+            parts = expr.split(' ')
+            if len(parts) == 3:
+                parsed.append((BINOPS[parts[1]], operand(dest), operand(parts[0]),
+                               operand(parts[2])))
+            else:
+                parsed.append((MOVE, operand(dest), operand(expr), None))
+
+    base = len(names)
+
+    def slot(ref):
+        if ref is None:
+            return 0
+        kind, index = ref
+        return index if kind == 'name' else base + index
+
+    label_position = {label: i for i, label in enumerate(labels)}
+    opcodes, a, b, c = [], [], [], []
+    for op, dest, left, right in parsed:
+        opcodes.append(op)
+        b.append(slot(left))
+        if op in (GOTO, IFNOT):
+            a.append(labels[dest])
+            c.append(label_position[dest])
+        else:
+            a.append(slot(dest))
+            c.append(slot(right))
+    return TacProgram(opcodes, a, b, c, names, constants, labels,
+                      instruction_types if types else None)
+
+
+def specialize(program):
+    """
+    Devuelve un TacProgram equivalente con las instrucciones COPY e IFEQ
+    allí donde los tipos lo permiten. Sin tipos, devuelve el mismo programa.
+    """
+    types = program.types
+    if types is None:
+        return program
+    opcodes, a, b, c = program.opcodes, program.a, program.b, program.c
+    label_targets = set(program.labels.values())
+    # Usos de cada slot como operando: un temporal solo se puede eliminar si
+    # su único uso es el salto que lo sigue
+    uses = {}
+    for i, op in enumerate(opcodes):
+        if op != GOTO:
+            uses[b[i]] = uses.get(b[i], 0) + 1
+        if op in (ADD, SUB, MUL, DIV):
+            uses[c[i]] = uses.get(c[i], 0) + 1
+
+    new_index = []  # índice viejo -> índice nuevo
+    out = ([], [], [], [], [])
+    i = 0
+    while i < len(opcodes):
+        new_index.append(len(out[0]))
+        op = opcodes[i]
+        if (op == SUB and types[i] == 'int' and i + 1 < len(opcodes)
+                and opcodes[i + 1] == IFNOT and b[i + 1] == a[i]
+                and uses.get(a[i]) == 1 and i + 1 not in label_targets
+                and is_temp(program.names[a[i]])):
+            # int - int, así que (b - c) == 0 equivale a b == c
+            new_index.append(len(out[0]))
+            record = (IFEQ, a[i + 1], b[i], c[i], None)
+            i += 2
+        else:
+            if op == MOVE and types[i] is not None:
+                op = COPY
+            record = (op, a[i], b[i], c[i], types[i])
+            i += 1
+        for column, value in zip(out, record):
+            column.append(value)
+    new_index.append(len(out[0]))
+
+    new_opcodes, new_a, new_b, new_c, new_types = out
+    for j, op in enumerate(new_opcodes):
+        if op in (GOTO, IFNOT, IFEQ):
+            new_a[j] = new_index[new_a[j]]
+    labels = {label: new_index[index] for label, index in program.labels.items()}
+    return TacProgram(new_opcodes, new_a, new_b, new_c, program.names,
+                      program.constants, labels, new_types)
+
+
+def run_tac(program, env=None):
+    """
+    Ejecuta un TacProgram y devuelve el entorno final de las variables del
+    usuario (los temporales %t1, %t2, ... se omiten).
+    """
+    names = program.names
+    regs = [_Unset(name) for name in names] + list(program.constants)
+    if env:
+        for i, name in enumerate(names):
+            if name in env:
+                regs[i] = env[name]
+    opcodes, a, b, c = program.opcodes, program.a, program.b, program.c
+    pc = 0
+    end = len(opcodes)
+    while pc < end:
+        op = opcodes[pc]
+        if op == ADD:
+            regs[a[pc]] = regs[b[pc]] + regs[c[pc]]
+        elif op == SUB:
+            regs[a[pc]] = regs[b[pc]] - regs[c[pc]]
+        elif op == MUL:
+            regs[a[pc]] = regs[b[pc]] * regs[c[pc]]
+        elif op == DIV:
+            regs[a[pc]] = regs[b[pc]] / regs[c[pc]]
+        elif op == COPY:
+            regs[a[pc]] = regs[b[pc]]
+        elif op == IFEQ:
+            if regs[b[pc]] == regs[c[pc]]:
+                pc = a[pc]
+                continue
+        elif op == MOVE:
+            value = regs[b[pc]]
+            if value.__class__ is _Unset:
+                value._fail()
+            regs[a[pc]] = value
+        elif op == IFNOT:
+            if not regs[b[pc]]:
+                pc = a[pc]
+                continue
+        elif op == GOTO:
+            pc = a[pc]
+            continue
+        pc += 1
+    result = dict(env) if env else {}
+    result.update((name, value) for name, value in zip(names, regs)
+                  if value.__class__ is not _Unset and not is_temp(name))
+    return result
+
+
+def count_jumps(program, env=None):
+    """
+    Ejecuta un TacProgram igual que run_tac y devuelve cuántas instrucciones
+    de salto (GOTO, IFNOT, IFEQ) se ejecutaron, se tomara el salto o no.
+    Es más lento que run_tac: solo sirve para medir.
+    """
+    names = program.names
+    regs = [_Unset(name) for name in names] + list(program.constants)
+    if env:
+        for i, name in enumerate(names):
+            if name in env:
+                regs[i] = env[name]
+    opcodes, a, b, c = program.opcodes, program.a, program.b, program.c
+    operators = {ADD: operator.add, SUB: operator.sub, MUL: operator.mul, DIV: operator.truediv}
+    jumps = 0
+    pc = 0
+    end = len(opcodes)
+    while pc < end:
+        op = opcodes[pc]
+        if op in operators:
+            regs[a[pc]] = operators[op](regs[b[pc]], regs[c[pc]])
+        elif op == MOVE or op == COPY:
+            value = regs[b[pc]]
+            if value.__class__ is _Unset:
+                value._fail()
+            regs[a[pc]] = value
+        else:
+            jumps += 1
+            if (op == GOTO or op == IFNOT and not regs[b[pc]]
+                    or op == IFEQ and regs[b[pc]] == regs[c[pc]]):
+                pc = a[pc]
+                continue
+        pc += 1
+    return jumps
@@ -0,0 +1,7 @@
+"""
+Pruebas del paquete minipy (python -m pytest desde "Semana 7 Real").
+
+Casi todas son diferenciales: el intérprete que recorre el AST es la
+referencia semántica del lenguaje, y cada motor, optimización o formato se
+compara con él sobre programas escritos a mano y generados al azar.
+"""
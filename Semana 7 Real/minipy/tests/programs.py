@@ -0,0 +1,125 @@
+"""
+Programas de prueba: ejemplos escritos a mano y un generador al azar, y
+outcome(), que resume el resultado de ejecutarlos para poder compararlo
+entre motores.
+"""
+import random
+
+import pytest
+
+# Cada ejemplo ejercita algo concreto: tipos mezclados, ramas y lazos
+# anidados, subexpresiones repetidas, condiciones constantes, errores
+EXAMPLES = [
+    "x = 1;",
+    "x = 2 + 3 * 4; y = x / 4; z = y - 0.5;",
+    "a = 1; b = 2.5; c = a + b; d = c * 2; e = d / 3;",
+    "i = 5; s = 0; while i : BEGIN s = s + i * i; i = i - 1; END",
+    "i = 0; s = 0; while 6 - i : BEGIN s = s + i * 4; i = i + 2; END",
+    "a = 3; if a - 3 : BEGIN b = 1; END else : BEGIN b = 2; END",
+    "a = 1; if 0 : BEGIN a = 2; END if 1 : BEGIN a = a + 10; END",
+    "a = 1; while 0 : BEGIN a = 2; END while (1 - 1) : BEGIN a = 3; END",
+    "x = 2; y = (x + 1) * (x + 1); x = 5; z = (x + 1) * (x + 1);",
+    "x = 2; if x : BEGIN y = x * 3; END else : BEGIN END w = x * 3;",
+    "i = 3; n = 0; while i : BEGIN j = 2; while j : BEGIN n = n + i * j; j = j - 1; END i = i - 1; END",
+    "a = 7; b = a * 1 + 0; c = 0 + a * 2; d = 1 * a - 0;",
+    "a = 0.0; if a : BEGIN b = 1; END else : BEGIN b = 2.5; END",
+    "a = 1; b = a / 0;",
+    "a = 1; b = c + a;",
+    "x = 1; if x : BEGIN y = 2; END z = y + 1;",
+    "x = 0; if x : BEGIN y = 2; END z = y + 1;",
+    "x = 12345678901234567890 * 98765432109876543210;",
+    "x = 1.5; i = 4; while i : BEGIN x = x * x; i = i - 1; END",
+    "a = 2; b = 3; c = (a * b) + (a * b) - (a * b) / (a * b);",
+]
+
+NAMES = ['a', 'b', 'c', 'x', 'y']
+
+
+def random_program(seed, statements=8):
+    """
+    Programa distinto para cada semilla, con asignaciones, if/else y while
+    anidados. Termina siempre: cada while avanza un contador (i1, i2) que su
+    cuerpo no modifica. A veces divide por cero, usa una variable sin
+    asignar ('z', o 'y' si el programa no la asigna al principio) o repite
+    una subexpresión ya escrita.
+    """
+    rng = random.Random(seed)
+    written = []
+    undefined = rng.random() < 0.1
+
+    def leaf():
+        r = rng.random()
+        if undefined and r < 0.03:
+            return 'z'
+        if r < 0.55:
+            return rng.choice(NAMES + ['i1', 'i2'])
+        if r < 0.85:
+            return str(rng.randint(0, 9))
+        return f"{rng.randint(0, 9)}.5"
+
+    def expr(depth):
+        if written and rng.random() < 0.1:
+            return rng.choice(written)
+        if depth == 0 or rng.random() < 0.3:
+            return leaf()
+        op = rng.choice('++--***/')
+        if op == '*' and rng.random() < 0.5:
+            # Multiplicaciones por constante, candidatas a reducción de fuerza
+            text = f"({expr(depth - 1)} * {rng.choice(['1', '2', '3', 'i1'])})"
+        elif op == '/' and rng.random() < 0.8:
+            text = f"({expr(depth - 1)} / {rng.choice(['2', '4.5', 'c', 'b'])})"
+        else:
+            text = f"({expr(depth - 1)} {op} {expr(depth - 1)})"
+        written.append(text)
+        return text
+
+    def block(depth, count):
+        out = []
+        for _ in range(count):
+            r = rng.random()
+            if depth > 0 and r < 0.05:
+                cond = rng.choice(['0', '1', '(2 - 2)', '0.0', '2.5'])
+                out.append(f"if {cond} : BEGIN {block(depth - 1, 2)} END "
+                           f"else : BEGIN {block(depth - 1, 1)} END")
+            elif depth > 0 and r < 0.2:
+                out.append(f"if {expr(2)} : BEGIN {block(depth - 1, 3)} END "
+                           f"else : BEGIN {block(depth - 1, 2)} END")
+            elif depth > 0 and r < 0.35:
+                counter = f"i{depth}"
+                step = rng.choice(['1', '2', '3'])
+                out.append(f"{counter} = 0; while 6 - {counter} : BEGIN {block(depth - 1, 3)} "
+                           f"{counter} = {counter} + {step}; END")
+            elif depth > 0 and r < 0.4:
+                out.append(f"while 0 : BEGIN {block(depth - 1, 1)} END")
+            else:
+                out.append(f"{rng.choice(NAMES)} = {expr(3)};")
+        return ' '.join(out)
+
+    start = rng.choice(["a = 1; b = 2.5; c = 3;", "a = 1; b = 2; c = 3;", "a = 1.5; b = 2; c = 3;"])
+    start += " x = 0.5; i1 = 1; i2 = 2;"
+    if rng.random() < 0.7:
+        # Sin esta asignación, y puede quedar asignada solo en algunas ramas
+        start += " y = 4;"
+    return f"{start} {block(2, statements)}"
+
+
+def cases(random_count=150):
+    """
+    Los ejemplos y random_count programas al azar como parámetros de pytest,
+    con nombres cortos ('ejemplo3', 'azar17').
+    """
+    return ([pytest.param(source, id=f"ejemplo{i}") for i, source in enumerate(EXAMPLES)]
+            + [pytest.param(random_program(seed), id=f"azar{seed}") for seed in range(random_count)])
+
+
+def outcome(run, *args):
+    """
+    Resultado de run(*args) comparable entre motores: las variables finales
+    con el repr de su valor (así 1 y 1.0 son distintos y nan es igual a nan)
+    o el tipo de la excepción del programa.
+    """
+    try:
+        env = run(*args)
+    except (NameError, ZeroDivisionError, OverflowError) as error:
+        return type(error)
+    return {name: repr(value) for name, value in env.items()}
@@ -0,0 +1,64 @@
+"""
+Codificación binaria del AST (ast_binary.py): loads(dumps(ast)) reproduce
+el árbol nodo a nodo, sin depender del límite de recursión.
+"""
+import pytest
+
+from minipy.ast_binary import ASTFormatError, dumps, loads
+from minipy.compiler import compile_code
+from minipy.interpreter import interpret
+from minipy.nodes import ASTNode
+from minipy.tests.programs import cases, outcome
+
+
+def flatten(ast_nodes):
+    """
+    Los nodos en preorden como (nodetype, tipo y valor, hijos, línea,
+    columna), sin recursión. El tipo del valor cuenta: 1 y 1.0 son distintos.
+    """
+    rows, stack = [], list(reversed(ast_nodes))
+    while stack:
+        node = stack.pop()
+        rows.append((node.nodetype, type(node.value), node.value, len(node.children),
+                     node.line, node.column))
+        stack.extend(reversed(node.children))
+    return rows
+
+
+@pytest.mark.parametrize('source', cases())
+@pytest.mark.parametrize('hash_cons', [False, True])
+def test_round_trip(source, hash_cons):
+    ast_nodes = compile_code(source, hash_cons=hash_cons)[1]
+    loaded = loads(dumps(ast_nodes))
+    assert flatten(loaded) == flatten(ast_nodes)
+    assert outcome(interpret, loaded) == outcome(interpret, ast_nodes)
+
+
+def test_values_keep_their_type():
+    values = [None, True, 1, 1.0, 'x', 2 ** 63, -2 ** 63 - 1, 10 ** 40, -2 ** 63, float('inf')]
+    ast_nodes = [ASTNode('num', value, line=i + 1, column=1) for i, value in enumerate(values)]
+    assert flatten(loads(dumps(ast_nodes))) == flatten(ast_nodes)
+
+
+def test_deep_tree():
+    # 1 + (1 + (1 + ...)): mucho más profundo que el límite de recursión
+    node = ASTNode('num', 1)
+    for _ in range(100000):
+        node = ASTNode('binop', '+', [ASTNode('num', 1), node])
+    ast_nodes = [ASTNode('assign', 'x', [node], 1, 1)]
+    assert flatten(loads(dumps(ast_nodes))) == flatten(ast_nodes)
+
+
+def test_empty_program():
+    assert loads(dumps([])) == []
+
+
+def test_rejects_corrupt_data():
+    data = dumps(compile_code("x = 1; if x : BEGIN y = x + 2.5; END")[1])
+    with pytest.raises(ASTFormatError):
+        loads(b'XXXX' + data[4:])
+    with pytest.raises(ASTFormatError):
+        loads(data[:4] + bytes([99]) + data[5:])
+    for end in range(len(data)):
+        with pytest.raises(ASTFormatError):
+            loads(data[:end])
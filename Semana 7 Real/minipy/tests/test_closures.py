@@ -0,0 +1,27 @@
+"""
+El motor de clausuras da el mismo resultado que el intérprete del AST.
+"""
+import pytest
+
+from minipy.closures import compile_closures, run_closures
+from minipy.compiler import compile_code
+from minipy.interpreter import interpret
+from minipy.tests.programs import cases, outcome
+
+
+@pytest.mark.parametrize('source', cases())
+@pytest.mark.parametrize('hash_cons', [False, True])
+def test_matches_interpreter(source, hash_cons):
+    ast_nodes = compile_code(source, hash_cons=hash_cons)[1]
+    assert outcome(run_closures, ast_nodes) == outcome(interpret, ast_nodes)
+
+
+def test_initial_environment():
+    ast_nodes = compile_code("y = z * 2; w = q + 1;")[1]
+    env = {'z': 4, 'q': 0.5, 'sin_usar': 7}
+    assert run_closures(ast_nodes, env) == interpret(ast_nodes, env)
+
+
+def test_compiled_program_runs_again():
+    program = compile_closures(compile_code("i = 3; s = 0; while i : BEGIN s = s + i; i = i - 1; END")[1])
+    assert program.run() == program.run() == {'i': 0, 's': 6}
@@ -0,0 +1,45 @@
+"""
+hash_cons=True: las subexpresiones idénticas comparten nodo y el código
+intermedio calcula cada valor compartido una sola vez mientras siga siendo
+válido, sin cambiar el resultado del programa.
+"""
+import pytest
+
+from minipy.compiler import compile_code
+from minipy.interpreter import interpret
+from minipy.tac import from_tac, run_tac
+from minipy.tests.programs import cases, outcome
+
+
+@pytest.mark.parametrize('source', cases())
+def test_matches_interpreter(source):
+    ast_nodes = compile_code(source)[1]
+    expected = outcome(interpret, ast_nodes)
+    for optimize in (False, True):
+        _, shared_nodes, _, ir = compile_code(source, hash_cons=True, optimize=optimize)
+        assert outcome(interpret, shared_nodes) == expected
+        assert outcome(run_tac, from_tac(ir)) == expected
+
+
+@pytest.mark.parametrize('source', cases())
+def test_never_emits_more_code(source):
+    assert len(compile_code(source, hash_cons=True)[3]) <= len(compile_code(source)[3])
+
+
+def test_shared_nodes():
+    ast_nodes = compile_code("y = (x + 1) * (x + 1);", hash_cons=True)[1]
+    product = ast_nodes[0].children[0]
+    assert product.children[0] is product.children[1]
+
+
+def test_each_shared_value_computed_once_while_valid():
+    ir = compile_code("x = 2; y = (x + 1) * (x + 1); w = x + 1; x = 5; z = (x + 1) * (x + 1);",
+                      hash_cons=True)[3]
+    # Una vez antes de reasignar x y otra después
+    assert [line for line in ir if line.endswith('= x + 1')] == ['%t1 = x + 1', '%t3 = x + 1']
+
+
+def test_value_from_a_branch_is_not_reused_after_it():
+    ir = compile_code("a = 2; if a : BEGIN b = a * 3; END c = a * 3 + a * 3;", hash_cons=True)[3]
+    assert sum(line.endswith('= a * 3') for line in ir) == 2
+    assert run_tac(from_tac(ir)) == {'a': 2, 'b': 6, 'c': 12}
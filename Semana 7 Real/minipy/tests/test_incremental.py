@@ -0,0 +1,191 @@
+"""
+Análisis incremental (incremental.py): tras cualquier serie de ediciones,
+parse() da los mismos tokens y el mismo AST (con líneas y columnas) que
+analizar el texto completo, y los errores son los mismos.
+"""
+import random
+
+import pytest
+
+from minipy.compiler import compile_code
+from minipy.incremental import IncrementalFrontEnd, walk
+from minipy.lexer import lexer
+from minipy.parser import Parser
+from minipy.tests.test_ast_binary import flatten
+
+SNIPPETS = ['a', '1', ';', ' ', '\n', 'END', 'BEGIN', 'x = 2;', '\n\n', 'if a : BEGIN ',
+            'while 0 : BEGIN y = 1; END', '+ 2', '(', ')', 'END\n', '#', 'b = a;\n']
+
+
+def random_source(rng, depth, count, indent=''):
+    """
+    Programa con sentencias en líneas separadas y bloques de varias líneas.
+    """
+    def expr(d):
+        if d == 0 or rng.random() < 0.4:
+            return rng.choice(['a', 'b', 'x', '1', '2', '3.5'])
+        return f"({expr(d - 1)} {rng.choice('+-*/')} {expr(d - 1)})"
+
+    out = []
+    for _ in range(count):
+        r = rng.random()
+        if depth and r < 0.2:
+            body = random_source(rng, depth - 1, rng.randint(0, 4), indent + '  ')
+            out.append(f"{indent}while {expr(1)} : BEGIN\n{body}\n{indent}END")
+        elif depth and r < 0.35:
+            body = random_source(rng, depth - 1, rng.randint(0, 3), indent + '  ')
+            other = f" else : BEGIN {random_source(rng, depth - 1, 2)} END" if rng.random() < 0.5 else ''
+            out.append(f"{indent}if {expr(1)} : BEGIN\n{body}\n{indent}END{other}")
+        else:
+            out.append(f"{indent}{rng.choice('abxy')} = {expr(2)};" + rng.choice(['', ' ', ' c = 1;']))
+    return '\n'.join(out)
+
+
+def full_parse(source):
+    """
+    Resultado de analizar el texto completo: (tokens, filas del AST) o el
+    tipo de error.
+    """
+    try:
+        tokens = lexer(source)
+        return list(tokens), flatten(Parser(tokens).parse())
+    except (ValueError, SyntaxError) as error:
+        return type(error)
+
+
+def incremental_parse(front_end):
+    try:
+        tokens, ast_nodes = front_end.parse()
+        return list(tokens), flatten(ast_nodes)
+    except (ValueError, SyntaxError) as error:
+        return type(error)
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_edits_match_full_parse(seed):
+    rng = random.Random(seed)
+    source = random_source(rng, 3, rng.randint(1, 12)) + '\n'
+    front_end = IncrementalFrontEnd(source)
+    for _ in range(30):
+        if rng.random() < 0.5:
+            # Edición por posiciones, como las del widget de texto
+            lines = source.split('\n')
+            first = rng.randint(1, len(lines))
+            start = rng.randint(0, len(lines[first - 1]))
+            last = rng.randint(first, min(len(lines), first + rng.choice([0, 0, 1, 3])))
+            end = rng.randint(start if last == first else 0, len(lines[last - 1]))
+            text = ''.join(rng.choice(SNIPPETS) for _ in range(rng.randint(0, 2)))
+            begin = sum(len(line) + 1 for line in lines[:first - 1]) + start
+            stop = sum(len(line) + 1 for line in lines[:last - 1]) + end
+            source = source[:begin] + text + source[stop:]
+            front_end.edit((first, start), (last, end), text)
+        else:
+            # Texto completo nuevo
+            i = rng.randint(0, len(source))
+            j = min(len(source), i + rng.randint(0, 30))
+            text = rng.choice(['', random_source(rng, 1, 1) + '\n', 'z = 3;', '\n'])
+            source = source[:i] + text + source[j:]
+            front_end.update(source)
+        assert '\n'.join(front_end.lines) == source
+        if rng.random() < 0.4:
+            assert incremental_parse(front_end) == full_parse(source)
+        if rng.random() < 0.1:
+            source = random_source(rng, 3, rng.randint(1, 10)) + '\n'
+            front_end.update(source)
+    assert incremental_parse(front_end) == full_parse(source)
+
+
+def test_block_ends():
+    front_end = IncrementalFrontEnd("a = 1;\nwhile a : BEGIN\n  a = a - 1;\nEND\n")
+    front_end.edit((3, 2), (3, 2), "b = 2;\n  ")
+    _, ast_nodes = front_end.parse()
+    blocks = [node for node in walk(ast_nodes) if node.nodetype == 'block']
+    assert blocks and all(block in front_end.block_ends for block in blocks)
+
+
+def test_untouched_statements_are_reused():
+    source = "a = 1;\nb = 2;\nwhile a : BEGIN\n  a = a - 1;\nEND\nc = 3;"
+    front_end = IncrementalFrontEnd(source)
+    before = list(front_end.parse()[1])
+    front_end.edit((6, 4), (6, 5), "4")
+    after = front_end.parse()[1]
+    assert after[0] is before[0] and after[1] is before[1]
+    assert after[3] is not before[3] and after[3].children[0].value == 4
+
+
+def test_syntax_error_then_fix():
+    front_end = IncrementalFrontEnd("a = 1;\nb = 2;")
+    front_end.edit((2, 5), (2, 6), "")
+    with pytest.raises(SyntaxError):
+        front_end.parse()
+    front_end.edit((2, 5), (2, 5), ";")
+    assert incremental_parse(front_end) == full_parse("a = 1;\nb = 2;")
+
+
+def typed(ast_nodes):
+    """
+    Tipo anotado de cada nodo, en preorden.
+    """
+    rows, stack = [], list(reversed(ast_nodes))
+    while stack:
+        node = stack.pop()
+        rows.append((node.nodetype, node.value, getattr(node, 'type', None)))
+        stack.extend(reversed(node.children))
+    return rows
+
+
+def full_compile(source):
+    try:
+        _, ast_nodes, symbol_table, ir = compile_code(source)
+        return typed(ast_nodes), symbol_table, ir
+    except (ValueError, SyntaxError) as error:
+        return type(error)
+
+
+def incremental_compile(front_end):
+    try:
+        _, ast_nodes, symbol_table, ir = front_end.compile()
+        return typed(ast_nodes), symbol_table, ir
+    except (ValueError, SyntaxError) as error:
+        return type(error)
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_compile_after_edits_matches_compile_code(seed):
+    # Tipos, tabla de símbolos y TAC iguales a los de compilar todo, aunque
+    # compile() reutilice lo de las sentencias que no cambiaron
+    rng = random.Random(seed)
+    source = random_source(rng, 3, rng.randint(1, 12)) + '\n'
+    front_end = IncrementalFrontEnd(source)
+    for _ in range(20):
+        i = rng.randint(0, len(source))
+        j = min(len(source), i + rng.randint(0, 10))
+        text = rng.choice(SNIPPETS + ['1.5', random_source(rng, 1, 1) + '\n'])
+        source = source[:i] + text + source[j:]
+        front_end.update(source)
+        assert incremental_compile(front_end) == full_compile(source)
+
+
+def test_compile_reanalyzes_statements_after_a_type_change():
+    # Cambiar el tipo de a dentro del while cambia los tipos de las
+    # sentencias siguientes, que no se volvieron a analizar sintácticamente
+    source = "a = 1;\nwhile a : BEGIN\n  a = 2;\nEND\nb = a + 1;\nc = b;"
+    front_end = IncrementalFrontEnd(source)
+    front_end.compile()
+    before = list(front_end.ast)
+    source = source.replace("a = 2;", "a = 2.5;")
+    front_end.update(source)
+    assert incremental_compile(front_end) == full_compile(source)
+    assert front_end.ast[2] is before[2] and front_end.ast[2].children[0].type == 'num'
+    assert front_end.compile()[2]['b']['type'] == 'num'
+
+
+def test_compile_matches_compile_code():
+    source = "a = 1;\nb = a * 2.5;\nif a : BEGIN\n  c = b;\nEND"
+    front_end = IncrementalFrontEnd("a = 1;")
+    front_end.update(source)
+    _, ast_nodes, symbol_table, ir = front_end.compile()
+    _, expected_ast, expected_table, expected_ir = compile_code(source)
+    assert flatten(ast_nodes) == flatten(expected_ast)
+    assert ir == expected_ir
+    assert symbol_table == expected_table
@@ -0,0 +1,52 @@
+"""
+Compilación desde archivo con mmap (mmap_lexer.py): los SliceToken valen
+lo mismo que los tokens de lexer y compile_file da lo mismo que
+compile_code.
+"""
+import pytest
+
+from minipy.compiler import compile_code
+from minipy.lexer import lexer
+from minipy.mmap_lexer import MappedSource, compile_file, lexer_mapped
+from minipy.tests.programs import cases
+from minipy.tests.test_ast_binary import flatten
+
+
+def lex(function, data):
+    try:
+        return [tuple(token) for token in function(data)]
+    except ValueError as error:
+        return str(error)
+
+
+@pytest.mark.parametrize('source', cases(random_count=100) + ['', '\n\n', 'a = 1;\n  b = $;',
+                                                               'x = 2;\ny = ñ + 1;'])
+def test_tokens_match_lexer(source):
+    assert lex(lexer_mapped, source.encode('utf-8')) == lex(lexer, source)
+
+
+@pytest.mark.parametrize('source', cases(random_count=100))
+def test_compile_file_matches_compile_code(source, tmp_path):
+    path = tmp_path / 'programa.txt'
+    path.write_text(source, encoding='utf-8')
+    ast_nodes, symbol_table, ir = compile_file(str(path))
+    _, expected_ast, expected_table, expected_ir = compile_code(source)
+    assert ir == expected_ir
+    assert flatten(ast_nodes) == flatten(expected_ast)
+    assert symbol_table == expected_table
+
+
+def test_values_are_read_lazily(tmp_path):
+    path = tmp_path / 'programa.txt'
+    path.write_bytes(b'total = 12 + 3.5;')
+    with MappedSource(str(path)) as source:
+        tokens = source.tokens()
+        assert [token.value for token in tokens] == ['total', '=', 12, '+', 3.5, ';']
+    # Los valores ya pedidos siguen disponibles al cerrar el mapeo
+    assert tokens[4][1] == 3.5 and tokens[0][:] == ('ID', 'total', 1, 1)
+
+
+def test_empty_file(tmp_path):
+    path = tmp_path / 'vacio.txt'
+    path.write_bytes(b'')
+    assert compile_file(str(path)) == ([], {}, [])
@@ -0,0 +1,93 @@
+"""
+Optimizador del TAC (optimizer.py): cada pasada y optimize() completo dan
+la misma ejecución que el intérprete, con y sin tipos, y optimize_jumps
+nunca ejecuta más saltos que el código sin optimizar.
+"""
+import pytest
+
+from minipy.codegen import generate_code
+from minipy.compiler import compile_code
+from minipy.interpreter import interpret
+from minipy.optimizer import optimize, optimize_jumps, optimize_loops, simplify_algebra
+from minipy.tac import count_jumps, from_tac, run_tac, specialize
+from minipy.tests.programs import cases, outcome
+
+PASSES = [simplify_algebra, optimize_loops, optimize_jumps, optimize]
+
+
+def run_optimized(ast_nodes, optimization, with_types, stats=None):
+    if with_types:
+        ir, types = generate_code(ast_nodes, with_types=True)
+    else:
+        ir, types = generate_code(ast_nodes), None
+    ir, types = optimization(ir, types, stats)
+    program = from_tac(ir, types)
+    return run_tac(specialize(program) if with_types else program)
+
+
+@pytest.mark.parametrize('source', cases())
+@pytest.mark.parametrize('optimization', PASSES, ids=lambda f: f.__name__)
+@pytest.mark.parametrize('with_types', [False, True])
+def test_matches_interpreter(source, optimization, with_types):
+    ast_nodes = compile_code(source)[1]
+    assert outcome(run_optimized, ast_nodes, optimization, with_types) == outcome(interpret, ast_nodes)
+
+
+@pytest.mark.parametrize('source', cases(random_count=30))
+def test_optimizing_twice(source):
+    ast_nodes = compile_code(source)[1]
+    ir, types = optimize(*generate_code(ast_nodes, with_types=True))
+    again, again_types = optimize(ir, types)
+    assert outcome(run_tac, from_tac(again, again_types)) == outcome(interpret, ast_nodes)
+
+
+def test_identities():
+    stats = {}
+    ast_nodes = compile_code("a = 7; b = a * 1 + 0; c = 0 + a * 2; d = 1 * a - 0;")[1]
+    assert run_optimized(ast_nodes, simplify_algebra, True, stats) == {'a': 7, 'b': 7, 'c': 14, 'd': 7}
+    assert stats['identidades'] >= 4
+
+
+def test_float_plus_zero_is_kept():
+    # -0.0 + 0 es 0.0: x + 0 solo se simplifica con x entero
+    ast_nodes = compile_code("m = 0 - 1; a = 0.0 * m; b = a + 0;")[1]
+    assert repr(run_optimized(ast_nodes, simplify_algebra, True)['b']) == '0.0'
+
+
+def test_loop_invariants_and_strength_reduction():
+    stats = {}
+    source = "k = 3; i = 0; s = 0; while 6 - i : BEGIN s = s + i * 4 + k * k; i = i + 2; END"
+    ast_nodes = compile_code(source)[1]
+    assert run_optimized(ast_nodes, optimize_loops, True, stats) == interpret(ast_nodes)
+    assert stats['invariantes'] >= 1
+    assert stats['reducciones'] >= 1
+
+
+@pytest.mark.parametrize('source', cases())
+def test_fewer_jumps(source):
+    ir, types = generate_code(compile_code(source)[1], with_types=True)
+    jumped, jumped_types = optimize_jumps(ir, types)
+    assert len(jumped) <= len(ir)
+    try:
+        before = count_jumps(from_tac(ir, types))
+    except (NameError, ZeroDivisionError, OverflowError):
+        return
+    assert count_jumps(from_tac(jumped, jumped_types)) <= before
+
+
+def test_constant_branches_disappear():
+    stats = {}
+    source = "a = 1; if 0 : BEGIN a = 2; END if 1 : BEGIN a = a + 10; END while 0 : BEGIN a = 3; END"
+    ir, types = optimize_jumps(*generate_code(compile_code(source)[1], with_types=True), stats)
+    program = from_tac(ir, types)
+    assert run_tac(program) == {'a': 11}
+    assert count_jumps(program) == 0
+    assert stats['ramas'] >= 3
+
+
+def test_empty_else_is_removed():
+    source = "x = 2; if x : BEGIN y = x * 3; END else : BEGIN END"
+    ir, types = generate_code(compile_code(source)[1], with_types=True)
+    jumped, jumped_types = optimize_jumps(ir, types)
+    assert len(jumped) < len(ir)
+    assert count_jumps(from_tac(jumped, jumped_types)) < count_jumps(from_tac(ir, types))
@@ -0,0 +1,53 @@
+"""
+Lexer en paralelo (parallel_lexer.py): con trozos pequeños y cualquier
+número de procesos da los mismos tokens que lexer(), o el mismo error.
+"""
+import random
+
+import pytest
+
+from minipy.lexer import Token, lexer
+from minipy.parallel_lexer import parallel_lexer, split_chunks
+
+PIECES = ['x', 'if', 'else', 'while', 'BEGIN', 'END', '12', '3.5', '=', '+', '-', '(', ')', ':', ';',
+          ' ', '\t', '\n', '\n\n', 'abc1', 'iff', '7']
+
+
+def random_code(seed):
+    rng = random.Random(seed)
+    code = ''.join(rng.choice(PIECES) for _ in range(rng.randint(0, 400)))
+    if rng.random() < 0.15:
+        # Un carácter inesperado, con más código después
+        code += rng.choice('$!') + ''.join(rng.choice(PIECES) for _ in range(50))
+    return code, rng.randint(1, 60)
+
+
+def lex(function, *args):
+    try:
+        return function(*args)
+    except ValueError as error:
+        return str(error)
+
+
+@pytest.mark.parametrize('seed', range(30))
+def test_matches_lexer(seed):
+    code, chunk_size = random_code(seed)
+    chunks = split_chunks(code, chunk_size)
+    assert ''.join(code[start:end] for start, end, _ in chunks) == code
+    expected = lex(lexer, code)
+    for workers in (1, 3):
+        tokens = lex(parallel_lexer, code, workers, chunk_size)
+        assert tokens == expected
+        assert all(type(token) is Token for token in tokens if not isinstance(tokens, str))
+
+
+def test_chunks_end_at_line_breaks():
+    code = 'a = 1;\nb = 2;\n\nc = a + b;'
+    chunks = split_chunks(code, 3)
+    assert [code[start:end] for start, end, _ in chunks] == ['a = 1;\n', 'b = 2;\n', '\nc = a + b;']
+    assert [line for _, _, line in chunks] == [1, 2, 3]
+
+
+def test_first_error_is_reported():
+    code = 'a = 1;\n' * 20 + 'b = $;\n' + 'c = !;\n' * 20
+    assert lex(parallel_lexer, code, 3, 8) == lex(lexer, code)
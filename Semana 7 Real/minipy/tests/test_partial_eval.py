@@ -0,0 +1,48 @@
+"""
+Evaluación parcial (partial_eval.py): con cualquier combustible, el código
+de compile_code(fuel=N) da la misma ejecución que el intérprete; si el
+programa termina y sus valores se pueden escribir, el código es una tabla
+sin saltos.
+"""
+import pytest
+
+from minipy.compiler import compile_code
+from minipy.interpreter import interpret
+from minipy.partial_eval import DEFAULT_FUEL, constant_text
+from minipy.tac import from_tac, run_tac
+from minipy.tests.programs import cases, outcome
+
+
+@pytest.mark.parametrize('source', cases())
+@pytest.mark.parametrize('fuel', [0, 20, DEFAULT_FUEL])
+def test_matches_interpreter(source, fuel):
+    _, ast_nodes, _, ir = compile_code(source, fuel=fuel)
+    assert outcome(run_tac, from_tac(ir)) == outcome(interpret, ast_nodes)
+
+
+def test_loop_becomes_table():
+    source = "i = 5; s = 0; while i : BEGIN s = s + i * i; i = i - 1; END"
+    ir = compile_code(source, fuel=DEFAULT_FUEL)[3]
+    assert ir == ['i = 0', 's = 55']
+
+
+def test_out_of_fuel_keeps_code():
+    source = "i = 5; s = 0; while i : BEGIN s = s + i * i; i = i - 1; END"
+    assert compile_code(source, fuel=10)[3] == compile_code(source)[3]
+
+
+@pytest.mark.parametrize('source', [
+    "a = 1; b = a / 0;",
+    "x = 0; if x : BEGIN y = 2; END z = y + 1;",
+    "m = 0 - 1; a = 0.0 * m;",
+    "x = 1.5; i = 12; while i : BEGIN x = x * x; i = i - 1; END",
+])
+def test_failures_and_unwritable_values_keep_code(source):
+    # Errores, -0.0 e inf se siguen calculando en cada ejecución
+    assert compile_code(source, fuel=DEFAULT_FUEL)[3] == compile_code(source)[3]
+
+
+@pytest.mark.parametrize('value', [0, 7, -3, 2 ** 70, -(2 ** 70), 2.5, -2.5, 1e300, -1e-300, 0.1])
+def test_constant_text(value):
+    result = run_tac(from_tac([f"x = {constant_text(value)}"]))['x']
+    assert type(result) is type(value) and result == value
@@ -0,0 +1,64 @@
+"""
+Perfilador (profiler.py): con los dos motores el programa da el mismo
+resultado que el intérprete y cada sentencia se cuenta las mismas veces.
+"""
+import pytest
+
+from minipy.compiler import compile_code
+from minipy.interpreter import interpret
+from minipy.profiler import profile_program
+from minipy.tests.programs import cases, outcome
+
+
+def counts(profiler):
+    """
+    Ejecuciones de cada sentencia que se ejecutó (el motor de clausuras
+    registra también las que nunca se ejecutan, con 0).
+    """
+    return {key: count for key, (count, _) in profiler.stats.items() if count}
+
+
+def profiled(ast_nodes, engine):
+    env, profiler = profile_program(ast_nodes, engine=engine)
+    return env, counts(profiler)
+
+
+@pytest.mark.parametrize('source', cases())
+def test_engines_agree(source):
+    ast_nodes = compile_code(source)[1]
+    expected = outcome(interpret, ast_nodes)
+    results = []
+    for engine in ('tree', 'closures'):
+        try:
+            env, stats = profiled(ast_nodes, engine)
+        except (NameError, ZeroDivisionError, OverflowError) as error:
+            results.append(type(error))
+            continue
+        assert {name: repr(value) for name, value in env.items()} == expected
+        results.append(stats)
+    assert results[0] == results[1]
+
+
+def test_counts_per_statement():
+    source = "i = 5;\ns = 0;\nwhile i : BEGIN\n  s = s + i;\n  i = i - 1;\nEND\nif s : BEGIN\n  t = 1;\nEND"
+    for engine in ('tree', 'closures'):
+        env, stats = profiled(compile_code(source)[1], engine)
+        assert env == {'i': 0, 's': 15, 't': 1}
+        assert stats == {(1, 1, 'i = ...'): 1, (2, 1, 's = ...'): 1, (3, 1, 'while'): 1,
+                         (4, 3, 's = ...'): 5, (5, 3, 'i = ...'): 5, (7, 1, 'if'): 1,
+                         (8, 3, 't = ...'): 1}
+
+
+def test_report_sorted_by_time():
+    _, profiler = profile_program(compile_code("i = 50; while i : BEGIN i = i - 1; END")[1])
+    times = [row[4] for row in profiler.hot_spots()]
+    assert times == sorted(times, reverse=True)
+    assert len(profiler.report()) == len(times) + 1
+    assert len(profiler.report(limit=1)) == 2
+
+
+def test_fuel_stops_infinite_loops():
+    ast_nodes = compile_code("i = 1; while i : BEGIN i = i + 1; END")[1]
+    assert profile_program(ast_nodes, fuel=1000) is None
+    ast_nodes = compile_code("i = 3; while i : BEGIN i = i - 1; END")[1]
+    assert profile_program(ast_nodes, fuel=1000)[0] == {'i': 0}
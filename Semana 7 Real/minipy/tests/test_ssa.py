@@ -0,0 +1,59 @@
+"""
+Forma SSA y SCCP (ssa.py): propagate_constants da la misma ejecución que el
+intérprete, to_ssa asigna cada versión una sola vez y las ramas con
+condición constante desaparecen.
+"""
+import pytest
+
+from minipy.codegen import generate_code
+from minipy.compiler import compile_code
+from minipy.interpreter import interpret
+from minipy.optimizer import parse_tac
+from minipy.ssa import propagate_constants, to_ssa
+from minipy.tac import from_tac, run_tac, specialize
+from minipy.tests.programs import cases, outcome
+
+
+def propagated(source, stats=None):
+    ir, types = generate_code(compile_code(source)[1], with_types=True)
+    return propagate_constants(ir, types, stats)
+
+
+@pytest.mark.parametrize('source', cases())
+def test_matches_interpreter(source):
+    ast_nodes = compile_code(source)[1]
+    expected = outcome(interpret, ast_nodes)
+    ir, types = propagate_constants(*generate_code(ast_nodes, with_types=True))
+    assert outcome(run_tac, from_tac(ir)) == expected
+    assert outcome(run_tac, specialize(from_tac(ir, types))) == expected
+    untyped, _ = propagate_constants(generate_code(ast_nodes))
+    assert outcome(run_tac, from_tac(untyped)) == expected
+
+
+@pytest.mark.parametrize('source', cases(random_count=50))
+def test_single_assignment(source):
+    blocks = to_ssa(parse_tac(generate_code(compile_code(source)[1])))
+    dests = [phi.dest for block in blocks for phi in block.phis.values()]
+    dests += [ins.dest for block in blocks for ins in block.instrs if ins.kind in ('move', 'binop')]
+    assert len(dests) == len(set(dests))
+
+
+def test_constant_branch_is_folded():
+    stats = {}
+    ir, types = propagated("a = 3; if a - 3 : BEGIN b = 1; END else : BEGIN b = 2; END c = b * a;", stats)
+    assert not any(line.startswith(('IF', 'GOTO')) for line in ir)
+    assert run_tac(from_tac(ir, types)) == {'a': 3, 'b': 2, 'c': 6}
+    assert stats['ramas'] >= 1
+    assert stats['bloques_muertos'] >= 1
+
+
+def test_loop_variables_are_not_constant():
+    source = "i = 5; s = 0; while i : BEGIN s = s + i * i; i = i - 1; END"
+    ir, types = propagated(source)
+    assert run_tac(from_tac(ir, types)) == interpret(compile_code(source)[1])
+
+
+def test_unassigned_read_still_fails():
+    ir, types = propagated("x = 0; if x : BEGIN y = 2; END z = y + 1;")
+    with pytest.raises(NameError):
+        run_tac(from_tac(ir, types))
@@ -0,0 +1,67 @@
+"""
+TAC en arreglos (tac.py) y su formato binario (binary_ir.py): ejecutar el
+programa da lo mismo que el intérprete del AST, y pasar por texto o por
+bytes no cambia el programa.
+"""
+import math
+
+import pytest
+
+from minipy.binary_ir import BinaryFormatError, dumps, load, loads, save
+from minipy.compiler import compile_code
+from minipy.interpreter import interpret
+from minipy.tac import from_tac, run_tac
+from minipy.tests.programs import cases, outcome
+
+
+@pytest.mark.parametrize('source', cases())
+def test_run_tac_matches_interpreter(source):
+    _, ast_nodes, _, ir = compile_code(source)
+    assert outcome(run_tac, from_tac(ir)) == outcome(interpret, ast_nodes)
+
+
+@pytest.mark.parametrize('source', cases(50))
+def test_text_round_trip(source):
+    ir = compile_code(source)[3]
+    assert from_tac(ir).to_tac() == ir
+
+
+@pytest.mark.parametrize('source', cases())
+def test_binary_round_trip(source):
+    program = from_tac(compile_code(source)[3])
+    loaded = loads(dumps(program))
+    assert loaded.to_tac() == program.to_tac()
+    assert outcome(run_tac, loaded) == outcome(run_tac, program)
+
+
+def test_constants_keep_type_and_value():
+    # 1 y 1.0 son constantes distintas; los enteros fuera de i64 se guardan
+    # como texto; inf y nan (un real que desborda) vuelven a leerse como
+    # constantes aunque haya variables con esos nombres
+    source = ("a = 1; b = 1.0; c = 18446744073709551616 * 3; d = 0 - 9223372036854775809;"
+              " inf = 2; nan = 3; e = " + "9" * 400 + ".0; f = e - e; g = e * inf + nan;")
+    _, ast_nodes, _, ir = compile_code(source)
+    program = from_tac(ir)
+    for candidate in (program, from_tac(program.to_tac()), loads(dumps(program))):
+        assert outcome(run_tac, candidate) == outcome(interpret, ast_nodes)
+    env = run_tac(loads(dumps(program)))
+    assert type(env['b']) is float and env['inf'] == 2 and env['nan'] == 3
+    assert math.isinf(env['e']) and math.isnan(env['f'])
+
+
+def test_file_round_trip(tmp_path):
+    program = from_tac(compile_code("i = 3; while i : BEGIN i = i - 1; END")[3])
+    path = tmp_path / "programa.mtac"
+    save(program, str(path))
+    assert load(str(path)).to_tac() == program.to_tac()
+
+
+def test_rejects_corrupt_data():
+    data = dumps(from_tac(compile_code("x = 1; y = x + 2.5;")[3]))
+    with pytest.raises(BinaryFormatError):
+        loads(b'XXXX' + data[4:])
+    with pytest.raises(BinaryFormatError):
+        loads(data[:4] + bytes([99]) + data[5:])
+    for end in range(len(data)):
+        with pytest.raises(BinaryFormatError):
+            loads(data[:end])
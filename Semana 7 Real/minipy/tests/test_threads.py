@@ -0,0 +1,55 @@
+"""
+compile_code es reentrante: compilar desde muchos hilos a la vez da lo
+mismo que compilar uno tras otro.
+"""
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from minipy.compiler import compile_code
+from minipy.mmap_lexer import compile_file
+from minipy.tests.programs import random_program
+
+PROGRAMS = 400
+
+
+def compile_one(seed):
+    # Varía las opciones para que los hilos recorran caminos distintos
+    tokens, ast_nodes, symbol_table, ir = compile_code(
+        random_program(seed), hash_cons=seed % 2 == 1, optimize=seed % 3 == 0)
+    return tokens, repr(ast_nodes), symbol_table, ir
+
+
+@pytest.fixture
+def frequent_switches():
+    # Cambiar de hilo muy a menudo hace aparecer las carreras enseguida
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def test_compile_code_from_many_threads(frequent_switches):
+    expected = [compile_one(seed) for seed in range(PROGRAMS)]
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        results = list(pool.map(compile_one, range(PROGRAMS)))
+    mismatches = [seed for seed in range(PROGRAMS) if results[seed] != expected[seed]]
+    assert not mismatches
+
+
+def test_compile_file_from_many_threads(frequent_switches, tmp_path):
+    paths = []
+    for seed in range(PROGRAMS // 4):
+        path = tmp_path / f"programa{seed}.mp"
+        path.write_text(random_program(seed), encoding="utf-8")
+        paths.append(path)
+
+    def compile_path(path):
+        ast_nodes, symbol_table, ir = compile_file(str(path))
+        return repr(ast_nodes), symbol_table, ir
+
+    expected = [compile_path(path) for path in paths]
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(compile_path, paths))
+    assert results == expected
@@ -0,0 +1,56 @@
+"""
+Inferencia de tipos (semantic.py) y los backends que la usan: los tipos
+anotados coinciden con los valores que se calculan al ejecutar, y el TAC
+especializado da lo mismo que el intérprete.
+"""
+import pytest
+
+from minipy.codegen import generate_code
+from minipy.compiler import compile_code
+from minipy.interpreter import Interpreter, interpret
+from minipy.tac import IFEQ, from_tac, run_tac, specialize
+from minipy.tests.programs import cases, outcome
+
+
+class CheckedInterpreter(Interpreter):
+    """
+    Intérprete que comprueba que cada valor calculado tiene el tipo que la
+    inferencia anotó en su nodo ('num' y None admiten cualquiera).
+    """
+    def eval_expr(self, node):
+        value = super().eval_expr(node)
+        if node.type in ('int', 'float'):
+            assert type(value).__name__ == node.type, (node, value)
+        return value
+
+
+@pytest.mark.parametrize('source', cases())
+@pytest.mark.parametrize('hash_cons', [False, True])
+def test_annotations_are_sound(source, hash_cons):
+    _, ast_nodes, symbol_table, _ = compile_code(source, hash_cons=hash_cons)
+    env = outcome(CheckedInterpreter().run, ast_nodes)
+    if isinstance(env, dict):
+        for name, value in interpret(ast_nodes).items():
+            if symbol_table[name]['type'] in ('int', 'float'):
+                assert type(value).__name__ == symbol_table[name]['type']
+
+
+@pytest.mark.parametrize('source', cases())
+def test_specialized_tac_matches_interpreter(source):
+    ast_nodes = compile_code(source)[1]
+    program = specialize(from_tac(*generate_code(ast_nodes, with_types=True)))
+    assert outcome(run_tac, program) == outcome(interpret, ast_nodes)
+
+
+def test_types_of_variables():
+    symbol_table = compile_code("a = 1; b = a / 2; c = a + 2.5; if a : BEGIN d = 1; END "
+                                "else : BEGIN d = 1.5; END e = a * 2;")[2]
+    types = {name: entry['type'] for name, entry in symbol_table.items()}
+    assert types == {'a': 'int', 'b': 'float', 'c': 'float', 'd': 'num', 'e': 'int'}
+
+
+def test_integer_loop_condition_becomes_ifeq():
+    ast_nodes = compile_code("i = 0; while 6 - i : BEGIN i = i + 1; END")[1]
+    program = specialize(from_tac(*generate_code(ast_nodes, with_types=True)))
+    assert IFEQ in program.opcodes
+    assert run_tac(program) == {'i': 6}
@@ -0,0 +1,89 @@
+"""
+Evaluación vectorizada (vectorized.py): cada fila del resultado es lo que
+da el intérprete con los valores de esa fila, aunque el evaluador reutilice
+sus temporales como destino de otras operaciones.
+"""
+import random
+
+import numpy as np
+import pytest
+
+from minipy.interpreter import interpret
+from minipy.vectorized import evaluate_block, evaluate_expression, parse_block
+
+INPUTS = ['x', 'y', 'k']
+
+
+def random_block(seed, statements=6):
+    """
+    Asignaciones en línea recta que leen las entradas y las variables ya
+    asignadas (a veces la misma varias veces, para probar el reuso de
+    temporales).
+    """
+    rng = random.Random(seed)
+    names = list(INPUTS)
+
+    def expr(depth):
+        if depth == 0 or rng.random() < 0.3:
+            return rng.choice(names + ['2', '3', '0.5'])
+        op = rng.choice('+-*/')
+        if op == '/':
+            # Divisores sin ceros en las columnas
+            return f"({expr(depth - 1)} / {rng.choice(['x', '2', '0.5', '(k + 1)'])})"
+        return f"({expr(depth - 1)} {op} {expr(depth - 1)})"
+
+    lines = []
+    for _ in range(statements):
+        name = rng.choice('abc')
+        lines.append(f"{name} = {expr(3)};")
+        if name not in names:
+            names.append(name)
+    return ' '.join(lines)
+
+
+def columns(seed, rows=20):
+    rng = np.random.default_rng(seed)
+    return {'x': rng.uniform(1, 5, rows), 'y': rng.uniform(-3, 3, rows),
+            'k': rng.integers(0, 10, rows)}
+
+
+def row_values(inputs, i):
+    return {name: values[i].item() for name, values in inputs.items()}
+
+
+@pytest.mark.parametrize('seed', range(100))
+def test_block_matches_interpreter(seed):
+    source = random_block(seed)
+    inputs = columns(seed)
+    result = evaluate_block(source, inputs)
+    statements = parse_block(source)
+    rows = len(inputs['x'])
+    # Una variable que no depende de las entradas queda como escalar
+    result = {name: np.broadcast_to(values, (rows,)) for name, values in result.items()}
+    for i in range(rows):
+        expected = interpret(statements, row_values(inputs, i))
+        assert {name: result[name][i].item() for name in expected} == expected
+
+
+def test_expression_matches_interpreter():
+    inputs = columns(0)
+    result = evaluate_expression("(x * 2 + y) * (x * 2 + y) - k / 4", inputs)
+    for i, value in enumerate(result):
+        row = row_values(inputs, i)
+        assert value == pytest.approx((row['x'] * 2 + row['y']) ** 2 - row['k'] / 4, rel=1e-12)
+
+
+def test_assigned_values_are_not_overwritten():
+    inputs = {'x': np.arange(5, dtype=np.float64)}
+    env = evaluate_block("a = x * 2; b = (a + 1) * 3; c = (a + a) + b;", inputs)
+    assert env['a'].tolist() == [0.0, 2.0, 4.0, 6.0, 8.0]
+    assert env['c'].tolist() == (env['a'] * 2 + (env['a'] + 1) * 3).tolist()
+    assert inputs['x'].tolist() == [0.0, 1.0, 2.0, 3.0, 4.0]
+
+
+def test_errors():
+    with pytest.raises(NameError):
+        evaluate_expression("x + w", {'x': [1, 2]})
+    with pytest.raises(ValueError):
+        evaluate_block("while x : BEGIN x = x - 1; END", {'x': [1, 2]})
+    assert np.isinf(evaluate_expression("1 / x", {'x': [0.0]})[0])
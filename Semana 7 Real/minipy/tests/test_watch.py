@@ -0,0 +1,68 @@
+"""
+Modo watch (watch.py): cada revisión deja el mismo IR que compile_code, y
+la ejecución con presupuesto se detiene en los lazos infinitos.
+"""
+import os
+
+from minipy.compiler import compile_code
+from minipy.watch import Watcher
+
+
+def save(path, source, step):
+    """
+    Escribe el archivo con una fecha de modificación distinta en cada paso.
+    """
+    path.write_text(source, encoding="utf-8")
+    os.utime(path, ns=(step * 10 ** 9, step * 10 ** 9))
+
+
+def test_poll_recompiles_changed_files(tmp_path):
+    path = tmp_path / "programa.txt"
+    output = []
+    watcher = Watcher([str(tmp_path)], output=output.append)
+    versions = ["x = 1;\ny = x + 2;",
+                "x = 1;\nw = 5;\ny = x + 2;",
+                "x = 1;\nw = 5;\nif w : BEGIN\n  y = x + 2;\nEND",
+                "x = 1;\nwhile x : BEGIN\n  x = x - 1;\nEND"]
+    for step, source in enumerate(versions, 1):
+        save(path, source, step)
+        [watched] = watcher.poll()
+        assert watched.ir == compile_code(source)[3]
+    assert len(output) == len(versions)
+
+
+def test_unchanged_or_broken_saves(tmp_path):
+    path = tmp_path / "programa.txt"
+    output = []
+    watcher = Watcher([str(path)], output=output.append)
+    save(path, "x = 1;", 1)
+    [watched] = watcher.poll()
+    assert watcher.poll() == []
+    # Guardado sin cambios: no se recompila
+    save(path, "x = 1;", 2)
+    assert watcher.poll() == []
+    save(path, "x = (1;", 3)
+    assert watcher.poll() == [watched]
+    assert isinstance(watched.error, SyntaxError) and "error" in output[-1]
+    save(path, "x = 2;", 4)
+    watcher.poll()
+    assert watched.error is None and watched.ir == compile_code("x = 2;")[3]
+    path.unlink()
+    assert watcher.poll() == []
+    assert output[-1].endswith("borrado") and not watcher.files
+
+
+def test_run_with_fuel(tmp_path):
+    path = tmp_path / "programa.txt"
+    output = []
+    watcher = Watcher([str(path)], run=True, fuel=1000, output=output.append)
+    save(path, "i = 3; s = 0; while i : BEGIN s = s + i; i = i - 1; END", 1)
+    watcher.poll()
+    assert output[1:] == ["  i = 0", "  s = 6"]
+    del output[:]
+    save(path, "i = 1; while i : BEGIN i = i + 1; END", 2)
+    watcher.poll()
+    assert "interrumpida" in output[-1]
+    save(path, "a = 1; b = a / 0;", 3)
+    watcher.poll()
+    assert "ZeroDivisionError" in output[-1]
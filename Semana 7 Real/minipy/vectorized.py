@@ -0,0 +1,138 @@
+"""
+Evaluación vectorizada (NumPy) de expresiones del mini-lenguaje.
+
+En lugar de recorrer el AST una vez por cada fila de datos, cada variable de
+entrada es un arreglo de NumPy (una columna) y cada nodo 'binop' se evalúa
+como una sola operación sobre arreglos completos. Así un barrido de
+parámetros sobre millones de filas cuesta un recorrido del árbol.
+"""
+import numpy as np
+
+from .lexer import lexer
+from .nodes import ASTNode
+from .parser import Parser
+
+_UFUNCS = {
+    '+': np.add,
+    '-': np.subtract,
+    '*': np.multiply,
+    '/': np.true_divide,
+}
+
+
+def parse_expression(source):
+    """
+    Construye el AST de una expresión suelta (por ejemplo "x * 2 + y").
+    """
+    parser = Parser(lexer(source))
+    node = parser.expression()
+    if parser.current_token() is not None:
+        raise SyntaxError(f"Token inesperado tras la expresión: {parser.current_token()}")
+    return node
+
+
+def parse_block(source):
+    """
+    Construye la lista de sentencias de un bloque de asignaciones.
+    """
+    return Parser(lexer(source)).parse()
+
+
+class _Evaluator:
+    def __init__(self, env):
+        # env: nombre de variable -> arreglo (o escalar) de NumPy
+        self.env = env
+        # ids de los arreglos temporales creados por este evaluador; solo
+        # esos pueden reutilizarse como destino de una operación (out=)
+        self.owned = set()
+
+    def expr(self, node):
+        if node.nodetype == 'num':
+            return node.value
+        elif node.nodetype == 'id':
+            if node.value not in self.env:
+                raise NameError(f"Variable '{node.value}' sin valor de entrada")
+            return self.env[node.value]
+        elif node.nodetype == 'binop':
+            left = self.expr(node.children[0])
+            right = self.expr(node.children[1])
+            return self.apply(_UFUNCS[node.value], left, right)
+        raise ValueError(f"Nodo '{node.nodetype}' no es una expresión")
+
+    def apply(self, ufunc, left, right):
+        # Si uno de los operandos es un temporal propio con la forma y el tipo
+        # del resultado, se escribe sobre él y se evita reservar otro arreglo.
+        if ufunc is np.true_divide:
+            result_type = np.result_type(left, right, np.float64)
+        else:
+            result_type = np.result_type(left, right)
+        shape = np.broadcast_shapes(np.shape(left), np.shape(right))
+        for operand in (left, right):
+            if (id(operand) in self.owned and operand.dtype == result_type
+                    and operand.shape == shape):
+                return ufunc(left, right, out=operand)
+        result = ufunc(left, right)
+        if isinstance(result, np.ndarray):
+            self.owned.add(id(result))
+        return result
+
+    def stmt(self, node):
+        if node.nodetype == 'assign':
+            value = self.expr(node.children[0])
+            # El valor asignado deja de ser temporal: otra expresión no debe
+            # sobrescribirlo.
+            self.owned.discard(id(value))
+            self.env[node.value] = value
+        elif node.nodetype == 'block':
+            for stmt in node.children:
+                self.stmt(stmt)
+        else:
+            raise ValueError(
+                f"Sentencia '{node.nodetype}' no soportada: solo se vectorizan "
+                "bloques de asignaciones en línea recta")
+
+
+def _as_columns(inputs):
+    return {name: np.asarray(values) for name, values in inputs.items()}
+
+
+def evaluate_expression(node, inputs):
+    """
+    Evalúa un AST de expresión sobre columnas de entrada.
+    inputs: nombre de variable -> secuencia/arreglo de valores (o escalar).
+    Devuelve un arreglo con un resultado por fila.
+    """
+    if isinstance(node, str):
+        node = parse_expression(node)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.asarray(_Evaluator(_as_columns(inputs)).expr(node))
+
+
+def evaluate_block(statements, inputs):
+    """
+    Evalúa un bloque de asignaciones en línea recta sobre columnas de entrada.
+    Devuelve el entorno final: nombre de variable -> arreglo de valores.
+    """
+    if isinstance(statements, str):
+        statements = parse_block(statements)
+    elif isinstance(statements, ASTNode):
+        statements = [statements]
+    evaluator = _Evaluator(_as_columns(inputs))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for stmt in statements:
+            evaluator.stmt(stmt)
+    return {name: np.asarray(value) for name, value in evaluator.env.items()}
+
+
+if __name__ == "__main__":  # python -m minipy.vectorized
+    import time
+
+    rows = 1_000_000
+    x = np.arange(rows, dtype=np.float64)
+    y = np.linspace(0.0, 1.0, rows)
+    code = "a = x * 2 + y; b = (a - x) / 3;"
+
+    start = time.perf_counter()
+    env = evaluate_block(code, {'x': x, 'y': y})
+    elapsed = time.perf_counter() - start
+    print(f"{rows} filas vectorizadas en {elapsed:.4f} s; b[-1] = {env['b'][-1]}")
@@ -0,0 +1,179 @@
+"""
+Modo watch: recompila los programas que cambian en uno o más directorios.
+
+Uso (desde la carpeta "Semana 7 Real"):
+    python -m minipy.watch DIRECTORIO_O_ARCHIVO... [--ejecutar]
+        [--intervalo SEGUNDOS] [--extension .txt] [--combustible N]
+
+Cada intervalo se revisan la fecha de modificación y el tamaño de los
+archivos (os.stat, sin dependencias externas) y solo se recompilan los que
+cambiaron. Todo queda en memoria entre compilaciones: las expresiones
+regulares del lexer se compilan una vez por proceso y cada archivo tiene su
+IncrementalFrontEnd con los tokens y el AST de la versión anterior, así que
+una edición solo vuelve a lexear y analizar sintácticamente las líneas que
+tocó. El análisis semántico y el TAC de las sentencias que no cambiaron se
+reutilizan, pero juntarlos recorre todas las sentencias del programa: ese
+paso crece con el tamaño del archivo. El IR también se conserva: si el
+archivo se guardó sin cambios, no se recompila.
+
+Por cada cambio se informa el tiempo de compilación y la latencia desde la
+edición (la fecha de modificación del archivo) hasta tener el IR. Con
+--ejecutar el IR se ejecuta además con un presupuesto de instrucciones
+(partial_eval.run_with_fuel), para que un lazo infinito no detenga el
+modo watch.
+"""
+import argparse
+import os
+import time
+
+from .incremental import IncrementalFrontEnd
+from .partial_eval import DEFAULT_FUEL, run_with_fuel
+from .tac import from_tac
+
+
+def file_signature(path):
+    """
+    (fecha de modificación en ns, tamaño): si no cambia, el archivo se da por
+    no modificado.
+    """
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+class WatchedFile:
+    """
+    Estado en memoria de un archivo vigilado.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.signature = None
+        self.source = None
+        self.front_end = IncrementalFrontEnd()
+        self.ir = None
+        self.error = None
+
+
+class Watcher:
+    def __init__(self, paths, extension=".txt", run=False, fuel=DEFAULT_FUEL, output=print):
+        self.paths = list(paths)
+        self.extension = extension
+        self.run = run
+        self.fuel = fuel
+        self.output = output
+        self.files = {}   # ruta -> WatchedFile
+
+    def discover(self):
+        """
+        Archivos vigilados: los que se nombraron directamente y los que
+        tienen la extensión dentro de los directorios (recursivamente).
+        """
+        found = []
+        for path in self.paths:
+            if not os.path.isdir(path):
+                found.append(path)
+                continue
+            for directory, subdirectories, names in os.walk(path):
+                subdirectories.sort()
+                found.extend(os.path.join(directory, name) for name in sorted(names)
+                             if name.endswith(self.extension))
+        return found
+
+    def poll(self):
+        """
+        Una revisión: recompila los archivos nuevos o modificados y olvida los
+        borrados. Devuelve la lista de WatchedFile recompilados.
+        """
+        changed = []
+        seen = set()
+        for path in self.discover():
+            try:
+                signature = file_signature(path)
+            except OSError:
+                continue
+            seen.add(path)
+            watched = self.files.get(path)
+            if watched is None:
+                watched = self.files[path] = WatchedFile(path)
+            if watched.signature == signature:
+                continue
+            watched.signature = signature
+            if self.compile(watched):
+                changed.append(watched)
+        for path in list(self.files):
+            if path not in seen:
+                del self.files[path]
+                self.output(f"{path}: borrado")
+        return changed
+
+    def compile(self, watched):
+        """
+        Vuelve a leer y compilar un archivo modificado. Devuelve False si el
+        contenido es el mismo de la última compilación.
+        """
+        try:
+            with open(watched.path, encoding="utf-8") as file:
+                source = file.read()
+        except (OSError, UnicodeDecodeError) as e:
+            self.output(f"{watched.path}: no se pudo leer ({e})")
+            return False
+        if source == watched.source:
+            return False
+        watched.source = source
+        start = time.perf_counter()
+        try:
+            watched.front_end.update(source)
+            watched.ir = watched.front_end.compile()[3]
+            watched.error = None
+        except Exception as e:
+            watched.error = e
+        compile_ms = (time.perf_counter() - start) * 1000
+        latency_ms = (time.time_ns() - watched.signature[0]) / 1e6
+        if watched.error is not None:
+            self.output(f"{watched.path}: error: {watched.error}")
+            return True
+        self.output(f"{watched.path}: IR de {len(watched.ir)} instrucciones en {compile_ms:.2f} ms"
+                    f" ({latency_ms:.1f} ms desde la edición)")
+        if self.run:
+            self.execute(watched)
+        return True
+
+    def execute(self, watched):
+        try:
+            env = run_with_fuel(from_tac(watched.ir), self.fuel)
+        except Exception as e:
+            self.output(f"  error en ejecución: {type(e).__name__}: {e}")
+            return
+        if env is None:
+            self.output(f"  ejecución interrumpida: más de {self.fuel} instrucciones")
+            return
+        for name, value in env.items():
+            self.output(f"  {name} = {value}")
+
+    def watch(self, interval=0.2):
+        """
+        Revisa los archivos cada interval segundos hasta Ctrl+C.
+        """
+        try:
+            while True:
+                self.poll()
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            pass
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Recompila los programas que cambian.")
+    arg_parser.add_argument("rutas", nargs="+", help="directorios o archivos a vigilar")
+    arg_parser.add_argument("--ejecutar", action="store_true", help="ejecutar el IR tras cada cambio")
+    arg_parser.add_argument("--intervalo", type=float, default=0.2, help="segundos entre revisiones")
+    arg_parser.add_argument("--extension", default=".txt", help="extensión de los programas")
+    arg_parser.add_argument("--combustible", type=int, default=DEFAULT_FUEL,
+                            help="instrucciones ejecutadas como máximo con --ejecutar")
+    args = arg_parser.parse_args(argv)
+    watcher = Watcher(args.rutas, args.extension, args.ejecutar, args.combustible)
+    print(f"Vigilando {', '.join(args.rutas)} (Ctrl+C para salir)")
+    watcher.watch(args.intervalo)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+Evaluación por lotes de expresiones aritméticas
+-----------------------------------------------
+Permite evaluar archivos grandes de expresiones (una por línea) sin abrir la
+interfaz gráfica. Se reutiliza la única instancia del parser LALR(1) definida
+en gramatica.py y se memorizan (LRU) los resultados de las
+expresiones repetidas. Para entradas de millones de líneas el trabajo se
+reparte por bloques entre procesos, manteniendo el orden de la salida.
+
+Uso:
+    python evaluador_lotes.py entrada.txt -o resultados.txt -j 4
+    cat entrada.txt | python evaluador_lotes.py - > resultados.txt
+"""
+
+import argparse
+import os
+import sys
+from collections import deque
+from functools import lru_cache
+from itertools import islice
+from multiprocessing import Pool
+
+from gramatica import evaluate
+
+DEFAULT_CACHE_SIZE = 4096
+DEFAULT_CHUNK_SIZE = 10000
+
+
+def _evaluate_safe(expression):
+    """
+    Devuelve (valor, error). Los errores se devuelven como texto para que
+    también puedan memorizarse y viajar entre procesos.
+    """
+    try:
+        return evaluate(expression), None
+    except Exception as e:
+        return None, str(e)
+
+
+def evaluate_batch(expressions, cache_size=DEFAULT_CACHE_SIZE):
+    """
+    Evalúa un iterable de expresiones y genera una tupla (valor, error) por
+    cada una, en el mismo orden. Las líneas vacías producen (None, None).
+    """
+    memo = lru_cache(maxsize=cache_size)(_evaluate_safe)
+    for expression in expressions:
+        expression = expression.strip()
+        if expression == "":
+            yield None, None
+        else:
+            yield memo(expression)
+
+
+# Memo propio de cada proceso trabajador (se crea en _init_worker)
+_worker_memo = None
+
+
+def _init_worker(cache_size):
+    global _worker_memo
+    _worker_memo = lru_cache(maxsize=cache_size)(_evaluate_safe)
+
+
+def _evaluate_chunk(chunk):
+    results = []
+    for expression in chunk:
+        expression = expression.strip()
+        results.append(_worker_memo(expression) if expression else (None, None))
+    return results
+
+
+def _chunks(expressions, chunk_size):
+    iterator = iter(expressions)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def evaluate_parallel(expressions, workers=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                      cache_size=DEFAULT_CACHE_SIZE):
+    """
+    Igual que evaluate_batch, pero reparte bloques de chunk_size expresiones
+    entre procesos. Solo se mantienen en vuelo unos pocos bloques por
+    trabajador, de modo que la memoria no crece con el tamaño de la entrada.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_pending = 2 * workers
+    with Pool(workers, initializer=_init_worker, initargs=(cache_size,)) as pool:
+        pending = deque()
+        for chunk in _chunks(expressions, chunk_size):
+            pending.append(pool.apply_async(_evaluate_chunk, (chunk,)))
+            if len(pending) >= max_pending:
+                yield from pending.popleft().get()
+        while pending:
+            yield from pending.popleft().get()
+
+
+def format_result(value, error):
+    """
+    Convierte un resultado en una línea de salida.
+    """
+    if error is not None:
+        return f"Error: {error}"
+    if value is None:
+        return ""
+    return str(value)
+
+
+def write_results(results, out):
+    """
+    Escribe los resultados en el archivo abierto out, una línea por expresión.
+    Devuelve el número de líneas escritas.
+    """
+    count = 0
+    for value, error in results:
+        out.write(format_result(value, error))
+        out.write("\n")
+        count += 1
+    return count
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(
+        description="Evalúa por lotes expresiones aritméticas (una por línea).")
+    arg_parser.add_argument("entrada", help="archivo de expresiones o '-' para stdin")
+    arg_parser.add_argument("-o", "--salida", help="archivo de resultados (por defecto stdout)")
+    arg_parser.add_argument("-j", "--procesos", type=int, default=1,
+                            help="número de procesos trabajadores (0 = uno por CPU)")
+    arg_parser.add_argument("--bloque", type=int, default=DEFAULT_CHUNK_SIZE,
+                            help="expresiones por bloque enviado a cada proceso")
+    arg_parser.add_argument("--cache", type=int, default=DEFAULT_CACHE_SIZE,
+                            help="tamaño del memo LRU de resultados")
+    args = arg_parser.parse_args(argv)
+
+    source = sys.stdin if args.entrada == "-" else open(args.entrada, "r", encoding="utf-8")
+    out = sys.stdout if args.salida is None else open(args.salida, "w", encoding="utf-8")
+    try:
+        if args.procesos == 1:
+            results = evaluate_batch(source, cache_size=args.cache)
+        else:
+            results = evaluate_parallel(source, workers=args.procesos or None,
+                                        chunk_size=args.bloque, cache_size=args.cache)
+        write_results(results, out)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+Gramática LALR(1) de expresiones aritméticas (sin interfaz gráfica)
+------------------------------------------------------------------
+Contiene el lexer y el parser PLY usados por AnalizadorSintactico.py y por
+evaluador_lotes.py. No importa Tkinter, de modo que puede cargarse en
+procesos trabajadores sin coste de arranque de la interfaz.
+"""
+
+import ply.lex as lex
+import ply.yacc as yacc
+
+# ----------------------------------------------------------------------
+# Parte Léxica: Definición de tokens
+# ----------------------------------------------------------------------
+tokens = (
+    'NUMBER',
+    'PLUS',
+    'MINUS',
+    'TIMES',
+    'DIVIDE',
+    'LPAREN',
+    'RPAREN'
+)
+
+# Patrones para los tokens
+t_PLUS = r'\+'
+t_MINUS = r'-'
+t_TIMES = r'\*'
+t_DIVIDE = r'/'
+t_LPAREN = r'\('
+t_RPAREN = r'\)'
+
+
+def t_NUMBER(t):
+    r'\d+'
+    t.value = int(t.value)  # Convertir la cadena a entero
+    return t
+
+
+t_ignore = ' \t'  # Ignorar espacios y tabulaciones
+
+
+def t_newline(t):
+    r'\n+'
+    t.lexer.lineno += len(t.value)
+
+
+def t_error(t):
+    # Se lanza una excepción para que tanto la interfaz como el modo por
+    # lotes reporten el error en lugar de ignorar el carácter en silencio.
+    raise SyntaxError(f"Caracter ilegal '{t.value[0]}' en la línea {t.lineno}")
+
+
+# Construcción del lexer
+lexer = lex.lex()
+
+
+# ----------------------------------------------------------------------
+# Parte Sintáctica: Definición de la gramática (método LR - LALR(1))
+# ----------------------------------------------------------------------
+# La gramática es la siguiente:
+#
+# expression : expression PLUS term
+#            | expression MINUS term
+#            | term
+#
+# term       : term TIMES factor
+#            | term DIVIDE factor
+#            | factor
+#
+# factor     : NUMBER
+#            | LPAREN expression RPAREN
+
+def p_expression_plus(p):
+    'expression : expression PLUS term'
+    p[0] = p[1] + p[3]
+
+
+def p_expression_minus(p):
+    'expression : expression MINUS term'
+    p[0] = p[1] - p[3]
+
+
+def p_expression_term(p):
+    'expression : term'
+    p[0] = p[1]
+
+
+def p_term_times(p):
+    'term : term TIMES factor'
+    p[0] = p[1] * p[3]
+
+
+def p_term_divide(p):
+    'term : term DIVIDE factor'
+    p[0] = p[1] / p[3]
+
+
+def p_term_factor(p):
+    'term : factor'
+    p[0] = p[1]
+
+
+def p_factor_number(p):
+    'factor : NUMBER'
+    p[0] = p[1]
+
+
+def p_factor_expr(p):
+    'factor : LPAREN expression RPAREN'
+    p[0] = p[2]
+
+
+def p_error(p):
+    if p:
+        raise SyntaxError(f"Error sintáctico en el token {p.type}")
+    raise SyntaxError("Error sintáctico al final de la entrada")
+
+
+# Construcción del parser (usa LALR(1), método LR)
+parser = yacc.yacc()
+
+
+def evaluate(expression):
+    """
+    Evalúa una expresión con el parser LALR(1) del módulo y devuelve su valor.
+    Lanza SyntaxError ante errores léxicos o sintácticos.
+    """
+    lexer.lineno = 1  # El lexer se reutiliza entre llamadas
+    return parser.parse(expression, lexer=lexer)
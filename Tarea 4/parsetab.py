@@ -27,12 +27,12 @@ for _k, _v in _lr_goto_items.items():
 del _lr_goto_items
 _lr_productions = [
   ("S' -> expression","S'",1,None,None,None),
-  ('expression -> expression PLUS term','expression',3,'p_expression_plus','AnalizadorSintactico.py',77),
-  ('expression -> expression MINUS term','expression',3,'p_expression_minus','AnalizadorSintactico.py',82),
-  ('expression -> term','expression',1,'p_expression_term','AnalizadorSintactico.py',87),
-  ('term -> term TIMES factor','term',3,'p_term_times','AnalizadorSintactico.py',92),
-  ('term -> term DIVIDE factor','term',3,'p_term_divide','AnalizadorSintactico.py',97),
-  ('term -> factor','term',1,'p_term_factor','AnalizadorSintactico.py',102),
-  ('factor -> NUMBER','factor',1,'p_factor_number','AnalizadorSintactico.py',107),
-  ('factor -> LPAREN expression RPAREN','factor',3,'p_factor_expr','AnalizadorSintactico.py',112),
+  ('expression -> expression PLUS term','expression',3,'p_expression_plus','gramatica.py',76),
+  ('expression -> expression MINUS term','expression',3,'p_expression_minus','gramatica.py',81),
+  ('expression -> term','expression',1,'p_expression_term','gramatica.py',86),
+  ('term -> term TIMES factor','term',3,'p_term_times','gramatica.py',91),
+  ('term -> term DIVIDE factor','term',3,'p_term_divide','gramatica.py',96),
+  ('term -> factor','term',1,'p_term_factor','gramatica.py',101),
+  ('factor -> NUMBER','factor',1,'p_factor_number','gramatica.py',106),
+  ('factor -> LPAREN expression RPAREN','factor',3,'p_factor_expr','gramatica.py',111),
 ]
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas del evaluador por lotes
+-------------------------------
+Cada resultado es el valor que da Python para la misma expresión (la
+gramática es un subconjunto de la aritmética de Python), o un error; la
+versión con procesos da exactamente lo mismo que la secuencial.
+"""
+
+import random
+
+import pytest
+
+from evaluador_lotes import evaluate_batch, evaluate_parallel, format_result, main
+
+
+def expresion_al_azar(rng, profundidad=3):
+    if profundidad == 0 or rng.random() < 0.3:
+        return str(rng.randint(0, 99))
+    if rng.random() < 0.2:
+        return f"({expresion_al_azar(rng, profundidad - 1)})"
+    operador = rng.choice("+-*/")
+    return f"{expresion_al_azar(rng, profundidad - 1)} {operador} {expresion_al_azar(rng, profundidad - 1)}"
+
+
+def lineas_al_azar(semilla, cantidad=200):
+    """
+    Expresiones válidas, repetidas, vacías y con errores léxicos o
+    sintácticos. No se insertan operadores sueltos: Python acepta "+1" y
+    la gramática no.
+    """
+    rng = random.Random(semilla)
+    lineas = []
+    for _ in range(cantidad):
+        r = rng.random()
+        if r < 0.1 and lineas:
+            lineas.append(rng.choice(lineas))
+        elif r < 0.15:
+            lineas.append(rng.choice(["", "   ", "\t"]))
+        elif r < 0.25:
+            texto = expresion_al_azar(rng)
+            posicion = rng.randint(0, len(texto))
+            lineas.append(texto[:posicion] + rng.choice(["(", ")", "$", "x"]) + texto[posicion:])
+        else:
+            lineas.append(expresion_al_azar(rng))
+    return lineas
+
+
+def referencia(linea):
+    linea = linea.strip()
+    if not linea:
+        return None, None
+    try:
+        return eval(linea, {"__builtins__": {}}), None
+    except ZeroDivisionError as e:
+        return None, str(e)
+    except (SyntaxError, NameError, TypeError):
+        return None, "error"
+
+
+@pytest.mark.parametrize("semilla", range(20))
+def test_igual_que_python(semilla):
+    lineas = lineas_al_azar(semilla)
+    for linea, (valor, error) in zip(lineas, evaluate_batch(lineas, cache_size=16)):
+        esperado_valor, esperado_error = referencia(linea)
+        assert valor == esperado_valor and type(valor) is type(esperado_valor), linea
+        if esperado_error is None:
+            assert error is None, linea
+        elif esperado_error != "error":
+            assert error == esperado_error, linea
+        else:
+            assert error, linea
+
+
+@pytest.mark.parametrize("semilla", range(3))
+def test_procesos_igual_que_secuencial(semilla):
+    lineas = lineas_al_azar(semilla, 500)
+    esperado = list(evaluate_batch(lineas))
+    assert list(evaluate_parallel(lineas, workers=2, chunk_size=7)) == esperado
+
+
+def test_linea_de_comandos(tmp_path):
+    lineas = lineas_al_azar(0, 100)
+    entrada = tmp_path / "expresiones.txt"
+    entrada.write_text("\n".join(lineas) + "\n", encoding="utf-8")
+    esperado = [format_result(*resultado) for resultado in evaluate_batch(lineas)]
+    for procesos in ("1", "2"):
+        salida = tmp_path / f"resultados{procesos}.txt"
+        main([str(entrada), "-o", str(salida), "-j", procesos, "--bloque", "9"])
+        assert salida.read_text(encoding="utf-8").split("\n")[:-1] == esperado
@@ -68,6 +68,99 @@ class ReturnStatement(Node):
     def __init__(self, expr=None):
         self.expr = expr  # puede ser None en funciones void
 
+# =========================================
+# GRAFO DE LLAMADAS
+# =========================================
+
+def child_nodes(node):
+    # Hijos de un nodo (sentencias y expresiones) en orden de evaluación
+    if isinstance(node, BinaryExpression):
+        return [node.left, node.right]
+    if isinstance(node, Assignment):
+        return [node.expr]
+    if isinstance(node, FunctionCall):
+        return node.arguments
+    if isinstance(node, IfStatement):
+        return [node.condition] + node.then_body + (node.else_body or [])
+    if isinstance(node, WhileStatement):
+        return [node.condition] + node.body
+    if isinstance(node, ReturnStatement):
+        return [node.expr] if node.expr is not None else []
+    if isinstance(node, FunctionDeclaration):
+        return node.body
+    return []
+
+def walk(nodes):
+    # Recorre en preorden los nodos dados y todos sus descendientes (con una
+    # pila explícita: no depende del límite de recursión)
+    stack = list(reversed(nodes))
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(reversed(child_nodes(node)))
+
+def build_call_graph(program):
+    # Grafo de llamadas: nombre de función -> conjunto de nombres que llama
+    # (incluidas funciones no declaradas, que el analizador reporta)
+    return {func.name: {node.name for node in walk(func.body) if isinstance(node, FunctionCall)}
+            for func in program.functions}
+
+def reachable_functions(graph, roots=("main",)):
+    # Funciones declaradas alcanzables desde las raíces
+    reachable = set()
+    stack = [root for root in roots if root in graph]
+    while stack:
+        name = stack.pop()
+        if name in reachable:
+            continue
+        reachable.add(name)
+        stack.extend(callee for callee in graph[name] if callee in graph and callee not in reachable)
+    return reachable
+
+def recursive_functions(graph):
+    # Funciones que pueden llamarse a sí mismas, directa o indirectamente:
+    # las de una componente fuertemente conexa con más de una función o con
+    # un lazo propio (algoritmo de Tarjan iterativo)
+    index, lowlink = {}, {}
+    on_stack, component_stack = set(), []
+    recursive = set()
+    for start in graph:
+        if start in index:
+            continue
+        work = [(start, iter(graph[start]))]
+        index[start] = lowlink[start] = len(index)
+        component_stack.append(start)
+        on_stack.add(start)
+        while work:
+            name, callees = work[-1]
+            for callee in callees:
+                if callee not in graph:
+                    continue
+                if callee not in index:
+                    index[callee] = lowlink[callee] = len(index)
+                    component_stack.append(callee)
+                    on_stack.add(callee)
+                    work.append((callee, iter(graph[callee])))
+                    break
+                if callee in on_stack:
+                    lowlink[name] = min(lowlink[name], index[callee])
+            else:
+                work.pop()
+                if work:
+                    caller = work[-1][0]
+                    lowlink[caller] = min(lowlink[caller], lowlink[name])
+                if lowlink[name] == index[name]:
+                    component = []
+                    while True:
+                        member = component_stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == name:
+                            break
+                    if len(component) > 1 or name in graph[name]:
+                        recursive.update(component)
+    return recursive
+
 # =========================================
 # GESTIÓN DE TABLA DE SÍMBOLOS Y ÁMBITOS
 # =========================================
@@ -103,8 +196,12 @@ class SymbolTable:
 # =========================================
 
 class SemanticAnalyzer:
-    def __init__(self):
+    def __init__(self, roots=None):
         self.symbol_table = SymbolTable()
+        # Si se dan raíces (p. ej. ("main",)), solo se analizan los cuerpos de
+        # las funciones alcanzables desde ellas; las demás quedan en pruned
+        self.roots = roots
+        self.pruned = []
         # Tabla de funciones: nombre -> (lista_de_parametros, return_type)
         self.functions = {}
         # Registro de errores semánticos
@@ -134,8 +231,14 @@ class SemanticAnalyzer:
                 self.error(f"La función '{func.name}' ya ha sido declarada.")
             else:
                 self.functions[func.name] = (func.parameters, func.return_type)
-        # Ahora analizamos el cuerpo de cada función
-        for func in node.functions:
+        # Ahora analizamos el cuerpo de cada función (con roots, solo de las
+        # alcanzables según el grafo de llamadas)
+        functions = node.functions
+        if self.roots is not None:
+            reachable = reachable_functions(build_call_graph(node), self.roots)
+            functions = [func for func in node.functions if func.name in reachable]
+            self.pruned = [func.name for func in node.functions if func.name not in reachable]
+        for func in functions:
             self.analyze(func)
 
     def analyze_VariableDeclaration(self, node: VariableDeclaration):
@@ -0,0 +1,570 @@
+# maquina_virtual.py
+
+# =========================================
+# GENERACIÓN DE BYTECODE Y MÁQUINA VIRTUAL
+# =========================================
+#
+# Compila un Program ya verificado por SemanticAnalyzer a bytecode de pila y
+# lo ejecuta en una máquina virtual sin recursión de Python (la profundidad
+# de las llamadas no depende del límite de recursión).
+#
+# - Cada nombre se resuelve al compilar: las globales a un índice del
+#   arreglo de globales y los parámetros y locales a un slot del marco de su
+#   función. El compilador recorre el programa con una SymbolTable y abre y
+#   cierra ámbitos en los mismos puntos que el analizador, así que cada
+#   nombre se resuelve a la misma declaración que el analizador verificó. Al
+#   cerrar un ámbito sus slots quedan libres para los bloques siguientes.
+# - La pila de valores es una lista preasignada de STACK_SIZE posiciones. El
+#   llamador apila los argumentos, que pasan a ser los primeros slots del
+#   marco de la función llamada; después vienen sus locales y su pila de
+#   operandos, cuyo tamaño máximo se calcula al compilar.
+# - Los marcos de llamada (pc de retorno y base del marco del llamador) son
+#   objetos Frame de un pool que crece hasta MAX_FRAMES y se reutiliza en
+#   cada llamada y en cada ejecución.
+# - Solo se compilan las funciones alcanzables desde las raíces (por defecto
+#   main) según el grafo de llamadas, y el analizador tampoco revisa las
+#   demás. Las llamadas a funciones no recursivas y pequeñas (a lo sumo
+#   INLINE_MAX_NODES nodos, contando las llamadas que ellas mismas expanden)
+#   se expanden en línea: los argumentos pasan a slots libres del marco del
+#   llamador y el cuerpo se compila con los ámbitos de la función llamada
+#   (globales y parámetros), así que cada nombre sigue resolviéndose a la
+#   misma variable. Cada return del cuerpo expandido salta al final con su
+#   valor en la pila, sin CALL ni RET.
+#
+# Semántica: una declaración inicializa la variable en 0 (0.0 si es float),
+# '/' y '%' truncan hacia cero como en C, las comparaciones dan 1 o 0 y una
+# función que termina sin return devuelve 0 (en las void ese valor se
+# descarta).
+
+from Analizador_Semantico import (Program, VariableDeclaration, Assignment, BinaryExpression,
+                                  Literal, Identifier, FunctionDeclaration, FunctionCall,
+                                  IfStatement, WhileStatement, ReturnStatement,
+                                  SymbolTable, SemanticAnalyzer, build_call_graph,
+                                  reachable_functions, recursive_functions, walk)
+
+STACK_SIZE = 1 << 20   # posiciones de la pila de valores
+MAX_FRAMES = 200_000   # llamadas anidadas como máximo
+INLINE_MAX_NODES = 16  # nodos del AST de una función que se expande en línea
+
+# Códigos de operación
+(CONST, LOAD, STORE, GLOAD, GSTORE, ADD, SUB, MUL, DIV, MOD, LT, GT, LE, GE, EQ, NE,
+ JUMP, JUMPF, CALL, RET, POP) = range(21)
+
+OPCODE_NAMES = ['CONST', 'LOAD', 'STORE', 'GLOAD', 'GSTORE', 'ADD', 'SUB', 'MUL', 'DIV', 'MOD',
+                'LT', 'GT', 'LE', 'GE', 'EQ', 'NE', 'JUMP', 'JUMPF', 'CALL', 'RET', 'POP']
+BINARY_OPCODES = {'+': ADD, '-': SUB, '*': MUL, '/': DIV, '%': MOD,
+                  '<': LT, '>': GT, '<=': LE, '>=': GE, '==': EQ, '!=': NE}
+
+# Efecto de cada instrucción en la altura de la pila (CALL depende de sus argumentos)
+STACK_EFFECT = {CONST: 1, LOAD: 1, STORE: -1, GLOAD: 1, GSTORE: -1, JUMP: 0, JUMPF: -1,
+                RET: -1, POP: -1}
+STACK_EFFECT.update((opcode, -1) for opcode in BINARY_OPCODES.values())
+
+ZERO = {'float': 0.0}   # valor inicial de una variable según su tipo (por defecto 0)
+
+class CompileError(Exception):
+    pass
+
+class VMError(RuntimeError):
+    pass
+
+# =========================================
+# COMPILADOR A BYTECODE
+# =========================================
+
+class FunctionInfo:
+    def __init__(self, name, index, num_params):
+        self.name = name
+        self.index = index
+        self.num_params = num_params
+        self.entry = None      # primera instrucción
+        self.num_slots = 0     # parámetros + locales (los bloques hermanos comparten slots)
+        self.frame_size = 0    # num_slots + altura máxima de la pila de operandos
+
+class Bytecode:
+    # Resultado de compile_program: instrucciones en arreglos paralelos
+    # (código de operación y operando) más las tablas de funciones y globales
+    def __init__(self, ops, args, functions, global_names, global_zeros, pruned=(), inlined=0):
+        self.ops = ops
+        self.args = args
+        self.functions = functions          # nombre -> FunctionInfo
+        self.global_names = global_names
+        self.global_zeros = global_zeros    # valores iniciales de las globales
+        self.pruned = list(pruned)          # funciones no alcanzables, sin compilar
+        self.inlined = inlined              # llamadas expandidas en línea
+
+    def disassemble(self):
+        names = {info.entry: info.name for info in self.functions.values()}
+        by_index = {info.index: info.name for info in self.functions.values()}
+        lines = []
+        for pc, (op, arg) in enumerate(zip(self.ops, self.args)):
+            if pc in names:
+                lines.append(f'{names[pc]}:')
+            text = OPCODE_NAMES[op]
+            if op == CALL:
+                text += f' {by_index[arg]}'
+            elif op == GLOAD or op == GSTORE:
+                text += f' {self.global_names[arg]}'
+            elif arg is not None:
+                text += f' {arg}'
+            lines.append(f'  {pc:5d}  {text}')
+        return lines
+
+class BytecodeCompiler:
+    def __init__(self, roots=None, inline=True):
+        self.roots = roots     # None: se compilan todas las funciones
+        self.inline = inline
+        self.ops = []
+        self.args = []
+        self.symbol_table = SymbolTable()
+        self.functions = {}
+        self.global_names = []
+        self.global_zeros = []
+        self.functions_by_index = []
+        self.function = None   # FunctionInfo que se está compilando
+        self.next_slot = 0
+        self.depth = 0         # altura de la pila de operandos
+        self.declarations = {}   # nombre -> FunctionDeclaration de las funciones compiladas
+        self.inlinable = set()
+        self.inlined = 0
+        self.return_jumps = None   # saltos al final del cuerpo que se está expandiendo
+
+    def emit(self, op, arg=None):
+        self.ops.append(op)
+        self.args.append(arg)
+        self.depth += STACK_EFFECT[op] if op != CALL else 1 - self.functions_by_index[arg].num_params
+        self.function.frame_size = max(self.function.frame_size, self.depth)
+        return len(self.ops) - 1
+
+    def patch(self, index, target=None):
+        self.args[index] = len(self.ops) if target is None else target
+
+    def compile(self, node):
+        method = getattr(self, 'compile_' + node.__class__.__name__, None)
+        if method is None:
+            raise CompileError(f'No se puede compilar {node.__class__.__name__}')
+        return method(node)
+
+    def compile_Program(self, node: Program):
+        for decl in node.global_decls:
+            self.symbol_table.declare(decl.name, ('global', len(self.global_names)))
+            self.global_names.append(decl.name)
+            self.global_zeros.append(ZERO.get(decl.var_type, 0))
+        graph = build_call_graph(node)
+        functions, pruned = node.functions, []
+        if self.roots is not None:
+            reachable = reachable_functions(graph, self.roots)
+            functions = [func for func in node.functions if func.name in reachable]
+            pruned = [func.name for func in node.functions if func.name not in reachable]
+        for func in functions:
+            info = FunctionInfo(func.name, len(self.functions_by_index), len(func.parameters))
+            self.functions[func.name] = info
+            self.functions_by_index.append(info)
+            self.declarations[func.name] = func
+        if self.inline:
+            self.inlinable = self.find_inlinable(graph)
+        for func in functions:
+            self.compile(func)
+        # frame_size llevaba la altura máxima de la pila de operandos
+        for info in self.functions_by_index:
+            info.frame_size += info.num_slots
+        return Bytecode(self.ops, self.args, self.functions, self.global_names, self.global_zeros,
+                        pruned, self.inlined)
+
+    def find_inlinable(self, graph):
+        # Funciones no recursivas cuyo tamaño, con sus propias llamadas
+        # expandibles ya expandidas, no pasa de INLINE_MAX_NODES. Sin las
+        # recursivas el grafo no tiene ciclos: se recorre en postorden
+        # (primero las funciones llamadas) con una pila explícita
+        recursive = recursive_functions(graph)
+        sizes = {}
+        for start in self.declarations:
+            stack = [start]
+            while stack:
+                name = stack[-1]
+                if name in sizes or name in recursive:
+                    stack.pop()
+                    continue
+                pending = [callee for callee in graph[name]
+                           if callee not in sizes and callee not in recursive]
+                if pending:
+                    stack.extend(pending)
+                    continue
+                stack.pop()
+                size = 0
+                for child in walk(self.declarations[name].body):
+                    size += 1
+                    if child.__class__ is FunctionCall and sizes.get(child.name, INLINE_MAX_NODES + 1) <= INLINE_MAX_NODES:
+                        size += sizes[child.name]
+                sizes[name] = size
+        return {name for name, size in sizes.items() if size <= INLINE_MAX_NODES}
+
+    def declare_local(self, name):
+        self.symbol_table.declare(name, ('local', self.next_slot))
+        self.next_slot += 1
+        self.function.num_slots = max(self.function.num_slots, self.next_slot)
+        return self.next_slot - 1
+
+    def compile_statement(self, node):
+        # Una llamada usada como sentencia descarta su valor
+        self.compile(node)
+        if node.__class__ is FunctionCall:
+            self.emit(POP)
+
+    def compile_body(self, statements):
+        # Un bloque con su propio ámbito: al cerrarlo se liberan sus slots
+        self.symbol_table.enter_scope()
+        first_free = self.next_slot
+        for stmt in statements:
+            self.compile_statement(stmt)
+        self.next_slot = first_free
+        self.symbol_table.exit_scope()
+
+    def compile_FunctionDeclaration(self, node: FunctionDeclaration):
+        self.function = self.functions[node.name]
+        self.function.entry = len(self.ops)
+        self.next_slot = 0
+        self.depth = 0
+        self.symbol_table.enter_scope()
+        for param_name, _param_type in node.parameters:
+            self.declare_local(param_name)
+        for stmt in node.body:
+            self.compile_statement(stmt)
+        self.symbol_table.exit_scope()
+        # Sin return al final: devuelve 0
+        self.emit(CONST, 0)
+        self.emit(RET)
+
+    def compile_VariableDeclaration(self, node: VariableDeclaration):
+        slot = self.declare_local(node.name)
+        self.emit(CONST, ZERO.get(node.var_type, 0))
+        self.emit(STORE, slot)
+
+    def compile_Assignment(self, node: Assignment):
+        self.compile(node.expr)
+        kind, index = self.symbol_table.lookup(node.name)
+        self.emit(STORE if kind == 'local' else GSTORE, index)
+
+    def compile_BinaryExpression(self, node: BinaryExpression):
+        if node.operator not in BINARY_OPCODES:
+            raise CompileError(f"Operador '{node.operator}' no soportado")
+        self.compile(node.left)
+        self.compile(node.right)
+        self.emit(BINARY_OPCODES[node.operator])
+
+    def compile_Literal(self, node: Literal):
+        self.emit(CONST, node.value)
+
+    def compile_Identifier(self, node: Identifier):
+        kind, index = self.symbol_table.lookup(node.name)
+        self.emit(LOAD if kind == 'local' else GLOAD, index)
+
+    def compile_FunctionCall(self, node: FunctionCall):
+        for arg in node.arguments:
+            self.compile(arg)
+        if node.name in self.inlinable:
+            self.inline_call(self.declarations[node.name])
+        else:
+            self.emit(CALL, self.functions[node.name].index)
+
+    def inline_call(self, func: FunctionDeclaration):
+        # Expande el cuerpo de func con los argumentos ya en la pila: pasan a
+        # slots libres del marco actual y los nombres se resuelven con los
+        # ámbitos de func (globales y parámetros), no con los del llamador
+        saved_scopes, saved_jumps = self.symbol_table.scopes, self.return_jumps
+        first_free = self.next_slot
+        self.symbol_table.scopes = [saved_scopes[0], {}]
+        self.return_jumps = []
+        slots = [self.declare_local(param_name) for param_name, _param_type in func.parameters]
+        for slot in reversed(slots):
+            self.emit(STORE, slot)
+        for stmt in func.body:
+            self.compile_statement(stmt)
+        # Sin return al final: el valor es 0
+        self.emit(CONST, 0)
+        for jump in self.return_jumps:
+            self.patch(jump)
+        self.symbol_table.scopes, self.return_jumps = saved_scopes, saved_jumps
+        self.next_slot = first_free
+        self.inlined += 1
+
+    def compile_IfStatement(self, node: IfStatement):
+        self.compile(node.condition)
+        jump_else = self.emit(JUMPF)
+        self.compile_body(node.then_body)
+        if node.else_body:
+            jump_end = self.emit(JUMP)
+            self.patch(jump_else)
+            self.compile_body(node.else_body)
+            self.patch(jump_end)
+        else:
+            self.patch(jump_else)
+
+    def compile_WhileStatement(self, node: WhileStatement):
+        top = len(self.ops)
+        self.compile(node.condition)
+        jump_end = self.emit(JUMPF)
+        self.compile_body(node.body)
+        self.emit(JUMP, top)
+        self.patch(jump_end)
+
+    def compile_ReturnStatement(self, node: ReturnStatement):
+        if node.expr is None:
+            self.emit(CONST, 0)
+        else:
+            self.compile(node.expr)
+        if self.return_jumps is None:
+            self.emit(RET)
+        else:
+            # Dentro de un cuerpo expandido: salta al final con el valor en la
+            # pila; el código que sigue empieza sin él
+            self.return_jumps.append(self.emit(JUMP))
+            self.depth -= 1
+
+def compile_program(program, roots=('main',), inline=True):
+    # Verifica el programa con SemanticAnalyzer y lo compila; si hay errores
+    # semánticos lanza CompileError con todos ellos. Solo se analizan y
+    # compilan las funciones alcanzables desde roots (todas si es None)
+    analyzer = SemanticAnalyzer(roots)
+    analyzer.analyze(program)
+    if analyzer.errors:
+        raise CompileError('El programa tiene errores semánticos:\n' +
+                           '\n'.join(f' - {err}' for err in analyzer.errors))
+    return BytecodeCompiler(roots, inline).compile(program)
+
+# =========================================
+# MÁQUINA VIRTUAL
+# =========================================
+
+class Frame:
+    __slots__ = ('return_pc', 'fp')
+
+    def __init__(self):
+        self.return_pc = 0
+        self.fp = 0
+
+class VirtualMachine:
+    def __init__(self, bytecode, stack_size=STACK_SIZE, max_frames=MAX_FRAMES):
+        self.bytecode = bytecode
+        self.stack = [0] * stack_size
+        self.frames = [Frame()]
+        self.max_frames = max_frames
+        self.globals = list(bytecode.global_zeros)
+        # Por índice de función: (entrada, parámetros, slots, tamaño del marco)
+        self.function_table = [None] * len(bytecode.functions)
+        for info in bytecode.functions.values():
+            self.function_table[info.index] = (info.entry, info.num_params, info.num_slots,
+                                               info.frame_size)
+        self.calls = 0   # llamadas de la última ejecución
+
+    def global_values(self):
+        return dict(zip(self.bytecode.global_names, self.globals))
+
+    def run(self, name='main', arguments=()):
+        # Ejecuta la función name con los argumentos dados y devuelve su
+        # valor de retorno. Las globales vuelven a su valor inicial
+        info = self.bytecode.functions.get(name)
+        if info is None:
+            raise VMError(f"La función '{name}' no existe")
+        if len(arguments) != info.num_params:
+            raise VMError(f"La función '{name}' espera {info.num_params} argumentos")
+        self.globals[:] = self.bytecode.global_zeros
+        stack = self.stack
+        stack_size = len(stack)
+        if info.frame_size > stack_size:
+            raise VMError('Desbordamiento de la pila de valores')
+        stack[:info.num_params] = arguments
+        try:
+            return self._execute(info.entry, info.num_slots)
+        except ZeroDivisionError:
+            raise VMError('División entre cero')
+
+    def _execute(self, pc, sp):
+        ops = self.bytecode.ops
+        args = self.bytecode.args
+        stack = self.stack
+        stack_size = len(stack)
+        globals_ = self.globals
+        frames = self.frames
+        function_table = self.function_table
+        max_frames = self.max_frames
+        fp = 0
+        depth = 0
+        calls = 0
+        while True:
+            op = ops[pc]
+            pc += 1
+            if op == LOAD:
+                stack[sp] = stack[fp + args[pc - 1]]
+                sp += 1
+            elif op == CONST:
+                stack[sp] = args[pc - 1]
+                sp += 1
+            elif op == STORE:
+                sp -= 1
+                stack[fp + args[pc - 1]] = stack[sp]
+            elif op == ADD:
+                sp -= 1
+                stack[sp - 1] += stack[sp]
+            elif op == SUB:
+                sp -= 1
+                stack[sp - 1] -= stack[sp]
+            elif op == JUMPF:
+                sp -= 1
+                if not stack[sp]:
+                    pc = args[pc - 1]
+            elif op == LT:
+                sp -= 1
+                stack[sp - 1] = 1 if stack[sp - 1] < stack[sp] else 0
+            elif op == GT:
+                sp -= 1
+                stack[sp - 1] = 1 if stack[sp - 1] > stack[sp] else 0
+            elif op == JUMP:
+                pc = args[pc - 1]
+            elif op == CALL:
+                entry, num_params, num_slots, frame_size = function_table[args[pc - 1]]
+                new_fp = sp - num_params
+                if new_fp + frame_size > stack_size:
+                    raise VMError('Desbordamiento de la pila de valores')
+                depth += 1
+                if depth == len(frames):
+                    if depth >= max_frames:
+                        raise VMError(f'Más de {max_frames} llamadas anidadas')
+                    frames.append(Frame())
+                frame = frames[depth]
+                frame.return_pc = pc
+                frame.fp = fp
+                fp = new_fp
+                sp = new_fp + num_slots
+                pc = entry
+                calls += 1
+            elif op == RET:
+                value = stack[sp - 1]
+                if depth == 0:
+                    self.calls = calls
+                    return value
+                frame = frames[depth]
+                depth -= 1
+                stack[fp] = value
+                sp = fp + 1
+                pc = frame.return_pc
+                fp = frame.fp
+            elif op == MUL:
+                sp -= 1
+                stack[sp - 1] *= stack[sp]
+            elif op == GLOAD:
+                stack[sp] = globals_[args[pc - 1]]
+                sp += 1
+            elif op == GSTORE:
+                sp -= 1
+                globals_[args[pc - 1]] = stack[sp]
+            elif op == POP:
+                sp -= 1
+            elif op == DIV or op == MOD:
+                sp -= 1
+                a, b = stack[sp - 1], stack[sp]
+                q = abs(a) // abs(b)
+                if (a < 0) != (b < 0):
+                    q = -q
+                stack[sp - 1] = q if op == DIV else a - b * q
+            elif op == LE:
+                sp -= 1
+                stack[sp - 1] = 1 if stack[sp - 1] <= stack[sp] else 0
+            elif op == GE:
+                sp -= 1
+                stack[sp - 1] = 1 if stack[sp - 1] >= stack[sp] else 0
+            elif op == EQ:
+                sp -= 1
+                stack[sp - 1] = 1 if stack[sp - 1] == stack[sp] else 0
+            elif op == NE:
+                sp -= 1
+                stack[sp - 1] = 1 if stack[sp - 1] != stack[sp] else 0
+            else:
+                raise VMError(f'Código de operación desconocido: {op}')
+
+# =========================================
+# BENCHMARK: RECURSIÓN PROFUNDA Y BUCLES CON LLAMADAS
+# =========================================
+
+def crear_programa_benchmark():
+    # suma(n): recursión de profundidad n; fib(n): árbol de llamadas;
+    # bucle(n): n iteraciones con dos llamadas a funciones pequeñas cada una;
+    # sin_usar no se llama desde ninguna
+    def call(name, *args):
+        return FunctionCall(name, list(args))
+
+    def binary(left, operator, right):
+        return BinaryExpression(left, operator, right)
+
+    n = Identifier("n")
+    suma = FunctionDeclaration("suma", [("n", "int")], "int", [
+        IfStatement(binary(n, "<", Literal(1)), [ReturnStatement(Literal(0))]),
+        ReturnStatement(binary(n, "+", call("suma", binary(n, "-", Literal(1))))),
+    ])
+    fib = FunctionDeclaration("fib", [("n", "int")], "int", [
+        IfStatement(binary(n, "<", Literal(2)), [ReturnStatement(n)]),
+        ReturnStatement(binary(call("fib", binary(n, "-", Literal(1))), "+",
+                               call("fib", binary(n, "-", Literal(2))))),
+    ])
+    x = Identifier("x")
+    cuadrado = FunctionDeclaration("cuadrado", [("x", "int")], "int", [
+        ReturnStatement(binary(binary(x, "*", x), "%", Literal(1000))),
+    ])
+    siguiente = FunctionDeclaration("siguiente", [("x", "int")], "int", [
+        ReturnStatement(binary(x, "+", Literal(1))),
+    ])
+    i, s = Identifier("i"), Identifier("s")
+    bucle = FunctionDeclaration("bucle", [("n", "int")], "int", [
+        VariableDeclaration("int", "i"),
+        VariableDeclaration("int", "s"),
+        WhileStatement(binary(i, "<", n), [
+            Assignment("s", binary(s, "+", call("cuadrado", i))),
+            Assignment("i", call("siguiente", i)),
+        ]),
+        ReturnStatement(s),
+    ])
+    sin_usar = FunctionDeclaration("sin_usar", [("x", "int")], "int", [
+        ReturnStatement(call("cuadrado", call("siguiente", x))),
+    ])
+    return Program([], [suma, fib, cuadrado, siguiente, bucle, sin_usar])
+
+if __name__ == '__main__':
+    import sys
+    from time import perf_counter
+
+    escala = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+    raices = ('suma', 'fib', 'bucle')
+    bytecode = compile_program(crear_programa_benchmark(), raices)
+    print(f'{len(bytecode.pruned)} funciones podadas ({", ".join(bytecode.pruned)}),'
+          f' {bytecode.inlined} llamadas expandidas en línea')
+    vm = VirtualMachine(bytecode)
+
+    def fib_python(n):
+        a, b = 0, 1
+        for _ in range(n):
+            a, b = b, a + b
+        return a
+
+    casos = [
+        ('suma', int(100_000 * escala), lambda n: n * (n + 1) // 2),
+        ('fib', 25 if escala >= 1 else 20, fib_python),
+        ('bucle', int(300_000 * escala), lambda n: sum(i * i % 1000 for i in range(n))),
+    ]
+    for name, argument, expected in casos:
+        start = perf_counter()
+        result = vm.run(name, (argument,))
+        elapsed = perf_counter() - start
+        assert result == expected(argument), (name, result)
+        print(f'{name}({argument}): {vm.calls:8d} llamadas en {elapsed * 1000:8.1f} ms'
+              f'  ({vm.calls / elapsed / 1e6:.2f} M llamadas/s)')
+
+    # La misma función sin expandir las llamadas en línea
+    argument = int(300_000 * escala)
+    for inline in (False, True):
+        vm = VirtualMachine(compile_program(crear_programa_benchmark(), raices, inline))
+        start = perf_counter()
+        result = vm.run('bucle', (argument,))
+        elapsed = perf_counter() - start
+        assert result == casos[2][2](argument), result
+        print(f'bucle({argument}) {"con" if inline else "sin"} expansión en línea:'
+              f' {vm.calls:8d} llamadas en {elapsed * 1000:8.1f} ms')
@@ -0,0 +1,186 @@
+# programas_prueba.py
+
+# =========================================
+# PROGRAMAS PARA LAS PRUEBAS
+# =========================================
+#
+# Lo comparten los test_*.py de esta carpeta:
+#
+# - programa_al_azar(semilla): un Program distinto para cada semilla, con
+#   globales, funciones que se llaman entre sí (y a veces a sí mismas),
+#   declaraciones en bloques anidados, if/else, while y return.
+# - ejecutar(programa, nombre, argumentos): intérprete de referencia que
+#   recorre el AST con la semántica de maquina_virtual ('/' y '%' truncan
+#   hacia cero, las comparaciones dan 1 o 0, una función sin return
+#   devuelve 0). Devuelve (valor de retorno, globales).
+
+import random
+
+from Analizador_Semantico import (Program, VariableDeclaration, Assignment, BinaryExpression,
+                                  Literal, Identifier, FunctionDeclaration, FunctionCall,
+                                  IfStatement, WhileStatement, ReturnStatement)
+
+LIMITE = 10 ** 30
+
+class Agotado(Exception):
+    # El programa superó el presupuesto de pasos o de llamadas anidadas, o
+    # calculó enteros de más de LIMITE
+    pass
+
+class _Retorno(Exception):
+    def __init__(self, valor):
+        self.valor = valor
+
+# =========================================
+# GENERADOR
+# =========================================
+
+def programa_al_azar(semilla):
+    # Devuelve (programa, argumentos de main). main es la primera función;
+    # cada función llama solo a las siguientes o a sí misma, y la última a
+    # veces no es alcanzable desde main
+    rng = random.Random(semilla)
+    nombres = ['main'] + [f'f{i}' for i in range(1, rng.randint(1, 4))]
+    parametros = {nombre: [f'p{j}' for j in range(rng.randint(0, 2))] for nombre in nombres}
+    contadores = [0]
+
+    def expresion(variables, profundidad, actual):
+        r = rng.random()
+        if profundidad <= 0 or r < 0.3:
+            if rng.random() < 0.4 or not variables:
+                return Literal(rng.randint(-3, 9))
+            return Identifier(rng.choice(variables))
+        if r < 0.45:
+            posteriores = nombres[actual + 1:]
+            if posteriores and rng.random() < 0.7:
+                llamada = rng.choice(posteriores)
+            elif rng.random() < 0.2:
+                llamada = nombres[actual]
+            else:
+                llamada = None
+            if llamada:
+                return FunctionCall(llamada, [expresion(variables, profundidad - 1, actual)
+                                              for _ in parametros[llamada]])
+        operador = rng.choice(['+', '+', '-', '-', '*', '<', '>', '/', '%']) if rng.random() < 0.9 else \
+            rng.choice(['==', '!=', '<=', '>='])
+        izquierda = expresion(variables, profundidad - 1, actual)
+        if operador in ('/', '%') and rng.random() < 0.7:
+            # Casi siempre un divisor distinto de cero
+            return BinaryExpression(izquierda, operador, Literal(rng.choice([-3, 2, 3, 7])))
+        return BinaryExpression(izquierda, operador, expresion(variables, profundidad - 1, actual))
+
+    def sentencias(variables, profundidad, actual, cantidad):
+        salida, variables, declaradas = [], list(variables), set()
+        for _ in range(cantidad):
+            r = rng.random()
+            if r < 0.2:
+                nombre = rng.choice('abcxy')
+                if nombre not in declaradas:
+                    declaradas.add(nombre)
+                    salida.append(VariableDeclaration('int', nombre))
+                    variables.append(nombre)
+            elif r < 0.55 and variables:
+                salida.append(Assignment(rng.choice(variables), expresion(variables, 2, actual)))
+            elif r < 0.7 and profundidad > 0:
+                otro = sentencias(variables, profundidad - 1, actual, 2) if rng.random() < 0.5 else None
+                salida.append(IfStatement(expresion(variables, 2, actual),
+                                          sentencias(variables, profundidad - 1, actual, 3), otro))
+            elif r < 0.8 and profundidad > 0:
+                # El contador es una variable nueva que el cuerpo no asigna
+                contadores[0] += 1
+                contador = f'i{contadores[0]}'
+                salida.append(VariableDeclaration('int', contador))
+                salida.append(Assignment(contador, expresion(variables, 1, actual)))
+                cuerpo = sentencias(variables, profundidad - 1, actual, 3)
+                cuerpo.append(Assignment(contador, BinaryExpression(Identifier(contador), '+', Literal(1))))
+                salida.append(WhileStatement(BinaryExpression(Identifier(contador), '<', Literal(5)), cuerpo))
+            elif r < 0.85 and actual + 1 < len(nombres):
+                llamada = nombres[actual + 1]
+                salida.append(FunctionCall(llamada, [expresion(variables, 1, actual)
+                                                     for _ in parametros[llamada]]))
+            elif r < 0.9:
+                salida.append(ReturnStatement(expresion(variables, 2, actual)))
+        return salida
+
+    funciones = [FunctionDeclaration(nombre, [(p, 'int') for p in parametros[nombre]], 'int',
+                                     sentencias(['g'] + parametros[nombre], 2, i, 6))
+                 for i, nombre in enumerate(nombres)]
+    argumentos = tuple(rng.randint(-2, 6) for _ in parametros['main'])
+    return Program([VariableDeclaration('int', 'g')], funciones), argumentos
+
+# =========================================
+# INTÉRPRETE DE REFERENCIA
+# =========================================
+
+def ejecutar(programa, nombre='main', argumentos=(), pasos=20000, profundidad_maxima=100):
+    funciones = {funcion.name: funcion for funcion in programa.functions}
+    globales = {decl.name: 0.0 if decl.var_type == 'float' else 0 for decl in programa.global_decls}
+    restantes = [pasos]
+
+    def llamar(funcion, valores, profundidad):
+        if profundidad > profundidad_maxima:
+            raise Agotado('demasiadas llamadas anidadas')
+        ambitos = [dict(zip([p for p, _ in funcion.parameters], valores))]
+        try:
+            bloque(funcion.body, ambitos, profundidad, nuevo=False)
+        except _Retorno as retorno:
+            return retorno.valor
+        return 0
+
+    def ambito_de(ambitos, nombre):
+        for ambito in reversed(ambitos):
+            if nombre in ambito:
+                return ambito
+        return globales
+
+    def evaluar(expr, ambitos, profundidad):
+        restantes[0] -= 1
+        if restantes[0] < 0:
+            raise Agotado('demasiados pasos')
+        if isinstance(expr, Literal):
+            return expr.value
+        if isinstance(expr, Identifier):
+            return ambito_de(ambitos, expr.name)[expr.name]
+        if isinstance(expr, FunctionCall):
+            valores = [evaluar(arg, ambitos, profundidad) for arg in expr.arguments]
+            return llamar(funciones[expr.name], valores, profundidad + 1)
+        a = evaluar(expr.left, ambitos, profundidad)
+        b = evaluar(expr.right, ambitos, profundidad)
+        operador = expr.operator
+        if operador in ('/', '%'):
+            cociente = abs(a) // abs(b)
+            if (a < 0) != (b < 0):
+                cociente = -cociente
+            return cociente if operador == '/' else a - b * cociente
+        if operador in ('+', '-', '*'):
+            if abs(a) > LIMITE or abs(b) > LIMITE:
+                # Los enteros que crecen sin medida hacen lenta la prueba
+                raise Agotado('enteros demasiado grandes')
+            return a + b if operador == '+' else a - b if operador == '-' else a * b
+        return int({'<': a < b, '>': a > b, '<=': a <= b, '>=': a >= b,
+                    '==': a == b, '!=': a != b}[operador])
+
+    def bloque(lista, ambitos, profundidad, nuevo=True):
+        if nuevo:
+            ambitos = ambitos + [{}]
+        for sentencia in lista:
+            if isinstance(sentencia, VariableDeclaration):
+                ambitos[-1][sentencia.name] = 0.0 if sentencia.var_type == 'float' else 0
+            elif isinstance(sentencia, Assignment):
+                valor = evaluar(sentencia.expr, ambitos, profundidad)
+                ambito_de(ambitos, sentencia.name)[sentencia.name] = valor
+            elif isinstance(sentencia, FunctionCall):
+                evaluar(sentencia, ambitos, profundidad)
+            elif isinstance(sentencia, IfStatement):
+                if evaluar(sentencia.condition, ambitos, profundidad):
+                    bloque(sentencia.then_body, ambitos, profundidad)
+                elif sentencia.else_body:
+                    bloque(sentencia.else_body, ambitos, profundidad)
+            elif isinstance(sentencia, WhileStatement):
+                while evaluar(sentencia.condition, ambitos, profundidad):
+                    bloque(sentencia.body, ambitos, profundidad)
+            elif isinstance(sentencia, ReturnStatement):
+                raise _Retorno(evaluar(sentencia.expr, ambitos, profundidad)
+                               if sentencia.expr is not None else 0)
+
+    return llamar(funciones[nombre], list(argumentos), 0), globales
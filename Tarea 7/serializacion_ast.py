@@ -0,0 +1,354 @@
+# serializacion_ast.py
+
+# =========================================
+# SERIALIZACIÓN BINARIA COMPACTA DEL AST
+# =========================================
+#
+# Codifica el AST de Analizador_Semantico.py (Program, FunctionDeclaration,
+# ...) en bytes para guardarlo en una caché o pasarlo a otro proceso. Ocupa
+# menos y es más rápido que pickle, y el codificador y el decodificador usan
+# una pila explícita, así que no dependen del límite de recursión.
+#
+# El árbol se escribe en preorden como un flujo de enteros. Por cada nodo:
+# el índice de su clase y, en el orden de FIELDS, un entero por campo:
+#
+#   VALUE  índice en la tabla de valores internados (nombres, tipos, ...)
+#   NODE   1 si hay nodo hijo, 0 si es None
+#   NODES  número de hijos + 1 (0 significa None, p. ej. else_body)
+#   PARAMS número de parámetros, seguido de dos índices (nombre, tipo) por cada uno
+#
+# Los nodos hijos van a continuación, en el orden de los campos.
+#
+# Distribución del archivo (little-endian):
+#   cabecera   b'T7AS' + versión (u8)
+#   valores    u32 cantidad + una etiqueta (u8) por valor, y después los
+#              enteros (i64), los reales (f64) y los textos (longitudes en
+#              caracteres + UTF-8 concatenado) en el orden de la tabla; los
+#              enteros que no caben en i64 van como texto decimal
+#   flujo      u32 longitud + typecode ('B', 'H' o 'I') + los enteros
+
+import gc
+import struct
+import sys
+from array import array
+
+from Analizador_Semantico import (Program, VariableDeclaration, Assignment, BinaryExpression,
+                                  Literal, Identifier, FunctionDeclaration, FunctionCall,
+                                  IfStatement, WhileStatement, ReturnStatement)
+
+MAGIC = b'T7AS'
+VERSION = 2
+
+VALUE, NODE, NODES, PARAMS = range(4)
+
+FIELDS = {
+    Program: (('global_decls', NODES), ('functions', NODES)),
+    VariableDeclaration: (('var_type', VALUE), ('name', VALUE)),
+    Assignment: (('name', VALUE), ('expr', NODE)),
+    BinaryExpression: (('left', NODE), ('operator', VALUE), ('right', NODE)),
+    Literal: (('value', VALUE), ('lit_type', VALUE)),
+    Identifier: (('name', VALUE),),
+    FunctionDeclaration: (('name', VALUE), ('parameters', PARAMS),
+                          ('return_type', VALUE), ('body', NODES)),
+    FunctionCall: (('name', VALUE), ('arguments', NODES)),
+    IfStatement: (('condition', NODE), ('then_body', NODES), ('else_body', NODES)),
+    WhileStatement: (('condition', NODE), ('body', NODES)),
+    ReturnStatement: (('expr', NODE),),
+}
+CLASSES = list(FIELDS)
+CLASS_INDEX = {cls: i for i, cls in enumerate(CLASSES)}
+
+# Etiquetas de la tabla de valores
+T_NONE, T_BOOL, T_INT, T_FLOAT, T_STR, T_BIGINT = range(6)
+
+_U8 = struct.Struct('<B')
+_U32 = struct.Struct('<I')
+
+class ASTFormatError(ValueError):
+    pass
+
+# =========================================
+# CODIFICACIÓN
+# =========================================
+
+def _pack_array(out, typecode, values):
+    values = array(typecode, values)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    out += values.tobytes()
+
+def _pack_index_array(out, values):
+    largest = max(values, default=0)
+    typecode = 'B' if largest < 2 ** 8 else 'H' if largest < 2 ** 16 else 'I'
+    out += _U32.pack(len(values))
+    out += typecode.encode('ascii')
+    _pack_array(out, typecode, values)
+
+def _pack_values(out, values):
+    tags, ints, floats, texts = bytearray(), [], [], []
+    for value in values:
+        if value is None:
+            tags.append(T_NONE)
+        elif value is True or value is False:
+            tags.append(T_BOOL)
+            ints.append(int(value))
+        elif isinstance(value, int) and -2 ** 63 <= value < 2 ** 63:
+            tags.append(T_INT)
+            ints.append(value)
+        elif isinstance(value, int):
+            # Fuera del rango de i64: su texto decimal va con los textos
+            tags.append(T_BIGINT)
+            texts.append(str(value))
+        elif isinstance(value, float):
+            tags.append(T_FLOAT)
+            floats.append(value)
+        elif isinstance(value, str):
+            tags.append(T_STR)
+            texts.append(value)
+        else:
+            raise TypeError(f"Valor no serializable en el AST: {value!r}")
+    out += _U32.pack(len(values))
+    out += tags
+    _pack_array(out, 'q', ints)
+    _pack_array(out, 'd', floats)
+    _pack_index_array(out, [len(text) for text in texts])
+    data = ''.join(texts).encode('utf-8')
+    out += _U32.pack(len(data))
+    out += data
+
+def dumps(root):
+    values, value_index = [], {}
+    stream = []
+    append = stream.append
+
+    def intern(value):
+        # El tipo forma parte de la clave: 1, 1.0 y True son distintos
+        key = (value.__class__, value)
+        index = value_index.get(key)
+        if index is None:
+            index = value_index[key] = len(values)
+            values.append(value)
+        return index
+
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        cls = node.__class__
+        if cls not in CLASS_INDEX:
+            raise TypeError(f"Nodo no serializable: {cls.__name__}")
+        append(CLASS_INDEX[cls])
+        children = []
+        for name, kind in FIELDS[cls]:
+            field = getattr(node, name)
+            if kind == VALUE:
+                append(intern(field))
+            elif kind == NODE:
+                if field is None:
+                    append(0)
+                else:
+                    append(1)
+                    children.append(field)
+            elif kind == NODES:
+                if field is None:
+                    append(0)
+                else:
+                    append(len(field) + 1)
+                    children.extend(field)
+            else:
+                append(len(field))
+                for param_name, param_type in field:
+                    append(intern(param_name))
+                    append(intern(param_type))
+        if children:
+            children.reverse()
+            stack.extend(children)
+
+    out = bytearray(MAGIC)
+    out += _U8.pack(VERSION)
+    _pack_values(out, values)
+    _pack_index_array(out, stream)
+    return bytes(out)
+
+# =========================================
+# DECODIFICACIÓN
+# =========================================
+
+class _Reader:
+    def __init__(self, data):
+        self.data = memoryview(data)
+        self.pos = 0
+
+    def unpack(self, fmt):
+        try:
+            (value,) = fmt.unpack_from(self.data, self.pos)
+        except struct.error:
+            raise ASTFormatError("AST binario truncado")
+        self.pos += fmt.size
+        return value
+
+    def take(self, size):
+        if self.pos + size > len(self.data):
+            raise ASTFormatError("AST binario truncado")
+        chunk = self.data[self.pos:self.pos + size]
+        self.pos += size
+        return chunk
+
+    def array(self, typecode, count):
+        values = array(typecode)
+        values.frombytes(self.take(count * values.itemsize))
+        if sys.byteorder == 'big':
+            values.byteswap()
+        return values.tolist()
+
+    def index_array(self):
+        count = self.unpack(_U32)
+        typecode = str(self.take(1), 'ascii')
+        if typecode not in ('B', 'H', 'I'):
+            raise ASTFormatError(f"Typecode inválido: {typecode!r}")
+        return self.array(typecode, count)
+
+    def values(self):
+        tags = bytes(self.take(self.unpack(_U32)))
+        ints = iter(self.array('q', tags.count(T_INT) + tags.count(T_BOOL)))
+        floats = iter(self.array('d', tags.count(T_FLOAT)))
+        lengths = iter(self.index_array())
+        text = str(self.take(self.unpack(_U32)), 'utf-8')
+        values, start = [], 0
+        for tag in tags:
+            if tag == T_STR or tag == T_BIGINT:
+                end = start + next(lengths)
+                values.append(text[start:end] if tag == T_STR else int(text[start:end]))
+                start = end
+            elif tag == T_INT:
+                values.append(next(ints))
+            elif tag == T_FLOAT:
+                values.append(next(floats))
+            elif tag == T_BOOL:
+                values.append(bool(next(ints)))
+            elif tag == T_NONE:
+                values.append(None)
+            else:
+                raise ASTFormatError(f"Etiqueta de valor desconocida: {tag}")
+        return values
+
+def loads(data):
+    reader = _Reader(data)
+    if bytes(reader.take(len(MAGIC))) != MAGIC:
+        raise ASTFormatError("No es un AST binario de Tarea 7")
+    version = reader.unpack(_U8)
+    if version != VERSION:
+        raise ASTFormatError(f"Versión de AST no soportada: {version}")
+    values = reader.values()
+    stream = iter(reader.index_array())
+
+    root = []
+    # Pila de huecos por llenar: cada hueco es (objeto, atributo) o
+    # (lista, None); cada marco está invertido para sacar el siguiente con pop()
+    frames = [[(root, None)]]
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        while frames:
+            frame = frames[-1]
+            if not frame:
+                frames.pop()
+                continue
+            target, attr = frame.pop()
+            cls = CLASSES[next(stream)]
+            node = cls.__new__(cls)
+            if attr is None:
+                target.append(node)
+            else:
+                setattr(target, attr, node)
+            slots = []
+            for name, kind in FIELDS[cls]:
+                if kind == VALUE:
+                    setattr(node, name, values[next(stream)])
+                elif kind == NODE:
+                    setattr(node, name, None)
+                    if next(stream):
+                        slots.append((node, name))
+                elif kind == NODES:
+                    count = next(stream)
+                    if count:
+                        children = []
+                        slots.extend([(children, None)] * (count - 1))
+                    else:
+                        children = None
+                    setattr(node, name, children)
+                else:
+                    setattr(node, name, [(values[next(stream)], values[next(stream)])
+                                         for _ in range(next(stream))])
+            if slots:
+                slots.reverse()
+                frames.append(slots)
+    except (StopIteration, IndexError):
+        raise ASTFormatError("Flujo de nodos inválido")
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return root[0]
+
+# =========================================
+# BENCHMARK FRENTE A PICKLE
+# =========================================
+
+def crear_programa_grande(funciones):
+    # Programa sintético: cada función declara variables, hace cálculos en un
+    # bucle con un if y llama a la anterior
+    functions = []
+    for i in range(funciones):
+        body = [
+            VariableDeclaration("int", "x"),
+            VariableDeclaration("int", "y"),
+            Assignment("x", BinaryExpression(Identifier("n"), "*", Literal(i))),
+            WhileStatement(
+                condition=BinaryExpression(Identifier("x"), ">", Literal(0)),
+                body=[
+                    Assignment("y", BinaryExpression(Identifier("y"), "+", Identifier("x"))),
+                    IfStatement(
+                        condition=BinaryExpression(Identifier("y"), ">", Literal(100)),
+                        then_body=[Assignment("y", Literal(0))],
+                        else_body=None
+                    ),
+                    Assignment("x", BinaryExpression(Identifier("x"), "-", Literal(1)))
+                ]
+            ),
+        ]
+        if i:
+            body.append(Assignment("y", FunctionCall(f"f{i - 1}", [Identifier("y")])))
+        body.append(ReturnStatement(Identifier("y")))
+        functions.append(FunctionDeclaration(f"f{i}", [("n", "int")], "int", body))
+    return Program([VariableDeclaration("int", "a")], functions)
+
+if __name__ == '__main__':
+    import pickle
+    from time import perf_counter
+    from Analizador_Semantico import crear_programa_ejemplo
+
+    def best_of(function, *args):
+        best = None
+        for _ in range(5):
+            start = perf_counter()
+            result = function(*args)
+            elapsed = perf_counter() - start
+            if best is None or elapsed < best[0]:
+                best = (elapsed, result)
+        return best
+
+    ejemplo = crear_programa_ejemplo()
+    assert dumps(loads(dumps(ejemplo))) == dumps(ejemplo)
+
+    funciones = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    programa = crear_programa_grande(funciones)
+    t_pickle_dump, pickled = best_of(pickle.dumps, programa, pickle.HIGHEST_PROTOCOL)
+    t_pickle_load, _ = best_of(pickle.loads, pickled)
+    t_dump, encoded = best_of(dumps, programa)
+    t_load, decoded = best_of(loads, encoded)
+    assert dumps(decoded) == encoded
+
+    print(f"{funciones} funciones")
+    print(f"  pickle  : {len(pickled):9d} bytes  codificar {t_pickle_dump * 1000:7.2f} ms"
+          f"  decodificar {t_pickle_load * 1000:7.2f} ms")
+    print(f"  binario : {len(encoded):9d} bytes  codificar {t_dump * 1000:7.2f} ms"
+          f"  decodificar {t_load * 1000:7.2f} ms")
@@ -0,0 +1,131 @@
+# test_maquina_virtual.py
+
+# =========================================
+# PRUEBAS DE LA MÁQUINA VIRTUAL
+# =========================================
+#
+# El bytecode da el mismo valor de retorno y las mismas globales que el
+# intérprete de referencia de programas_prueba, con y sin expansión en
+# línea, y la profundidad de las llamadas no depende del límite de recursión
+# de Python.
+
+import contextlib
+import io
+
+import pytest
+
+from Analizador_Semantico import (Program, VariableDeclaration, Assignment, BinaryExpression,
+                                  Literal, Identifier, FunctionDeclaration, FunctionCall,
+                                  ReturnStatement)
+from maquina_virtual import (CompileError, VirtualMachine, VMError, compile_program,
+                             crear_programa_benchmark)
+from programas_prueba import Agotado, ejecutar, programa_al_azar
+
+def compilar(programa, **opciones):
+    # El analizador escribe sus mensajes en la salida estándar
+    with contextlib.redirect_stdout(io.StringIO()):
+        return compile_program(programa, **opciones)
+
+def resultado_vm(bytecode, nombre='main', argumentos=()):
+    vm = VirtualMachine(bytecode, stack_size=4096)
+    try:
+        return vm.run(nombre, argumentos), vm.global_values()
+    except VMError as error:
+        assert 'cero' in str(error)
+        return ZeroDivisionError
+
+def resultado_referencia(programa, argumentos):
+    try:
+        return ejecutar(programa, 'main', argumentos)
+    except ZeroDivisionError:
+        return ZeroDivisionError
+
+@pytest.mark.parametrize('semilla', range(300))
+def test_igual_que_la_referencia(semilla):
+    programa, argumentos = programa_al_azar(semilla)
+    try:
+        esperado = resultado_referencia(programa, argumentos)
+    except Agotado:
+        pytest.skip('el programa no termina dentro del presupuesto')
+    assert resultado_vm(compilar(programa, inline=False), 'main', argumentos) == esperado
+
+@pytest.mark.parametrize('semilla', range(300))
+def test_expansion_en_linea_igual_que_la_referencia(semilla):
+    programa, argumentos = programa_al_azar(semilla)
+    try:
+        esperado = resultado_referencia(programa, argumentos)
+    except Agotado:
+        pytest.skip('el programa no termina dentro del presupuesto')
+    assert resultado_vm(compilar(programa), 'main', argumentos) == esperado
+
+def test_los_programas_al_azar_expanden_y_podan():
+    # Si ninguna llamada se expandiera, la prueba anterior no probaría nada
+    bytecodes = [compilar(programa_al_azar(semilla)[0]) for semilla in range(300)]
+    assert sum(bytecode.inlined > 0 for bytecode in bytecodes) >= 10
+    assert sum(len(bytecode.pruned) > 0 for bytecode in bytecodes) >= 10
+
+def test_recursion_profunda():
+    # Mucho más profundo que el límite de recursión de Python
+    vm = VirtualMachine(compilar(crear_programa_benchmark(), roots=('suma', 'fib', 'bucle'), inline=False))
+    assert vm.run('suma', (50000,)) == 50000 * 50001 // 2
+    assert vm.run('fib', (15,)) == 610
+    assert vm.run('bucle', (1000,)) == sum(i * i % 1000 for i in range(1000))
+    assert vm.calls == 2000
+
+def test_demasiadas_llamadas():
+    bytecode = compilar(crear_programa_benchmark(), roots=('suma',))
+    with pytest.raises(VMError):
+        VirtualMachine(bytecode, max_frames=100).run('suma', (1000,))
+    # La máquina sigue sirviendo después del error
+    vm = VirtualMachine(bytecode, max_frames=100)
+    with pytest.raises(VMError):
+        vm.run('suma', (1000,))
+    assert vm.run('suma', (10,)) == 55
+
+def test_expansion_del_benchmark():
+    bytecode = compilar(crear_programa_benchmark(), roots=('suma', 'fib', 'bucle'))
+    assert bytecode.pruned == ['sin_usar']
+    assert bytecode.inlined == 2
+    vm = VirtualMachine(bytecode)
+    # cuadrado y siguiente se expanden; las recursivas no
+    assert vm.run('bucle', (1000,)) == sum(i * i % 1000 for i in range(1000))
+    assert vm.calls == 0
+    assert vm.run('fib', (15,)) == 610
+    assert vm.calls > 0
+
+def test_cada_nombre_es_la_misma_variable():
+    # f usa un parámetro con el mismo nombre que un local de main y escribe
+    # la global g; expandida en línea debe comportarse igual que llamada
+    f = FunctionDeclaration('f', [('x', 'int')], 'int', [
+        VariableDeclaration('int', 'y'),
+        Assignment('y', BinaryExpression(Identifier('x'), '*', Literal(10))),
+        Assignment('g', BinaryExpression(Identifier('g'), '+', Identifier('y'))),
+        ReturnStatement(BinaryExpression(Identifier('y'), '+', Literal(1))),
+    ])
+    main = FunctionDeclaration('main', [], 'int', [
+        VariableDeclaration('int', 'x'),
+        VariableDeclaration('int', 'y'),
+        Assignment('x', Literal(3)),
+        Assignment('y', FunctionCall('f', [BinaryExpression(Identifier('x'), '+', Literal(1))])),
+        ReturnStatement(BinaryExpression(BinaryExpression(Identifier('x'), '*', Literal(1000)), '+',
+                                         BinaryExpression(Identifier('y'), '+',
+                                                          FunctionCall('f', [Identifier('x')])))),
+    ])
+    programa = Program([VariableDeclaration('int', 'g')], [main, f])
+    esperado = ejecutar(programa)
+    assert esperado == (3000 + 41 + 31, {'g': 70})
+    for inline in (False, True):
+        bytecode = compilar(programa, inline=inline)
+        assert bytecode.inlined == (2 if inline else 0)
+        assert resultado_vm(bytecode) == esperado
+
+def test_poda_de_funciones_inalcanzables():
+    # sin_usar tiene un error semántico, pero no se llama desde main
+    sin_usar = FunctionDeclaration('sin_usar', [], 'int', [Assignment('no_declarada', Literal(1))])
+    main = FunctionDeclaration('main', [], 'int', [ReturnStatement(Literal(7))])
+    programa = Program([], [main, sin_usar])
+    bytecode = compilar(programa)
+    assert bytecode.pruned == ['sin_usar']
+    assert VirtualMachine(bytecode).run('main', ()) == 7
+    with pytest.raises(CompileError):
+        compilar(programa, roots=None)
@@ -0,0 +1,70 @@
+# test_serializacion_ast.py
+
+# =========================================
+# PRUEBAS DE LA SERIALIZACIÓN BINARIA DEL AST
+# =========================================
+#
+# loads(dumps(programa)) reproduce el árbol campo a campo (con el tipo de
+# cada valor, y None distinto de una lista vacía), sin depender del límite
+# de recursión.
+
+import pytest
+
+from Analizador_Semantico import (Node, Program, VariableDeclaration, Assignment, BinaryExpression,
+                                  Literal, Identifier, FunctionDeclaration, IfStatement,
+                                  ReturnStatement, crear_programa_ejemplo)
+from programas_prueba import programa_al_azar
+from serializacion_ast import ASTFormatError, crear_programa_grande, dumps, loads
+
+def aplanar(raiz):
+    # El árbol en preorden como filas comparables, sin recursión
+    filas, pila = [], [raiz]
+    while pila:
+        valor = pila.pop()
+        if isinstance(valor, Node):
+            campos = sorted(vars(valor).items())
+            filas.append((type(valor).__name__, tuple(nombre for nombre, _ in campos)))
+            pila.extend(reversed([campo for _, campo in campos]))
+        elif isinstance(valor, (list, tuple)):
+            filas.append((type(valor), len(valor)))
+            pila.extend(reversed(valor))
+        else:
+            filas.append((type(valor), valor))
+    return filas
+
+@pytest.mark.parametrize('semilla', range(200))
+def test_programas_al_azar(semilla):
+    programa, _argumentos = programa_al_azar(semilla)
+    assert aplanar(loads(dumps(programa))) == aplanar(programa)
+
+def test_programas_de_ejemplo():
+    for programa in (crear_programa_ejemplo(), crear_programa_grande(50)):
+        assert aplanar(loads(dumps(programa))) == aplanar(programa)
+
+def test_valores_conservan_su_tipo():
+    literales = [Literal(1), Literal(1.0, 'float'), Literal(True, 'bool'), Literal(2 ** 63),
+                 Literal(-2 ** 63 - 1), Literal(10 ** 40), Literal(-2 ** 63), Literal('x', 'str')]
+    cuerpo = [Assignment('a', literal) for literal in literales]
+    cuerpo.append(IfStatement(Identifier('a'), [], None))
+    cuerpo.append(IfStatement(Identifier('a'), [ReturnStatement()], []))
+    programa = Program([VariableDeclaration('int', 'a')],
+                       [FunctionDeclaration('main', [('p', 'int')], 'void', cuerpo)])
+    assert aplanar(loads(dumps(programa))) == aplanar(programa)
+
+def test_arbol_profundo():
+    # 1 + (1 + (1 + ...)): mucho más profundo que el límite de recursión
+    expr = Literal(1)
+    for _ in range(100000):
+        expr = BinaryExpression(Literal(1), '+', expr)
+    programa = Program([], [FunctionDeclaration('main', [], 'int', [ReturnStatement(expr)])])
+    assert aplanar(loads(dumps(programa))) == aplanar(programa)
+
+def test_rechaza_datos_corruptos():
+    datos = dumps(crear_programa_ejemplo())
+    with pytest.raises(ASTFormatError):
+        loads(b'XXXX' + datos[4:])
+    with pytest.raises(ASTFormatError):
+        loads(datos[:4] + bytes([99]) + datos[5:])
+    for fin in range(len(datos)):
+        with pytest.raises(ASTFormatError):
+            loads(datos[:fin])
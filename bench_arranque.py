@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark de arranque de procesos
+---------------------------------
+Compara cuánto tarda en arrancar un proceso (y un pool de procesos
+trabajadores con el método 'spawn') que importa solo el núcleo sin interfaz
+de cada compilador frente a uno que importa el módulo de la interfaz gráfica.
+
+Uso:
+    python bench_arranque.py [-n REPETICIONES] [-j TRABAJADORES]
+"""
+
+import argparse
+import importlib
+import os
+import statistics
+import subprocess
+import sys
+import time
+from multiprocessing import get_context
+
+RAIZ = os.path.dirname(os.path.abspath(__file__))
+
+# (carpeta, módulo del núcleo, módulo de la interfaz gráfica)
+CASOS = [
+    (RAIZ, "tokenizador", "Analizador_Flex"),
+    (os.path.join(RAIZ, "Tarea 4"), "gramatica", "AnalizadorSintactico"),
+    (os.path.join(RAIZ, "Semana 7 Real"), "minipy", "Compilador"),
+]
+
+
+def _importar(carpeta, modulo):
+    sys.path.insert(0, carpeta)
+    importlib.import_module(modulo)
+
+
+def _nada(_):
+    return os.getpid()
+
+
+def tiempo_proceso(carpeta, modulo, repeticiones):
+    """
+    Mediana (s) de lanzar un intérprete nuevo que solo importa el módulo.
+    """
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        subprocess.run([sys.executable, "-c", f"import {modulo}"], cwd=carpeta, check=True)
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos)
+
+
+def tiempo_pool(carpeta, modulo, trabajadores, repeticiones):
+    """
+    Mediana (s) del tiempo hasta que un pool 'spawn' tiene todos sus
+    trabajadores listos con el módulo importado.
+    """
+    contexto = get_context("spawn")
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        with contexto.Pool(trabajadores, initializer=_importar, initargs=(carpeta, modulo)) as pool:
+            pool.map(_nada, range(trabajadores), chunksize=1)
+            tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos)
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Mide el arranque de procesos trabajadores.")
+    arg_parser.add_argument("-n", "--repeticiones", type=int, default=5)
+    arg_parser.add_argument("-j", "--trabajadores", type=int, default=os.cpu_count() or 1)
+    args = arg_parser.parse_args(argv)
+
+    print(f"{'módulo':<22}{'proceso (ms)':>14}{'pool x' + str(args.trabajadores) + ' (ms)':>16}")
+    for carpeta, nucleo, interfaz in CASOS:
+        for modulo in (nucleo, interfaz):
+            proceso = tiempo_proceso(carpeta, modulo, args.repeticiones)
+            pool = tiempo_pool(carpeta, modulo, args.trabajadores, args.repeticiones)
+            print(f"{modulo:<22}{proceso * 1000:>14.1f}{pool * 1000:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+# Serialización binaria compacta del AST (parser.Node).
+#
+# Pensada para la caché de compilación y para pasar árboles entre procesos
+# (por ejemplo al pool del sandbox o al servidor de compilación): ocupa menos
+# y es más rápida que pickle, y tanto el codificador como el decodificador
+# usan una pila explícita, así que no dependen del límite de recursión.
+#
+# El árbol se escribe en preorden como un flujo de enteros, cuatro por nodo:
+#
+#     etiqueta, número de hijos, línea, columna
+#
+# donde la etiqueta es un índice a la tabla de etiquetas internadas y línea o
+# columna 0 significa None. Distribución del archivo (little-endian):
+#
+#     cabecera    b'PAST' + versión (u8)
+#     etiquetas   u32 longitud + las etiquetas en UTF-8 separadas por '\0'
+#     flujo       u32 longitud + typecode ('B', 'H' o 'I') + los enteros
+
+import gc
+import struct
+import sys
+from array import array
+
+from parser import Node
+
+MAGIC = b'PAST'
+VERSION = 1
+
+_U8 = struct.Struct('<B')
+_U32 = struct.Struct('<I')
+
+class ASTFormatError(ValueError):
+    pass
+
+def dumps(ast):
+    labels, label_index = [], {}
+    stream = []
+    append = stream.append
+    stack = [ast]
+    pop, extend = stack.pop, stack.extend
+    while stack:
+        node = pop()
+        label = node.label
+        index = label_index.get(label)
+        if index is None:
+            if '\0' in label:
+                raise ValueError(f'Etiqueta no serializable: {label!r}')
+            index = label_index[label] = len(labels)
+            labels.append(label)
+        children = node.children
+        append(index)
+        append(len(children))
+        append(node.line or 0)
+        append(node.column or 0)
+        if children:
+            extend(reversed(children))
+
+    out = bytearray(MAGIC)
+    out += _U8.pack(VERSION)
+    data = '\0'.join(labels).encode('utf-8')
+    out += _U32.pack(len(data))
+    out += data
+    largest = max(stream)
+    typecode = 'B' if largest < 2 ** 8 else 'H' if largest < 2 ** 16 else 'I'
+    values = array(typecode, stream)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    out += _U32.pack(len(stream))
+    out += typecode.encode('ascii')
+    out += values.tobytes()
+    return bytes(out)
+
+def loads(data):
+    data = memoryview(data)
+    if bytes(data[:4]) != MAGIC:
+        raise ASTFormatError('No es un AST binario')
+    if len(data) < 14:
+        raise ASTFormatError('AST binario truncado')
+    version = data[4]
+    if version != VERSION:
+        raise ASTFormatError(f'Versión de AST no soportada: {version}')
+    (size,) = _U32.unpack_from(data, 5)
+    labels = str(data[9:9 + size], 'utf-8').split('\0')
+    pos = 9 + size
+    try:
+        (count,) = _U32.unpack_from(data, pos)
+        typecode = str(data[pos + 4:pos + 5], 'ascii')
+    except struct.error:
+        raise ASTFormatError('AST binario truncado')
+    if typecode not in ('B', 'H', 'I'):
+        raise ASTFormatError(f'Typecode inválido: {typecode!r}')
+    stream = array(typecode)
+    end = pos + 5 + count * stream.itemsize
+    if end > len(data) or count % 4:
+        raise ASTFormatError('AST binario truncado')
+    stream.frombytes(data[pos + 5:end])
+    if sys.byteorder == 'big':
+        stream.byteswap()
+    stream = stream.tolist()
+
+    root = []
+    # Pila de [lista de hijos por llenar, hijos que faltan]
+    pending = [[root, 1]]
+    i = 0
+    # Se crean muchos objetos seguidos y ninguno es basura: sin pausar el
+    # recolector de ciclos, este recorrería el árbol una y otra vez
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        while pending:
+            top = pending[-1]
+            if not top[1]:
+                pending.pop()
+                continue
+            top[1] -= 1
+            label, children, line, column = stream[i:i + 4]
+            i += 4
+            node = Node(labels[label], None, line or None, column or None)
+            top[0].append(node)
+            if children:
+                pending.append([node.children, children])
+    except (ValueError, IndexError):
+        raise ASTFormatError('Flujo de nodos inválido')
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return root[0]
+
+if __name__ == '__main__':
+    # Benchmark frente a pickle: tamaño y tiempo de codificar y decodificar
+    import pickle
+    from time import perf_counter
+    from intermediate import compile_code
+
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    source = []
+    for i in range(statements):
+        source.append(f'x{i % 100} = ({i} + y) * x{(i + 1) % 100} - 3')
+        if i % 10 == 0:
+            source.append(f'if x{i % 100} then\n    y = {i}\nend')
+    _code, ast = compile_code('\n'.join(source))
+
+    def best_of(function, *args):
+        best = None
+        for _ in range(5):
+            start = perf_counter()
+            result = function(*args)
+            elapsed = perf_counter() - start
+            if best is None or elapsed < best[0]:
+                best = (elapsed, result)
+        return best
+
+    t_pickle_dump, pickled = best_of(pickle.dumps, ast, pickle.HIGHEST_PROTOCOL)
+    t_pickle_load, _ = best_of(pickle.loads, pickled)
+    t_dump, encoded = best_of(dumps, ast)
+    t_load, decoded = best_of(loads, encoded)
+    assert dumps(decoded) == encoded
+
+    print(f'{statements} sentencias')
+    print(f'  pickle  : {len(pickled):9d} bytes  codificar {t_pickle_dump * 1000:7.2f} ms'
+          f'  decodificar {t_pickle_load * 1000:7.2f} ms')
+    print(f'  binario : {len(encoded):9d} bytes  codificar {t_dump * 1000:7.2f} ms'
+          f'  decodificar {t_load * 1000:7.2f} ms')
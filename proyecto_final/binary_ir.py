@@ -0,0 +1,325 @@
+# Formato binario compacto y versionado para el código intermedio.
+#
+# El código intermedio son los registros (código de operación, destino,
+# operando1, operando2) de instructions.py. Al guardarlo, los nombres se
+# internan en una tabla, las constantes en un pool y las etiquetas en una
+# tabla propia, y cada campo se guarda como un arreglo de índices. Cargarlo
+# no analiza texto: las secciones se leen directamente a los arreglos de
+# IrProgram, y to_records() vuelve a producir los registros que ejecuta
+# executor.execute_code.
+#
+# Distribución del archivo (enteros little-endian):
+#
+#     cabecera    b'PFIR' + versión (u8)
+#     nombres     u32 longitud + los nombres en UTF-8 separados por '\n'
+#     constantes  u32 cantidad + una etiqueta (u8) por constante (0 = entero
+#                 i64, 1 = real f64, 2 = entero grande), y después los
+#                 enteros, los reales y los enteros grandes (u32 longitud +
+#                 su texto decimal separado por '\n'), en el orden de la tabla
+#     etiquetas   u32 longitud + los nombres separados por '\n', y la
+#                 instrucción LABEL que define cada una (arreglo de índices)
+#     código      u32 instrucciones, los códigos de operación (u8 cada uno) y
+#                 después los arreglos dest, a, b y la línea y la columna
+#                 de la sentencia fuente de cada instrucción (0 =
+#                 desconocida); cada arreglo lleva delante su typecode ('B',
+#                 'H' o 'I')
+#
+# En dest, a y b todo campo es un slot: los nombres ocupan 0 .. N-1, las
+# constantes N .. N+C-1, el slot N+C representa None (los campos que la
+# instrucción no usa) y las etiquetas van a continuación. Así to_records no
+# tiene que distinguir casos por código de operación.
+#
+# La versión 1 guardaba líneas de texto con sangría (el código intermedio
+# anterior) y la 2 solo la línea de cada sentencia; ya no se pueden cargar.
+
+import struct
+import sys
+from array import array
+
+from instructions import IFNOT, LABEL
+
+MAGIC = b'PFIR'
+VERSION = 3
+
+INT, FLOAT, BIGINT = range(3)
+
+_U8 = struct.Struct('<B')
+_U16 = struct.Struct('<H')
+_U32 = struct.Struct('<I')
+_I64 = struct.Struct('<q')
+_F64 = struct.Struct('<d')
+
+class BinaryFormatError(ValueError):
+    pass
+
+class IrProgram:
+    def __init__(self, opcodes, dest, a, b, names, constants, labels, statements=None):
+        self.opcodes = opcodes        # código de operación por instrucción
+        self.dest = dest              # destino (slot, o posición de la etiqueta)
+        self.a = a                    # primer operando (slot)
+        self.b = b                    # segundo operando (slot)
+        self.names = names            # nombre por slot (0 .. len(names)-1)
+        self.constants = constants    # valor por slot (len(names) ..)
+        self.labels = labels          # [(etiqueta, índice de instrucción)]
+        self.statements = statements  # (línea, columna) de la sentencia por instrucción, o None
+
+    def __len__(self):
+        return len(self.opcodes)
+
+    def to_records(self):
+        slots = self.names + self.constants + [None] + [label for label, _ in self.labels]
+        field = slots.__getitem__
+        return list(zip(self.opcodes, map(field, self.dest), map(field, self.a), map(field, self.b)))
+
+def from_records(code, code_lines=None):
+    names, name_slot = [], {}
+    constants, constant_slot = [], {}
+    labels, label_slot = [], {}
+
+    def operand(value):
+        if value is None:
+            return ('none', 0)
+        if isinstance(value, str):
+            if value not in name_slot:
+                name_slot[value] = len(names)
+                names.append(value)
+            return ('name', name_slot[value])
+        # El tipo forma parte de la clave: 1 y 1.0 son constantes distintas
+        key = (type(value), value)
+        if key not in constant_slot:
+            constant_slot[key] = len(constants)
+            constants.append(value)
+        return ('const', constant_slot[key])
+
+    def label(name, index=None):
+        if name not in label_slot:
+            label_slot[name] = len(labels)
+            labels.append([name, 0])
+        if index is not None:
+            labels[label_slot[name]][1] = index
+        return ('label', label_slot[name])
+
+    fields = []
+    for i, (op, dest, a, b) in enumerate(code):
+        if op == LABEL:
+            dest = label(dest, i)
+        elif op == IFNOT:
+            dest = label(dest)
+        else:
+            dest = operand(dest)
+        fields.append((dest, operand(a), operand(b)))
+
+    bases = {'name': 0, 'const': len(names), 'none': len(names) + len(constants),
+             'label': len(names) + len(constants) + 1}
+
+    def slot(ref):
+        kind, index = ref
+        return bases[kind] + index
+
+    statements = None
+    if code_lines is not None:
+        statements = [statement or (0, 0) for statement in code_lines]
+    return IrProgram([record[0] for record in code],
+                     [slot(f[0]) for f in fields], [slot(f[1]) for f in fields],
+                     [slot(f[2]) for f in fields],
+                     names, constants, [tuple(entry) for entry in labels], statements)
+
+def _pack_text(out, text, length=_U16):
+    data = text.encode('utf-8')
+    out += length.pack(len(data))
+    out += data
+
+def _pack_array(out, typecode, values):
+    values = array(typecode, values)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    out += values.tobytes()
+
+def _pack_index_array(out, values):
+    largest = max(values, default=0)
+    typecode = 'B' if largest < 2 ** 8 else 'H' if largest < 2 ** 16 else 'I'
+    out += typecode.encode('ascii')
+    _pack_array(out, typecode, values)
+
+def dumps(program):
+    out = bytearray(MAGIC)
+    out += _U8.pack(VERSION)
+
+    _pack_text(out, '\n'.join(program.names), _U32)
+
+    tags, ints, floats, bigints = bytearray(), [], [], []
+    for value in program.constants:
+        if isinstance(value, float):
+            tags.append(FLOAT)
+            floats.append(value)
+        elif -2 ** 63 <= value < 2 ** 63:
+            tags.append(INT)
+            ints.append(value)
+        else:
+            # Entero que no cabe en 64 bits: se guarda como texto
+            tags.append(BIGINT)
+            bigints.append(str(value))
+    out += _U32.pack(len(tags))
+    out += tags
+    _pack_array(out, 'q', ints)
+    _pack_array(out, 'd', floats)
+    _pack_text(out, '\n'.join(bigints), _U32)
+
+    _pack_text(out, '\n'.join(label for label, _ in program.labels), _U32)
+    _pack_index_array(out, [index for _, index in program.labels])
+
+    out += _U32.pack(len(program.opcodes))
+    out += bytes(program.opcodes)
+    _pack_index_array(out, program.dest)
+    _pack_index_array(out, program.a)
+    _pack_index_array(out, program.b)
+    statements = program.statements or [(0, 0)] * len(program.opcodes)
+    _pack_index_array(out, [line for line, _ in statements])
+    _pack_index_array(out, [column for _, column in statements])
+    return bytes(out)
+
+class _Reader:
+    def __init__(self, data):
+        self.data = memoryview(data)
+        self.pos = 0
+
+    def unpack(self, fmt):
+        try:
+            (value,) = fmt.unpack_from(self.data, self.pos)
+        except struct.error:
+            raise BinaryFormatError('Archivo de código intermedio truncado')
+        self.pos += fmt.size
+        return value
+
+    def take(self, size):
+        if self.pos + size > len(self.data):
+            raise BinaryFormatError('Archivo de código intermedio truncado')
+        chunk = self.data[self.pos:self.pos + size]
+        self.pos += size
+        return chunk
+
+    def text(self, length=_U16):
+        return str(self.take(self.unpack(length)), 'utf-8')
+
+    def index_array(self, count):
+        typecode = str(self.take(1), 'ascii')
+        if typecode not in ('B', 'H', 'I'):
+            raise BinaryFormatError(f'Typecode de operandos inválido: {typecode!r}')
+        return self.array(typecode, count)
+
+    def array(self, typecode, count):
+        values = array(typecode)
+        values.frombytes(self.take(count * values.itemsize))
+        if sys.byteorder == 'big':
+            values.byteswap()
+        return values.tolist()
+
+def loads(data):
+    reader = _Reader(data)
+    if bytes(reader.take(len(MAGIC))) != MAGIC:
+        raise BinaryFormatError('No es un archivo de código intermedio binario')
+    version = reader.unpack(_U8)
+    if version != VERSION:
+        raise BinaryFormatError(f'Versión no soportada: {version}')
+
+    names = reader.text(_U32)
+    names = names.split('\n') if names else []
+
+    tags = bytes(reader.take(reader.unpack(_U32)))
+    ints = iter(reader.array('q', tags.count(INT)))
+    floats = iter(reader.array('d', tags.count(FLOAT)))
+    bigints = reader.text(_U32).split('\n')
+    if max(tags, default=INT) > BIGINT or len(bigints) < tags.count(BIGINT):
+        raise BinaryFormatError('Tabla de constantes inválida')
+    bigints = iter(bigints)
+    try:
+        constants = [next(ints) if tag == INT else next(floats) if tag == FLOAT else int(next(bigints))
+                     for tag in tags]
+    except ValueError:
+        raise BinaryFormatError('Entero grande inválido')
+
+    label_names = reader.text(_U32)
+    label_names = label_names.split('\n') if label_names else []
+    labels = list(zip(label_names, reader.index_array(len(label_names))))
+
+    count = reader.unpack(_U32)
+    opcodes = bytes(reader.take(count))
+    if max(opcodes, default=0) > LABEL:
+        raise BinaryFormatError('Código de operación desconocido')
+    opcodes = list(opcodes)
+    dest = reader.index_array(count)
+    a = reader.index_array(count)
+    b = reader.index_array(count)
+    lines = reader.index_array(count)
+    columns = reader.index_array(count)
+    statements = [(line, column) if line else None for line, column in zip(lines, columns)]
+    return IrProgram(opcodes, dest, a, b, names, constants, labels, statements)
+
+def save(path, intermediate_code, code_lines=None):
+    with open(path, 'wb') as f:
+        f.write(dumps(from_records(intermediate_code, code_lines)))
+
+def load(path):
+    # Devuelve (código intermedio, sentencia fuente por instrucción)
+    with open(path, 'rb') as f:
+        program = loads(f.read())
+    try:
+        return program.to_records(), program.statements
+    except IndexError:
+        raise BinaryFormatError('Operando fuera de rango')
+
+if __name__ == '__main__':
+    # Benchmark: tamaño y tiempo de carga frente a leer y analizar la vista
+    # de texto y frente a pickle de los registros
+    import os
+    import pickle
+    import tempfile
+    from time import perf_counter
+    from intermediate import compile_code_with_lines
+    from instructions import format_code, parse_code
+
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    source = []
+    for i in range(statements):
+        source.append(f'x{i % 100} = ({i} + y) * x{(i + 1) % 100}')
+        if i % 10 == 0:
+            source.append(f'if x{i % 100} then\n    y = {i}\nend')
+    intermediate_code, _ast, code_lines = compile_code_with_lines('\n'.join(source))
+
+    def best_of(function, *args):
+        best = None
+        for _ in range(5):
+            start = perf_counter()
+            result = function(*args)
+            elapsed = perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best, result
+
+    def load_text(path):
+        with open(path, encoding='utf-8') as f:
+            return parse_code(f.read().splitlines())
+
+    with tempfile.TemporaryDirectory() as folder:
+        text_path = os.path.join(folder, 'codigo.txt')
+        pickle_path = os.path.join(folder, 'codigo.pickle')
+        binary_path = os.path.join(folder, 'codigo.pfir')
+        with open(text_path, 'w', encoding='utf-8') as f:
+            for line in format_code(intermediate_code):
+                f.write(line + '\n')
+        with open(pickle_path, 'wb') as f:
+            pickle.dump((intermediate_code, code_lines), f, pickle.HIGHEST_PROTOCOL)
+        save(binary_path, intermediate_code, code_lines)
+        t_text, from_text = best_of(load_text, text_path)
+        t_pickle, (from_pickle, _lines) = best_of(lambda: pickle.loads(open(pickle_path, 'rb').read()))
+        t_program, program = best_of(lambda: loads(open(binary_path, 'rb').read()))
+        t_binary, (from_binary, _lines) = best_of(load, binary_path)
+        text_size = os.path.getsize(text_path)
+        pickle_size = os.path.getsize(pickle_path)
+        binary_size = os.path.getsize(binary_path)
+    assert from_text == from_pickle == from_binary == intermediate_code
+
+    print(f'{len(intermediate_code)} instrucciones')
+    print(f'  texto (leer + analizar) : {text_size:9d} bytes  {t_text * 1000:8.2f} ms')
+    print(f'  pickle (registros)      : {pickle_size:9d} bytes  {t_pickle * 1000:8.2f} ms')
+    print(f'  binario (arreglos)      : {binary_size:9d} bytes  {t_program * 1000:8.2f} ms')
+    print(f'  binario (+ to_records)  : {"":9s}        {t_binary * 1000:8.2f} ms')
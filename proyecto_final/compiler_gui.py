@@ -1,31 +1,56 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox
-from intermediate import compile_code
+from intermediate import compile_code_with_lines
 from lexer import lexer
-from executor import execute_code
+from profiler import Profiler
+from sandbox import SandboxPool, SandboxError
 from visual_ast import show_ast_window
+from mmap_lexer import compile_file
+from instructions import format_code
+from highlighter import Highlighter
+import binary_ir
 
 generated_code = []
+generated_lines = None
+sandbox = None
+
+def get_sandbox():
+    # El pool de procesos se crea una sola vez y se reutiliza en cada ejecución
+    global sandbox
+    if sandbox is None:
+        sandbox = SandboxPool()
+    return sandbox
 
 def run_compiler():
-    global generated_code
+    global generated_code, generated_lines
     code = code_input.get("1.0", tk.END)
     output_display.delete("1.0", tk.END)
     generated_code = []
+    generated_lines = None
     try:
         tokens = lexer(code)
         output_display.insert(tk.END, "Tokens generados:\n")
         for token in tokens:
             output_display.insert(tk.END, f"{token}\n")
-        intermediate, ast = compile_code(code)
+        intermediate, ast, code_lines = compile_code_with_lines(code)
         generated_code = intermediate
+        generated_lines = code_lines
         output_display.insert(tk.END, "\nCódigo intermedio:\n")
-        for line in intermediate:
+        for line in format_code(intermediate):
             output_display.insert(tk.END, line + '\n')
         output_display.insert(tk.END, "\nEjecución:\n")
-        results = execute_code(intermediate)
+        # Medir cada instrucción tiene un costo: solo si se pidió el perfil
+        profiler = Profiler() if profile_enabled.get() else None
+        try:
+            results = get_sandbox().run(intermediate, code_lines, profiler)
+        except SandboxError as e:
+            results = [f"Ejecución interrumpida: {e}"]
         for r in results:
             output_display.insert(tk.END, r + '\n')
+        if profiler is not None:
+            output_display.insert(tk.END, "\nPerfil de ejecución (puntos calientes por sentencia):\n")
+            for line in profiler.report(code):
+                output_display.insert(tk.END, line + '\n')
         show_ast_window(ast)
     except Exception as e:
         messagebox.showerror("Error", str(e))
@@ -42,16 +67,62 @@ def load_code():
             code_input.delete("1.0", tk.END)
             code_input.insert(tk.END, code)
 
+def compile_from_file():
+    # Compila un archivo grande directamente desde disco (mmap), sin cargarlo
+    # en el área de texto
+    global generated_code, generated_lines
+    path = filedialog.askopenfilename(filetypes=[("Text Files", "*.txt")])
+    if not path:
+        return
+    output_display.delete("1.0", tk.END)
+    try:
+        intermediate, ast = compile_file(path)
+        generated_code = intermediate
+        generated_lines = None
+        output_display.insert(tk.END, f"Código intermedio de {path} ({len(intermediate)} instrucciones):\n")
+        output_display.insert(tk.END, "\n".join(format_code(intermediate)) + "\n")
+    except Exception as e:
+        messagebox.showerror("Error", str(e))
+
 def save_code():
     if not generated_code:
         messagebox.showwarning("Advertencia", "Primero debes compilar el código.")
         return
-    path = filedialog.asksaveasfilename(defaultextension=".txt", filetypes=[("Text Files", "*.txt")])
-    if path:
+    # .pfir guarda el formato binario (ver binary_ir.py); .txt, la vista de
+    # texto (solo para leerla: no se puede volver a cargar)
+    path = filedialog.asksaveasfilename(defaultextension=".pfir",
+                                        filetypes=[("IR binario", "*.pfir"), ("Text Files", "*.txt")])
+    if not path:
+        return
+    if path.endswith(".txt"):
         with open(path, "w") as f:
-            for line in generated_code:
+            for line in format_code(generated_code):
                 f.write(line + "\n")
-        messagebox.showinfo("Éxito", f"Código intermedio guardado en {path}")
+    else:
+        binary_ir.save(path, generated_code, generated_lines)
+    messagebox.showinfo("Éxito", f"Código intermedio guardado en {path}")
+
+def run_saved_ir():
+    # Carga un IR binario guardado y lo ejecuta sin volver a compilar
+    global generated_code, generated_lines
+    path = filedialog.askopenfilename(filetypes=[("IR binario", "*.pfir")])
+    if not path:
+        return
+    output_display.delete("1.0", tk.END)
+    try:
+        intermediate, code_lines = binary_ir.load(path)
+        generated_code, generated_lines = intermediate, code_lines
+        output_display.insert(tk.END, f"Código intermedio de {path}:\n")
+        output_display.insert(tk.END, "\n".join(format_code(intermediate)) + "\n")
+        output_display.insert(tk.END, "\nEjecución:\n")
+        try:
+            results = get_sandbox().run(intermediate, code_lines)
+        except SandboxError as e:
+            results = [f"Ejecución interrumpida: {e}"]
+        for r in results:
+            output_display.insert(tk.END, r + '\n')
+    except Exception as e:
+        messagebox.showerror("Error", str(e))
 
 if __name__ == "__main__":
     app = tk.Tk()
@@ -61,17 +132,23 @@ if __name__ == "__main__":
     frame = tk.Frame(app)
     frame.pack(padx=10, pady=10, fill=tk.BOTH, expand=True)
 
-    global code_input, output_display
+    global code_input, output_display, profile_enabled
 
     code_input = tk.Text(frame, height=15, width=110)
     code_input.pack(pady=10)
+    # Resaltado de sintaxis: solo se vuelven a etiquetar las líneas editadas
+    highlighter = Highlighter(code_input)
 
     btn_frame = tk.Frame(frame)
     btn_frame.pack()
 
     tk.Button(btn_frame, text="Cargar Archivo", command=load_code).pack(side=tk.LEFT, padx=5)
     tk.Button(btn_frame, text="Compilar", command=run_compiler).pack(side=tk.LEFT, padx=5)
-    tk.Button(btn_frame, text="Guardar TXT", command=save_code).pack(side=tk.LEFT, padx=5)
+    profile_enabled = tk.BooleanVar(value=False)
+    tk.Checkbutton(btn_frame, text="Perfilar", variable=profile_enabled).pack(side=tk.LEFT, padx=5)
+    tk.Button(btn_frame, text="Compilar Archivo", command=compile_from_file).pack(side=tk.LEFT, padx=5)
+    tk.Button(btn_frame, text="Guardar IR", command=save_code).pack(side=tk.LEFT, padx=5)
+    tk.Button(btn_frame, text="Ejecutar IR", command=run_saved_ir).pack(side=tk.LEFT, padx=5)
     tk.Button(btn_frame, text="Limpiar", command=clear_fields).pack(side=tk.LEFT, padx=5)
 
     output_display = tk.Text(frame, height=20, width=110, bg="black", fg="lime", insertbackground="white")
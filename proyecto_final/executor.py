@@ -1,11 +1,69 @@
-def execute_code(intermediate_code):
+from time import perf_counter
+
+from instructions import ASSIGN, ADD, SUB, MUL, DIV, IFNOT, LABEL, is_temp, resolve_labels
+
+class StepLimitExceeded(BaseException):
+    # Hereda de BaseException para que no la atrape el 'except Exception'
+    # que ignora las instrucciones inválidas
+    pass
+
+def execute_code(intermediate_code, profiler=None, code_lines=None, max_steps=None):
+    # Ejecuta los registros de instructions.py sin analizar texto. Si se pasa
+    # un Profiler, se mide cada instrucción y se atribuye a la sentencia que
+    # la generó (code_lines: su posición (línea, columna), en paralelo a
+    # intermediate_code).
+    # max_steps limita las instrucciones ejecutadas en total; al superarse se
+    # lanza StepLimitExceeded.
+    #
+    # Como antes, una instrucción que falla (variable sin asignar, división
+    # entre cero) se ignora y su destino no cambia; si falla la condición de
+    # un if, el cuerpo no se ejecuta.
+    code = intermediate_code
+    labels = resolve_labels(code)
+    starts = None
+    if profiler is not None:
+        # La primera instrucción de cada sentencia: la que cambia de sentencia
+        statements = code_lines or [None] * len(code)
+        starts = [pc == 0 or statements[pc] != statements[pc - 1] for pc in range(len(code))]
     env = {}
-    output = []
-    for line in intermediate_code:
+    steps = 0
+    pc = 0
+    end = len(code)
+    while pc < end:
+        op, dest, a, b = code[pc]
+        if op == LABEL:
+            pc += 1
+            continue
+        steps += 1
+        if max_steps is not None and steps > max_steps:
+            raise StepLimitExceeded(f'Se superó el límite de {max_steps} instrucciones ejecutadas')
+        if profiler is not None:
+            start = perf_counter()
+        next_pc = pc + 1
         try:
-            exec(line, {}, env)
-        except:
-            pass
-    for k, v in env.items():
-        output.append(f'{k} = {v}')
-    return output
+            left = env[a] if a.__class__ is str else a
+            if op == ASSIGN:
+                env[dest] = left
+            elif op == IFNOT:
+                if not left:
+                    next_pc = labels[dest]
+            else:
+                right = env[b] if b.__class__ is str else b
+                if op == ADD:
+                    env[dest] = left + right
+                elif op == SUB:
+                    env[dest] = left - right
+                elif op == MUL:
+                    env[dest] = left * right
+                elif op == DIV:
+                    env[dest] = left / right
+        except MemoryError:
+            raise
+        except Exception:
+            if op == IFNOT:
+                next_pc = labels[dest]
+        if profiler is not None:
+            statement = code_lines[pc] if code_lines else None
+            profiler.record(statement, perf_counter() - start, starts[pc])
+        pc = next_pc
+    return [f'{k} = {v}' for k, v in env.items() if not is_temp(k)]
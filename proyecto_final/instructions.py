@@ -0,0 +1,88 @@
+# Código intermedio estructurado.
+#
+# El parser emite cada instrucción como una tupla
+#
+#     (código de operación, destino, operando1, operando2)
+#
+# en vez de una línea de texto, así que las fases siguientes (ejecución,
+# formato binario, análisis) trabajan directamente con los registros sin
+# volver a analizar cadenas. Un operando es un nombre (str) o una constante
+# (int o float); los campos que una instrucción no usa valen None.
+#
+#     ASSIGN      destino = operando1
+#     ADD .. DIV  destino = operando1 op operando2
+#     IFNOT       si operando1 es falso, saltar a la etiqueta destino
+#     LABEL       define la etiqueta destino
+#
+# Los temporales se llaman %t1, %t2, ...: no pueden chocar con los nombres
+# del programa fuente. format_code produce la vista de texto y parse_code la
+# vuelve a leer.
+
+import math
+
+ASSIGN, ADD, SUB, MUL, DIV, IFNOT, LABEL = range(7)
+
+OPCODE_NAMES = ['ASSIGN', 'ADD', 'SUB', 'MUL', 'DIV', 'IFNOT', 'LABEL']
+BINOPS = {'+': ADD, '-': SUB, '*': MUL, '/': DIV}
+BINOP_SYMBOLS = {code: op for op, code in BINOPS.items()}
+
+TEMP_PREFIX = '%t'
+
+def is_temp(name):
+    return isinstance(name, str) and name.startswith(TEMP_PREFIX)
+
+def constant(text):
+    # Valor de un token NUMBER ('5' -> 5, '2.5' -> 2.5, '3.' -> 3.0)
+    return float(text) if '.' in text else int(text)
+
+def operand_text(value):
+    # Los reales no finitos se escriben con signo ('+inf', '-inf', '+nan'):
+    # 'inf' y 'nan' son identificadores válidos y se leerían como variables
+    if isinstance(value, float) and not math.isfinite(value):
+        return f'{value:+}'
+    return str(value)
+
+def parse_operand(text):
+    # Los nombres empiezan por letra, '_' o '%'; una constante, por dígito o
+    # signo, y se lee con int() o, si no es entera, con float()
+    if not (text[0].isdigit() or text[0] in '+-'):
+        return text
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+def format_instruction(record):
+    op, dest, a, b = record
+    if op == ASSIGN:
+        return f'{dest} = {operand_text(a)}'
+    if op == IFNOT:
+        return f'IF NOT {operand_text(a)} GOTO {dest}'
+    if op == LABEL:
+        return f'{dest}:'
+    return f'{dest} = {operand_text(a)} {BINOP_SYMBOLS[op]} {operand_text(b)}'
+
+def format_code(code):
+    # Vista de texto del código intermedio, una línea por instrucción
+    return [format_instruction(record) for record in code]
+
+def parse_instruction(line):
+    # Inversa de format_instruction
+    if line.startswith('IF NOT '):
+        cond, label = line[7:].split(' GOTO ')
+        return (IFNOT, label, parse_operand(cond), None)
+    if line.endswith(':'):
+        return (LABEL, line[:-1], None, None)
+    dest, expr = line.split(' = ')
+    parts = expr.split(' ')
+    if len(parts) == 3:
+        return (BINOPS[parts[1]], dest, parse_operand(parts[0]), parse_operand(parts[2]))
+    return (ASSIGN, dest, parse_operand(expr), None)
+
+def parse_code(lines):
+    # Registros a partir de la vista de texto
+    return [parse_instruction(line) for line in lines]
+
+def resolve_labels(code):
+    # Etiqueta -> índice de la instrucción LABEL que la define
+    return {record[1]: i for i, record in enumerate(code) if record[0] == LABEL}
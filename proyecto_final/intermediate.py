@@ -1,8 +1,28 @@
 from lexer import lexer
 from parser import Parser
+from partial_eval import partial_evaluate
 
-def compile_code(code):
+def _parse(code, hash_cons=False):
     tokens = lexer(code)
-    parser = Parser(tokens)
+    parser = Parser(tokens, hash_cons)
     parser.parse_program()
+    return parser
+
+def compile_code(code, hash_cons=False, fuel=None):
+    # hash_cons: las subexpresiones repetidas comparten un único nodo del AST
+    # fuel: si se da, el programa se evalúa al compilar ejecutando a lo sumo
+    # fuel instrucciones y, si termina, el código intermedio es la tabla de
+    # valores finales (ver partial_eval.py)
+    parser = _parse(code, hash_cons)
+    if fuel is not None:
+        table = partial_evaluate(parser.code, fuel)
+        if table is not None:
+            return table, parser.ast
     return parser.code, parser.ast
+
+def compile_code_with_lines(code):
+    # Igual que compile_code, pero además devuelve la sentencia de la que
+    # proviene cada instrucción, como posición (línea, columna) en el código
+    # fuente (para el perfilador)
+    parser = _parse(code)
+    return parser.code, parser.ast, parser.code_lines
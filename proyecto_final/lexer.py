@@ -1,4 +1,5 @@
 import re
+from collections import namedtuple
 
 token_specification = [
     ('NUMBER',   r'\d+(\.\d*)?'),
@@ -18,19 +19,29 @@ token_specification = [
 tok_regex = '|'.join(f'(?P<{name}>{pattern})' for name, pattern in token_specification)
 get_token = re.compile(tok_regex).match
 
-def lexer(code):
+# (tipo, valor) más la línea y columna (desde 1) donde empieza el token
+Token = namedtuple('Token', ['type', 'value', 'line', 'column'])
+
+# first_line es el número de la primera línea de code (para lexear solo un
+# trozo de un archivo, ver parallel_lexer.py)
+def lexer(code, first_line=1):
     pos = 0
+    line = first_line
+    line_start = 0
     tokens = []
     mo = get_token(code, pos)
     while mo:
         kind = mo.lastgroup
         value = mo.group()
-        if kind in ['SKIP', 'NEWLINE']:
+        if kind == 'NEWLINE':
+            line += 1
+            line_start = mo.end()
+        elif kind == 'SKIP':
             pass
         elif kind == 'MISMATCH':
-            raise RuntimeError(f'Símbolo inesperado: {value}')
+            raise RuntimeError(f'Símbolo inesperado: {value} (línea {line}, columna {pos - line_start + 1})')
         else:
-            tokens.append((kind, value))
+            tokens.append(Token(kind, value, line, pos - line_start + 1))
         pos = mo.end()
         mo = get_token(code, pos)
     return tokens
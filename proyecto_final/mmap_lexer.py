@@ -0,0 +1,119 @@
+# Ruta de compilación desde archivo con mmap.
+#
+# El archivo se mapea en memoria y el lexer recorre directamente sus bytes (el
+# alfabeto de tokens es ASCII), sin leerlo a un str. Cada token guarda solo
+# su tipo y los desplazamientos dentro del mapeo; el texto se decodifica la
+# primera vez que alguien pide su valor, y solo en identificadores y números
+# (el resto de tokens tienen un texto fijo o de un solo carácter).
+
+import mmap
+import re
+
+from lexer import tok_regex
+from parser import Parser
+
+get_token_bytes = re.compile(tok_regex.encode('ascii')).match
+
+# Texto de los tokens que no dependen del código fuente
+_FIXED_VALUES = {'IF': 'if', 'THEN': 'then', 'END': 'end', 'ASSIGN': '=',
+                 'LPAREN': '(', 'RPAREN': ')'}
+_ONE_CHAR = [chr(c) for c in range(128)]
+
+class SliceToken:
+    # Se comporta como la tupla (tipo, valor, línea, columna) de lexer.Token
+    __slots__ = ('type', 'start', 'end', 'line', 'column', '_source', '_value')
+
+    def __init__(self, kind, start, end, line, column, source):
+        self.type = kind
+        self.start = start
+        self.end = end
+        self.line = line
+        self.column = column
+        self._source = source
+        self._value = _FIXED_VALUES.get(kind)
+
+    @property
+    def value(self):
+        if self._value is None:
+            if self.end - self.start == 1:
+                self._value = _ONE_CHAR[self._source[self.start]]
+            else:
+                self._value = self._source[self.start:self.end].decode('ascii')
+        return self._value
+
+    def __len__(self):
+        return 4
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return tuple(self[i] for i in range(4)[index])
+        if index < 0:
+            index += 4
+        if index == 0:
+            return self.type
+        if index == 1:
+            return self.value
+        if index == 2:
+            return self.line
+        if index == 3:
+            return self.column
+        raise IndexError('índice de token fuera de rango')
+
+    def __repr__(self):
+        return f'SliceToken({self.type!r}, {self.start}, {self.end}, line={self.line}, column={self.column})'
+
+class MappedSource:
+    # Archivo fuente mapeado en memoria. Los SliceToken que produce leen del
+    # mapeo, así que sus valores no decodificados dejan de estar disponibles
+    # al cerrarlo.
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        try:
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # no se puede mapear un archivo vacío
+            self.data = b''
+
+    def tokens(self):
+        return lexer_mapped(self.data)
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def lexer_mapped(data):
+    # Igual que lexer.lexer, pero sobre bytes (o un mmap) y con SliceToken
+    pos = 0
+    line = 1
+    line_start = 0
+    tokens = []
+    mo = get_token_bytes(data, pos)
+    while mo:
+        kind = mo.lastgroup
+        if kind == 'NEWLINE':
+            line += 1
+            line_start = mo.end()
+        elif kind == 'SKIP':
+            pass
+        elif kind == 'MISMATCH':
+            # El mensaje de lexer muestra el carácter, aunque ocupe varios bytes
+            char = data[pos:pos + 4].decode('utf-8', 'replace')[0]
+            raise RuntimeError(f'Símbolo inesperado: {char} (línea {line}, columna {pos - line_start + 1})')
+        else:
+            tokens.append(SliceToken(kind, pos, mo.end(), line, pos - line_start + 1, data))
+        pos = mo.end()
+        mo = get_token_bytes(data, pos)
+    return tokens
+
+def compile_file(path):
+    # Igual que intermediate.compile_code, pero leyendo el archivo con mmap
+    with MappedSource(path) as source:
+        parser = Parser(source.tokens())
+        parser.parse_program()
+    return parser.code, parser.ast
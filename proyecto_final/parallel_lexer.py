@@ -0,0 +1,107 @@
+# Análisis léxico en paralelo de archivos enormes.
+#
+# Ningún token cruza un salto de línea, así que el código se puede cortar en
+# trozos que terminan en '\n' y lexear cada trozo por separado: basta con
+# decirle a lexer en qué línea empieza el trozo (las columnas no cambian,
+# porque cada trozo empieza al comienzo de una línea). lex_chunks reparte los
+# trozos entre procesos y devuelve sus tokens en orden, así que el resultado
+# es el mismo que el de lexer(code), incluido el error del primer símbolo
+# inesperado.
+#
+# Los procesos devuelven los tokens por columnas (tipos, valores, líneas,
+# columnas), que se serializan mucho más rápido que una namedtuple por token;
+# el proceso principal solo arma los Token. Como mucho hay 2 * workers trozos
+# en vuelo, así que la memoria no depende del tamaño del archivo si se
+# consumen los trozos a medida que llegan.
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from lexer import Token, lexer
+
+CHUNK_SIZE = 1 << 20  # caracteres por trozo (se alarga hasta el siguiente '\n')
+
+def split_chunks(code, chunk_size=CHUNK_SIZE):
+    # Lista de (inicio, fin, línea donde empieza) de trozos de unos
+    # chunk_size caracteres que terminan en un salto de línea o en el final
+    chunks = []
+    start = 0
+    line = 1
+    while start < len(code):
+        end = code.find('\n', start + chunk_size - 1)
+        end = len(code) if end == -1 else end + 1
+        chunks.append((start, end, line))
+        line += code.count('\n', start, end)
+        start = end
+    return chunks
+
+def _lex_chunk(text, first_line):
+    # En el proceso trabajador: los tokens del trozo, por columnas
+    return tuple(zip(*lexer(text, first_line)))
+
+def _tokens(columns):
+    return list(map(Token, *columns)) if columns else []
+
+def lex_chunks(code, workers=None, chunk_size=CHUNK_SIZE):
+    # Genera en orden la lista de tokens de cada trozo. workers es el número
+    # de procesos (por defecto, uno por CPU); con uno solo, o con un solo
+    # trozo, se lexea en este proceso
+    chunks = split_chunks(code, chunk_size)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(chunks) <= 1:
+        for start, end, first_line in chunks:
+            yield lexer(code[start:end], first_line)
+        return
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        pending = deque()
+        for start, end, first_line in chunks:
+            pending.append(pool.submit(_lex_chunk, code[start:end], first_line))
+            if len(pending) >= 2 * workers:
+                yield _tokens(pending.popleft().result())
+        while pending:
+            yield _tokens(pending.popleft().result())
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+def parallel_lexer(code, workers=None, chunk_size=CHUNK_SIZE):
+    # Igual que lexer(code), pero lexeando los trozos en paralelo
+    tokens = []
+    for chunk_tokens in lex_chunks(code, workers, chunk_size):
+        tokens.extend(chunk_tokens)
+    return tokens
+
+if __name__ == '__main__':
+    # Benchmark: lexer secuencial contra lex_chunks sobre un código de N MB
+    # (python parallel_lexer.py N). Los tokens de cada trozo se cuentan y se
+    # descartan: los de un archivo de cientos de MB no caben en memoria
+    import sys
+    from time import perf_counter
+
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 100
+    block = []
+    for i in range(2000):
+        block.append(f'x{i % 97} = (x{(i + 3) % 97} + {i}) * 2.5 - y{i % 13}')
+        if i % 50 == 0:
+            block.append(f'if x{i % 97} then\n    y = y - 1\nend')
+    block = '\n'.join(block) + '\n'
+    source = block * max(int(megabytes * 1e6) // len(block), 1)
+    prefix = source[:3 * len(block)]
+    assert parallel_lexer(prefix, 2, 64 * 1024) == lexer(prefix)
+
+    def timed(function):
+        start = perf_counter()
+        result = function()
+        return perf_counter() - start, result
+
+    size = len(source) / 1e6
+    t_sequential, count = timed(lambda: sum(len(lexer(source[start:end], first_line))
+                                            for start, end, first_line in split_chunks(source)))
+    print(f'{size:.1f} MB, {count} tokens, {os.cpu_count()} CPU')
+    print(f'  lexer secuencial : {t_sequential:8.2f} s  {size / t_sequential:6.2f} MB/s')
+    for workers in sorted({2, 4, os.cpu_count() or 1}):
+        t_parallel, parallel_count = timed(lambda: sum(len(tokens) for tokens in lex_chunks(source, workers)))
+        assert parallel_count == count
+        print(f'  {workers:2d} procesos      : {t_parallel:8.2f} s  {size / t_parallel:6.2f} MB/s'
+              f'  ({t_sequential / t_parallel:.2f}x)')
@@ -1,18 +1,107 @@
+from instructions import ASSIGN, BINOPS, IFNOT, LABEL, TEMP_PREFIX, constant
+
 class Node:
-    def __init__(self, label, children=None):
+    def __init__(self, label, children=None, line=None, column=None):
         self.label = label
         self.children = children if children else []
+        # Posición en el código fuente del token que inicia el nodo
+        self.line = line
+        self.column = column
+
+def reads(node):
+    # Variables que lee una expresión
+    names, stack = set(), [node]
+    while stack:
+        node = stack.pop()
+        if node.children:
+            stack.extend(node.children)
+        elif not node.label[0].isdigit():
+            names.add(node.label)
+    return names
 
 class Parser:
-    def __init__(self, tokens):
+    def __init__(self, tokens, hash_cons=False):
+        # Con hash_cons las subexpresiones estructuralmente idénticas (misma
+        # etiqueta e hijos) comparten un único Node, que conserva la posición
+        # de su primera aparición: el AST pasa a ser un DAG. Además, el valor
+        # de un nodo compartido se calcula una sola vez: available guarda
+        # nodo -> (temporal, variables que lee) mientras ninguna de esas
+        # variables se reasigne y el cálculo domine el uso
         self.tokens = tokens
         self.pos = 0
+        self.shared = {} if hash_cons else None
+        self.available = {}
+        # Código intermedio: registros (código de operación, destino,
+        # operando1, operando2), ver instructions.py
         self.code = []
+        # Sentencia de la que proviene cada elemento de self.code: la posición
+        # (línea, columna) de su primer token, o None si no se conoce
+        self.code_lines = []
+        self.temp_count = 0
+        self.label_count = 0
         self.ast = []
 
     def current(self):
         return self.tokens[self.pos] if self.pos < len(self.tokens) else ('EOF', '')
 
+    def position(self):
+        token = self.current()
+        return (token[2], token[3]) if len(token) > 3 else (None, None)
+
+    def expr_node(self, label, children, line, column):
+        # Las expresiones no tienen efectos secundarios: compartirlas es seguro
+        if self.shared is None:
+            return Node(label, children, line, column)
+        # Los hijos ya son únicos, así que basta con su identidad
+        key = (label,) + tuple(id(child) for child in children or ())
+        node = self.shared.get(key)
+        if node is None:
+            node = self.shared[key] = Node(label, children, line, column)
+        return node
+
+    def emit(self, record, statement):
+        self.code.append(record)
+        self.code_lines.append(statement)
+
+    def new_temp(self):
+        self.temp_count += 1
+        return f'{TEMP_PREFIX}{self.temp_count}'
+
+    def new_label(self):
+        self.label_count += 1
+        return f'L{self.label_count}'
+
+    def gen_operand(self, node, statement):
+        # Devuelve el operando (nombre o constante) con el valor de la
+        # expresión, después de emitir las instrucciones que lo calculan
+        if not node.children:
+            return constant(node.label) if node.label[0].isdigit() else node.label
+        if node in self.available:
+            return self.available[node][0]
+        left = self.gen_operand(node.children[0], statement)
+        right = self.gen_operand(node.children[1], statement)
+        temp = self.new_temp()
+        self.emit((BINOPS[node.label], temp, left, right), statement)
+        if self.shared is not None:
+            self.available[node] = (temp, reads(node))
+        return temp
+
+    def kill(self, var):
+        # Invalida los valores calculados que dependen de var
+        for node in [node for node, (_, names) in self.available.items() if var in names]:
+            del self.available[node]
+
+    def gen_assign(self, var, expr, statement):
+        # La operación de más arriba escribe directamente en la variable (si
+        # su valor no está ya calculado en un temporal)
+        if expr.children and expr not in self.available:
+            left = self.gen_operand(expr.children[0], statement)
+            right = self.gen_operand(expr.children[1], statement)
+            self.emit((BINOPS[expr.label], var, left, right), statement)
+        else:
+            self.emit((ASSIGN, var, self.gen_operand(expr, statement), None), statement)
+        self.kill(var)
+
     def match(self, expected_type):
         if self.current()[0] == expected_type:
             val = self.current()[1]
@@ -29,54 +118,66 @@ class Parser:
         self.ast = Node("Program", nodes)
 
     def parse_statement(self):
+        line, column = self.position()
+        # Clave de la sentencia para el perfilador: una línea puede tener
+        # varias sentencias, y el cuerpo de un if es otras sentencias
+        statement = (line, column) if line is not None else None
         if self.current()[0] == 'ID':
             var = self.match('ID')
             self.match('ASSIGN')
             expr = self.parse_expression()
-            stmt_code = f'{var} = {expr.label}'
-            self.code.append(stmt_code)
-            return Node('Assign', [Node(var), expr])
+            self.gen_assign(var, expr, statement)
+            return Node('Assign', [Node(var, None, line, column), expr], line, column)
         elif self.current()[0] == 'IF':
             self.match('IF')
             cond = self.parse_expression()
             self.match('THEN')
+            # Las sentencias del cuerpo emiten su código al analizarse, entre
+            # el salto condicional y la etiqueta del final
+            label_end = self.new_label()
+            self.emit((IFNOT, label_end, self.gen_operand(cond, statement), None), statement)
+            before = dict(self.available)
             body = []
             while self.current()[0] != 'END':
                 stmt = self.parse_statement()
                 body.append(stmt)
             self.match('END')
-            self.code.append(f'if {cond.label}:')
-            for b in body:
-                for line in self._flatten_code(b):
-                    self.code.append('    ' + line)
-            return Node('If', [cond] + body)
+            self.emit((LABEL, label_end, None, None), statement)
+            # Lo calculado en el cuerpo puede no haberse ejecutado: tras el
+            # if solo sigue válido lo de antes que el cuerpo no invalidó
+            self.available = {node: entry for node, entry in before.items()
+                              if self.available.get(node) is entry}
+            return Node('If', [cond] + body, line, column)
         else:
             raise SyntaxError(f'Sentencia inválida: {self.current()[1]}')
 
     def parse_expression(self):
         left = self.parse_term()
         while self.current()[0] == 'OP' and self.current()[1] in ['+', '-']:
+            line, column = self.position()
             op = self.match('OP')
             right = self.parse_term()
-            left = Node(op, [left, right])
+            left = self.expr_node(op, [left, right], line, column)
         return left
 
     def parse_term(self):
         left = self.parse_factor()
         while self.current()[0] == 'OP' and self.current()[1] in ['*', '/']:
+            line, column = self.position()
             op = self.match('OP')
             right = self.parse_factor()
-            left = Node(op, [left, right])
+            left = self.expr_node(op, [left, right], line, column)
         return left
 
     def parse_factor(self):
-        token_type, value = self.current()
+        token_type, value = self.current()[:2]
+        line, column = self.position()
         if token_type == 'NUMBER':
             self.match('NUMBER')
-            return Node(value)
+            return self.expr_node(value, None, line, column)
         elif token_type == 'ID':
             self.match('ID')
-            return Node(value)
+            return self.expr_node(value, None, line, column)
         elif token_type == 'LPAREN':
             self.match('LPAREN')
             expr = self.parse_expression()
@@ -84,6 +185,3 @@ class Parser:
             return expr
         else:
             raise SyntaxError(f'Factor inválido: {value}')
-
-    def _flatten_code(self, node):
-        return self.code[-1:] if node.label != 'Assign' else [self.code[-1]]
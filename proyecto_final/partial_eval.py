@@ -0,0 +1,106 @@
+# Evaluación parcial de programas completos.
+#
+# El lenguaje no tiene instrucciones de entrada, así que cada programa es un
+# cálculo cerrado que da el mismo resultado en todas sus ejecuciones.
+# partial_evaluate lo ejecuta al compilar con un presupuesto de instrucciones
+# (combustible) y, si termina, el código intermedio se reemplaza por una
+# tabla con el valor final de cada variable: un registro ASSIGN por variable,
+# en el mismo orden en que execute_code las listaría. Ejecutar la tabla da
+# la misma salida que el programa original sin repetir el cálculo.
+#
+# Si se agota el combustible, o algún entero crece más de MAX_INT_BITS (el
+# coste de cada operación crece con el tamaño del número), devuelve None y
+# se usa el código normal. La semántica es la de executor.execute_code: una
+# instrucción que falla se ignora y, si falla la condición de un if, se salta
+# el cuerpo.
+
+from instructions import ASSIGN, ADD, SUB, MUL, DIV, IFNOT, LABEL, is_temp, resolve_labels
+
+DEFAULT_FUEL = 1_000_000  # instrucciones ejecutadas como máximo (sin contar LABEL)
+MAX_INT_BITS = 4096
+
+def evaluate_code(intermediate_code, fuel=DEFAULT_FUEL):
+    # Entorno final del programa (temporales incluidos), o None si no se pudo
+    # evaluar dentro del presupuesto
+    code = intermediate_code
+    labels = resolve_labels(code)
+    env = {}
+    pc = 0
+    end = len(code)
+    while pc < end:
+        op, dest, a, b = code[pc]
+        if op == LABEL:
+            pc += 1
+            continue
+        fuel -= 1
+        if fuel < 0:
+            return None
+        next_pc = pc + 1
+        try:
+            left = env[a] if a.__class__ is str else a
+            if op == ASSIGN:
+                env[dest] = left
+            elif op == IFNOT:
+                if not left:
+                    next_pc = labels[dest]
+            else:
+                right = env[b] if b.__class__ is str else b
+                if op == ADD:
+                    value = left + right
+                elif op == SUB:
+                    value = left - right
+                elif op == MUL:
+                    value = left * right
+                elif op == DIV:
+                    value = left / right
+                if value.__class__ is int and value.bit_length() > MAX_INT_BITS:
+                    return None
+                env[dest] = value
+        except MemoryError:
+            return None
+        except Exception:
+            if op == IFNOT:
+                next_pc = labels[dest]
+        pc = next_pc
+    return env
+
+def partial_evaluate(intermediate_code, fuel=DEFAULT_FUEL):
+    # Tabla de valores finales que reemplaza a intermediate_code, o None
+    env = evaluate_code(intermediate_code, fuel)
+    if env is None:
+        return None
+    return [(ASSIGN, name, value, None) for name, value in env.items() if not is_temp(name)]
+
+if __name__ == '__main__':
+    # Benchmark: compilar con y sin evaluación parcial y ejecutar el
+    # resultado de cada una
+    import sys
+    from time import perf_counter
+    from executor import execute_code
+    from intermediate import compile_code
+
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    source = [f'x{i} = {i}' for i in range(100)] + ['y = 0']
+    for i in range(statements):
+        source.append(f'x{i % 100} = ({i} + x{(i + 7) % 100}) - x{(i + 1) % 100} / 4')
+        if i % 10 == 0:
+            source.append(f'if x{i % 100} - {i} then\n    y = y + 1\nend')
+    source = '\n'.join(source)
+
+    def timed(function, *args, **kwargs):
+        start = perf_counter()
+        result = function(*args, **kwargs)
+        return perf_counter() - start, result
+
+    t_compile, (code, _ast) = timed(compile_code, source)
+    t_fold, (table, _ast) = timed(compile_code, source, fuel=DEFAULT_FUEL)
+    t_run, output = timed(execute_code, code)
+    t_run_table, output_table = timed(execute_code, table)
+    assert output == output_table
+
+    print(f'{len(code)} instrucciones -> tabla de {len(table)} valores')
+    print(f'  compilar              : {t_compile * 1000:8.2f} ms')
+    print(f'  compilar y evaluar    : {t_fold * 1000:8.2f} ms')
+    print(f'  ejecutar el código    : {t_run * 1000:8.2f} ms por ejecución')
+    print(f'  ejecutar la tabla     : {t_run_table * 1000:8.2f} ms por ejecución'
+          f'  ({t_run / t_run_table:.0f}x)')
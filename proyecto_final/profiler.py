@@ -0,0 +1,68 @@
+# Perfilador de ejecución: cuenta cuántas veces se ejecuta cada sentencia del
+# programa fuente y el tiempo acumulado que pasa en ella.
+#
+# Las instrucciones del código intermedio se agrupan por la sentencia que las
+# generó, identificada por la posición (línea, columna) de su primer token,
+# así que varias sentencias en una misma línea se miden por separado. La
+# sentencia se ejecuta una vez cada vez que se ejecuta su primera
+# instrucción, y su tiempo es la suma del de todas sus instrucciones. El
+# tiempo de un if es el de su condición; su cuerpo son otras sentencias.
+
+import re
+
+_CLOSING_ENDS = re.compile(r'(\s*\bend\b)+\s*$')
+
+class Profiler:
+    def __init__(self):
+        # (línea, columna) de la sentencia -> [ejecuciones, instrucciones
+        # ejecutadas, segundos]
+        self.stats = {}
+
+    def record(self, statement, elapsed, starts=False):
+        # starts: la instrucción es la primera de su sentencia
+        stat = self.stats.get(statement)
+        if stat is None:
+            stat = self.stats[statement] = [0, 0, 0.0]
+        if starts:
+            stat[0] += 1
+        stat[1] += 1
+        stat[2] += elapsed
+
+    def merge(self, stats):
+        # Suma las estadísticas de otro Profiler (por ejemplo, las que
+        # devuelve un proceso del sandbox)
+        for statement, (count, instructions, total) in stats.items():
+            stat = self.stats.setdefault(statement, [0, 0, 0.0])
+            stat[0] += count
+            stat[1] += instructions
+            stat[2] += total
+
+    def hot_spots(self):
+        # ((línea, columna), ejecuciones, instrucciones, segundos), de mayor a
+        # menor tiempo
+        rows = [(statement, count, instructions, total)
+                for statement, (count, instructions, total) in self.stats.items()]
+        rows.sort(key=lambda row: row[3], reverse=True)
+        return rows
+
+    def report(self, source=None, limit=None):
+        # Con el código fuente, cada fila muestra además el texto de la
+        # sentencia: desde su columna hasta la siguiente sentencia de la línea
+        source_lines = source.split('\n') if source is not None else []
+        columns = {}
+        for statement in self.stats:
+            if statement is not None:
+                columns.setdefault(statement[0], []).append(statement[1])
+        lines = [f"{'posición':>9}  {'ejecuciones':>11}  {'instrucciones':>13}  {'tiempo (ms)':>11}  sentencia"]
+        for statement, count, instructions, total in self.hot_spots()[:limit]:
+            position, text = '?', ''
+            if statement is not None:
+                line, column = statement
+                position = f'{line}:{column}'
+                if line <= len(source_lines):
+                    end = min([c for c in columns[line] if c > column], default=None)
+                    text = source_lines[line - 1][column - 1:end - 1 if end else None]
+                    # Los 'end' que cierran ifs no son parte de la sentencia
+                    text = _CLOSING_ENDS.sub('', text).strip()
+            lines.append(f"{position:>9}  {count:>11}  {instructions:>13}  {total * 1000:>11.3f}  {text}")
+        return lines
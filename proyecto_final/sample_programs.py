@@ -0,0 +1,102 @@
+# Programas de prueba para los test_*.py de este directorio: ejemplos
+# escritos a mano, un generador al azar y run_ast, un intérprete de
+# referencia que recorre el AST con la semántica de executor.execute_code
+# (una sentencia que falla se ignora; si falla la condición de un if, se
+# salta el cuerpo) sin pasar por el código intermedio.
+
+import random
+
+from instructions import constant
+
+EXAMPLES = [
+    'x = 1',
+    'x = 2 + 3 * 4\ny = x / 4\nz = y - 0.5',
+    'a = 1\nb = 2.5\nc = a + b\nd = c * 2\ne = d / 3',
+    'a = 3\nif a - 3 then\n    b = 1\nend\nif a then\n    b = 2\nend',
+    'a = 1\nif 0 then\n    a = 2\nend\nif 1 then\n    a = a + 10\nend',
+    'x = 2\ny = (x + 1) * (x + 1)\nx = 5\nz = (x + 1) * (x + 1)',
+    'x = 2\nif x then\n    y = x * 3\nend\nw = x * 3',
+    'a = 1\nb = a / 0\nc = b + 1\nd = 4',
+    'a = 1\nb = c + a\nif c then\n    a = 2\nend',
+    'x = 0\nif x then\n    y = 2\nend\nz = y + 1',
+    'a = 0.0\nif a then\n    b = 1\nend\nif a + 1 then\n    b = 2.5\nend',
+    'x = 3.\ny = x * 2',
+    'x = 12345678901234567890 * 98765432109876543210',
+    'a = 2\nb = 3\nc = a * b + a * b - a * b / (a * b)',
+    'if 1 then\n    if 0 then\n        a = 1\n    end\n    b = 2\nend',
+]
+
+NAMES = ['a', 'b', 'c', 'x']
+
+def random_program(seed, statements=8):
+    # Programa distinto para cada semilla, con asignaciones e if anidados. A
+    # veces divide por cero, usa una variable sin asignar ('u', o 'b' y 'x'
+    # si el programa no empieza asignándolas) o repite una subexpresión ya
+    # escrita (para hash_cons)
+    rng = random.Random(seed)
+    written = []
+    undefined = rng.random() < 0.15
+
+    def leaf():
+        r = rng.random()
+        if undefined and r < 0.05:
+            return 'u'
+        if r < 0.6:
+            return rng.choice(NAMES)
+        if r < 0.9:
+            return str(rng.randint(0, 9))
+        return f'{rng.randint(0, 9)}.5'
+
+    def expr(depth):
+        if written and rng.random() < 0.15:
+            return rng.choice(written)
+        if depth == 0 or rng.random() < 0.3:
+            return leaf()
+        text = f'{expr(depth - 1)} {rng.choice("+-*/")} {expr(depth - 1)}'
+        if rng.random() < 0.6:
+            text = f'({text})'
+        written.append(text)
+        return text
+
+    def block(depth, count, indent):
+        lines = []
+        for _ in range(count):
+            if depth > 0 and rng.random() < 0.25:
+                lines.append(f'{indent}if {expr(2)} then')
+                lines.extend(block(depth - 1, 3, indent + '    '))
+                lines.append(f'{indent}end')
+            else:
+                lines.append(f'{indent}{rng.choice(NAMES)} = {expr(3)}')
+        return lines
+
+    start = rng.choice(['a = 1\nb = 3\nc = 0\nx = 2', 'a = 1\nb = 2.5\nc = 2\nx = 0.5', 'a = 4\nc = 1'])
+    return start + '\n' + '\n'.join(block(2, statements, ''))
+
+def evaluate(node, env):
+    if not node.children:
+        return constant(node.label) if node.label[0].isdigit() else env[node.label]
+    left = evaluate(node.children[0], env)
+    right = evaluate(node.children[1], env)
+    if node.label == '+':
+        return left + right
+    if node.label == '-':
+        return left - right
+    if node.label == '*':
+        return left * right
+    return left / right
+
+def run_statements(statements, env):
+    for statement in statements:
+        try:
+            if statement.label == 'Assign':
+                env[statement.children[0].label] = evaluate(statement.children[1], env)
+            elif evaluate(statement.children[0], env):
+                run_statements(statement.children[1:], env)
+        except (KeyError, ZeroDivisionError, OverflowError):
+            pass
+
+def run_ast(ast):
+    # Salida de execute_code para el programa del AST
+    env = {}
+    run_statements(ast.children, env)
+    return [f'{k} = {v}' for k, v in env.items()]
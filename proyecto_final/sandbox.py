@@ -0,0 +1,170 @@
+# Sandbox de ejecución: un pool de procesos trabajadores "calientes" que
+# ejecutan el código intermedio con límites de recursos.
+#
+# - límite de pasos: instrucciones del código intermedio ejecutadas (ver executor.execute_code)
+# - tiempo de reloj: si un trabajador no responde a tiempo se mata y se
+#   reemplaza, y la petición falla de inmediato con SandboxTimeout
+# - memoria: límite de espacio de direcciones con el módulo resource (solo
+#   en sistemas tipo Unix; en los demás se omite)
+#
+# Los trabajadores se reutilizan entre ejecuciones, así que el coste de crear
+# un proceso solo se paga al arrancar el pool o al reemplazar uno atascado.
+
+import os
+import queue
+import threading
+from multiprocessing import get_context
+
+from executor import execute_code, StepLimitExceeded
+from profiler import Profiler
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_WORKERS = 2
+DEFAULT_TIMEOUT = 2.0           # segundos de reloj por ejecución
+DEFAULT_MAX_STEPS = 10_000_000  # instrucciones ejecutadas por ejecución
+DEFAULT_MEMORY_MB = 256         # memoria adicional permitida por trabajador
+
+class SandboxError(RuntimeError):
+    pass
+
+class SandboxTimeout(SandboxError):
+    pass
+
+class SandboxStepLimit(SandboxError):
+    pass
+
+class SandboxMemoryError(SandboxError):
+    pass
+
+def _limit_memory(memory_mb):
+    if resource is None or memory_mb is None:
+        return
+    # El límite se suma a lo que el intérprete ya tiene reservado
+    baseline = 0
+    try:
+        with open('/proc/self/statm') as statm:
+            baseline = int(statm.read().split()[0]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        pass
+    limit = baseline + memory_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+def _worker_main(conn, memory_mb):
+    _limit_memory(memory_mb)
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            return
+        if request is None:
+            return
+        intermediate_code, code_lines, max_steps, profile = request
+        profiler = Profiler() if profile else None
+        try:
+            output = execute_code(intermediate_code, profiler, code_lines, max_steps)
+            reply = ('ok', output, profiler.stats if profiler else None)
+        except StepLimitExceeded as e:
+            reply = ('steps', str(e), None)
+        except MemoryError:
+            reply = ('memory', f'Se superó el límite de memoria de {memory_mb} MB', None)
+        conn.send(reply)
+
+class _Worker:
+    def __init__(self, context, memory_mb):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, memory_mb),
+                                       daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (OSError, EOFError):
+            pass
+        self.process.join(1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+class SandboxPool:
+    def __init__(self, workers=DEFAULT_WORKERS, timeout=DEFAULT_TIMEOUT,
+                 max_steps=DEFAULT_MAX_STEPS, memory_mb=DEFAULT_MEMORY_MB):
+        # 'spawn' crea intérpretes limpios (sin la interfaz gráfica ni la
+        # memoria del proceso padre), lo que hace útil el límite de memoria
+        self.context = get_context('spawn')
+        self.timeout = timeout
+        self.max_steps = max_steps
+        self.memory_mb = memory_mb
+        self.idle = queue.Queue()
+        self.lock = threading.Lock()
+        self.workers = []
+        for _ in range(workers):
+            self._add_worker()
+
+    def _add_worker(self):
+        worker = _Worker(self.context, self.memory_mb)
+        with self.lock:
+            self.workers.append(worker)
+        self.idle.put(worker)
+
+    def _replace(self, worker):
+        # El reemplazo se arranca en segundo plano para que la petición que
+        # falló no espere a que se cree el nuevo proceso
+        worker.kill()
+        with self.lock:
+            self.workers.remove(worker)
+        threading.Thread(target=self._add_worker, daemon=True).start()
+
+    def run(self, intermediate_code, code_lines=None, profiler=None):
+        # Ejecuta el código en un trabajador libre y devuelve la misma salida
+        # que execute_code. Si no hay trabajadores libres dentro del plazo,
+        # o el trabajador se atasca, se lanza SandboxTimeout sin bloquear el
+        # resto del pool.
+        try:
+            worker = self.idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise SandboxTimeout('Todos los procesos del sandbox están ocupados')
+        request = (list(intermediate_code), code_lines, self.max_steps, profiler is not None)
+        try:
+            worker.conn.send(request)
+            ready = worker.conn.poll(self.timeout)
+            reply = worker.conn.recv() if ready else None
+        except (OSError, EOFError):
+            self._replace(worker)
+            raise SandboxError('El proceso del sandbox terminó de forma inesperada')
+        if reply is None:
+            self._replace(worker)
+            raise SandboxTimeout(f'La ejecución superó {self.timeout} s')
+        self.idle.put(worker)
+
+        status, payload, stats = reply
+        if status == 'steps':
+            raise SandboxStepLimit(payload)
+        if status == 'memory':
+            raise SandboxMemoryError(payload)
+        if profiler is not None and stats:
+            profiler.merge(stats)
+        return payload
+
+    def close(self):
+        with self.lock:
+            workers, self.workers = self.workers, []
+        for worker in workers:
+            worker.stop()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
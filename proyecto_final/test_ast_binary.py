@@ -0,0 +1,51 @@
+# Codificación binaria del AST (ast_binary.py): loads(dumps(ast)) reproduce
+# el árbol nodo a nodo, sin depender del límite de recursión.
+
+import pytest
+
+from ast_binary import ASTFormatError, dumps, loads
+from intermediate import compile_code
+from parser import Node
+from sample_programs import EXAMPLES, random_program, run_ast
+
+SOURCES = EXAMPLES + [random_program(seed) for seed in range(150)]
+
+def flatten(ast):
+    # Los nodos en preorden como (etiqueta, hijos, línea, columna), sin recursión
+    rows, stack = [], [ast]
+    while stack:
+        node = stack.pop()
+        rows.append((node.label, len(node.children), node.line, node.column))
+        stack.extend(reversed(node.children))
+    return rows
+
+@pytest.mark.parametrize('source', SOURCES)
+@pytest.mark.parametrize('hash_cons', [False, True])
+def test_round_trip(source, hash_cons):
+    _code, ast = compile_code(source, hash_cons=hash_cons)
+    loaded = loads(dumps(ast))
+    assert flatten(loaded) == flatten(ast)
+    assert run_ast(loaded) == run_ast(ast)
+
+def test_deep_tree():
+    # 1 + (1 + (1 + ...)): mucho más profundo que el límite de recursión
+    node = Node('1', None, 1, 1)
+    for _ in range(100000):
+        node = Node('+', [Node('1'), node])
+    ast = Node('Program', [Node('Assign', [Node('x', None, 1, 1), node], 1, 1)])
+    assert flatten(loads(dumps(ast))) == flatten(ast)
+
+def test_rejects_labels_with_nul():
+    with pytest.raises(ValueError):
+        dumps(Node('Program', [Node('a\0b')]))
+
+def test_rejects_corrupt_data():
+    _code, ast = compile_code('x = 1\nif x then\n    y = x + 2.5\nend')
+    data = dumps(ast)
+    with pytest.raises(ASTFormatError):
+        loads(b'XXXX' + data[4:])
+    with pytest.raises(ASTFormatError):
+        loads(data[:4] + bytes([99]) + data[5:])
+    for end in range(len(data)):
+        with pytest.raises(ASTFormatError):
+            loads(data[:end])
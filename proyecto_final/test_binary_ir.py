@@ -0,0 +1,66 @@
+# Formato binario (binary_ir.py) y vista de texto (instructions.py) del
+# código intermedio: guardar y volver a cargar da los mismos registros y la
+# misma ejecución.
+
+import math
+
+import pytest
+
+import binary_ir
+from binary_ir import BinaryFormatError
+from executor import execute_code
+from instructions import format_code, parse_code
+from intermediate import compile_code, compile_code_with_lines
+from sample_programs import EXAMPLES, random_program
+
+SOURCES = EXAMPLES + [random_program(seed) for seed in range(150)]
+
+def round_trip(code, code_lines=None):
+    program = binary_ir.loads(binary_ir.dumps(binary_ir.from_records(code, code_lines)))
+    return program.to_records(), program.statements
+
+@pytest.mark.parametrize('source', SOURCES)
+def test_binary_round_trip(source):
+    code, _ast, code_lines = compile_code_with_lines(source)
+    assert round_trip(code, code_lines) == (code, code_lines)
+
+@pytest.mark.parametrize('source', SOURCES)
+def test_text_round_trip(source):
+    code, _ast = compile_code(source)
+    assert parse_code(format_code(code)) == code
+
+@pytest.mark.parametrize('source', SOURCES)
+def test_hash_consed_code_round_trip(source):
+    code, _ast = compile_code(source, hash_cons=True)
+    assert round_trip(code)[0] == code
+    assert parse_code(format_code(code)) == code
+
+def test_constants_keep_type_and_value():
+    # 1 y 1.0 son constantes distintas; los enteros fuera de i64 van como
+    # texto; inf y nan se escriben '+inf' y '+nan', así que no se confunden
+    # con variables llamadas inf y nan
+    source = ('a = 1\nb = 1.0\nc = 18446744073709551616 * 3\n'
+              'inf = 2\nnan = 3\ne = ' + '9' * 400 + '.0\nf = e - e\ng = e * inf + nan')
+    code, _ast = compile_code(source)
+    for loaded in (round_trip(code)[0], parse_code(format_code(code))):
+        assert execute_code(loaded) == execute_code(code)
+        constants = [value for record in loaded for value in record[2:] if not isinstance(value, str)]
+        assert any(type(value) is float and value == 1 for value in constants)
+        assert any(isinstance(value, float) and math.isinf(value) for value in constants)
+
+def test_file_round_trip(tmp_path):
+    code, _ast, code_lines = compile_code_with_lines('a = 1\nif a then\n    b = a * 2\nend')
+    path = str(tmp_path / 'codigo.pfir')
+    binary_ir.save(path, code, code_lines)
+    assert binary_ir.load(path) == (code, code_lines)
+
+def test_rejects_corrupt_data():
+    code, _ast = compile_code('x = 1\nif x then\n    y = x + 2.5\nend')
+    data = binary_ir.dumps(binary_ir.from_records(code))
+    with pytest.raises(BinaryFormatError):
+        binary_ir.loads(b'XXXX' + data[4:])
+    with pytest.raises(BinaryFormatError):
+        binary_ir.loads(data[:4] + bytes([99]) + data[5:])
+    for end in range(len(data)):
+        with pytest.raises(BinaryFormatError):
+            binary_ir.loads(data[:end])
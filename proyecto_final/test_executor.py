@@ -0,0 +1,47 @@
+# Registros del código intermedio (instructions.py) y su ejecución
+# (executor.py): execute_code da la misma salida que recorrer el AST.
+
+import pytest
+
+from executor import StepLimitExceeded, execute_code
+from instructions import ASSIGN, ADD, SUB, MUL, DIV, IFNOT, LABEL, format_code, is_temp
+from intermediate import compile_code
+from sample_programs import EXAMPLES, random_program, run_ast
+
+SOURCES = EXAMPLES + [random_program(seed) for seed in range(200)]
+
+@pytest.mark.parametrize('source', SOURCES)
+def test_matches_ast(source):
+    code, ast = compile_code(source)
+    assert execute_code(code) == run_ast(ast)
+
+@pytest.mark.parametrize('source', SOURCES)
+def test_records_are_well_formed(source):
+    code, _ast = compile_code(source)
+    for op, dest, a, b in code:
+        assert isinstance(dest, str)
+        if op == LABEL:
+            assert a is None and b is None
+            continue
+        assert a is not None and type(a) in (str, int, float)
+        if op in (ASSIGN, IFNOT):
+            assert b is None
+        else:
+            assert op in (ADD, SUB, MUL, DIV) and type(b) in (str, int, float)
+
+def test_records_of_a_small_program():
+    code, _ast = compile_code('x = 1\nif x - 1 then\n    y = x * 2.5\nend')
+    assert code == [(ASSIGN, 'x', 1, None), (SUB, '%t1', 'x', 1), (IFNOT, 'L1', '%t1', None),
+                    (MUL, 'y', 'x', 2.5), (LABEL, 'L1', None, None)]
+    assert format_code(code)[1] == '%t1 = x - 1'
+    assert is_temp('%t1') and not is_temp('t1')
+
+def test_failing_instructions_are_ignored():
+    code, _ast = compile_code('a = 1\nb = a / 0\nc = u + 1\nif u then\n    d = 1\nend\ne = a + 1')
+    assert execute_code(code) == ['a = 1', 'e = 2']
+
+def test_step_limit():
+    code, _ast = compile_code('\n'.join(f'x{i} = {i}' for i in range(10)))
+    assert len(execute_code(code, max_steps=10)) == 10
+    with pytest.raises(StepLimitExceeded):
+        execute_code(code, max_steps=9)
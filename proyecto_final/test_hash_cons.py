@@ -0,0 +1,36 @@
+# hash_cons=True: las subexpresiones idénticas comparten nodo y el código
+# intermedio calcula cada valor compartido una sola vez mientras siga siendo
+# válido, sin cambiar la salida del programa.
+
+import pytest
+
+from executor import execute_code
+from instructions import format_code
+from intermediate import compile_code
+from sample_programs import EXAMPLES, random_program, run_ast
+
+SOURCES = EXAMPLES + [random_program(seed) for seed in range(200)]
+
+@pytest.mark.parametrize('source', SOURCES)
+def test_matches_reference(source):
+    code, ast = compile_code(source)
+    shared_code, shared_ast = compile_code(source, hash_cons=True)
+    assert execute_code(shared_code) == run_ast(shared_ast) == run_ast(ast)
+    assert len(shared_code) <= len(code)
+
+def test_shared_nodes():
+    _code, ast = compile_code('y = (x + 1) * (x + 1)', hash_cons=True)
+    product = ast.children[0].children[1]
+    assert product.children[0] is product.children[1]
+
+def test_each_shared_value_computed_once_while_valid():
+    code, _ast = compile_code('x = 2\ny = (x + 1) * (x + 1)\nw = x + 1\nx = 5\nz = (x + 1) * (x + 1)',
+                              hash_cons=True)
+    # Una vez antes de reasignar x y otra después
+    assert format_code(code) == ['x = 2', '%t1 = x + 1', 'y = %t1 * %t1', 'w = %t1',
+                                 'x = 5', '%t2 = x + 1', 'z = %t2 * %t2']
+
+def test_value_from_a_branch_is_not_reused_after_it():
+    code, _ast = compile_code('a = 2\nif a then\n    b = a * 3\nend\nc = a * 3 + a * 3', hash_cons=True)
+    assert sum(line.endswith('= a * 3') for line in format_code(code)) == 2
+    assert execute_code(code) == ['a = 2', 'b = 6', 'c = 12']
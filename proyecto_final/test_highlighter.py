@@ -0,0 +1,206 @@
+# Resaltado incremental (highlighter.py): después de cualquier serie de
+# ediciones, las etiquetas del widget son las mismas que daría resaltar todo
+# el texto de nuevo, y coinciden con los tokens del lexer.
+#
+# FakeText imita lo que Highlighter usa de un widget tk.Text (el comando Tcl
+# que se renombra, index, get, insert, delete, replace, tag y after_idle),
+# así que la prueba no necesita una pantalla.
+
+import random
+
+import pytest
+
+from highlighter import KIND_TAGS, Highlighter, line_spans
+from lexer import lexer
+from sample_programs import EXAMPLES
+
+SNIPPETS = ['a = 1', 'if x then', 'end', 'y = 12.5 - b', '@', ' ', '3.', '# ', 'endx']
+
+class FakeTk:
+    def __init__(self):
+        self.commands = {}
+
+    def call(self, *args):
+        if len(args) == 1 and isinstance(args[0], tuple):
+            args = args[0]
+        if args[0] == 'rename':
+            self.commands[args[2]] = self.commands.pop(args[1])
+            return ''
+        return self.commands[args[0]](*args[1:])
+
+    def createcommand(self, name, function):
+        self.commands[name] = function
+
+class FakeText:
+    # Texto por líneas; cada carácter guarda el conjunto de sus etiquetas.
+    # Las funciones after_idle se ejecutan con run_idle()
+    def __init__(self):
+        self._w = '.texto'
+        self.lines = [[]]   # cada línea: lista de [carácter, etiquetas]
+        self.tk = FakeTk()
+        self.tk.createcommand(self._w, self.native)
+        self.idle = []
+
+    def insert(self, index, chars):
+        return self.tk.call(self._w, 'insert', index, chars)
+
+    def delete(self, start, end=None):
+        return self.tk.call((self._w, 'delete', start) + ((end,) if end else ()))
+
+    def replace(self, start, end, chars):
+        return self.tk.call(self._w, 'replace', start, end, chars)
+
+    def tag_configure(self, tag, **options):
+        pass
+
+    def after_idle(self, function):
+        self.idle.append(function)
+        return len(self.idle)
+
+    def run_idle(self, limit=None):
+        count = 0
+        while self.idle and (limit is None or count < limit):
+            self.idle.pop(0)()
+            count += 1
+
+    def text(self):
+        return '\n'.join(''.join(char for char, _ in line) for line in self.lines)
+
+    def tags(self):
+        return [[frozenset(tags) for _, tags in line] for line in self.lines]
+
+    def position(self, index):
+        # (línea, columna) de un índice 'L.C', 'L.end', 'end' o 'end-1c',
+        # dentro del texto
+        count = len(self.lines)
+        if index in ('end', 'end-1c'):
+            return count, len(self.lines[-1])
+        line, column = index.split('.')
+        line = int(line)
+        if line > count:
+            return count, len(self.lines[-1])
+        line = max(line, 1)
+        length = len(self.lines[line - 1])
+        return line, length if column == 'end' else min(int(column), length)
+
+    def native(self, command, *args):
+        if command == 'index':
+            return '%d.%d' % self.position(args[0])
+        if command == 'get':
+            return '\n'.join(''.join(char for char, _ in part)
+                             for part in self._slice(self.position(args[0]), self.position(args[1])))
+        if command == 'insert':
+            self._insert(self.position(args[0]), args[1])
+        elif command == 'delete':
+            start = self.position(args[0])
+            if len(args) > 1:
+                end = self.position(args[1])
+            elif start[1] < len(self.lines[start[0] - 1]):
+                end = (start[0], start[1] + 1)
+            else:
+                end = (start[0] + 1, 0) if start[0] < len(self.lines) else start
+            if end > start:
+                self._delete(start, end)
+        elif command == 'replace':
+            start, end = self.position(args[0]), self.position(args[1])
+            if end > start:
+                self._delete(start, end)
+            self._insert(start, args[2])
+        elif command == 'tag':
+            action, tag, *indices = args
+            for i in range(0, len(indices), 2):
+                start, end = self.position(indices[i]), self.position(indices[i + 1])
+                for part in self._slice(start, end):
+                    for _, tags in part:
+                        (tags.add if action == 'add' else tags.discard)(tag)
+        else:
+            raise ValueError(command)
+        return ''
+
+    def _slice(self, start, end):
+        parts = []
+        for line in range(start[0], end[0] + 1):
+            chars = self.lines[line - 1]
+            parts.append(chars[start[1] if line == start[0] else 0:
+                               end[1] if line == end[0] else len(chars)])
+        return parts
+
+    def _insert(self, position, chars):
+        line, column = position
+        old = self.lines[line - 1]
+        new = [[[char, set()] for char in part] for part in chars.split('\n')]
+        new[0] = old[:column] + new[0]
+        new[-1] = new[-1] + old[column:]
+        self.lines[line - 1:line] = new
+
+    def _delete(self, start, end):
+        joined = self.lines[start[0] - 1][:start[1]] + self.lines[end[0] - 1][end[1]:]
+        self.lines[start[0] - 1:end[0]] = [joined]
+
+def expected_tags(text):
+    # Etiquetas de cada carácter si se resalta todo el texto de una vez
+    result = []
+    for line in text.split('\n'):
+        tags = [set() for _ in line]
+        for tag, start, end in line_spans(line):
+            for column in range(start, end):
+                tags[column].add(tag)
+        result.append([frozenset(t) for t in tags])
+    return result
+
+@pytest.mark.parametrize('seed', range(40))
+def test_edits_match_full_highlight(seed):
+    rng = random.Random(seed)
+    widget = FakeText()
+    widget.insert('1.0', '\n'.join(rng.choice(SNIPPETS) for _ in range(rng.randint(0, 30))))
+    Highlighter(widget, chunk_lines=rng.choice([1, 3, 500]))
+
+    def index():
+        line = rng.randint(1, len(widget.lines) + 1)
+        if line > len(widget.lines):
+            return rng.choice(['end', 'end-1c'])
+        return f'{line}.{rng.choice([0, 1, 3, "end"])}'
+
+    for _ in range(40):
+        chars = ''.join(rng.choice(SNIPPETS + ['\n', 'x', ' ']) for _ in range(rng.randint(0, 4)))
+        start, end = sorted([index(), index()], key=widget.position)
+        r = rng.random()
+        if r < 0.5:
+            widget.insert(start, chars)
+        elif r < 0.8:
+            widget.delete(start, end if rng.random() < 0.6 else None)
+        else:
+            widget.replace(start, end, chars)
+        if rng.random() < 0.3:
+            widget.run_idle(limit=rng.choice([1, 2, None]))
+    widget.run_idle()
+    assert widget.tags() == expected_tags(widget.text())
+
+@pytest.mark.parametrize('source', EXAMPLES)
+def test_spans_match_lexer(source):
+    expected = [(token.line, KIND_TAGS[token.type], token.column - 1)
+                for token in lexer(source) if token.type in KIND_TAGS]
+    spans = [(number, tag, start) for number, line in enumerate(source.split('\n'), 1)
+             for tag, start, _ in line_spans(line)]
+    assert spans == expected
+
+def test_large_load_is_split_in_chunks():
+    widget = FakeText()
+    Highlighter(widget, chunk_lines=10)
+    widget.run_idle()
+    widget.insert('1.0', '\n'.join(['x = 1'] * 35))
+    widget.run_idle(limit=1)
+    assert widget.tags() != expected_tags(widget.text())
+    widget.run_idle()
+    assert widget.tags() == expected_tags(widget.text())
+
+def test_pending_damage_moves_with_inserted_lines():
+    widget = FakeText()
+    widget.insert('1.0', '\n'.join(['a = 1'] * 6))
+    Highlighter(widget)
+    widget.run_idle()
+    widget.insert('5.0', 'if ')
+    widget.insert('1.0', '\n\n\n')
+    widget.delete('2.0', '3.0')
+    widget.run_idle()
+    assert widget.tags() == expected_tags(widget.text())
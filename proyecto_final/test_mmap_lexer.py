@@ -0,0 +1,38 @@
+# Compilación desde archivo con mmap (mmap_lexer.py): los SliceToken valen
+# lo mismo que los tokens de lexer y compile_file da el mismo código que
+# compile_code.
+
+import pytest
+
+from intermediate import compile_code
+from lexer import lexer
+from mmap_lexer import MappedSource, compile_file, lexer_mapped
+from sample_programs import EXAMPLES, random_program
+from test_ast_binary import flatten
+
+SOURCES = EXAMPLES + [random_program(seed) for seed in range(100)]
+
+def lex(function, data):
+    try:
+        return [tuple(token) for token in function(data)]
+    except RuntimeError as error:
+        return str(error)
+
+@pytest.mark.parametrize('source', SOURCES + ['', '\n\n', 'a = 1\n  b = $', 'x = 2\ny = ñ + 1'])
+def test_tokens_match_lexer(source):
+    assert lex(lexer_mapped, source.encode('utf-8')) == lex(lexer, source)
+
+@pytest.mark.parametrize('source', SOURCES)
+def test_compile_file_matches_compile_code(source, tmp_path):
+    path = tmp_path / 'programa.txt'
+    path.write_text(source, encoding='utf-8')
+    code, ast = compile_file(str(path))
+    expected_code, expected_ast = compile_code(source)
+    assert code == expected_code
+    assert flatten(ast) == flatten(expected_ast)
+
+def test_empty_file(tmp_path):
+    path = tmp_path / 'vacio.txt'
+    path.write_bytes(b'')
+    with MappedSource(str(path)) as source:
+        assert source.tokens() == []
@@ -0,0 +1,36 @@
+# Evaluación parcial (partial_eval.py): con cualquier combustible, el código
+# de compile_code(fuel=N) da la misma salida que el código normal; si el
+# programa termina, es una tabla de asignaciones sin temporales.
+
+import pytest
+
+from executor import execute_code
+from instructions import ASSIGN, format_code
+from intermediate import compile_code
+from partial_eval import DEFAULT_FUEL
+from sample_programs import EXAMPLES, random_program
+
+SOURCES = EXAMPLES + [random_program(seed) for seed in range(150)]
+
+@pytest.mark.parametrize('source', SOURCES)
+@pytest.mark.parametrize('fuel', [0, 5, DEFAULT_FUEL])
+def test_matches_plain_code(source, fuel):
+    table, _ast = compile_code(source, fuel=fuel)
+    code, _ast = compile_code(source)
+    assert execute_code(table) == execute_code(code)
+
+def test_program_becomes_table():
+    table, _ast = compile_code('x = 2\ny = (x + 1) * 4\nif y - 12 then\n    y = 0\nend\nz = y / 8',
+                               fuel=DEFAULT_FUEL)
+    assert format_code(table) == ['x = 2', 'y = 12', 'z = 1.5']
+    assert all(record[0] == ASSIGN for record in table)
+
+def test_failing_instructions_are_ignored():
+    source = 'a = 1\nb = a / 0\nc = u + 1\nif u then\n    d = 1\nend\ne = a + 1'
+    table, _ast = compile_code(source, fuel=DEFAULT_FUEL)
+    assert format_code(table) == ['a = 1', 'e = 2']
+    assert execute_code(table) == execute_code(compile_code(source)[0])
+
+def test_out_of_fuel_keeps_code():
+    source = 'x = 1\ny = x + 1\nz = y * 2'
+    assert compile_code(source, fuel=2)[0] == compile_code(source)[0]
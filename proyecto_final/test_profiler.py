@@ -0,0 +1,55 @@
+# Perfilador (profiler.py): medir no cambia la salida de execute_code, y
+# cada sentencia se cuenta una vez por ejecución con todas sus
+# instrucciones.
+
+import pytest
+
+from executor import execute_code
+from instructions import LABEL
+from intermediate import compile_code_with_lines
+from profiler import Profiler
+from sample_programs import EXAMPLES, random_program
+
+SOURCES = EXAMPLES + [random_program(seed) for seed in range(150)]
+
+def profiled(source):
+    code, _ast, code_lines = compile_code_with_lines(source)
+    profiler = Profiler()
+    output = execute_code(code, profiler, code_lines)
+    return code, output, profiler
+
+@pytest.mark.parametrize('source', SOURCES)
+def test_same_output(source):
+    code, output, profiler = profiled(source)
+    assert output == execute_code(code)
+    # Sin lazos, cada sentencia se ejecuta a lo sumo una vez
+    assert all(count == 1 for count, _, _ in profiler.stats.values())
+    executed = sum(instructions for _, instructions, _ in profiler.stats.values())
+    assert executed <= sum(1 for record in code if record[0] != LABEL)
+
+def test_counts_per_statement():
+    source = 'x = 2\ny = (x + 1) * 3\nif x - 2 then\n    z = 1\nend\nw = y / 2'
+    _code, output, profiler = profiled(source)
+    assert output == ['x = 2', 'y = 9', 'w = 4.5']
+    counts = {statement: (count, instructions)
+              for statement, count, instructions, _ in profiler.hot_spots()}
+    assert counts == {(1, 1): (1, 1), (2, 1): (1, 2), (3, 1): (1, 2), (6, 1): (1, 1)}
+    report = profiler.report(source)
+    assert len(report) == 5 and any(row.endswith('y = (x + 1) * 3') for row in report)
+
+def test_statements_on_the_same_line():
+    # Cada sentencia es una fila, y el cuerpo del if no se le atribuye al if
+    source = 'x = 0 i = 5\nif i then x = x + 1 i = i - 1 end'
+    _code, output, profiler = profiled(source)
+    assert output == ['x = 1', 'i = 4']
+    counts = {statement: (count, instructions)
+              for statement, count, instructions, _ in profiler.hot_spots()}
+    assert counts == {(1, 1): (1, 1), (1, 7): (1, 1), (2, 1): (1, 1), (2, 11): (1, 1), (2, 21): (1, 1)}
+    texts = sorted(row.split(maxsplit=4)[4] for row in profiler.report(source)[1:])
+    assert texts == ['i = 5', 'i = i - 1', 'if i then', 'x = 0', 'x = x + 1']
+
+def test_merge():
+    _code, _output, first = profiled('x = 1\ny = x + 1')
+    _code, _output, second = profiled('x = 1\ny = x + 1')
+    first.merge(second.stats)
+    assert {statement: stat[:2] for statement, stat in first.stats.items()} == {(1, 1): [2, 2], (2, 1): [2, 2]}
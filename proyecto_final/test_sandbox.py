@@ -0,0 +1,54 @@
+# Sandbox (sandbox.py): los procesos del pool dan la misma salida que
+# execute_code, y cada límite (pasos, tiempo, memoria) se informa con su
+# excepción sin dejar el pool inutilizable.
+
+import pytest
+
+import sandbox
+from executor import execute_code
+from instructions import ASSIGN, ADD, MUL
+from intermediate import compile_code_with_lines
+from profiler import Profiler
+from sample_programs import EXAMPLES, random_program
+from sandbox import SandboxMemoryError, SandboxPool, SandboxStepLimit, SandboxTimeout
+
+SOURCES = EXAMPLES + [random_program(seed) for seed in range(50)]
+
+@pytest.fixture(scope='module')
+def pool():
+    with SandboxPool(workers=2, timeout=10) as pool:
+        yield pool
+
+@pytest.mark.parametrize('source', SOURCES)
+def test_matches_execute_code(pool, source):
+    code, _ast, code_lines = compile_code_with_lines(source)
+    assert pool.run(code) == execute_code(code)
+    profiler = Profiler()
+    assert pool.run(code, code_lines, profiler) == execute_code(code)
+    local = Profiler()
+    execute_code(code, local, code_lines)
+    assert {line: stat[:2] for line, stat in profiler.stats.items()} == \
+        {line: stat[:2] for line, stat in local.stats.items()}
+
+def test_step_limit():
+    code = [(ASSIGN, 'x', 0, None)] + [(ADD, 'x', 'x', 1)] * 100
+    with SandboxPool(workers=1, max_steps=50) as pool:
+        with pytest.raises(SandboxStepLimit):
+            pool.run(code)
+        assert pool.run(code[:50]) == ['x = 49']
+
+def test_timeout_replaces_the_worker():
+    code = [(ASSIGN, 'x', 0, None)] + [(ADD, 'x', 'x', 1)] * 3_000_000
+    with SandboxPool(workers=1, timeout=0.2) as pool:
+        with pytest.raises(SandboxTimeout):
+            pool.run(code)
+        assert pool.run([(ASSIGN, 'y', 1, None)]) == ['y = 1']
+
+@pytest.mark.skipif(sandbox.resource is None, reason='el límite de memoria necesita resource')
+def test_memory_limit():
+    # Cada cuadrado duplica el tamaño de x
+    code = [(ASSIGN, 'x', 3, None)] + [(MUL, 'x', 'x', 'x')] * 40
+    with SandboxPool(workers=1, memory_mb=2, timeout=10) as pool:
+        with pytest.raises(SandboxMemoryError):
+            pool.run(code)
+        assert pool.run([(ASSIGN, 'y', 1, None)]) == ['y = 1']
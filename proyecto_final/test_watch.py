@@ -0,0 +1,71 @@
+# Modo watch (watch.py): relex da los mismos tokens que volver a lexear todo
+# el archivo, y cada revisión deja el mismo código que compile_code.
+
+import os
+import random
+
+import pytest
+
+from intermediate import compile_code_with_lines
+from lexer import lexer
+from watch import Watcher, relex
+
+LINES = ['x = 1', 'if x then', 'end', 'y = (x + 2) * 3', '', '  z = y / 4.5', 'iffy = endx']
+
+@pytest.mark.parametrize('seed', range(200))
+def test_relex_matches_lexer(seed):
+    rng = random.Random(seed)
+    old = [rng.choice(LINES) for _ in range(rng.randint(0, 12))]
+    new = list(old)
+    for _ in range(rng.randint(1, 3)):
+        i = rng.randint(0, len(new))
+        r = rng.random()
+        if r < 0.3:
+            new.insert(i, rng.choice(LINES))
+        elif r < 0.6 and new:
+            del new[min(i, len(new) - 1)]
+        elif new:
+            new[min(i, len(new) - 1)] = rng.choice(LINES)
+    assert relex(old, lexer('\n'.join(old)), new) == lexer('\n'.join(new))
+
+def save(path, source, step):
+    # Escribe el archivo con una fecha de modificación distinta en cada paso
+    path.write_text(source, encoding='utf-8')
+    os.utime(path, ns=(step * 10 ** 9, step * 10 ** 9))
+
+def test_poll_recompiles_changed_files(tmp_path):
+    path = tmp_path / 'programa.txt'
+    output = []
+    watcher = Watcher([str(tmp_path)], output=output.append)
+    versions = ['x = 1\ny = x + 2',
+                'x = 1\nw = 5\ny = x + 2',
+                'x = 1\nw = 5\nif w then\n    y = x + 2\nend']
+    for step, source in enumerate(versions, 1):
+        save(path, source, step)
+        [watched] = watcher.poll()
+        code, _ast, code_lines = compile_code_with_lines(source)
+        assert watched.tokens == lexer(source)
+        assert (watched.code, watched.code_lines) == (code, code_lines)
+    assert len(output) == len(versions)
+
+def test_unchanged_or_broken_saves(tmp_path):
+    path = tmp_path / 'programa.txt'
+    output = []
+    watcher = Watcher([str(path)], output=output.append)
+    save(path, 'x = 1', 1)
+    [watched] = watcher.poll()
+    assert watcher.poll() == []
+    # Guardado sin cambios: no se recompila
+    save(path, 'x = 1', 2)
+    assert watcher.poll() == []
+    # Un error conserva la última versión válida
+    save(path, 'x = (1', 3)
+    assert watcher.poll() == [watched]
+    assert 'error' in output[-1]
+    assert watched.lines == ['x = 1']
+    save(path, 'x = 2', 4)
+    watcher.poll()
+    assert watched.code == compile_code_with_lines('x = 2')[0]
+    path.unlink()
+    assert watcher.poll() == []
+    assert output[-1].endswith('borrado') and not watcher.files
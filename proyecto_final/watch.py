@@ -0,0 +1,174 @@
+# Modo watch: recompila los programas que cambian en uno o más directorios.
+#
+#     python watch.py DIRECTORIO_O_ARCHIVO... [--ejecutar] [--intervalo SEGUNDOS] [--extension .txt]
+#
+# Cada intervalo se revisan la fecha de modificación y el tamaño de los
+# archivos (os.stat, sin dependencias externas) y solo se recompilan los que
+# cambiaron. Todo queda en memoria entre compilaciones: las expresiones
+# regulares del lexer se compilan una sola vez, y de cada archivo se guardan
+# sus líneas, tokens, AST y código intermedio. Al recompilar solo se vuelven a
+# lexear las líneas que cambiaron (los tokens del prefijo y del sufijo comunes
+# se reutilizan, corrigiendo su número de línea), y si el archivo se guardó
+# sin cambios no se recompila.
+#
+# Por cada cambio se informa el tiempo de compilación y la latencia desde la
+# edición (la fecha de modificación del archivo) hasta tener el código
+# intermedio. Con --ejecutar el código se ejecuta además en el sandbox (ver
+# sandbox.py), cuyos procesos se crean una vez y se reutilizan.
+
+import argparse
+import os
+import time
+from bisect import bisect_right
+
+from lexer import Token, lexer
+from parser import Parser
+from sandbox import SandboxPool, SandboxError
+
+def file_signature(path):
+    # (fecha de modificación en ns, tamaño): si no cambia, el archivo se da
+    # por no modificado
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+def relex(old_lines, old_tokens, new_lines):
+    # Tokens de new_lines reutilizando los de old_lines: como ningún token
+    # cruza un salto de línea, solo hay que lexear las líneas entre el
+    # prefijo y el sufijo comunes
+    first = 0
+    common = min(len(old_lines), len(new_lines))
+    while first < common and old_lines[first] == new_lines[first]:
+        first += 1
+    old_end, new_end = len(old_lines), len(new_lines)
+    while old_end > first and new_end > first and old_lines[old_end - 1] == new_lines[new_end - 1]:
+        old_end -= 1
+        new_end -= 1
+    prefix = old_tokens[:bisect_right(old_tokens, first, key=lambda token: token.line)]
+    middle = lexer('\n'.join(new_lines[first:new_end]), first + 1) if new_end > first else []
+    shift = new_end - old_end
+    suffix = old_tokens[bisect_right(old_tokens, old_end, key=lambda token: token.line):]
+    if shift:
+        suffix = [Token(t.type, t.value, t.line + shift, t.column) for t in suffix]
+    return prefix + middle + suffix
+
+class WatchedFile:
+    # Estado en memoria de un archivo vigilado
+    def __init__(self, path):
+        self.path = path
+        self.signature = None
+        self.lines = []
+        self.tokens = []
+        self.ast = None
+        self.code = None
+        self.code_lines = None
+
+class Watcher:
+    def __init__(self, paths, extension='.txt', run=False, output=print):
+        self.paths = list(paths)
+        self.extension = extension
+        self.run = run
+        self.output = output
+        self.files = {}   # ruta -> WatchedFile
+        self.sandbox = None
+
+    def discover(self):
+        # Los archivos nombrados directamente y los que tienen la extensión
+        # dentro de los directorios (recursivamente)
+        found = []
+        for path in self.paths:
+            if not os.path.isdir(path):
+                found.append(path)
+                continue
+            for directory, subdirectories, names in os.walk(path):
+                subdirectories.sort()
+                found.extend(os.path.join(directory, name) for name in sorted(names)
+                             if name.endswith(self.extension))
+        return found
+
+    def poll(self):
+        # Una revisión: recompila los archivos nuevos o modificados y olvida
+        # los borrados. Devuelve la lista de WatchedFile recompilados
+        changed = []
+        seen = set()
+        for path in self.discover():
+            try:
+                signature = file_signature(path)
+            except OSError:
+                continue
+            seen.add(path)
+            watched = self.files.get(path)
+            if watched is None:
+                watched = self.files[path] = WatchedFile(path)
+            if watched.signature == signature:
+                continue
+            watched.signature = signature
+            if self.compile(watched):
+                changed.append(watched)
+        for path in list(self.files):
+            if path not in seen:
+                del self.files[path]
+                self.output(f'{path}: borrado')
+        return changed
+
+    def compile(self, watched):
+        # Vuelve a leer y compilar un archivo modificado. Devuelve False si el
+        # contenido es el mismo de la última compilación
+        try:
+            with open(watched.path, encoding='utf-8') as file:
+                lines = file.read().split('\n')
+        except (OSError, UnicodeDecodeError) as e:
+            self.output(f'{watched.path}: no se pudo leer ({e})')
+            return False
+        if lines == watched.lines and watched.code is not None:
+            return False
+        start = time.perf_counter()
+        try:
+            tokens = relex(watched.lines, watched.tokens, lines)
+            parser = Parser(tokens)
+            parser.parse_program()
+        except Exception as e:
+            # Se conservan las líneas y tokens de la última versión válida
+            self.output(f'{watched.path}: error: {e}')
+            return True
+        watched.lines, watched.tokens = lines, tokens
+        watched.ast, watched.code, watched.code_lines = parser.ast, parser.code, parser.code_lines
+        compile_ms = (time.perf_counter() - start) * 1000
+        latency_ms = (time.time_ns() - watched.signature[0]) / 1e6
+        self.output(f'{watched.path}: {len(watched.code)} instrucciones en {compile_ms:.2f} ms'
+                    f' ({latency_ms:.1f} ms desde la edición)')
+        if self.run:
+            self.execute(watched)
+        return True
+
+    def execute(self, watched):
+        if self.sandbox is None:
+            self.sandbox = SandboxPool()
+        try:
+            results = self.sandbox.run(watched.code, watched.code_lines)
+        except SandboxError as e:
+            results = [f'Ejecución interrumpida: {e}']
+        for line in results:
+            self.output(f'  {line}')
+
+    def watch(self, interval=0.2):
+        # Revisa los archivos cada interval segundos hasta Ctrl+C
+        try:
+            while True:
+                self.poll()
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if self.sandbox is not None:
+                self.sandbox.close()
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description='Recompila los programas que cambian.')
+    arg_parser.add_argument('rutas', nargs='+', help='directorios o archivos a vigilar')
+    arg_parser.add_argument('--ejecutar', action='store_true', help='ejecutar el código tras cada cambio')
+    arg_parser.add_argument('--intervalo', type=float, default=0.2, help='segundos entre revisiones')
+    arg_parser.add_argument('--extension', default='.txt', help='extensión de los programas')
+    args = arg_parser.parse_args()
+    watcher = Watcher(args.rutas, args.extension, args.ejecutar)
+    print(f'Vigilando {", ".join(args.rutas)} (Ctrl+C para salir)')
+    watcher.watch(args.intervalo)
@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+"""
+Servidor de compilación persistente
+-----------------------------------
+Proceso de larga duración que atiende peticiones de compilación por un socket
+Unix, para que las herramientas por lotes y los editores no tengan que lanzar
+un intérprete nuevo (y reimportar todo) en cada compilación. Envuelve
+compile_code de proyecto_final y de Semana 7 (minipy), mantiene una caché LRU
+de resultados y un pool de procesos ya calientes, y lleva percentiles de
+latencia por petición.
+
+Protocolo: una petición JSON por línea y una respuesta JSON por línea.
+    {"id": 1, "pipeline": "final" | "minipy", "source": "x = 1"}
+    {"id": 1, "ok": true, "ir": [...], "symbols": {...}, "cached": false, "ms": 0.4}
+    {"id": 2, "op": "stats"}
+Las respuestas llevan el mismo "id" y pueden llegar en otro orden. Con
+"ast": true la respuesta incluye además el AST en el formato binario de
+ast_binary.py (proyecto_final) o minipy/ast_binary.py, codificado en base64;
+el AST solo se codifica cuando se pide, y la caché guarda por separado las
+compilaciones con y sin AST.
+
+Uso:
+    python servidor_compilacion.py serve [-s SOCKET] [-j TRABAJADORES]
+    python servidor_compilacion.py compile final programa.txt
+    python servidor_compilacion.py stats
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import socket
+import sys
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+
+RAIZ = os.path.dirname(os.path.abspath(__file__))
+RUTAS = [os.path.join(RAIZ, "proyecto_final"), os.path.join(RAIZ, "Semana 7 Real")]
+DEFAULT_SOCKET = "/tmp/compiladores.sock"
+DEFAULT_CACHE_SIZE = 1024
+LATENCY_WINDOW = 10000  # últimas latencias conservadas por pipeline
+
+
+# ----------------------------------------------------------------------
+# Compilación (se ejecuta dentro de los procesos trabajadores)
+# ----------------------------------------------------------------------
+_compilers = None
+
+
+def _load_compilers():
+    global _compilers
+    if _compilers is None:
+        for ruta in RUTAS:
+            if ruta not in sys.path:
+                sys.path.insert(0, ruta)
+        import intermediate
+        import instructions
+        import ast_binary
+        import minipy
+        from minipy import ast_binary as minipy_ast_binary
+        _compilers = {"final": (intermediate.compile_code, ast_binary.dumps,
+                                instructions.format_code),
+                      "minipy": (minipy.compile_code, minipy_ast_binary.dumps, list)}
+    return _compilers
+
+
+def compile_source(pipeline, source, with_ast=False):
+    """
+    Compila con el pipeline indicado y devuelve un dict; todo es serializable
+    en JSON salvo "ast" (solo con with_ast), que son los bytes del AST
+    codificado.
+    """
+    compilers = _load_compilers()
+    if pipeline not in compilers:
+        return {"ok": False, "error": f"Pipeline desconocido: {pipeline}"}
+    # format_ir da la vista de texto del código intermedio (proyecto_final
+    # genera registros, minipy ya genera líneas)
+    compile_code, encode_ast, format_ir = compilers[pipeline]
+    try:
+        if pipeline == "final":
+            ir, ast = compile_code(source)
+            result = {"ok": True, "ir": format_ir(ir)}
+        else:
+            _tokens, ast, symtab, ir = compile_code(source)
+            result = {"ok": True, "ir": format_ir(ir), "symbols": symtab}
+        if with_ast:
+            result["ast"] = encode_ast(ast)
+        return result
+    except Exception as e:
+        return {"ok": False, "error": f"{type(e).__name__}: {e}"}
+
+
+# ----------------------------------------------------------------------
+# Servidor
+# ----------------------------------------------------------------------
+def percentiles(values, points=(50, 90, 99)):
+    if not values:
+        return {f"p{p}": None for p in points}
+    ordered = sorted(values)
+    last = len(ordered) - 1
+    return {f"p{p}": round(ordered[min(last, round(p / 100 * last))], 3) for p in points}
+
+
+class CompileServer:
+    def __init__(self, workers=1, cache_size=DEFAULT_CACHE_SIZE):
+        # workers=0 compila en el propio hilo del servidor (sin IPC)
+        self.pool = None
+        if workers:
+            self.pool = ProcessPoolExecutor(workers, initializer=_load_compilers)
+        else:
+            _load_compilers()
+        self.cache = OrderedDict()
+        self.cache_size = cache_size
+        self.in_flight = {}  # compilaciones en curso, para no repetirlas
+        self.latencies = {}  # pipeline -> deque de ms
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0  # peticiones que esperaron una compilación ya en curso
+
+    async def compile(self, pipeline, source, with_ast=False):
+        key = (pipeline, source, with_ast)
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            self.hits += 1
+            return self.cache[key], True
+        if key in self.in_flight:
+            self.shared += 1
+            return await asyncio.shield(self.in_flight[key]), False
+        self.misses += 1
+        loop = asyncio.get_running_loop()
+        if self.pool is None:
+            future = loop.create_future()
+            future.set_result(compile_source(pipeline, source, with_ast))
+        else:
+            future = loop.run_in_executor(self.pool, compile_source, pipeline, source, with_ast)
+        self.in_flight[key] = future
+        try:
+            result = await future
+        finally:
+            del self.in_flight[key]
+        self.cache[key] = result
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return result, False
+
+    def stats(self):
+        return {
+            "ok": True,
+            "cache": {"size": len(self.cache), "hits": self.hits, "misses": self.misses,
+                      "shared": self.shared},
+            "latency_ms": {pipeline: dict(count=len(values), **percentiles(values))
+                           for pipeline, values in self.latencies.items()},
+        }
+
+    async def handle_request(self, request):
+        if not isinstance(request, dict):
+            return {"ok": False, "error": "La petición debe ser un objeto JSON"}
+        if request.get("op") == "stats":
+            return self.stats()
+        pipeline = request.get("pipeline", "minipy")
+        source = request.get("source", "")
+        if not isinstance(pipeline, str) or not isinstance(source, str):
+            return {"ok": False, "error": '"pipeline" y "source" deben ser cadenas'}
+        start = time.perf_counter()
+        with_ast = bool(request.get("ast"))
+        result, cached = await self.compile(pipeline, source, with_ast)
+        elapsed = (time.perf_counter() - start) * 1000
+        self.latencies.setdefault(pipeline, deque(maxlen=LATENCY_WINDOW)).append(elapsed)
+        response = dict(result, cached=cached, ms=round(elapsed, 3))
+        if "ast" in response:
+            response["ast"] = base64.b64encode(response["ast"]).decode("ascii")
+        return response
+
+    async def handle_connection(self, reader, writer):
+        lock = asyncio.Lock()  # las respuestas concurrentes no deben mezclarse
+
+        async def respond(line):
+            # Toda petición recibe una respuesta, aunque falle: si no, el
+            # cliente se quedaría esperando
+            request = None
+            try:
+                request = json.loads(line)
+                response = await self.handle_request(request)
+            except json.JSONDecodeError as e:
+                response = {"ok": False, "error": f"JSON inválido: {e}"}
+            except Exception as e:
+                response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            if isinstance(request, dict) and "id" in request:
+                response = dict(response, id=request["id"])
+            async with lock:
+                writer.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+                await writer.drain()
+
+        tasks = set()
+        try:
+            while line := await reader.readline():
+                if line.strip():
+                    task = asyncio.create_task(respond(line))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            writer.close()
+
+    async def serve(self, path):
+        if os.path.exists(path):
+            os.unlink(path)
+        server = await asyncio.start_unix_server(self.handle_connection, path=path,
+                                                 limit=2 ** 24)
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+
+
+# ----------------------------------------------------------------------
+# Cliente
+# ----------------------------------------------------------------------
+class CompileClient:
+    """
+    Cliente bloqueante sencillo: una petición a la vez por conexión.
+    """
+    def __init__(self, path=DEFAULT_SOCKET):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(path)
+        self.stream = self.sock.makefile("rwb")
+        self.next_id = 0
+
+    def request(self, **request):
+        self.next_id += 1
+        request["id"] = self.next_id
+        self.stream.write(json.dumps(request).encode("utf-8") + b"\n")
+        self.stream.flush()
+        return json.loads(self.stream.readline())
+
+    def compile(self, pipeline, source, ast=False):
+        return self.request(pipeline=pipeline, source=source, ast=ast)
+
+    def stats(self):
+        return self.request(op="stats")
+
+    def close(self):
+        self.stream.close()
+        self.sock.close()
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Servidor de compilación persistente.")
+    arg_parser.add_argument("-s", "--socket", default=DEFAULT_SOCKET)
+    sub = arg_parser.add_subparsers(dest="comando", required=True)
+    serve = sub.add_parser("serve", help="inicia el servidor")
+    serve.add_argument("-j", "--trabajadores", type=int, default=os.cpu_count() or 1,
+                       help="procesos de compilación (0 = en el propio servidor)")
+    serve.add_argument("--cache", type=int, default=DEFAULT_CACHE_SIZE)
+    comp = sub.add_parser("compile", help="compila un archivo usando el servidor")
+    comp.add_argument("pipeline", choices=("final", "minipy"))
+    comp.add_argument("archivo")
+    sub.add_parser("stats", help="muestra caché y percentiles de latencia")
+    args = arg_parser.parse_args(argv)
+
+    if args.comando == "serve":
+        server = CompileServer(args.trabajadores, args.cache)
+        try:
+            asyncio.run(server.serve(args.socket))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.close()
+        return
+
+    client = CompileClient(args.socket)
+    try:
+        if args.comando == "compile":
+            with open(args.archivo, "r", encoding="utf-8") as f:
+                response = client.compile(args.pipeline, f.read())
+        else:
+            response = client.stats()
+    finally:
+        client.close()
+    print(json.dumps(response, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de la separación entre núcleo e interfaz
+------------------------------------------------
+Los módulos del núcleo de cada compilador se importan sin cargar tkinter
+(cada prueba usa un intérprete nuevo, porque sys.modules es compartido), la
+interfaz gráfica sigue exponiendo los nombres de antes y bench_arranque
+mide los seis módulos.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+import bench_arranque
+from bench_arranque import CASOS, RAIZ
+
+SEMANA_7 = os.path.join(RAIZ, "Semana 7 Real")
+MODULOS_MINIPY = sorted("minipy." + nombre[:-3]
+                        for nombre in os.listdir(os.path.join(SEMANA_7, "minipy"))
+                        if nombre.endswith(".py") and nombre != "__init__.py")
+
+
+def ejecutar(carpeta, codigo):
+    """
+    Corre el código en un intérprete nuevo dentro de la carpeta y devuelve
+    su salida estándar.
+    """
+    resultado = subprocess.run([sys.executable, "-c", codigo], cwd=carpeta,
+                               capture_output=True, text=True)
+    assert resultado.returncode == 0, resultado.stderr
+    return resultado.stdout
+
+
+@pytest.mark.parametrize("carpeta, modulos", [
+    (RAIZ, ["tokenizador"]),
+    (os.path.join(RAIZ, "Tarea 4"), ["gramatica", "evaluador_lotes"]),
+    (SEMANA_7, ["minipy"] + MODULOS_MINIPY),
+])
+def test_nucleo_sin_tkinter(carpeta, modulos):
+    importaciones = "; ".join(f"import {modulo}" for modulo in modulos)
+    salida = ejecutar(carpeta, f"import sys; {importaciones}; print('tkinter' in sys.modules)")
+    assert salida.split() == ["False"]
+
+
+def test_interfaz_reexporta_el_nucleo():
+    salida = ejecutar(SEMANA_7, "import Compilador, minipy\n"
+                                "for nombre in ('lexer', 'ASTNode', 'Parser', 'semantic_analysis',\n"
+                                "               'generate_code', 'compile_code'):\n"
+                                "    print(getattr(Compilador, nombre) is getattr(minipy, nombre))")
+    assert salida.split() == ["True"] * 6
+    salida = ejecutar(os.path.join(RAIZ, "Tarea 4"),
+                      "import AnalizadorSintactico, gramatica\n"
+                      "print(AnalizadorSintactico.evaluate is gramatica.evaluate)")
+    assert salida.split() == ["True"]
+
+
+def test_interfaz_no_abre_ventanas_al_importarse():
+    # Sin pantalla, crear una ventana Tk falla: importar debe funcionar igual
+    for carpeta, _nucleo, interfaz in CASOS:
+        entorno = "import os; os.environ.pop('DISPLAY', None); "
+        assert ejecutar(carpeta, f"{entorno}import {interfaz}; print('ok')").split() == ["ok"]
+
+
+def test_benchmark(capsys):
+    carpeta, nucleo, _interfaz = CASOS[0]
+    assert bench_arranque.tiempo_proceso(carpeta, nucleo, 1) > 0
+    assert bench_arranque.tiempo_pool(carpeta, nucleo, 1, 1) > 0
+    bench_arranque.main(["-n", "1", "-j", "1"])
+    lineas = capsys.readouterr().out.splitlines()
+    assert [linea.split()[0] for linea in lineas[1:]] == [modulo for caso in CASOS for modulo in caso[1:]]
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas del servidor de compilación
+-----------------------------------
+Cada respuesta del servidor es la misma compilación que hacen compile_code
+de proyecto_final y de minipy, desde la caché o no, y las peticiones mal
+formadas reciben una respuesta de error con su id.
+"""
+
+import asyncio
+import base64
+import json
+
+import pytest
+
+import servidor_compilacion
+from servidor_compilacion import CompileServer, compile_source
+
+PROGRAMAS = {
+    "final": ["x = 1", "x = 2\nif x then\n    y = x * 2.5\nend\nz = y / 0", "x = (1"],
+    "minipy": ["x = 1;", "i = 3; s = 0; while i : BEGIN s = s + i; i = i - 1; END",
+               "x = (1;", "a = 1; b = a / 0;"],
+}
+CASOS = [(pipeline, source) for pipeline, sources in PROGRAMAS.items() for source in sources]
+
+
+def esperado(pipeline, source):
+    """
+    (ir en texto, AST codificado) según el compile_code de cada pipeline, o
+    el nombre de la excepción.
+    """
+    servidor_compilacion._load_compilers()
+    try:
+        if pipeline == "final":
+            import intermediate
+            import instructions
+            import ast_binary
+            ir, ast = intermediate.compile_code(source)
+            return instructions.format_code(ir), ast_binary.dumps(ast)
+        import minipy
+        from minipy import ast_binary
+        _tokens, ast, _symbols, ir = minipy.compile_code(source)
+        return ir, ast_binary.dumps(ast)
+    except Exception as e:
+        return type(e).__name__
+
+
+@pytest.mark.parametrize("pipeline, source", CASOS)
+def test_compile_source(pipeline, source):
+    result = compile_source(pipeline, source, with_ast=True)
+    expected = esperado(pipeline, source)
+    if isinstance(expected, str):
+        assert not result["ok"] and result["error"].startswith(expected)
+    else:
+        assert result["ok"] and (result["ir"], result["ast"]) == expected
+
+
+def test_handle_request_and_cache():
+    async def probar():
+        server = CompileServer(workers=0)
+        for pipeline, source in CASOS:
+            first = await server.handle_request({"pipeline": pipeline, "source": source, "ast": True})
+            second = await server.handle_request({"pipeline": pipeline, "source": source, "ast": True})
+            assert not first["cached"] and second["cached"]
+            for key in ("ok", "ir", "ast", "error"):
+                assert first.get(key) == second.get(key)
+            expected = esperado(pipeline, source)
+            if not isinstance(expected, str):
+                assert (first["ir"], base64.b64decode(first["ast"])) == expected
+            without_ast = await server.handle_request({"pipeline": pipeline, "source": source})
+            assert "ast" not in without_ast and not without_ast["cached"]
+        stats = server.stats()
+        assert stats["cache"]["hits"] == len(CASOS) and stats["cache"]["misses"] == 2 * len(CASOS)
+        assert stats["latency_ms"]["final"]["count"] == 3 * len(PROGRAMAS["final"])
+        server.close()
+
+    asyncio.run(probar())
+
+
+def test_invalid_requests():
+    async def probar():
+        server = CompileServer(workers=0)
+        for request in ([1, 2], {"pipeline": 3, "source": "x = 1"}, {"pipeline": "otro"}):
+            response = await server.handle_request(request)
+            assert not response["ok"] and response["error"]
+        server.close()
+
+    asyncio.run(probar())
+
+
+def test_socket_connection(tmp_path):
+    # Varias peticiones por la misma conexión, incluidas líneas que no son
+    # JSON: cada una recibe su respuesta, con su id si lo tenía
+    path = str(tmp_path / "servidor.sock")
+
+    async def probar():
+        server = CompileServer(workers=0)
+        unix_server = await asyncio.start_unix_server(server.handle_connection, path=path)
+        reader, writer = await asyncio.open_unix_connection(path)
+        requests = [{"id": i, "pipeline": pipeline, "source": source}
+                    for i, (pipeline, source) in enumerate(CASOS)]
+        lines = [json.dumps(request) for request in requests] + ["{no es json", '{"id": 99, "op": "stats"}']
+        writer.write(("\n".join(lines) + "\n").encode("utf-8"))
+        await writer.drain()
+        responses = [json.loads(await reader.readline()) for _ in lines]
+        writer.close()
+        unix_server.close()
+        await unix_server.wait_closed()
+        server.close()
+        return responses
+
+    responses = asyncio.run(probar())
+    by_id = {response.get("id"): response for response in responses}
+    for i, (pipeline, source) in enumerate(CASOS):
+        expected = esperado(pipeline, source)
+        assert by_id[i]["ok"] == (not isinstance(expected, str))
+    assert by_id[99]["ok"] and "cache" in by_id[99]
+    assert "JSON" in by_id[None]["error"]
+
+
+def test_process_pool_matches_inline():
+    async def probar():
+        server = CompileServer(workers=1)
+        try:
+            return [await server.compile(pipeline, source) for pipeline, source in CASOS]
+        finally:
+            server.close()
+
+    results = asyncio.run(probar())
+    assert [result for result, _cached in results] == [compile_source(p, s) for p, s in CASOS]
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas del tokenizador
+-----------------------
+Tokenizar línea por línea da los mismos tokens (con su línea y columna) que
+pasar el texto completo por el lexer de PLY, y los formatos JSON Lines y
+binario conservan cada token.
+"""
+
+import io
+import json
+import random
+
+import pytest
+
+import tokenizador
+from tokenizador import Token, read_binary, tokenize, write_binary, write_jsonl
+
+PIEZAS = ["x", "abc_1", "_y", "12", "7", "+", "-", "*", "/", "(", ")", " ", "\t", "\n", "\n\n", "ñ", "$"]
+
+
+def texto_al_azar(semilla):
+    rng = random.Random(semilla)
+    return "".join(rng.choice(PIEZAS) for _ in range(rng.randint(0, 300)))
+
+
+def tokens_de_referencia(texto):
+    """
+    Tokens del texto completo con el lexer de PLY; la columna se calcula
+    desde el último salto de línea.
+    """
+    lexer = tokenizador.lexer.clone()
+    lexer.lineno = 1
+    lexer.input(texto)
+    resultado = []
+    while True:
+        tok = lexer.token()
+        if not tok:
+            return resultado
+        inicio_linea = texto.rfind("\n", 0, tok.lexpos) + 1
+        resultado.append(Token(tok.type, tok.value, tok.lineno, tok.lexpos - inicio_linea + 1))
+
+
+@pytest.mark.parametrize("semilla", range(100))
+def test_igual_que_el_texto_completo(semilla, capsys):
+    texto = texto_al_azar(semilla)
+    assert list(tokenize(texto)) == tokens_de_referencia(texto)
+    # Los caracteres ilegales se informan por stderr, no en la salida
+    assert capsys.readouterr().out == ""
+
+
+@pytest.mark.parametrize("semilla", range(30))
+def test_formatos(semilla, capsys):
+    esperado = list(tokenize(texto_al_azar(semilla)))
+    binario = io.BytesIO()
+    write_binary(esperado, binario)
+    binario.seek(0)
+    assert list(read_binary(binario)) == esperado
+    jsonl = io.StringIO()
+    write_jsonl(esperado, jsonl)
+    assert [Token(**json.loads(linea)) for linea in jsonl.getvalue().splitlines()] == esperado
+
+
+def test_rechaza_otro_formato():
+    with pytest.raises(ValueError):
+        list(read_binary(io.BytesIO(b"XXXX")))
+
+
+def test_linea_de_comandos(tmp_path, capsys):
+    entrada = tmp_path / "programa.txt"
+    entrada.write_text("x = 12 + y\n  (abc) * 3\n", encoding="utf-8")
+    salida = tmp_path / "tokens.bin"
+    tokenizador.main([str(entrada), "-f", "bin", "-o", str(salida)])
+    with open(salida, "rb") as flujo:
+        assert list(read_binary(flujo)) == list(tokenize(entrada.read_text(encoding="utf-8")))
+    tokenizador.main([str(entrada)])
+    lineas = capsys.readouterr().out.splitlines()
+    assert json.loads(lineas[0]) == {"type": "ID", "value": "x", "line": 1, "column": 1}
+    assert json.loads(lineas[-1]) == {"type": "NUMBER", "value": 3, "line": 2, "column": 11}
@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""
+Tokenizador sin interfaz gráfica (PLY)
+--------------------------------------
+Contiene las reglas léxicas de Analizador_Flex.py en un módulo importable que
+no depende de Tkinter. Los tokens se producen línea por línea, con su línea y
+columna, de modo que archivos arbitrariamente grandes se procesan con memoria
+constante. Desde la línea de comandos los tokens se escriben como JSON Lines o
+en un formato binario compacto.
+
+Uso:
+    python tokenizador.py programa.txt                 # JSON Lines a stdout
+    python tokenizador.py programa.txt -f bin -o t.bin
+    cat programa.txt | python tokenizador.py -
+"""
+
+import argparse
+import io
+import json
+import struct
+import sys
+from collections import namedtuple
+
+import ply.lex as lex
+
+# ----------------------------------------------------------------------
+# Definición de tokens
+# ----------------------------------------------------------------------
+# Lista de nombres de tokens que el analizador reconocerá.
+tokens = (
+    'NUMBER',
+    'PLUS',
+    'MINUS',
+    'TIMES',
+    'DIVIDE',
+    'LPAREN',
+    'RPAREN',
+    'ID'
+)
+
+# Expresiones regulares para tokens de un solo carácter
+t_PLUS = r'\+'
+t_MINUS = r'-'
+t_TIMES = r'\*'
+t_DIVIDE = r'/'
+t_LPAREN = r'\('
+t_RPAREN = r'\)'
+
+# Token para identificadores: letras, números y guiones bajos, comenzando con letra o _
+t_ID = r'[a-zA-Z_][a-zA-Z_0-9]*'
+
+
+# Token para números (enteros)
+def t_NUMBER(t):
+    r'\d+'
+    t.value = int(t.value)  # Convertir el valor a entero
+    return t
+
+
+# Caracteres a ignorar (espacios y tabulaciones)
+t_ignore = ' \t'
+
+
+# Actualización del contador de línea para saltos de línea
+def t_newline(t):
+    r'\n+'
+    t.lexer.lineno += len(t.value)
+
+
+# Manejo de errores: se informa por stderr (para no mezclarse con la salida de
+# tokens) y se ignora el carácter ilegal
+def t_error(t):
+    print(f"Caracter ilegal '{t.value[0]}' en la línea {t.lineno}", file=sys.stderr)
+    t.lexer.skip(1)
+
+
+# Construcción del lexer (analizador léxico)
+lexer = lex.lex()
+
+# Token con posición: la columna empieza en 1, igual que la línea
+Token = namedtuple('Token', ['type', 'value', 'line', 'column'])
+
+
+# ----------------------------------------------------------------------
+# Tokenización por líneas
+# ----------------------------------------------------------------------
+def tokenize_lines(lines):
+    """
+    Genera los tokens de un iterable de líneas (por ejemplo, un archivo
+    abierto). Ningún token abarca más de una línea, así que solo se mantiene
+    en memoria la línea actual.
+    """
+    line_lexer = lexer.clone()
+    for line_number, line in enumerate(lines, start=1):
+        line_lexer.lineno = line_number
+        line_lexer.input(line)
+        while True:
+            tok = line_lexer.token()
+            if not tok:
+                break
+            yield Token(tok.type, tok.value, line_number, tok.lexpos + 1)
+
+
+def tokenize(text):
+    """
+    Genera los tokens de una cadena completa.
+    """
+    return tokenize_lines(io.StringIO(text))
+
+
+# ----------------------------------------------------------------------
+# Formatos de salida
+# ----------------------------------------------------------------------
+def write_jsonl(token_stream, out):
+    """
+    Escribe un objeto JSON por línea: {"type", "value", "line", "column"}.
+    """
+    for tok in token_stream:
+        out.write(json.dumps(tok._asdict(), ensure_ascii=False))
+        out.write("\n")
+
+
+# Formato binario:
+#   cabecera: b"TKN1", uint8 n, y n nombres de tipo (uint8 longitud + ASCII)
+#   registro: uint8 tipo, uint32 línea, uint32 columna, uint16 longitud y el
+#             valor como texto UTF-8
+BINARY_MAGIC = b"TKN1"
+_RECORD = struct.Struct('<BIIH')
+
+
+def write_binary(token_stream, out):
+    """
+    Escribe los tokens en el formato binario compacto en el flujo binario out.
+    """
+    type_index = {name: i for i, name in enumerate(tokens)}
+    header = [BINARY_MAGIC, bytes([len(tokens)])]
+    for name in tokens:
+        header.append(bytes([len(name)]) + name.encode('ascii'))
+    out.write(b"".join(header))
+    pack = _RECORD.pack
+    for tok in token_stream:
+        value = str(tok.value).encode('utf-8')
+        out.write(pack(type_index[tok.type], tok.line, tok.column, len(value)))
+        out.write(value)
+
+
+def read_binary(stream):
+    """
+    Lee un flujo binario producido por write_binary y genera los Token.
+    Los valores de NUMBER se devuelven como int.
+    """
+    if stream.read(4) != BINARY_MAGIC:
+        raise ValueError("El flujo no está en el formato binario de tokens")
+    names = []
+    for _ in range(stream.read(1)[0]):
+        length = stream.read(1)[0]
+        names.append(stream.read(length).decode('ascii'))
+    size = _RECORD.size
+    while True:
+        record = stream.read(size)
+        if not record:
+            return
+        kind, line, column, length = _RECORD.unpack(record)
+        value = stream.read(length).decode('utf-8')
+        if names[kind] == 'NUMBER':
+            value = int(value)
+        yield Token(names[kind], value, line, column)
+
+
+# ----------------------------------------------------------------------
+# Línea de comandos
+# ----------------------------------------------------------------------
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Tokeniza un archivo con el lexer PLY.")
+    arg_parser.add_argument("entrada", help="archivo de entrada o '-' para stdin")
+    arg_parser.add_argument("-f", "--formato", choices=("jsonl", "bin"), default="jsonl",
+                            help="formato de salida (por defecto jsonl)")
+    arg_parser.add_argument("-o", "--salida", help="archivo de salida (por defecto stdout)")
+    args = arg_parser.parse_args(argv)
+
+    source = sys.stdin if args.entrada == "-" else open(args.entrada, "r", encoding="utf-8")
+    binary = args.formato == "bin"
+    if args.salida is not None:
+        out = open(args.salida, "wb" if binary else "w", encoding=None if binary else "utf-8")
+    else:
+        out = sys.stdout.buffer if binary else sys.stdout
+    try:
+        token_stream = tokenize_lines(source)
+        if binary:
+            write_binary(token_stream, out)
+        else:
+            write_jsonl(token_stream, out)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if args.salida is not None:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()